@@ -0,0 +1,37 @@
+"""add token_counts to messages
+
+Revision ID: 3b7e2d9c4a15
+Revises: 1c28e167b74f
+Create Date: 2026-10-18 10:12:41.302114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e2d9c4a15"
+down_revision: Union[str, None] = "1c28e167b74f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    message_columns = {column["name"] for column in inspector.get_columns("messages")}
+    if "token_counts" not in message_columns:
+        op.add_column("messages", sa.Column("token_counts", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    message_columns = {column["name"] for column in inspector.get_columns("messages")}
+    if "token_counts" in message_columns:
+        op.drop_column("messages", "token_counts")
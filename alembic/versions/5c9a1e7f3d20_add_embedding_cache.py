@@ -0,0 +1,39 @@
+"""add embedding cache
+
+Revision ID: 5c9a1e7f3d20
+Revises: 8d41f0a6b2c3
+Create Date: 2026-10-18 14:21:40.192035
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c9a1e7f3d20"
+down_revision: Union[str, None] = "8d41f0a6b2c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("cache_key", sa.String(), nullable=False),
+        sa.Column("organization_id", sa.String(), nullable=False),
+        sa.Column("embedding_model", sa.String(), nullable=False),
+        sa.Column("embedding_dim", sa.Integer(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("cache_key"),
+    )
+    op.create_index("ix_embedding_cache_created_at", "embedding_cache", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_created_at", table_name="embedding_cache")
+    op.drop_table("embedding_cache")
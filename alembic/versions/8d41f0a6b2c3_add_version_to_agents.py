@@ -0,0 +1,37 @@
+"""add version to agents
+
+Revision ID: 8d41f0a6b2c3
+Revises: 3b7e2d9c4a15
+Create Date: 2026-10-18 11:02:17.518733
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41f0a6b2c3"
+down_revision: Union[str, None] = "3b7e2d9c4a15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    agent_columns = {column["name"] for column in inspector.get_columns("agents")}
+    if "version" not in agent_columns:
+        op.add_column("agents", sa.Column("version", sa.BigInteger(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    agent_columns = {column["name"] for column in inspector.get_columns("agents")}
+    if "version" in agent_columns:
+        op.drop_column("agents", "version")
@@ -0,0 +1,38 @@
+"""add passage ann pre-filter indexes
+
+Revision ID: b7e2d94c1a05
+Revises: 5c9a1e7f3d20
+Create Date: 2026-10-18 16:02:11.583920
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d94c1a05"
+down_revision: Union[str, None] = "5c9a1e7f3d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    # composite indexes for the scope + date pre-filters of vector search; the per-archive/per-source ANN
+    # indexes themselves are built on demand by PassageVectorIndexManager
+    op.create_index("ix_archival_passages_archive_created_at", "archival_passages", ["archive_id", "created_at"], unique=False)
+    op.create_index("ix_source_passages_source_created_at", "source_passages", ["source_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    op.drop_index("ix_source_passages_source_created_at", table_name="source_passages")
+    op.drop_index("ix_archival_passages_archive_created_at", table_name="archival_passages")
@@ -0,0 +1,74 @@
+"""add message search columns
+
+Revision ID: e4a9c1d7b362
+Revises: b7e2d94c1a05
+Create Date: 2026-10-18 18:41:27.204816
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+from alembic import op
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a9c1d7b362"
+down_revision: Union[str, None] = "b7e2d94c1a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must match letta.orm.message.MESSAGE_SEARCH_VECTOR_SQL, which search queries use to hit the index
+MESSAGE_SEARCH_VECTOR_SQL = (
+    "to_tsvector('english'::regconfig, coalesce(\"text\", '')) || "
+    "to_tsvector('english'::regconfig, coalesce(jsonb_path_query_array(content::jsonb, '$[*] ? (@.type == \"text\").text'), '[]'::jsonb)) || "
+    "to_tsvector('english'::regconfig, coalesce(jsonb_path_query_array(tool_calls::jsonb, '$[*].function.arguments'), '[]'::jsonb))"
+)
+
+
+def upgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    # optional embedding of the message, for hybrid search without Turbopuffer (nullable, so no table rewrite)
+    # sized for text-embedding-3-small (letta.constants.MESSAGE_EMBEDDING_DIM) so it can have an HNSW index
+    op.add_column("messages", sa.Column("embedding", Vector(dim=1536), nullable=True))
+
+    # built concurrently so writes to messages are not blocked while the indexes build
+    with op.get_context().autocommit_block():
+        # expression index instead of a stored generated column, which would rewrite the whole messages table
+        op.create_index(
+            "ix_messages_search_vector",
+            "messages",
+            [sa.text(f"({MESSAGE_SEARCH_VECTOR_SQL})")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_messages_embedding",
+            "messages",
+            ["embedding"],
+            unique=False,
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_where=sa.text("embedding IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # Skip this migration for SQLite
+    if not settings.letta_pg_uri_no_default:
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_messages_embedding", table_name="messages", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_messages_search_vector", table_name="messages", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("messages", "embedding")
@@ -0,0 +1,61 @@
+"""add fork parent to conversations
+
+Revision ID: f3b8d2a6c914
+Revises: e4a9c1d7b362
+Create Date: 2026-10-18 21:12:45.530917
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d2a6c914"
+down_revision: Union[str, None] = "e4a9c1d7b362"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    conversation_columns = {column["name"] for column in inspector.get_columns("conversations")}
+    if "parent_conversation_id" not in conversation_columns:
+        op.add_column("conversations", sa.Column("parent_conversation_id", sa.String(), nullable=True))
+        # SQLite can't add constraints to existing tables
+        if bind.dialect.name != "sqlite":
+            op.create_foreign_key(
+                "fk_conversations_parent_conversation_id",
+                "conversations",
+                "conversations",
+                ["parent_conversation_id"],
+                ["id"],
+                ondelete="SET NULL",
+            )
+    if "fork_position" not in conversation_columns:
+        op.add_column("conversations", sa.Column("fork_position", sa.Integer(), nullable=True))
+
+    conversation_indexes = {index["name"] for index in inspector.get_indexes("conversations")}
+    if "ix_conversations_parent_conversation_id" not in conversation_indexes:
+        op.create_index("ix_conversations_parent_conversation_id", "conversations", ["parent_conversation_id"], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    conversation_indexes = {index["name"] for index in inspector.get_indexes("conversations")}
+    if "ix_conversations_parent_conversation_id" in conversation_indexes:
+        op.drop_index("ix_conversations_parent_conversation_id", table_name="conversations")
+
+    conversation_columns = {column["name"] for column in inspector.get_columns("conversations")}
+    if "fork_position" in conversation_columns:
+        op.drop_column("conversations", "fork_position")
+    if "parent_conversation_id" in conversation_columns:
+        if bind.dialect.name != "sqlite":
+            op.drop_constraint("fk_conversations_parent_conversation_id", "conversations", type_="foreignkey")
+        op.drop_column("conversations", "parent_conversation_id")
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import uuid
 from datetime import datetime
@@ -62,6 +63,7 @@ from letta.services.credit_verification_service import CreditVerificationService
 from letta.services.helpers.tool_parser_helper import runtime_override_tool_json_schema
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
+from letta.services.run_cancellation import get_run_cancellation_signals, is_run_cancelled_by_signal
 from letta.services.run_manager import RunManager
 from letta.services.step_manager import StepManager
 from letta.services.summarizer.enums import SummarizationMode
@@ -734,6 +736,8 @@ class LettaAgentV2(BaseAgentV2):
         self.last_function_response = None
         self.response_messages = []
         self.override_system: str | None = None
+        # the run's pushed cancellation event, held while this agent runs it
+        self.run_cancellation_event: asyncio.Event | None = None
 
     async def _check_credits(self) -> bool:
         """Check if the organization still has credits. Returns True if OK or not configured."""
@@ -749,6 +753,12 @@ class LettaAgentV2(BaseAgentV2):
     @trace_method
     async def _check_run_cancellation(self, run_id) -> bool:
         try:
+            if settings.run_cancellation_push_enabled and self.run_cancellation_event is None:
+                # keeps the run registered for pushes, so later checks are answered without a Redis query
+                self.run_cancellation_event = get_run_cancellation_signals().event(run_id)
+            cancelled = await is_run_cancelled_by_signal(run_id)
+            if cancelled is not None:
+                return cancelled
             run = await self.run_manager.get_run_by_id(run_id=run_id, actor=self.actor)
             return run.status == RunStatus.cancelled
         except Exception as e:
@@ -93,6 +93,8 @@ DEFAULT_MIN_MESSAGE_BUFFER_LENGTH = 15
 MAX_EMBEDDING_DIM = 4096  # maximum supported embeding size - do NOT change or else DBs will need to be reset
 DEFAULT_EMBEDDING_CHUNK_SIZE = 300
 DEFAULT_EMBEDDING_DIM = 1024
+# dimension of messages.embedding: the model Turbopuffer message search also uses (text-embedding-3-small)
+MESSAGE_EMBEDDING_DIM = 1536
 
 # tokenizers
 EMBEDDING_TO_TOKENIZER_MAP = {
@@ -482,6 +484,20 @@ OTID_RUN_TTL_SECONDS = 10800  # 3 hours (same as stream TTL)
 MEMORY_REPO_LOCK_PREFIX = "memory_repo:lock:"
 MEMORY_REPO_LOCK_TTL_SECONDS = 60  # 1 minute (git operations should be fast)
 
+# MCP server tool listings (per organization and server)
+MCP_TOOL_CACHE_PREFIX = "mcp:tools:"
+
+# Provider model catalog invalidations (payload: organization id, or empty for global providers)
+PROVIDER_CATALOG_INVALIDATION_CHANNEL = "provider_catalog:invalidate"
+
+# Runs with SSE subscribers, so writers in every process flush their chunks immediately (payload: run id)
+SSE_LIVE_RUNS_CHANNEL = "sse:live_runs"
+
+# Run cancellations, pushed to the processes executing the runs (payload: run id), and recorded for late readers
+RUN_CANCELLATION_CHANNEL = "run:cancellations"
+RUN_CANCELLED_KEY_PREFIX = "run:cancelled:"
+RUN_CANCELLED_KEY_TTL_SECONDS = 10800  # 3 hours, like run streams
+
 # TODO: This is temporary, eventually use token-based eviction
 # File based controls
 DEFAULT_MAX_FILES_OPEN = 5
@@ -1,6 +1,6 @@
 import asyncio
 from functools import wraps
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
 
 from letta.constants import (
     CONVERSATION_LOCK_PREFIX,
@@ -372,6 +372,12 @@ class AsyncRedisClient:
         client = await self.get_client()
         return await client.exists(*keys)
 
+    @with_retry()
+    async def mget(self, *keys: str) -> List[Any]:
+        """Get the values of keys, None for missing keys."""
+        client = await self.get_client()
+        return await client.mget(*keys)
+
     # Set operations
     async def sadd(self, key: str, *members: Union[str, int, float]) -> int:
         """Add members to set."""
@@ -413,6 +419,30 @@ class AsyncRedisClient:
         client = await self.get_client()
         return await client.decr(key)
 
+    # Pub/sub operations
+    @with_retry()
+    async def publish(self, channel: str, message: Union[str, bytes]) -> int:
+        """Publish a message to a channel. Returns the number of subscribers that received it."""
+        client = await self.get_client()
+        return await client.publish(channel, message)
+
+    async def subscribe(self, *channels: str, on_subscribe: Optional[Callable[[], Awaitable[None]]] = None) -> AsyncIterator[Dict]:
+        """
+        Subscribe to channels and yield their messages until the iteration is closed or cancelled. `on_subscribe` is
+        awaited once subscribed, before any message is yielded (messages published meanwhile are yielded after it).
+        """
+        client = await self.get_client()
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(*channels)
+        try:
+            if on_subscribe is not None:
+                await on_subscribe()
+            async for message in pubsub.listen():
+                yield message
+        finally:
+            await pubsub.unsubscribe(*channels)
+            await pubsub.aclose()
+
     # Stream operations
     @with_retry()
     async def xadd(self, stream: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
@@ -581,6 +611,9 @@ class NoopAsyncRedisClient(AsyncRedisClient):
     async def exists(self, *keys: str) -> int:
         return 0
 
+    async def mget(self, *keys: str) -> List[Any]:
+        return [None] * len(keys)
+
     async def sadd(self, key: str, *members: Union[str, int, float]) -> int:
         return 0
 
@@ -634,6 +667,14 @@ class NoopAsyncRedisClient(AsyncRedisClient):
     async def srem(self, key: str, *members: Union[str, int, float]) -> int:
         return 0
 
+    # Pub/sub operations
+    async def publish(self, channel: str, message: Union[str, bytes]) -> int:
+        return 0
+
+    async def subscribe(self, *channels: str, on_subscribe: Optional[Callable[[], Awaitable[None]]] = None) -> AsyncIterator[Dict]:
+        return
+        yield
+
     # Stream operations
     async def xadd(self, stream: str, fields: Dict[str, Any], id: str = "*", maxlen: Optional[int] = None, approximate: bool = True) -> str:
         return ""
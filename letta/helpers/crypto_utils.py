@@ -2,9 +2,11 @@ import asyncio
 import base64
 import hashlib
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -40,6 +42,26 @@ PLAINTEXT_PREFIXES = (
     "ASIA",  # AWS temporary credentials
 )
 
+# Envelope-encrypted values are ENVELOPE_PREFIX + base64(wrapped data key + iv + ciphertext + tag), where the wrapped
+# data key is iv + AES-GCM(key-encryption key, data key) + tag. Legacy values are base64(salt + iv + ciphertext + tag),
+# which can never start with the prefix since ":" is not in the base64 alphabet.
+ENVELOPE_PREFIX = "enc:v2:"
+_WRAP_AAD = b"letta-envelope-data-key-v2"
+
+
+@dataclass
+class _DataKey:
+    key: bytes
+    wrapped: bytes
+    uses: int = 0
+
+
+# key-encryption keys by master key, derived once per process
+_keks: Dict[str, bytes] = {}
+# data keys used for new encryptions, by (key-encryption key, organization id)
+_data_keys: Dict[Tuple[bytes, Optional[str]], _DataKey] = {}
+_data_keys_lock = threading.Lock()
+
 
 class CryptoUtils:
     """Utility class for AES-256-GCM encryption/decryption of sensitive data."""
@@ -58,6 +80,14 @@ class CryptoUtils:
     # Number of PBKDF2 iterations
     PBKDF2_ITERATIONS = 100000
 
+    # WARNING: DO NOT CHANGE THIS VALUE, EXISTING ENVELOPE-ENCRYPTED SECRETS DEPEND ON IT
+    # Fixed salt for the envelope key-encryption key, which every process must derive identically
+    KEK_SALT = b"letta-envelope-kek-v2"
+    # Size of a wrapped data key: iv + encrypted key + tag
+    WRAPPED_KEY_SIZE = IV_SIZE + KEY_SIZE + TAG_SIZE
+    # Encryptions per data key before a new one is generated (far below the random-IV limit for AES-GCM)
+    DATA_KEY_MAX_USES = 1 << 20
+
     @classmethod
     @lru_cache(maxsize=256)
     def _derive_key_cached(cls, master_key: str, salt: bytes) -> bytes:
@@ -101,7 +131,88 @@ class CryptoUtils:
         return await loop.run_in_executor(_crypto_executor, cls._derive_key, master_key, salt)
 
     @classmethod
-    def encrypt(cls, plaintext: str, master_key: Optional[str] = None) -> str:
+    def _derive_kek(cls, master_key: str) -> bytes:
+        """
+        Derive the envelope key-encryption key from the master key (PBKDF2, once per process and master key).
+
+        WARNING: The first call per master key is a synchronous blocking operation (100-500ms). Use
+        _derive_kek_async() in async contexts.
+        """
+        kek = _keks.get(master_key)
+        if kek is None:
+            kek = hashlib.pbkdf2_hmac(
+                hash_name="sha256",
+                password=master_key.encode(),
+                salt=cls.KEK_SALT,
+                iterations=cls.PBKDF2_ITERATIONS,
+                dklen=cls.KEY_SIZE,
+            )
+            _keks[master_key] = kek
+        return kek
+
+    @classmethod
+    async def _derive_kek_async(cls, master_key: str) -> bytes:
+        """Async version of _derive_kek that only uses the crypto thread pool when the key is not derived yet."""
+        kek = _keks.get(master_key)
+        if kek is not None:
+            return kek
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_crypto_executor, cls._derive_kek, master_key)
+
+    @classmethod
+    def _gcm_encrypt(cls, key: bytes, iv: bytes, data: bytes, associated_data: bytes) -> bytes:
+        """AES-256-GCM encrypt, returning ciphertext + tag."""
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(iv), backend=_CRYPTO_BACKEND).encryptor()
+        encryptor.authenticate_additional_data(associated_data)
+        return encryptor.update(data) + encryptor.finalize() + encryptor.tag
+
+    @classmethod
+    def _gcm_decrypt(cls, key: bytes, iv: bytes, data: bytes, associated_data: bytes) -> bytes:
+        """AES-256-GCM decrypt of ciphertext + tag."""
+        decryptor = Cipher(algorithms.AES(key), modes.GCM(iv, data[-cls.TAG_SIZE :]), backend=_CRYPTO_BACKEND).decryptor()
+        decryptor.authenticate_additional_data(associated_data)
+        return decryptor.update(data[: -cls.TAG_SIZE]) + decryptor.finalize()
+
+    @classmethod
+    def _get_data_key(cls, kek: bytes, organization_id: Optional[str]) -> _DataKey:
+        """The in-memory data key for new encryptions of an organization's secrets (rotated after DATA_KEY_MAX_USES)."""
+        with _data_keys_lock:
+            data_key = _data_keys.get((kek, organization_id))
+            if data_key is None or data_key.uses >= cls.DATA_KEY_MAX_USES:
+                key = os.urandom(cls.KEY_SIZE)
+                iv = os.urandom(cls.IV_SIZE)
+                data_key = _DataKey(key=key, wrapped=iv + cls._gcm_encrypt(kek, iv, key, _WRAP_AAD))
+                _data_keys[(kek, organization_id)] = data_key
+            data_key.uses += 1
+            return data_key
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _unwrap_data_key_cached(cls, kek: bytes, wrapped: bytes) -> bytes:
+        """Decrypt a wrapped data key. A single AES-GCM operation, cached since many values share a data key."""
+        return cls._gcm_decrypt(kek, wrapped[: cls.IV_SIZE], wrapped[cls.IV_SIZE :], _WRAP_AAD)
+
+    @classmethod
+    def _envelope_encrypt(cls, plaintext: str, kek: bytes, organization_id: Optional[str]) -> str:
+        data_key = cls._get_data_key(kek, organization_id)
+        iv = os.urandom(cls.IV_SIZE)
+        # bind the value to its wrapped data key so the two cannot be mixed and matched
+        ciphertext = cls._gcm_encrypt(data_key.key, iv, plaintext.encode(), ENVELOPE_PREFIX.encode() + data_key.wrapped)
+        return ENVELOPE_PREFIX + base64.b64encode(data_key.wrapped + iv + ciphertext).decode("utf-8")
+
+    @classmethod
+    def _envelope_decrypt(cls, encrypted: str, kek: bytes) -> str:
+        encrypted_data = base64.b64decode(encrypted[len(ENVELOPE_PREFIX) :], validate=True)
+        wrapped = encrypted_data[: cls.WRAPPED_KEY_SIZE]
+        iv = encrypted_data[cls.WRAPPED_KEY_SIZE : cls.WRAPPED_KEY_SIZE + cls.IV_SIZE]
+        ciphertext = encrypted_data[cls.WRAPPED_KEY_SIZE + cls.IV_SIZE :]
+        if len(wrapped) != cls.WRAPPED_KEY_SIZE or len(ciphertext) < cls.TAG_SIZE:
+            raise ValueError("Envelope-encrypted value is truncated")
+        data_key = cls._unwrap_data_key_cached(kek, wrapped)
+        return cls._gcm_decrypt(data_key, iv, ciphertext, ENVELOPE_PREFIX.encode() + wrapped).decode("utf-8")
+
+    @classmethod
+    def encrypt(cls, plaintext: str, master_key: Optional[str] = None, organization_id: Optional[str] = None) -> str:
         """
         Encrypt a string using AES-256-GCM (synchronous version).
 
@@ -111,9 +222,11 @@ class CryptoUtils:
         Args:
             plaintext: The string to encrypt
             master_key: Optional master key (defaults to settings.encryption_key)
+            organization_id: Optional organization whose data key is used (envelope format only)
 
         Returns:
-            Base64 encoded string containing: salt + iv + ciphertext + tag
+            Base64 encoded string containing: salt + iv + ciphertext + tag, or an envelope-encrypted
+            value (see ENVELOPE_PREFIX) if settings.encryption_envelope_enabled is set
 
         Raises:
             ValueError: If no encryption key is configured
@@ -126,6 +239,9 @@ class CryptoUtils:
                 "No encryption key configured. Please set the LETTA_ENCRYPTION_KEY environment variable (not fully supported yet for Letta v0.12.1 and below)."
             )
 
+        if settings.encryption_envelope_enabled:
+            return cls._envelope_encrypt(plaintext, cls._derive_kek(master_key), organization_id)
+
         # Generate random salt and IV
         salt = os.urandom(cls.SALT_SIZE)
         iv = os.urandom(cls.IV_SIZE)
@@ -150,7 +266,7 @@ class CryptoUtils:
         return base64.b64encode(encrypted_data).decode("utf-8")
 
     @classmethod
-    async def encrypt_async(cls, plaintext: str, master_key: Optional[str] = None) -> str:
+    async def encrypt_async(cls, plaintext: str, master_key: Optional[str] = None, organization_id: Optional[str] = None) -> str:
         """
         Encrypt a string using AES-256-GCM (async version).
 
@@ -160,9 +276,11 @@ class CryptoUtils:
         Args:
             plaintext: The string to encrypt
             master_key: Optional master key (defaults to settings.encryption_key)
+            organization_id: Optional organization whose data key is used (envelope format only)
 
         Returns:
-            Base64 encoded string containing: salt + iv + ciphertext + tag
+            Base64 encoded string containing: salt + iv + ciphertext + tag, or an envelope-encrypted
+            value (see ENVELOPE_PREFIX) if settings.encryption_envelope_enabled is set
 
         Raises:
             ValueError: If no encryption key is configured
@@ -175,6 +293,10 @@ class CryptoUtils:
                 "No encryption key configured. Please set the LETTA_ENCRYPTION_KEY environment variable (not fully supported yet for Letta v0.12.1 and below)."
             )
 
+        if settings.encryption_envelope_enabled:
+            # only the first call per process derives the key-encryption key, the rest is a single AES-GCM operation
+            return cls._envelope_encrypt(plaintext, await cls._derive_kek_async(master_key), organization_id)
+
         # Generate random salt and IV
         salt = os.urandom(cls.SALT_SIZE)
         iv = os.urandom(cls.IV_SIZE)
@@ -225,6 +347,9 @@ class CryptoUtils:
             )
 
         try:
+            if encrypted.startswith(ENVELOPE_PREFIX):
+                return cls._envelope_decrypt(encrypted, cls._derive_kek(master_key))
+
             # Decode from base64
             encrypted_data = base64.b64decode(encrypted)
 
@@ -276,6 +401,9 @@ class CryptoUtils:
             )
 
         try:
+            if encrypted.startswith(ENVELOPE_PREFIX):
+                return cls._envelope_decrypt(encrypted, await cls._derive_kek_async(master_key))
+
             # Decode from base64
             encrypted_data = base64.b64decode(encrypted)
 
@@ -313,14 +441,27 @@ class CryptoUtils:
         if any(value.startswith(prefix) for prefix in PLAINTEXT_PREFIXES):
             return False
 
+        if value.startswith(ENVELOPE_PREFIX):
+            try:
+                decoded = base64.b64decode(value[len(ENVELOPE_PREFIX) :], validate=True)
+                # wrapped data key + iv + tag + ciphertext (empty for an encrypted empty string)
+                return len(decoded) >= cls.WRAPPED_KEY_SIZE + cls.IV_SIZE + cls.TAG_SIZE
+            except Exception:
+                return False
+
         try:
             decoded = base64.b64decode(value)
             # Check if length is consistent with our encryption format
-            # Minimum size: salt(16) + iv(12) + tag(16) + at least 1 byte of ciphertext
-            return len(decoded) >= cls.SALT_SIZE + cls.IV_SIZE + cls.TAG_SIZE + 1
+            # Minimum size: salt(16) + iv(12) + tag(16), plus no ciphertext bytes for an encrypted empty string
+            return len(decoded) >= cls.SALT_SIZE + cls.IV_SIZE + cls.TAG_SIZE
         except Exception:
             return False
 
+    @classmethod
+    def is_legacy_encrypted(cls, value: str) -> bool:
+        """Check if a string appears to be encrypted in the legacy (per-value PBKDF2) format rather than the envelope format."""
+        return not value.startswith(ENVELOPE_PREFIX) and cls.is_encrypted(value)
+
     @classmethod
     def is_encryption_available(cls) -> bool:
         """
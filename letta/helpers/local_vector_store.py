@@ -0,0 +1,695 @@
+"""Embedded vector store: search namespaces on local disk, for deployments without Turbopuffer."""
+
+import asyncio
+import heapq
+import math
+import os
+import random
+import re
+import shutil
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import orjson
+
+from letta.helpers.vector_store import VectorStore
+from letta.log import get_logger
+from letta.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+# files of a namespace directory
+_LOG_FILE = "rows.jsonl"
+_VECTORS_FILE = "vectors.f32"
+_GRAPH_FILE = "hnsw.json"
+# flock()ed by the process that owns the namespace
+_LOCK_FILE = ".lock"
+
+# filtered vector searches over at most this many rows are exact instead of walking the HNSW graph
+_EXACT_SEARCH_MAX_ROWS = 10_000
+# the graph is saved once this many (or 10% more) vectors were added since it was last saved; later vectors are
+# re-inserted from the vectors file on load
+_GRAPH_SAVE_INTERVAL = 1_000
+# namespaces are compacted once this many (and more than half of their) vector slots belong to deleted rows
+_COMPACT_MIN_DEAD_SLOTS = 1_000
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    try:
+        if op == "Lt":
+            return value is not None and value < operand
+        if op == "Lte":
+            return value is not None and value <= operand
+        if op == "Gt":
+            return value is not None and value > operand
+        return value is not None and value >= operand
+    except TypeError:
+        return False
+
+
+def matches_filter(attributes: Dict[str, Any], filters: Optional[tuple]) -> bool:
+    """Whether a row matches a Turbopuffer filter expression."""
+    if filters is None:
+        return True
+    if filters[0] in ("And", "Or"):
+        results = (matches_filter(attributes, condition) for condition in filters[1])
+        return all(results) if filters[0] == "And" else any(results)
+    if filters[0] == "Not":
+        return not matches_filter(attributes, filters[1])
+
+    attribute, op, operand = filters
+    value = attributes.get(attribute)
+    if op == "Eq":
+        return value == operand
+    if op == "NotEq":
+        return value != operand
+    if op == "In":
+        return value in operand
+    if op == "NotIn":
+        return value not in operand
+    if op in ("Lt", "Lte", "Gt", "Gte"):
+        return _compare(value, op, operand)
+    if op == "Contains":
+        return isinstance(value, list) and operand in value
+    if op == "ContainsAny":
+        return isinstance(value, list) and any(item in value for item in operand)
+    raise ValueError(f"Unsupported filter operator for the local vector store: {op}")
+
+
+def _equality_conditions(filters: Optional[tuple]) -> List[Tuple[str, Any]]:
+    """(attribute, value) conditions every row matching the filter must meet, to look candidates up by value."""
+    if filters is None:
+        return []
+    if filters[0] == "And":
+        return [condition for nested in filters[1] for condition in _equality_conditions(nested)]
+    if len(filters) == 3 and filters[1] == "Eq" and isinstance(filters[2], str):
+        return [(filters[0], filters[2])]
+    return []
+
+
+def _write_durably(path: Path, data: bytes) -> None:
+    """Write a file and flush it to disk."""
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _fsync_directory(path: Path) -> None:
+    """Flush the entries of a directory to disk, so that files renamed into it survive a crash."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _HNSWIndex:
+    """
+    Hierarchical navigable small world graph (Malkov & Yashunin) over normalized vectors, by cosine distance.
+
+    Nodes are the vector slots of a namespace; slots of deleted rows stay in the graph so it remains connected, and
+    searches skip them through `accept`.
+    """
+
+    def __init__(self, m: int = 16, ef_construction: int = 100, seed: int = 0):
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = ef_construction
+        self.level_multiplier = 1 / math.log(m)
+        self.levels: List[int] = []
+        # neighbors of each node, per level
+        self.graph: List[List[List[int]]] = []
+        self.entry = -1
+        self.max_level = -1
+        self._rng = random.Random(seed)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def to_dict(self) -> dict:
+        return {"m": self.m, "ef_construction": self.ef_construction, "levels": self.levels, "graph": self.graph, "entry": self.entry}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "_HNSWIndex":
+        index = cls(m=data["m"], ef_construction=data["ef_construction"])
+        index.levels = data["levels"]
+        index.graph = data["graph"]
+        index.entry = data["entry"]
+        index.max_level = index.levels[index.entry] if index.entry >= 0 else -1
+        return index
+
+    def add(self, vectors: np.ndarray, slot: int) -> None:
+        """Insert the vector of `slot`, which must be the next slot."""
+        query = vectors[slot]
+        level = int(-math.log(1.0 - self._rng.random()) * self.level_multiplier)
+        self.levels.append(level)
+        self.graph.append([[] for _ in range(level + 1)])
+        if self.entry < 0:
+            self.entry, self.max_level = slot, level
+            return
+
+        entry_points = [self.entry]
+        for layer in range(self.max_level, level, -1):
+            entry_points = [self._search_layer(vectors, query, entry_points, 1, layer)[0][1]]
+        for layer in range(min(level, self.max_level), -1, -1):
+            nearest = self._search_layer(vectors, query, entry_points, self.ef_construction, layer)
+            max_links = self.m0 if layer == 0 else self.m
+            neighbors = [node for _, node in nearest[:max_links]]
+            self.graph[slot][layer] = neighbors
+            for neighbor in neighbors:
+                links = self.graph[neighbor][layer]
+                links.append(slot)
+                if len(links) > max_links:
+                    distances = 1.0 - vectors[links] @ vectors[neighbor]
+                    self.graph[neighbor][layer] = [links[i] for i in np.argsort(distances)[:max_links].tolist()]
+            entry_points = [node for _, node in nearest]
+
+        if level > self.max_level:
+            self.entry, self.max_level = slot, level
+
+    def search(self, vectors: np.ndarray, query: np.ndarray, top_k: int, ef: int, accept: Callable[[int], bool]) -> List[Tuple[float, int]]:
+        """The `top_k` nearest accepted nodes as (distance, slot), nearest first."""
+        if self.entry < 0:
+            return []
+        entry_points = [self.entry]
+        for layer in range(self.max_level, 0, -1):
+            entry_points = [self._search_layer(vectors, query, entry_points, 1, layer)[0][1]]
+        return self._search_layer(vectors, query, entry_points, max(ef, top_k), 0, accept)[:top_k]
+
+    def _search_layer(
+        self,
+        vectors: np.ndarray,
+        query: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+        accept: Optional[Callable[[int], bool]] = None,
+    ) -> List[Tuple[float, int]]:
+        visited = set(entry_points)
+        distances = (1.0 - vectors[entry_points] @ query).tolist()
+        candidates = list(zip(distances, entry_points))
+        heapq.heapify(candidates)
+        # max-heap of the nearest accepted nodes
+        results = [(-distance, node) for distance, node in candidates if accept is None or accept(node)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if len(results) >= ef and distance > -results[0][0]:
+                break
+            neighbors = [neighbor for neighbor in self.graph[node][layer] if neighbor not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            for neighbor_distance, neighbor in zip((1.0 - vectors[neighbors] @ query).tolist(), neighbors):
+                if len(results) < ef or neighbor_distance < -results[0][0]:
+                    heapq.heappush(candidates, (neighbor_distance, neighbor))
+                    if accept is None or accept(neighbor):
+                        heapq.heappush(results, (-neighbor_distance, neighbor))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+        return sorted((-distance, node) for distance, node in results)
+
+
+class _BM25Index:
+    """Inverted index of the `text` attribute of the rows of a namespace, ranked with Okapi BM25."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.term_counts: Dict[str, Counter] = {}
+        self.total_length = 0
+
+    def add(self, row_id: str, text: Optional[str]) -> None:
+        counts = Counter(_tokenize(text or ""))
+        self.term_counts[row_id] = counts
+        self.total_length += sum(counts.values())
+        for term, count in counts.items():
+            self.postings[term][row_id] = count
+
+    def remove(self, row_id: str) -> None:
+        counts = self.term_counts.pop(row_id, None)
+        if counts is None:
+            return
+        self.total_length -= sum(counts.values())
+        for term in counts:
+            postings = self.postings[term]
+            postings.pop(row_id, None)
+            if not postings:
+                del self.postings[term]
+
+    def search(self, query: str, top_k: int, candidates: Optional[Set[str]]) -> List[Tuple[float, str]]:
+        """The `top_k` best matching rows as (score, id), best first."""
+        if not self.term_counts:
+            return []
+        n = len(self.term_counts)
+        average_length = self.total_length / n or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(_tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row_id, count in postings.items():
+                if candidates is not None and row_id not in candidates:
+                    continue
+                length = sum(self.term_counts[row_id].values())
+                scores[row_id] += idf * count * (self.k1 + 1) / (count + self.k1 * (1 - self.b + self.b * length / average_length))
+        return heapq.nlargest(top_k, ((score, row_id) for row_id, score in scores.items()))
+
+
+class _Namespace:
+    """
+    One namespace on disk:
+
+    - `rows.jsonl`: append-only log of upserted rows (attributes and vector slot) and deleted ids, replayed on load
+    - `vectors.f32`: memory-mapped float32 matrix of the normalized vectors, one slot per upserted row
+    - `hnsw.json`: the HNSW graph over the vector slots, saved periodically
+
+    Compaction writes the vectors and graph of a new generation (`vectors.<n>.f32`, `hnsw.<n>.json`) next to the
+    current ones, then atomically replaces the log with one starting with a `compact` entry naming the generation: a
+    crash before the log is replaced leaves the previous generation intact. The BM25 index and the lookup of rows by
+    attribute value are rebuilt in memory on load.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.RLock()
+        self._loaded = False
+        self._lock_file = None
+
+    def _acquire_ownership(self) -> None:
+        """Lock the namespace directory for this process; a second process using it would corrupt its files."""
+        if self._lock_file is not None or fcntl is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path / _LOCK_FILE, "a+b")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise RuntimeError(
+                f"Local vector store namespace {self.path} is in use by another process; "
+                "each LETTA_LOCAL_VECTOR_STORE_DIR must be owned by a single server process"
+            )
+        self._lock_file = lock_file
+
+    def _release_ownership(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _reset(self) -> None:
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.slots: Dict[str, int] = {}
+        # id of the row of each vector slot, None once the row was deleted or re-upserted
+        self.slot_ids: List[Optional[str]] = []
+        self.by_value: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self.bm25 = _BM25Index()
+        self.hnsw = _HNSWIndex()
+        self.graph_saved_size = 0
+        self.dimension: Optional[int] = None
+        self.vectors: Optional[np.memmap] = None
+        self.generation = 0
+
+    def _file(self, name: str, generation: Optional[int] = None) -> Path:
+        """Path of the vectors or graph file of a generation, the current one by default."""
+        generation = self.generation if generation is None else generation
+        if generation:
+            stem, suffix = name.split(".", 1)
+            name = f"{stem}.{generation}.{suffix}"
+        return self.path / name
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._acquire_ownership()
+        self._reset()
+        log_path = self.path / _LOG_FILE
+        if log_path.exists():
+            with open(log_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # a write interrupted mid-line; the vectors it refers to are unused
+                        logger.warning(f"Skipping a truncated entry of local vector store namespace {self.path.name}")
+                        continue
+                    self._apply(entry)
+            if self.dimension is not None:
+                self._open_vectors(max(len(self.slot_ids), 1))
+                self._load_graph()
+            self._remove_stale_files()
+        self._loaded = True
+
+    def _remove_stale_files(self) -> None:
+        """Remove vectors and graph files of other generations, left behind by an interrupted compaction."""
+        current = {self._file(_VECTORS_FILE), self._file(_GRAPH_FILE)}
+        for pattern in ("vectors*.f32", "hnsw*.json"):
+            for path in self.path.glob(pattern):
+                if path not in current:
+                    path.unlink(missing_ok=True)
+
+    def _apply(self, entry: dict) -> None:
+        if entry["op"] == "compact":
+            self.generation = entry["generation"]
+        elif entry["op"] == "upsert":
+            self.dimension = entry["dimension"]
+            for row in entry["rows"]:
+                attributes = {key: _decode(value) for key, value in row["attributes"].items()}
+                self._remove(row["id"])
+                self._add(row["id"], row["slot"], attributes)
+        elif entry["op"] == "delete":
+            for row_id in entry["ids"]:
+                self._remove(row_id)
+
+    def _add(self, row_id: str, slot: int, attributes: Dict[str, Any]) -> None:
+        while len(self.slot_ids) <= slot:
+            self.slot_ids.append(None)
+        self.slot_ids[slot] = row_id
+        self.slots[row_id] = slot
+        self.rows[row_id] = attributes
+        self.bm25.add(row_id, attributes.get("text"))
+        for key, value in attributes.items():
+            if isinstance(value, str) and key != "text":
+                self.by_value[(key, value)].add(row_id)
+
+    def _remove(self, row_id: str) -> bool:
+        attributes = self.rows.pop(row_id, None)
+        if attributes is None:
+            return False
+        self.slot_ids[self.slots.pop(row_id)] = None
+        self.bm25.remove(row_id)
+        for key, value in attributes.items():
+            if isinstance(value, str) and key != "text":
+                self.by_value[(key, value)].discard(row_id)
+        return True
+
+    def _open_vectors(self, min_slots: int) -> None:
+        """Memory-map the vectors file, growing it to hold at least `min_slots` vectors."""
+        path = self._file(_VECTORS_FILE)
+        row_bytes = self.dimension * 4
+        capacity = path.stat().st_size // row_bytes if path.exists() else 0
+        if capacity < min_slots:
+            capacity = max(1024, 2 * capacity, min_slots)
+            if self.vectors is not None:
+                self.vectors.flush()
+                self.vectors = None
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        if self.vectors is None or len(self.vectors) != capacity:
+            self.vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+    def _load_graph(self) -> None:
+        graph_path = self._file(_GRAPH_FILE)
+        if graph_path.exists():
+            try:
+                hnsw = _HNSWIndex.from_dict(orjson.loads(graph_path.read_bytes()))
+                if len(hnsw) <= len(self.slot_ids):
+                    self.hnsw = hnsw
+                    self.graph_saved_size = len(hnsw)
+            except (orjson.JSONDecodeError, KeyError, IndexError):
+                logger.warning(f"Rebuilding the unreadable HNSW graph of local vector store namespace {self.path.name}")
+        for slot in range(len(self.hnsw), len(self.slot_ids)):
+            self.hnsw.add(self.vectors, slot)
+
+    def _save_graph(self) -> None:
+        tmp_path = self.path / f"{_GRAPH_FILE}.tmp"
+        tmp_path.write_bytes(orjson.dumps(self.hnsw.to_dict()))
+        os.replace(tmp_path, self._file(_GRAPH_FILE))
+        self.graph_saved_size = len(self.hnsw)
+
+    def _append_log(self, entries: Iterable[dict]) -> None:
+        with open(self.path / _LOG_FILE, "ab") as f:
+            for entry in entries:
+                f.write(orjson.dumps(entry) + b"\n")
+
+    def write(self, upsert_columns: Optional[dict], deletes: Optional[list], delete_by_filter: Optional[tuple]) -> int:
+        with self.lock:
+            self._ensure_loaded()
+            self.path.mkdir(parents=True, exist_ok=True)
+            affected = 0
+
+            delete_ids = list(deletes or [])
+            if delete_by_filter is not None:
+                delete_ids.extend(self._matching_ids(delete_by_filter))
+            deleted = [row_id for row_id in dict.fromkeys(delete_ids) if self._remove(row_id)]
+            if deleted:
+                self._append_log([{"op": "delete", "ids": deleted}])
+                affected += len(deleted)
+
+            if upsert_columns:
+                affected += self._upsert(upsert_columns)
+
+            if len(self.slot_ids) - len(self.rows) >= max(_COMPACT_MIN_DEAD_SLOTS, len(self.rows)):
+                self._compact()
+            elif self.vectors is not None and len(self.hnsw) - self.graph_saved_size >= max(
+                _GRAPH_SAVE_INTERVAL, self.graph_saved_size // 10
+            ):
+                self.vectors.flush()
+                self._save_graph()
+            return affected
+
+    def _upsert(self, columns: dict) -> int:
+        ids = columns["id"]
+        vectors = np.asarray(columns["vector"], dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("Every row upserted to the local vector store needs a vector")
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Vectors of dimension {vectors.shape[1]} can't be added to a namespace of dimension {self.dimension}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        first_slot = len(self.slot_ids)
+        self._open_vectors(first_slot + len(ids))
+        self.vectors[first_slot : first_slot + len(ids)] = vectors
+        self.vectors.flush()
+
+        attribute_columns = {key: values for key, values in columns.items() if key not in ("id", "vector")}
+        rows = []
+        for i, row_id in enumerate(ids):
+            attributes = {key: values[i] for key, values in attribute_columns.items()}
+            rows.append({"id": row_id, "slot": first_slot + i, "attributes": {key: _encode(value) for key, value in attributes.items()}})
+            self._remove(row_id)
+            self._add(row_id, first_slot + i, attributes)
+        # the log entry is written once the vectors it refers to are
+        self._append_log([{"op": "upsert", "dimension": self.dimension, "rows": rows}])
+        for slot in range(first_slot, first_slot + len(ids)):
+            self.hnsw.add(self.vectors, slot)
+        return len(ids)
+
+    def _compact(self) -> None:
+        """Rewrite the namespace without the rows and vector slots of deleted rows."""
+        live = sorted(self.slots.items(), key=lambda item: item[1])
+        live_vectors = np.array(self.vectors[[slot for _, slot in live]]) if live else None
+        rows = [
+            {"id": row_id, "slot": i, "attributes": {k: _encode(v) for k, v in self.rows[row_id].items()}}
+            for i, (row_id, _) in enumerate(live)
+        ]
+        entries = [{"op": "compact", "generation": self.generation + 1}]
+        hnsw = _HNSWIndex()
+        if rows:
+            entries.append({"op": "upsert", "dimension": self.dimension, "rows": rows})
+            for slot in range(len(rows)):
+                hnsw.add(live_vectors, slot)
+            _write_durably(self._file(_VECTORS_FILE, self.generation + 1), live_vectors.tobytes())
+            _write_durably(self._file(_GRAPH_FILE, self.generation + 1), orjson.dumps(hnsw.to_dict()))
+
+        # replacing the log commits the new generation
+        tmp_path = self.path / f"{_LOG_FILE}.tmp"
+        _write_durably(tmp_path, b"".join(orjson.dumps(entry) + b"\n" for entry in entries))
+        os.replace(tmp_path, self.path / _LOG_FILE)
+        _fsync_directory(self.path)
+
+        stale_files = (self._file(_VECTORS_FILE), self._file(_GRAPH_FILE))
+        self.vectors = None
+        self._reset()
+        for entry in entries:
+            self._apply(entry)
+        if rows:
+            self._open_vectors(len(rows))
+            self.hnsw = hnsw
+            self.graph_saved_size = len(hnsw)
+        for path in stale_files:
+            path.unlink(missing_ok=True)
+
+    def delete_all(self) -> None:
+        with self.lock:
+            self.vectors = None
+            shutil.rmtree(self.path, ignore_errors=True)
+            self._release_ownership()
+            self._loaded = False
+
+    def _matching_ids(self, filters: Optional[tuple]) -> List[str]:
+        conditions = _equality_conditions(filters)
+        if conditions:
+            candidates = min((self.by_value.get(condition, set()) for condition in conditions), key=len)
+        else:
+            candidates = self.rows.keys()
+        return [row_id for row_id in candidates if matches_filter(self.rows[row_id], filters)]
+
+    def query(self, rank_by: tuple, top_k: int, include_attributes: Union[List[str], bool], filters: Optional[tuple]) -> List[Any]:
+        with self.lock:
+            self._ensure_loaded()
+            candidates = set(self._matching_ids(filters)) if filters is not None else None
+
+            if len(rank_by) == 3 and rank_by[1] == "ANN":
+                ranked = [(row_id, {"$dist": distance}) for distance, row_id in self._vector_search(rank_by[2], top_k, candidates)]
+            elif len(rank_by) == 3 and rank_by[1] == "BM25":
+                if rank_by[0] != "text":
+                    raise ValueError(f"The local vector store only has a full-text index of `text`, not `{rank_by[0]}`")
+                ranked = [(row_id, {"$score": score}) for score, row_id in self.bm25.search(rank_by[2], top_k, candidates)]
+            else:
+                attribute, direction = rank_by
+                row_ids = list(candidates if candidates is not None else self.rows)
+                # rows without the attribute come last
+                present = [row_id for row_id in row_ids if self.rows[row_id].get(attribute) is not None]
+                missing = [row_id for row_id in row_ids if self.rows[row_id].get(attribute) is None]
+                present.sort(key=lambda row_id: self.rows[row_id][attribute], reverse=direction == "desc")
+                ranked = [(row_id, {}) for row_id in (present + missing)[:top_k]]
+
+            return [self._row(row_id, include_attributes, scores) for row_id, scores in ranked]
+
+    def _vector_search(self, query_vector: List[float], top_k: int, candidates: Optional[Set[str]]) -> List[Tuple[float, str]]:
+        if not self.rows or top_k <= 0:
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        row_ids = candidates if candidates is not None else self.rows.keys()
+        if len(row_ids) <= _EXACT_SEARCH_MAX_ROWS:
+            if not row_ids:
+                return []
+            ids = list(row_ids)
+            distances = 1.0 - self.vectors[[self.slots[row_id] for row_id in ids]] @ query
+            nearest = np.argsort(distances)[:top_k].tolist()
+            return [(float(distances[i]), ids[i]) for i in nearest]
+
+        if candidates is not None:
+
+            def accept(slot: int) -> bool:
+                return self.slot_ids[slot] in candidates
+        else:
+
+            def accept(slot: int) -> bool:
+                return self.slot_ids[slot] is not None
+
+        nearest = self.hnsw.search(self.vectors, query, top_k, ef=max(64, 2 * top_k), accept=accept)
+        return [(distance, self.slot_ids[slot]) for distance, slot in nearest]
+
+    def _row(self, row_id: str, include_attributes: Union[List[str], bool], scores: Dict[str, float]) -> SimpleNamespace:
+        attributes = self.rows[row_id]
+        if include_attributes is True:
+            included = dict(attributes)
+        else:
+            included = {key: attributes.get(key) for key in include_attributes or []}
+        return SimpleNamespace(id=row_id, **included, **scores)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Namespaces stored in a local directory, one sub-directory each, searched in-process: vectors with an HNSW index
+    (exact search for small or narrowly filtered candidate sets), text with a BM25 inverted index. Hybrid queries are
+    fused by `TurbopufferClient` with RRF, as with Turbopuffer.
+
+    The directory must be owned by a single server process: each namespace directory is flock()ed by the process that
+    loads it, and another process using it fails loudly.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    def _namespace(self, name: str) -> _Namespace:
+        with self._lock:
+            if name not in self._namespaces:
+                self._namespaces[name] = _Namespace(self.root / re.sub(r"[^A-Za-z0-9_.-]", "_", name))
+            return self._namespaces[name]
+
+    async def write(
+        self,
+        namespace: str,
+        upsert_columns: Optional[dict] = None,
+        deletes: Optional[list] = None,
+        delete_by_filter: Optional[tuple] = None,
+        distance_metric: str = "cosine_distance",
+        schema: Optional[dict] = None,
+    ) -> Any:
+        if distance_metric != "cosine_distance":
+            raise ValueError(f"The local vector store only supports cosine distance, not {distance_metric}")
+        rows_affected = await asyncio.to_thread(self._namespace(namespace).write, upsert_columns, deletes, delete_by_filter)
+        return SimpleNamespace(rows_affected=rows_affected)
+
+    async def query(
+        self,
+        namespace: str,
+        rank_by: tuple,
+        top_k: int,
+        include_attributes: Union[List[str], bool],
+        filters: Optional[tuple] = None,
+    ) -> Any:
+        rows = await asyncio.to_thread(self._namespace(namespace).query, rank_by, top_k, include_attributes, filters)
+        return SimpleNamespace(rows=rows)
+
+    async def multi_query(self, namespace: str, queries: List[dict]) -> Any:
+        return SimpleNamespace(results=[await self.query(namespace, **query) for query in queries])
+
+    async def delete_all(self, namespace: str) -> None:
+        await asyncio.to_thread(self._namespace(namespace).delete_all)
+
+    def close(self) -> None:
+        """Release the namespace directories this store owns, so another store or process may load them."""
+        with self._lock:
+            for namespace in self._namespaces.values():
+                with namespace.lock:
+                    namespace._release_ownership()
+                    namespace._loaded = False
+            self._namespaces.clear()
+
+
+_local_stores: Dict[Path, LocalVectorStore] = {}
+
+
+def get_local_vector_store() -> LocalVectorStore:
+    """The process-wide local vector store of `LETTA_LOCAL_VECTOR_STORE_DIR` (by default under the Letta directory)."""
+    root = Path(settings.local_vector_store_dir or Path(settings.letta_dir) / "vector_store")
+    if root not in _local_stores:
+        _local_stores[root] = LocalVectorStore(root)
+    return _local_stores[root]
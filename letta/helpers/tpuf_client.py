@@ -16,11 +16,12 @@ import httpx
 
 from letta.constants import DEFAULT_EMBEDDING_CHUNK_SIZE
 from letta.errors import LettaInvalidArgumentError
+from letta.helpers.vector_store import get_vector_store
 from letta.otel.tracing import log_event, trace_method
 from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.enums import MessageRole, TagMatchMode
 from letta.schemas.passage import Passage as PydanticPassage
-from letta.settings import model_settings, settings
+from letta.settings import VectorStoreBackend, model_settings, settings
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,78 @@ TPUF_EXPONENTIAL_BASE = 2.0
 TPUF_JITTER = True
 
 
+def reciprocal_rank_fusion(
+    vector_results: List[Any],
+    fts_results: List[Any],
+    get_id_func: Callable[[Any], str],
+    vector_weight: float,
+    fts_weight: float,
+    top_k: int,
+) -> List[Tuple[Any, float, dict]]:
+    """RRF implementation that works with any object type.
+
+    RRF score = vector_weight * (1/(k + rank)) + fts_weight * (1/(k + rank))
+    where k is a constant (typically 60) to avoid division by zero
+
+    This is a pure rank-based fusion following the standard RRF algorithm.
+
+    Args:
+        vector_results: List of items from vector search (ordered by relevance)
+        fts_results: List of items from FTS (ordered by relevance)
+        get_id_func: Function to extract ID from an item
+        vector_weight: Weight for vector search results
+        fts_weight: Weight for FTS results
+        top_k: Number of results to return
+
+    Returns:
+        List of (item, score, metadata) tuples sorted by RRF score
+        metadata contains ranks from each result list
+    """
+    k = 60  # standard RRF constant from Cormack et al. (2009)
+
+    # create rank mappings based on position in result lists
+    # rank starts at 1, not 0
+    vector_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(vector_results)}
+    fts_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(fts_results)}
+
+    # combine all unique items from both result sets
+    all_items = {}
+    for item in vector_results:
+        all_items[get_id_func(item)] = item
+    for item in fts_results:
+        all_items[get_id_func(item)] = item
+
+    # calculate RRF scores based purely on ranks
+    rrf_scores = {}
+    score_metadata = {}
+    for item_id in all_items:
+        # RRF formula: sum of 1/(k + rank) across result lists
+        # If item not in a list, we don't add anything (equivalent to rank = infinity)
+        vector_rrf_score = 0.0
+        fts_rrf_score = 0.0
+
+        if item_id in vector_ranks:
+            vector_rrf_score = vector_weight / (k + vector_ranks[item_id])
+        if item_id in fts_ranks:
+            fts_rrf_score = fts_weight / (k + fts_ranks[item_id])
+
+        combined_score = vector_rrf_score + fts_rrf_score
+
+        rrf_scores[item_id] = combined_score
+        score_metadata[item_id] = {
+            "combined_score": combined_score,  # Final RRF score
+            "vector_rank": vector_ranks.get(item_id),
+            "fts_rank": fts_ranks.get(item_id),
+        }
+
+    # sort by RRF score and return with metadata
+    sorted_results = sorted(
+        [(all_items[iid], score, score_metadata[iid]) for iid, score in rrf_scores.items()], key=lambda x: x[1], reverse=True
+    )
+
+    return sorted_results[:top_k]
+
+
 def is_transient_error(error: Exception) -> bool:
     """Check if an error is transient and should be retried.
 
@@ -159,55 +232,14 @@ def async_retry_with_backoff(
 _GLOBAL_TURBOPUFFER_SEMAPHORE = asyncio.Semaphore(5)
 
 
-def _run_turbopuffer_write_in_thread(
-    api_key: str,
-    region: str,
-    namespace_name: str,
-    upsert_columns: dict | None = None,
-    deletes: list | None = None,
-    delete_by_filter: tuple | None = None,
-    distance_metric: str = "cosine_distance",
-    schema: dict | None = None,
-):
-    """
-    Sync wrapper to run turbopuffer write in isolated event loop.
-
-    Turbopuffer's async write() does CPU-intensive base64 encoding of vectors
-    synchronously in async functions, blocking the event loop. Running it in
-    a thread pool with an isolated event loop prevents blocking.
-    """
-    from turbopuffer import AsyncTurbopuffer
-
-    # Create new event loop for this worker thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-
-        async def do_write():
-            async with AsyncTurbopuffer(api_key=api_key, region=region) as client:
-                namespace = client.namespace(namespace_name)
-
-                # Build write kwargs
-                kwargs = {"distance_metric": distance_metric}
-                if upsert_columns:
-                    kwargs["upsert_columns"] = upsert_columns
-                if deletes:
-                    kwargs["deletes"] = deletes
-                if delete_by_filter:
-                    kwargs["delete_by_filter"] = delete_by_filter
-                if schema:
-                    kwargs["schema"] = schema
-
-                return await namespace.write(**kwargs)
-
-        return loop.run_until_complete(do_write())
-    finally:
-        loop.close()
-
-
 def should_use_tpuf() -> bool:
+    if not settings.use_tpuf:
+        return False
+    if settings.vector_store_backend is VectorStoreBackend.LOCAL:
+        # the local store embeds with the archive's, agent's or source's own embedding config, so it works offline
+        return True
     # We need OpenAI since we default to their embedding model
-    return bool(settings.use_tpuf) and bool(settings.tpuf_api_key) and bool(model_settings.openai_api_key)
+    return bool(settings.tpuf_api_key) and bool(model_settings.openai_api_key)
 
 
 def should_use_tpuf_for_messages() -> bool:
@@ -217,7 +249,8 @@ def should_use_tpuf_for_messages() -> bool:
 
 def should_use_tpuf_for_tools() -> bool:
     """Check if Turbopuffer should be used for tools."""
-    return should_use_tpuf() and bool(settings.embed_tools)
+    # tools are org-scoped, so they are always embedded with the default OpenAI model
+    return should_use_tpuf() and bool(settings.embed_tools) and bool(model_settings.openai_api_key)
 
 
 class TurbopufferClient:
@@ -242,8 +275,8 @@ class TurbopufferClient:
         self.archive_manager = ArchiveManager()
         self.agent_manager = AgentManager()
 
-        if not self.api_key:
-            raise ValueError("Turbopuffer API key not provided")
+        # Turbopuffer, or the local vector store (`LETTA_VECTOR_STORE_BACKEND=local`)
+        self.store = get_vector_store(api_key=self.api_key, region=self.region)
 
     async def hint_cache_warm(self, *, collection: Literal["messages"], scope: dict[str, str]) -> dict:
         """Fire a cache warm hint for a supported search collection.
@@ -258,15 +291,11 @@ class TurbopufferClient:
         Returns:
             {"status": "ACCEPTED", "namespace": "...", "collection": "messages"} on success
         """
-        from turbopuffer import AsyncTurbopuffer
-
         namespace_name = await self._get_cache_warm_namespace_name(collection=collection, scope=scope)
 
         try:
-            async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
-                ns = client.namespace(namespace_name)
-                result = await ns.hint_cache_warm()
-                return {"status": result.status, "namespace": namespace_name, "collection": collection}
+            status = await self.store.hint_cache_warm(namespace_name)
+            return {"status": status, "namespace": namespace_name, "collection": collection}
         except Exception as e:
             logger.error(f"Failed to warm turbopuffer cache for collection {collection} in namespace {namespace_name}: {e}")
             raise
@@ -281,18 +310,48 @@ class TurbopufferClient:
             argument_name="collection",
         )
 
+    async def _embedding_config_for(
+        self,
+        actor: "PydanticUser",
+        archive_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        source_id: Optional[str] = None,
+    ) -> Optional[EmbeddingConfig]:
+        """The embedding config a namespace's vectors are written and queried with.
+
+        Turbopuffer namespaces always use the default OpenAI config. The local store uses the archive's, agent's or
+        source's own config, so it needs no OpenAI key; without any of them (an org-wide message search) there is no
+        config that matches the stored vectors, and None is returned so the caller searches text only.
+        """
+        if settings.vector_store_backend is not VectorStoreBackend.LOCAL:
+            return self.default_embedding_config
+        if archive_id:
+            return (await self.archive_manager.get_archive_by_id_async(archive_id=archive_id, actor=actor)).embedding_config
+        if agent_id:
+            return (
+                await self.agent_manager.get_agent_by_id_async(agent_id=agent_id, actor=actor, include_relationships=[])
+            ).embedding_config
+        if source_id:
+            from letta.services.source_manager import SourceManager
+
+            return (await SourceManager().get_source_by_id(source_id=source_id, actor=actor)).embedding_config
+        return None
+
     @trace_method
-    async def _generate_embeddings(self, texts: List[str], actor: "PydanticUser") -> List[List[float]]:
-        """Generate embeddings using the default embedding configuration.
+    async def _generate_embeddings(
+        self, texts: List[str], actor: "PydanticUser", embedding_config: Optional[EmbeddingConfig] = None
+    ) -> List[List[float]]:
+        """Generate embeddings with the given embedding configuration, the default one if not given.
 
         Args:
             texts: List of texts to embed
             actor: User actor for embedding generation
+            embedding_config: Embedding configuration (see `_embedding_config_for`)
 
         Returns:
             List of embedding vectors
         """
-        from letta.llm_api.llm_client import LLMClient
+        from letta.services.embedding_batcher import embed_texts
 
         # filter out empty strings after stripping
         filtered_texts = [text for text in texts if text.strip()]
@@ -301,12 +360,7 @@ class TurbopufferClient:
         if not filtered_texts:
             return []
 
-        embedding_client = LLMClient.create(
-            provider_type=self.default_embedding_config.embedding_endpoint_type,
-            actor=actor,
-        )
-        embeddings = await embedding_client.request_embeddings(filtered_texts, self.default_embedding_config)
-        return embeddings
+        return await embed_texts(filtered_texts, embedding_config or self.default_embedding_config, actor)
 
     @trace_method
     async def _get_archive_namespace_name(self, archive_id: str) -> str:
@@ -469,12 +523,8 @@ class TurbopufferClient:
         try:
             # Use global semaphore to limit concurrent Turbopuffer writes
             async with _GLOBAL_TURBOPUFFER_SEMAPHORE:
-                # Run in thread pool to prevent CPU-intensive base64 encoding from blocking event loop
-                await asyncio.to_thread(
-                    _run_turbopuffer_write_in_thread,
-                    api_key=self.api_key,
-                    region=self.region,
-                    namespace_name=namespace_name,
+                await self.store.write(
+                    namespace_name,
                     upsert_columns=upsert_columns,
                     distance_metric="cosine_distance",
                     schema={"text": {"type": "string", "full_text_search": True}},
@@ -524,7 +574,9 @@ class TurbopufferClient:
 
         filtered_texts = [text for _, text in filtered_chunks]
 
-        # use provided embeddings only if dimensions match TPUF's expected dimension
+        embedding_config = await self._embedding_config_for(actor, archive_id=archive_id)
+
+        # use provided embeddings only if dimensions match the namespace's expected dimension
         use_provided_embeddings = False
         if embeddings is not None:
             if len(embeddings) != len(text_chunks):
@@ -535,17 +587,17 @@ class TurbopufferClient:
             # check if first non-empty embedding has correct dimensions
             filtered_indices = [i for i, _ in filtered_chunks]
             sample_embedding = embeddings[filtered_indices[0]] if filtered_indices else None
-            if sample_embedding is not None and len(sample_embedding) == self.default_embedding_config.embedding_dim:
+            if sample_embedding is not None and len(sample_embedding) == embedding_config.embedding_dim:
                 use_provided_embeddings = True
                 filtered_embeddings = [embeddings[i] for i, _ in filtered_chunks]
             else:
                 logger.debug(
                     f"Embedding dimension mismatch (got {len(sample_embedding) if sample_embedding else 'None'}, "
-                    f"expected {self.default_embedding_config.embedding_dim}), regenerating embeddings"
+                    f"expected {embedding_config.embedding_dim}), regenerating embeddings"
                 )
 
         if not use_provided_embeddings:
-            filtered_embeddings = await self._generate_embeddings(filtered_texts, actor)
+            filtered_embeddings = await self._generate_embeddings(filtered_texts, actor, embedding_config)
 
         namespace_name = await self._get_archive_namespace_name(archive_id)
 
@@ -599,7 +651,7 @@ class TurbopufferClient:
                 metadata_={},
                 tags=tags or [],  # Include tags in the passage
                 embedding=embedding,
-                embedding_config=self.default_embedding_config,  # Will be set by caller if needed
+                embedding_config=embedding_config,
             )
             passages.append(passage)
 
@@ -617,12 +669,8 @@ class TurbopufferClient:
         try:
             # Use global semaphore to limit concurrent Turbopuffer writes
             async with _GLOBAL_TURBOPUFFER_SEMAPHORE:
-                # Run in thread pool to prevent CPU-intensive base64 encoding from blocking event loop
-                await asyncio.to_thread(
-                    _run_turbopuffer_write_in_thread,
-                    api_key=self.api_key,
-                    region=self.region,
-                    namespace_name=namespace_name,
+                await self.store.write(
+                    namespace_name,
                     upsert_columns=upsert_columns,
                     distance_metric="cosine_distance",
                     schema={"text": {"type": "string", "full_text_search": True}},
@@ -677,9 +725,9 @@ class TurbopufferClient:
             logger.warning("All message texts were empty, skipping insertion")
             return True
 
-        # generate embeddings using the default config
         filtered_texts = [text for _, text in filtered_messages]
-        embeddings = await self._generate_embeddings(filtered_texts, actor)
+        embedding_config = await self._embedding_config_for(actor, agent_id=agent_id)
+        embeddings = await self._generate_embeddings(filtered_texts, actor, embedding_config)
 
         namespace_name = await self._get_message_namespace_name(organization_id)
 
@@ -762,12 +810,8 @@ class TurbopufferClient:
         try:
             # Use global semaphore to limit concurrent Turbopuffer writes
             async with _GLOBAL_TURBOPUFFER_SEMAPHORE:
-                # Run in thread pool to prevent CPU-intensive base64 encoding from blocking event loop
-                await asyncio.to_thread(
-                    _run_turbopuffer_write_in_thread,
-                    api_key=self.api_key,
-                    region=self.region,
-                    namespace_name=namespace_name,
+                await self.store.write(
+                    namespace_name,
                     upsert_columns=upsert_columns,
                     distance_metric="cosine_distance",
                     schema={
@@ -816,9 +860,6 @@ class TurbopufferClient:
         Returns:
             Raw Turbopuffer query results or multi-query response
         """
-        from turbopuffer import AsyncTurbopuffer
-        from turbopuffer.types import QueryParam
-
         # validate inputs based on search mode
         if search_mode == "vector" and query_embedding is None:
             raise ValueError("query_embedding is required for vector search mode")
@@ -830,80 +871,53 @@ class TurbopufferClient:
         if search_mode not in ["vector", "fts", "hybrid", "timestamp"]:
             raise ValueError(f"Invalid search_mode: {search_mode}. Must be 'vector', 'fts', 'hybrid', or 'timestamp'")
 
-        try:
-            async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
-                namespace = client.namespace(namespace_name)
-
-                if search_mode == "timestamp":
-                    # retrieve most recent items by timestamp
-                    query_params = {
-                        "rank_by": ("created_at", "desc"),
-                        "top_k": top_k,
-                        "include_attributes": include_attributes,
-                    }
-                    if filters:
-                        query_params["filters"] = filters
-                    return await namespace.query(**query_params)
-
-                elif search_mode == "vector":
-                    # vector search query
-                    query_params = {
-                        "rank_by": ("vector", "ANN", query_embedding),
-                        "top_k": top_k,
-                        "include_attributes": include_attributes,
-                    }
-                    if filters:
-                        query_params["filters"] = filters
-                    return await namespace.query(**query_params)
-
-                elif search_mode == "fts":
-                    # full-text search query
-                    query_params = {
-                        "rank_by": ("text", "BM25", query_text),
-                        "top_k": top_k,
-                        "include_attributes": include_attributes,
-                    }
-                    if filters:
-                        query_params["filters"] = filters
-                    return await namespace.query(**query_params)
-
-                else:  # hybrid mode
-                    queries = []
-
-                    # vector search query
-                    vector_query = {
-                        "rank_by": ("vector", "ANN", query_embedding),
-                        "top_k": top_k,
-                        "include_attributes": include_attributes,
-                    }
-                    if filters:
-                        vector_query["filters"] = filters
-                    queries.append(vector_query)
-
-                    # full-text search query
-                    fts_query = {
-                        "rank_by": ("text", "BM25", query_text),
-                        "top_k": top_k,
-                        "include_attributes": include_attributes,
-                    }
-                    if filters:
-                        fts_query["filters"] = filters
-                    queries.append(fts_query)
+        if search_mode == "timestamp":
+            # retrieve most recent items by timestamp
+            return await self.store.query(
+                namespace_name, rank_by=("created_at", "desc"), top_k=top_k, include_attributes=include_attributes, filters=filters
+            )
 
-                    # execute multi-query
-                    return await namespace.multi_query(queries=[QueryParam(**q) for q in queries])
-        except Exception as e:
-            # Wrap turbopuffer errors with user-friendly messages
-            from turbopuffer import NotFoundError
-
-            if isinstance(e, NotFoundError):
-                # Extract just the error message without implementation details
-                error_msg = str(e)
-                if "namespace" in error_msg.lower() and "not found" in error_msg.lower():
-                    raise ValueError("No conversation history found. Please send a message first to enable search.") from e
-                raise ValueError(f"Search data not found: {error_msg}") from e
-            # Re-raise other errors as-is
-            raise
+        elif search_mode == "vector":
+            # vector search query
+            return await self.store.query(
+                namespace_name,
+                rank_by=("vector", "ANN", query_embedding),
+                top_k=top_k,
+                include_attributes=include_attributes,
+                filters=filters,
+            )
+
+        elif search_mode == "fts":
+            # full-text search query
+            return await self.store.query(
+                namespace_name, rank_by=("text", "BM25", query_text), top_k=top_k, include_attributes=include_attributes, filters=filters
+            )
+
+        else:  # hybrid mode
+            queries = []
+
+            # vector search query
+            vector_query = {
+                "rank_by": ("vector", "ANN", query_embedding),
+                "top_k": top_k,
+                "include_attributes": include_attributes,
+            }
+            if filters:
+                vector_query["filters"] = filters
+            queries.append(vector_query)
+
+            # full-text search query
+            fts_query = {
+                "rank_by": ("text", "BM25", query_text),
+                "top_k": top_k,
+                "include_attributes": include_attributes,
+            }
+            if filters:
+                fts_query["filters"] = filters
+            queries.append(fts_query)
+
+            # execute multi-query
+            return await self.store.multi_query(namespace_name, queries)
 
     @trace_method
     async def query_passages(
@@ -941,7 +955,8 @@ class TurbopufferClient:
         # generate embedding for vector/hybrid search if query_text is provided
         query_embedding = None
         if query_text and search_mode in ["vector", "hybrid"]:
-            embeddings = await self._generate_embeddings([query_text], actor)
+            embedding_config = await self._embedding_config_for(actor, archive_id=archive_id)
+            embeddings = await self._generate_embeddings([query_text], actor, embedding_config)
             query_embedding = embeddings[0]
 
         # Check if we should fallback to timestamp-based retrieval
@@ -1097,7 +1112,8 @@ class TurbopufferClient:
         # generate embedding for vector/hybrid search if query_text is provided
         query_embedding = None
         if query_text and search_mode in ["vector", "hybrid"]:
-            embeddings = await self._generate_embeddings([query_text], actor)
+            embedding_config = await self._embedding_config_for(actor, agent_id=agent_id)
+            embeddings = await self._generate_embeddings([query_text], actor, embedding_config)
             query_embedding = embeddings[0]
 
         # Check if we should fallback to timestamp-based retrieval
@@ -1277,8 +1293,13 @@ class TurbopufferClient:
         # generate embedding for vector/hybrid search if query_text is provided
         query_embedding = None
         if query_text and search_mode in ["vector", "hybrid"]:
-            embeddings = await self._generate_embeddings([query_text], actor)
-            query_embedding = embeddings[0]
+            embedding_config = await self._embedding_config_for(actor, agent_id=agent_id)
+            if embedding_config is None:
+                # the local store's org-wide namespace holds vectors of each agent's own embedding model
+                search_mode = "fts"
+            else:
+                embeddings = await self._generate_embeddings([query_text], actor, embedding_config)
+                query_embedding = embeddings[0]
 
         # Check if we should fallback to timestamp-based retrieval
         if query_embedding is None and query_text is None and search_mode not in ["timestamp"]:
@@ -1495,68 +1516,8 @@ class TurbopufferClient:
         fts_weight: float,
         top_k: int,
     ) -> List[Tuple[Any, float, dict]]:
-        """RRF implementation that works with any object type.
-
-        RRF score = vector_weight * (1/(k + rank)) + fts_weight * (1/(k + rank))
-        where k is a constant (typically 60) to avoid division by zero
-
-        This is a pure rank-based fusion following the standard RRF algorithm.
-
-        Args:
-            vector_results: List of items from vector search (ordered by relevance)
-            fts_results: List of items from FTS (ordered by relevance)
-            get_id_func: Function to extract ID from an item
-            vector_weight: Weight for vector search results
-            fts_weight: Weight for FTS results
-            top_k: Number of results to return
-
-        Returns:
-            List of (item, score, metadata) tuples sorted by RRF score
-            metadata contains ranks from each result list
-        """
-        k = 60  # standard RRF constant from Cormack et al. (2009)
-
-        # create rank mappings based on position in result lists
-        # rank starts at 1, not 0
-        vector_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(vector_results)}
-        fts_ranks = {get_id_func(item): rank + 1 for rank, item in enumerate(fts_results)}
-
-        # combine all unique items from both result sets
-        all_items = {}
-        for item in vector_results:
-            all_items[get_id_func(item)] = item
-        for item in fts_results:
-            all_items[get_id_func(item)] = item
-
-        # calculate RRF scores based purely on ranks
-        rrf_scores = {}
-        score_metadata = {}
-        for item_id in all_items:
-            # RRF formula: sum of 1/(k + rank) across result lists
-            # If item not in a list, we don't add anything (equivalent to rank = infinity)
-            vector_rrf_score = 0.0
-            fts_rrf_score = 0.0
-
-            if item_id in vector_ranks:
-                vector_rrf_score = vector_weight / (k + vector_ranks[item_id])
-            if item_id in fts_ranks:
-                fts_rrf_score = fts_weight / (k + fts_ranks[item_id])
-
-            combined_score = vector_rrf_score + fts_rrf_score
-
-            rrf_scores[item_id] = combined_score
-            score_metadata[item_id] = {
-                "combined_score": combined_score,  # Final RRF score
-                "vector_rank": vector_ranks.get(item_id),
-                "fts_rank": fts_ranks.get(item_id),
-            }
-
-        # sort by RRF score and return with metadata
-        sorted_results = sorted(
-            [(all_items[iid], score, score_metadata[iid]) for iid, score in rrf_scores.items()], key=lambda x: x[1], reverse=True
-        )
-
-        return sorted_results[:top_k]
+        """RRF of vector and FTS results, see `reciprocal_rank_fusion`."""
+        return reciprocal_rank_fusion(vector_results, fts_results, get_id_func, vector_weight, fts_weight, top_k)
 
     @trace_method
     @async_retry_with_backoff()
@@ -1566,12 +1527,8 @@ class TurbopufferClient:
         namespace_name = await self._get_archive_namespace_name(archive_id)
 
         try:
-            # Run in thread pool for consistency (deletes are lightweight but use same wrapper)
-            await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            await self.store.write(
+                namespace_name,
                 deletes=[passage_id],
             )
             logger.info(f"Successfully deleted passage {passage_id} from Turbopuffer archive {archive_id}")
@@ -1591,12 +1548,8 @@ class TurbopufferClient:
         namespace_name = await self._get_archive_namespace_name(archive_id)
 
         try:
-            # Run in thread pool for consistency
-            await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            await self.store.write(
+                namespace_name,
                 deletes=passage_ids,
             )
             logger.info(f"Successfully deleted {len(passage_ids)} passages from Turbopuffer archive {archive_id}")
@@ -1609,17 +1562,12 @@ class TurbopufferClient:
     @async_retry_with_backoff()
     async def delete_all_passages(self, archive_id: str) -> bool:
         """Delete all passages for an archive from Turbopuffer."""
-        from turbopuffer import AsyncTurbopuffer
-
         namespace_name = await self._get_archive_namespace_name(archive_id)
 
         try:
-            async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
-                namespace = client.namespace(namespace_name)
-                # Turbopuffer has a delete_all() method on namespace
-                await namespace.delete_all()
-                logger.info(f"Successfully deleted all passages for archive {archive_id}")
-                return True
+            await self.store.delete_all(namespace_name)
+            logger.info(f"Successfully deleted all passages for archive {archive_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to delete all passages from Turbopuffer: {e}")
             raise
@@ -1635,12 +1583,8 @@ class TurbopufferClient:
         namespace_name = await self._get_message_namespace_name(organization_id)
 
         try:
-            # Run in thread pool for consistency
-            await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            await self.store.write(
+                namespace_name,
                 deletes=message_ids,
             )
             logger.info(f"Successfully deleted {len(message_ids)} messages from Turbopuffer for agent {agent_id}")
@@ -1657,12 +1601,8 @@ class TurbopufferClient:
         namespace_name = await self._get_message_namespace_name(organization_id)
 
         try:
-            # Run in thread pool for consistency
-            result = await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            result = await self.store.write(
+                namespace_name,
                 delete_by_filter=("agent_id", "Eq", agent_id),
             )
             logger.info(f"Successfully deleted all messages for agent {agent_id} (deleted {result.rows_affected if result else 0} rows)")
@@ -1726,8 +1666,8 @@ class TurbopufferClient:
             logger.warning("All text chunks were empty, skipping file passage insertion")
             return []
 
-        # generate embeddings using the default config
-        embeddings = await self._generate_embeddings(filtered_chunks, actor)
+        embedding_config = await self._embedding_config_for(actor, source_id=source_id)
+        embeddings = await self._generate_embeddings(filtered_chunks, actor, embedding_config)
 
         namespace_name = await self._get_file_passages_namespace_name(organization_id)
 
@@ -1759,7 +1699,7 @@ class TurbopufferClient:
                 file_id=file_id,
                 source_id=source_id,
                 embedding=embedding,
-                embedding_config=self.default_embedding_config,
+                embedding_config=embedding_config,
                 organization_id=actor.organization_id,
             )
             passages.append(passage)
@@ -1787,12 +1727,8 @@ class TurbopufferClient:
         try:
             # Use global semaphore to limit concurrent Turbopuffer writes
             async with _GLOBAL_TURBOPUFFER_SEMAPHORE:
-                # Run in thread pool to prevent CPU-intensive base64 encoding from blocking event loop
-                await asyncio.to_thread(
-                    _run_turbopuffer_write_in_thread,
-                    api_key=self.api_key,
-                    region=self.region,
-                    namespace_name=namespace_name,
+                await self.store.write(
+                    namespace_name,
                     upsert_columns=upsert_columns,
                     distance_metric="cosine_distance",
                     schema={"text": {"type": "string", "full_text_search": True}},
@@ -1839,7 +1775,8 @@ class TurbopufferClient:
         # generate embedding for vector/hybrid search if query_text is provided
         query_embedding = None
         if query_text and search_mode in ["vector", "hybrid"]:
-            embeddings = await self._generate_embeddings([query_text], actor)
+            embedding_config = await self._embedding_config_for(actor, source_id=source_ids[0] if source_ids else None)
+            embeddings = await self._generate_embeddings([query_text], actor, embedding_config)
             query_embedding = embeddings[0]
 
         # check if we should fallback to timestamp-based retrieval
@@ -1959,12 +1896,8 @@ class TurbopufferClient:
             # need to filter by both source_id and file_id
             filter_expr = ("And", [("source_id", "Eq", source_id), ("file_id", "Eq", file_id)])
 
-            # Run in thread pool for consistency
-            result = await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            result = await self.store.write(
+                namespace_name,
                 delete_by_filter=filter_expr,
             )
             logger.info(
@@ -1983,12 +1916,8 @@ class TurbopufferClient:
         namespace_name = await self._get_file_passages_namespace_name(organization_id)
 
         try:
-            # Run in thread pool for consistency
-            result = await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            result = await self.store.write(
+                namespace_name,
                 delete_by_filter=("source_id", "Eq", source_id),
             )
             logger.info(f"Successfully deleted all passages for source {source_id} (deleted {result.rows_affected if result else 0} rows)")
@@ -2018,12 +1947,8 @@ class TurbopufferClient:
         namespace_name = await self._get_tool_namespace_name(organization_id)
 
         try:
-            # Run in thread pool for consistency
-            await asyncio.to_thread(
-                _run_turbopuffer_write_in_thread,
-                api_key=self.api_key,
-                region=self.region,
-                namespace_name=namespace_name,
+            await self.store.write(
+                namespace_name,
                 deletes=tool_ids,
             )
             logger.info(f"Successfully deleted {len(tool_ids)} tools from Turbopuffer")
@@ -0,0 +1,205 @@
+"""Storage backends of the search namespaces used by `TurbopufferClient`."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Union
+
+from letta.log import get_logger
+from letta.settings import VectorStoreBackend, settings
+
+logger = get_logger(__name__)
+
+
+class VectorStore(ABC):
+    """
+    A store of namespaces of rows (an id, a vector and attributes) with vector, BM25 and attribute-ordered search.
+
+    `TurbopufferClient` builds the rows, filters and result objects of archival memories, messages, file passages and
+    tools; a store only writes and queries namespaces. Arguments and results follow the Turbopuffer API:
+
+    - filters are tuples such as `("agent_id", "Eq", agent_id)`, `("tags", "ContainsAny", tags)` or `("And", [...])`
+    - `rank_by` is `("vector", "ANN", embedding)`, `("text", "BM25", query)` or `(attribute, "asc" | "desc")`
+    - query results have `rows`, each with `id`, the included attributes and `$dist` (vector) or `$score` (BM25)
+    """
+
+    @abstractmethod
+    async def write(
+        self,
+        namespace: str,
+        upsert_columns: Optional[dict] = None,
+        deletes: Optional[list] = None,
+        delete_by_filter: Optional[tuple] = None,
+        distance_metric: str = "cosine_distance",
+        schema: Optional[dict] = None,
+    ) -> Any:
+        """Upsert rows given as columns and/or delete rows by id or filter. The result has `rows_affected`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def query(
+        self,
+        namespace: str,
+        rank_by: tuple,
+        top_k: int,
+        include_attributes: Union[List[str], bool],
+        filters: Optional[tuple] = None,
+    ) -> Any:
+        """The `top_k` rows matching the filters, ranked by `rank_by`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def multi_query(self, namespace: str, queries: List[dict]) -> Any:
+        """Several queries (keyword arguments of `query`) at once; the result has the result of each in `results`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_all(self, namespace: str) -> None:
+        """Delete a namespace and all of its rows."""
+        raise NotImplementedError
+
+    async def hint_cache_warm(self, namespace: str) -> str:
+        """Hint that queries of the namespace are coming; returns the status of the hint."""
+        return "ACCEPTED"
+
+
+def _run_turbopuffer_write_in_thread(
+    api_key: str,
+    region: str,
+    namespace_name: str,
+    upsert_columns: dict | None = None,
+    deletes: list | None = None,
+    delete_by_filter: tuple | None = None,
+    distance_metric: str = "cosine_distance",
+    schema: dict | None = None,
+):
+    """
+    Sync wrapper to run turbopuffer write in isolated event loop.
+
+    Turbopuffer's async write() does CPU-intensive base64 encoding of vectors
+    synchronously in async functions, blocking the event loop. Running it in
+    a thread pool with an isolated event loop prevents blocking.
+    """
+    from turbopuffer import AsyncTurbopuffer
+
+    # Create new event loop for this worker thread
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+
+        async def do_write():
+            async with AsyncTurbopuffer(api_key=api_key, region=region) as client:
+                namespace = client.namespace(namespace_name)
+
+                # Build write kwargs
+                kwargs = {"distance_metric": distance_metric}
+                if upsert_columns:
+                    kwargs["upsert_columns"] = upsert_columns
+                if deletes:
+                    kwargs["deletes"] = deletes
+                if delete_by_filter:
+                    kwargs["delete_by_filter"] = delete_by_filter
+                if schema:
+                    kwargs["schema"] = schema
+
+                return await namespace.write(**kwargs)
+
+        return loop.run_until_complete(do_write())
+    finally:
+        loop.close()
+
+
+def _raise_not_found(e: Exception) -> None:
+    """Wrap turbopuffer errors with user-friendly messages."""
+    from turbopuffer import NotFoundError
+
+    if isinstance(e, NotFoundError):
+        # Extract just the error message without implementation details
+        error_msg = str(e)
+        if "namespace" in error_msg.lower() and "not found" in error_msg.lower():
+            raise ValueError("No conversation history found. Please send a message first to enable search.") from e
+        raise ValueError(f"Search data not found: {error_msg}") from e
+
+
+class TurbopufferVectorStore(VectorStore):
+    """Namespaces stored in the Turbopuffer service."""
+
+    def __init__(self, api_key: str, region: str):
+        self.api_key = api_key
+        self.region = region
+
+    async def write(
+        self,
+        namespace: str,
+        upsert_columns: Optional[dict] = None,
+        deletes: Optional[list] = None,
+        delete_by_filter: Optional[tuple] = None,
+        distance_metric: str = "cosine_distance",
+        schema: Optional[dict] = None,
+    ) -> Any:
+        # Run in thread pool to prevent CPU-intensive base64 encoding from blocking event loop
+        return await asyncio.to_thread(
+            _run_turbopuffer_write_in_thread,
+            api_key=self.api_key,
+            region=self.region,
+            namespace_name=namespace,
+            upsert_columns=upsert_columns,
+            deletes=deletes,
+            delete_by_filter=delete_by_filter,
+            distance_metric=distance_metric,
+            schema=schema,
+        )
+
+    async def query(
+        self,
+        namespace: str,
+        rank_by: tuple,
+        top_k: int,
+        include_attributes: Union[List[str], bool],
+        filters: Optional[tuple] = None,
+    ) -> Any:
+        from turbopuffer import AsyncTurbopuffer
+
+        query_params = {"rank_by": rank_by, "top_k": top_k, "include_attributes": include_attributes}
+        if filters:
+            query_params["filters"] = filters
+        try:
+            async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
+                return await client.namespace(namespace).query(**query_params)
+        except Exception as e:
+            _raise_not_found(e)
+            raise
+
+    async def multi_query(self, namespace: str, queries: List[dict]) -> Any:
+        from turbopuffer import AsyncTurbopuffer
+        from turbopuffer.types import QueryParam
+
+        try:
+            async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
+                return await client.namespace(namespace).multi_query(queries=[QueryParam(**q) for q in queries])
+        except Exception as e:
+            _raise_not_found(e)
+            raise
+
+    async def delete_all(self, namespace: str) -> None:
+        from turbopuffer import AsyncTurbopuffer
+
+        async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
+            await client.namespace(namespace).delete_all()
+
+    async def hint_cache_warm(self, namespace: str) -> str:
+        from turbopuffer import AsyncTurbopuffer
+
+        async with AsyncTurbopuffer(api_key=self.api_key, region=self.region) as client:
+            result = await client.namespace(namespace).hint_cache_warm()
+            return result.status
+
+
+def get_vector_store(api_key: Optional[str] = None, region: Optional[str] = None) -> VectorStore:
+    """The vector store selected for this deployment (`LETTA_VECTOR_STORE_BACKEND`)."""
+    if settings.vector_store_backend is VectorStoreBackend.LOCAL:
+        from letta.helpers.local_vector_store import get_local_vector_store
+
+        return get_local_vector_store()
+    if not api_key:
+        raise ValueError("Turbopuffer API key not provided")
+    return TurbopufferVectorStore(api_key=api_key, region=region)
@@ -6,7 +6,7 @@ from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice,
 
 from letta.constants import PRE_EXECUTION_MESSAGE_ARG
 from letta.interfaces.utils import _format_sse_chunk
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 
 
 class OpenAIChatCompletionsStreamingInterface:
@@ -17,10 +17,10 @@ class OpenAIChatCompletionsStreamingInterface:
     """
 
     def __init__(self, stream_pre_execution_message: bool = True):
-        self.optimistic_json_parser: OptimisticJSONParser = OptimisticJSONParser()
         self.stream_pre_execution_message: bool = stream_pre_execution_message
 
-        self.current_parsed_json_result: dict[str, Any] = {}
+        # parses the tool call arguments as they stream in, without re-parsing what was already read
+        self.tool_call_args_parser: IncrementalJSONParser = IncrementalJSONParser()
         self.content_buffer: list[str] = []
         self.tool_call_happened: bool = False
         self.finish_reason_stop: bool = False
@@ -80,21 +80,10 @@ class OpenAIChatCompletionsStreamingInterface:
 
     async def _stream_pre_execution_message(self, chunk: ChatCompletionChunk, tool_call: Any) -> AsyncGenerator[str, None]:
         """Parses and streams pre-execution messages if they have changed."""
-        parsed_args = self.optimistic_json_parser.parse(self.tool_call_args_str)
-
-        if parsed_args.get(PRE_EXECUTION_MESSAGE_ARG) and parsed_args[PRE_EXECUTION_MESSAGE_ARG] != self.current_parsed_json_result.get(
-            PRE_EXECUTION_MESSAGE_ARG
-        ):
-            # Extract old and new message content
-            old = self.current_parsed_json_result.get(PRE_EXECUTION_MESSAGE_ARG, "")
-            new = parsed_args[PRE_EXECUTION_MESSAGE_ARG]
-
-            # Compute the new content by slicing off the old prefix
-            content = new[len(old) :] if old else new
-
-            # Update current state
-            self.current_parsed_json_result = parsed_args
+        # the text appended to the pre-execution message by this chunk
+        content = self.tool_call_args_parser.feed(tool_call.function.arguments).get(PRE_EXECUTION_MESSAGE_ARG)
 
+        if content:
             # Yield the formatted SSE chunk
             yield _format_sse_chunk(
                 ChatCompletionChunk(
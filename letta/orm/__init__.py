@@ -10,6 +10,7 @@ from letta.orm.blocks_conversations import BlocksConversations as BlocksConversa
 from letta.orm.blocks_tags import BlocksTags as BlocksTags
 from letta.orm.conversation import Conversation as Conversation
 from letta.orm.conversation_messages import ConversationMessage as ConversationMessage
+from letta.orm.embedding_cache import EmbeddingCache as EmbeddingCache
 from letta.orm.file import FileMetadata as FileMetadata
 from letta.orm.files_agents import FileAgent as FileAgent
 from letta.orm.group import Group as Group
@@ -39,6 +40,7 @@ from letta.orm.sandbox_config import (
     SandboxConfig as SandboxConfig,
     SandboxEnvironmentVariable as SandboxEnvironmentVariable,
 )
+from letta.orm.secret_reencryption import ENCRYPTED_COLUMNS as ENCRYPTED_COLUMNS  # also registers the re-encryption listeners
 from letta.orm.source import Source as Source
 from letta.orm.sources_agents import SourcesAgents as SourcesAgents
 from letta.orm.step import Step as Step
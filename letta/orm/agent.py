@@ -1,9 +1,9 @@
 import asyncio
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, List, Optional, Set
+from typing import TYPE_CHECKING, Any, ClassVar, List, Optional, Set
 
-from sqlalchemy import JSON, Boolean, DateTime, Index, Integer, String, select
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Index, Integer, String, select, text
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_object_session
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -124,6 +124,19 @@ class Agent(SqlalchemyBase, OrganizationMixin, ProjectMixin, TemplateEntityMixin
     hidden: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True, default=None, doc="If set to True, the agent will be hidden.")
     _vector_db_namespace: Mapped[Optional[str]] = mapped_column(String, nullable=True, doc="Private field for vector database namespace")
 
+    # cache invalidation: incremented on every update of the agent row, and explicitly bumped by writers
+    # of attached state (blocks, tools, sources, files, identities) via bump_agent_versions_async
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        onupdate=text("version + 1"),
+        doc="Monotonically increasing version of the agent's state, used to validate cached AgentStates.",
+    )
+    # fetch the incremented version with RETURNING instead of expiring it (lazy loads raise in async)
+    __mapper_args__: ClassVar[dict] = {"eager_defaults": True}
+
     # relationships
     organization: Mapped["Organization"] = relationship("Organization", back_populates="agents", lazy="raise")
     tool_exec_environment_variables: Mapped[List["AgentEnvironmentVariable"]] = relationship(
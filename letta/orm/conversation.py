@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
 from pydantic import TypeAdapter
-from sqlalchemy import JSON, DateTime, ForeignKey, Index, String
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from letta.orm.mixins import OrganizationMixin
@@ -28,6 +28,7 @@ class Conversation(SqlalchemyBase, OrganizationMixin):
         Index("ix_conversations_agent_id", "agent_id"),
         Index("ix_conversations_org_agent", "organization_id", "agent_id"),
         Index("ix_conversations_org_agent_last_message_at", "organization_id", "agent_id", "last_message_at"),
+        Index("ix_conversations_parent_conversation_id", "parent_conversation_id"),
     )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: f"conv-{uuid.uuid4()}")
@@ -42,6 +43,19 @@ class Conversation(SqlalchemyBase, OrganizationMixin):
     last_message_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True, doc="Timestamp of the most recent message request to this conversation"
     )
+    parent_conversation_id: Mapped[Optional[str]] = mapped_column(
+        String,
+        ForeignKey("conversations.id", ondelete="SET NULL"),
+        nullable=True,
+        doc="For a fork still sharing its message prefix: the conversation it was forked from",
+    )
+    fork_position: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        nullable=True,
+        doc="For a fork still sharing its message prefix: the position after the parent's last in-context message at the "
+        "fork. The fork's in-context messages are its own system message, the parent's in-context messages at positions "
+        "1..fork_position-1, then its own messages, which are positioned from fork_position on.",
+    )
 
     # Relationships
     agent: Mapped["Agent"] = relationship("Agent", back_populates="conversations", lazy="raise")
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from letta.orm.base import Base
+
+
+class EmbeddingCache(Base):
+    """Content-addressed store of computed embeddings, so identical chunks are never re-embedded under the same model."""
+
+    __tablename__ = "embedding_cache"
+    __table_args__ = (Index("ix_embedding_cache_created_at", "created_at"),)
+
+    cache_key: Mapped[str] = mapped_column(
+        String, primary_key=True, doc="sha256 over the organization, embedding model identity and sha256 of the text."
+    )
+    organization_id: Mapped[str] = mapped_column(
+        String, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, doc="The organization that computed the embedding."
+    )
+    embedding_model: Mapped[str] = mapped_column(String, nullable=False, doc="The embedding model used.")
+    embedding_dim: Mapped[int] = mapped_column(Integer, nullable=False, doc="The dimension of the embedding.")
+    embedding: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, doc="The cached embedding as packed float32.")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
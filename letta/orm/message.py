@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 if TYPE_CHECKING:
     from letta.orm.job import Job
@@ -7,9 +7,10 @@ if TYPE_CHECKING:
     from letta.orm.step import Step
 
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall
-from sqlalchemy import BigInteger, FetchedValue, ForeignKey, Index, event, text
+from sqlalchemy import JSON, BigInteger, FetchedValue, ForeignKey, Index, event, text
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
+from letta.constants import MESSAGE_EMBEDDING_DIM
 from letta.orm.custom_columns import ApprovalsColumn, MessageContentColumn, ToolCallColumn, ToolReturnColumn
 from letta.orm.mixins import AgentMixin, OrganizationMixin
 from letta.orm.sqlalchemy_base import SqlalchemyBase
@@ -19,6 +20,15 @@ from letta.schemas.letta_message_content import MessageContent, TextContent, Tex
 from letta.schemas.message import Message as PydanticMessage, ToolReturn
 from letta.settings import DatabaseChoice, settings
 
+# Words of a message for full-text search: its legacy text, its text content parts and the arguments of its tool calls
+# (which hold the assistant's message for agents that reply with send_message). Indexed as an expression (GIN), so
+# queries must use this exact expression to hit ix_messages_search_vector.
+MESSAGE_SEARCH_VECTOR_SQL = (
+    "to_tsvector('english'::regconfig, coalesce(\"text\", '')) || "
+    "to_tsvector('english'::regconfig, coalesce(jsonb_path_query_array(content::jsonb, '$[*] ? (@.type == \"text\").text'), '[]'::jsonb)) || "
+    "to_tsvector('english'::regconfig, coalesce(jsonb_path_query_array(tool_calls::jsonb, '$[*].function.arguments'), '[]'::jsonb))"
+)
+
 
 class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
     """Defines data model for storing Message objects"""
@@ -35,6 +45,18 @@ class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
         Index("ix_messages_run_sequence", "run_id", "sequence_id"),
         Index("idx_messages_step_id", "step_id"),
     )
+    if settings.database_engine is DatabaseChoice.POSTGRES:
+        __table_args__ += (
+            Index("ix_messages_search_vector", text(f"({MESSAGE_SEARCH_VECTOR_SQL})"), postgresql_using="gin"),
+            Index(
+                "ix_messages_embedding",
+                "embedding",
+                postgresql_using="hnsw",
+                postgresql_with={"m": 16, "ef_construction": 64},
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+                postgresql_where=text("embedding IS NOT NULL"),
+            ),
+        )
     __pydantic_model__ = PydanticMessage
 
     id: Mapped[str] = mapped_column(primary_key=True, doc="Unique message identifier")
@@ -81,6 +103,9 @@ class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
     approvals: Mapped[Optional[List[ApprovalReturn | ToolReturn]]] = mapped_column(
         ApprovalsColumn, nullable=True, doc="Approval responses for tool call requests"
     )
+    token_counts: Mapped[Optional[Dict[str, int]]] = mapped_column(
+        JSON, nullable=True, doc="Token counts for this message computed at creation, keyed by tokenizer family"
+    )
 
     # Monotonically increasing sequence for efficient/correct listing
     sequence_id: Mapped[int] = mapped_column(
@@ -90,6 +115,12 @@ class Message(SqlalchemyBase, OrganizationMixin, AgentMixin):
         nullable=False,
     )
 
+    # Optional embedding of the message for SQL conversation search, deferred so it is never loaded with the message
+    if settings.database_engine is DatabaseChoice.POSTGRES:
+        from pgvector.sqlalchemy import Vector
+
+        embedding = mapped_column(Vector(MESSAGE_EMBEDDING_DIM), nullable=True, deferred=True)
+
     # Relationships
     organization: Mapped["Organization"] = relationship("Organization", back_populates="messages", lazy="raise")
     step: Mapped["Step"] = relationship("Step", back_populates="messages", lazy="selectin")
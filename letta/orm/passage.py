@@ -64,6 +64,7 @@ class SourcePassage(BasePassage, FileMixin, SourceMixin):
                 Index("source_passages_org_idx", "organization_id"),
                 Index("source_passages_created_at_id_idx", "created_at", "id"),
                 Index("source_passages_file_id_idx", "file_id"),
+                Index("ix_source_passages_source_created_at", "source_id", "created_at"),
                 {"extend_existing": True},
             )
         return (
@@ -94,6 +95,7 @@ class ArchivalPassage(BasePassage, ArchiveMixin):
                 Index("ix_archival_passages_org_archive", "organization_id", "archive_id"),
                 Index("archival_passages_created_at_id_idx", "created_at", "id"),
                 Index("ix_archival_passages_archive_id", "archive_id"),
+                Index("ix_archival_passages_archive_created_at", "archive_id", "created_at"),
                 {"extend_existing": True},
             )
         return (
@@ -0,0 +1,121 @@
+"""
+Lazy re-encryption of legacy secrets.
+
+Secrets encrypted in the legacy format (a PBKDF2 key derivation per value) still decrypt transparently, but cost a key
+derivation each. When `encryption_envelope_enabled` and `encryption_reencrypt_legacy` are set, every loaded row with a
+legacy-encrypted column is re-encrypted in the envelope format in the background, so secrets migrate as they are used.
+"""
+
+import asyncio
+import hashlib
+from typing import Dict, Set, Tuple, Type
+
+from sqlalchemy import event, update
+
+from letta.helpers.crypto_utils import CryptoUtils
+from letta.log import get_logger
+from letta.orm.mcp_oauth import MCPOAuth
+from letta.orm.mcp_server import MCPServer
+from letta.orm.provider import Provider
+from letta.orm.sandbox_config import AgentEnvironmentVariable, SandboxEnvironmentVariable
+from letta.orm.sqlalchemy_base import SqlalchemyBase
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+# encrypted columns by model
+ENCRYPTED_COLUMNS: Dict[Type[SqlalchemyBase], Tuple[str, ...]] = {
+    Provider: ("api_key_enc", "access_key_enc"),
+    MCPServer: ("token_enc", "custom_headers_enc"),
+    MCPOAuth: ("authorization_code_enc", "access_token_enc", "refresh_token_enc", "client_secret_enc"),
+    SandboxEnvironmentVariable: ("value_enc",),
+    AgentEnvironmentVariable: ("value_enc",),
+}
+
+# rows with a re-encryption in flight, by (table, id)
+_in_flight: Set[Tuple[str, str]] = set()
+
+# sha256 of legacy-looking values that did not decrypt, so each costs one key derivation per process, not one per load
+_undecryptable: Set[str] = set()
+_MAX_UNDECRYPTABLE = 10_000
+
+
+def _value_hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+async def reencrypt_legacy_columns_async(model: Type[SqlalchemyBase], row_id: str, organization_id: str, legacy: Dict[str, str]) -> bool:
+    """
+    Re-encrypt the given legacy-encrypted column values of a row in the envelope format.
+
+    The row is only updated if none of the columns changed in the meantime. Returns whether it was updated.
+    """
+    from letta.server.db import db_registry
+
+    values = {}
+    for column, encrypted in legacy.items():
+        try:
+            plaintext = await CryptoUtils.decrypt_async(encrypted)
+        except ValueError:
+            # long plaintext values stored without a key can look like legacy ciphertexts
+            logger.debug(f"Skipping re-encryption of {model.__tablename__}.{column} for {row_id}: value does not decrypt")
+            if len(_undecryptable) >= _MAX_UNDECRYPTABLE:
+                _undecryptable.clear()
+            _undecryptable.add(_value_hash(encrypted))
+            continue
+        values[column] = await CryptoUtils.encrypt_async(plaintext, organization_id=organization_id)
+    if not values:
+        return False
+
+    table = model.__table__
+    stmt = update(table).where(table.c.id == row_id)
+    for column in values:
+        stmt = stmt.where(table.c[column] == legacy[column])
+    async with db_registry.async_session() as session:
+        result = await session.execute(stmt.values(**values))
+    return result.rowcount > 0
+
+
+async def _reencrypt_in_background(model: Type[SqlalchemyBase], row_id: str, organization_id: str, legacy: Dict[str, str]) -> None:
+    try:
+        if await reencrypt_legacy_columns_async(model, row_id, organization_id, legacy):
+            logger.debug(f"Re-encrypted {', '.join(legacy)} of {model.__tablename__} {row_id} in the envelope format")
+    except Exception as e:
+        logger.warning(f"Failed to re-encrypt legacy secrets of {model.__tablename__} {row_id}: {e}")
+    finally:
+        _in_flight.discard((model.__tablename__, row_id))
+
+
+def _on_load(target: SqlalchemyBase, context) -> None:
+    if not (settings.encryption_reencrypt_legacy and settings.encryption_envelope_enabled and settings.encryption_key):
+        return
+
+    # read loaded state directly, so unloaded (deferred) columns are never fetched here
+    legacy = {}
+    for column in ENCRYPTED_COLUMNS[type(target)]:
+        value = target.__dict__.get(column)
+        if value and CryptoUtils.is_legacy_encrypted(value) and _value_hash(value) not in _undecryptable:
+            legacy[column] = value
+    if not legacy:
+        return
+
+    key = (target.__tablename__, target.__dict__.get("id"))
+    if key[1] is None or key in _in_flight:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # synchronous sessions have nowhere to run the background task
+        return
+
+    from letta.utils import safe_create_task
+
+    _in_flight.add(key)
+    safe_create_task(
+        _reencrypt_in_background(type(target), key[1], target.__dict__.get("organization_id"), legacy),
+        label=f"re-encrypt legacy secrets of {key[0]}",
+    )
+
+
+for _model in ENCRYPTED_COLUMNS:
+    event.listen(_model, "load", _on_load)
@@ -230,6 +230,45 @@ class MetricRegistry:
             ),
         )
 
+    # (includes embedding_model)
+    @property
+    def embedding_batch_size_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_embedding_batch_size",
+            partial(
+                self._meter.create_histogram,
+                name="hist_embedding_batch_size",
+                description="Number of texts sent per coalesced embedding request",
+                unit="1",
+            ),
+        )
+
+    # (includes embedding_model)
+    @property
+    def embedding_batch_fill_ratio_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_embedding_batch_fill_ratio",
+            partial(
+                self._meter.create_histogram,
+                name="hist_embedding_batch_fill_ratio",
+                description="Fill of coalesced embedding requests relative to the max batch size",
+                unit="1",
+            ),
+        )
+
+    # (includes embedding_model)
+    @property
+    def embedding_batch_queue_wait_ms_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_embedding_batch_queue_wait_ms",
+            partial(
+                self._meter.create_histogram,
+                name="hist_embedding_batch_queue_wait_ms",
+                description="Time embedding requests wait in the coalescing queue before their batch is sent",
+                unit="ms",
+            ),
+        )
+
     # (includes route_class)
     @property
     def sse_active_sessions_counter(self) -> UpDownCounter:
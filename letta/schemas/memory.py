@@ -1,7 +1,11 @@
 import asyncio
+import hashlib
 import logging
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from io import StringIO
 from typing import List, Optional, Union
 
@@ -65,6 +69,41 @@ class ContextWindowOverview(BaseModel):
     messages: List[Message] = Field(..., description="The messages in the context window.")
 
 
+# Compiled prompts keyed by `Memory.compile_fingerprint`, shared across agents in the process
+COMPILED_MEMORY_CACHE_SIZE = 512
+_compiled_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+# compile runs in worker threads (asyncio.to_thread), so every access to the LRU holds this lock
+_compiled_memory_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _render_block_section(label: str, value: str, desc: str, limit: int, read_only: bool, line_numbered: bool) -> str:
+    """Render a single <memory_blocks> entry. Memoized so an edit only re-renders the block that changed."""
+    s = StringIO()
+    s.write(f"<{label}>\n")
+    s.write("<description>\n")
+    s.write(f"{desc}\n")
+    s.write("</description>\n")
+    s.write("<metadata>")
+    if read_only:
+        s.write("\n- read_only=true")
+    s.write(f"\n- chars_current={len(value)}")
+    s.write(f"\n- chars_limit={limit}\n")
+    s.write("</metadata>\n")
+    if line_numbered:
+        s.write(f"<warning>\n{CORE_MEMORY_LINE_NUMBER_WARNING}\n</warning>\n")
+        s.write("<value>\n")
+        if value:
+            for i, line in enumerate(value.split("\n"), start=1):
+                s.write(f"{i}→ {line}\n")
+    else:
+        s.write("<value>\n")
+        s.write(f"{value}\n")
+    s.write("</value>\n")
+    s.write(f"</{label}>\n")
+    return s.getvalue()
+
+
 class Memory(BaseModel, validate_assignment=True):
     """
 
@@ -148,26 +187,7 @@ class Memory(BaseModel, validate_assignment=True):
 
         s.write("<memory_blocks>\nThe following memory blocks are currently engaged in your core memory unit:\n\n")
         for idx, block in enumerate(renderable):
-            label = self._display_label(block.label or "block")
-            value = block.value or ""
-            desc = block.description or ""
-            chars_current = len(value)
-            limit = block.limit if block.limit is not None else 0
-
-            s.write(f"<{label}>\n")
-            s.write("<description>\n")
-            s.write(f"{desc}\n")
-            s.write("</description>\n")
-            s.write("<metadata>")
-            if getattr(block, "read_only", False):
-                s.write("\n- read_only=true")
-            s.write(f"\n- chars_current={chars_current}")
-            s.write(f"\n- chars_limit={limit}\n")
-            s.write("</metadata>\n")
-            s.write("<value>\n")
-            s.write(f"{value}\n")
-            s.write("</value>\n")
-            s.write(f"</{label}>\n")
+            s.write(self._render_block_section(block, line_numbered=False))
             if idx != len(renderable) - 1:
                 s.write("\n")
         s.write("\n</memory_blocks>")
@@ -176,32 +196,21 @@ class Memory(BaseModel, validate_assignment=True):
         renderable = self._get_renderable_blocks()
         s.write("<memory_blocks>\nThe following memory blocks are currently engaged in your core memory unit:\n\n")
         for idx, block in enumerate(renderable):
-            label = self._display_label(block.label or "block")
-            value = block.value or ""
-            desc = block.description or ""
-            limit = block.limit if block.limit is not None else 0
-
-            s.write(f"<{label}>\n")
-            s.write("<description>\n")
-            s.write(f"{desc}\n")
-            s.write("</description>\n")
-            s.write("<metadata>")
-            if getattr(block, "read_only", False):
-                s.write("\n- read_only=true")
-            s.write(f"\n- chars_current={len(value)}")
-            s.write(f"\n- chars_limit={limit}\n")
-            s.write("</metadata>\n")
-            s.write(f"<warning>\n{CORE_MEMORY_LINE_NUMBER_WARNING}\n</warning>\n")
-            s.write("<value>\n")
-            if value:
-                for i, line in enumerate(value.split("\n"), start=1):
-                    s.write(f"{i}→ {line}\n")
-            s.write("</value>\n")
-            s.write(f"</{label}>\n")
+            s.write(self._render_block_section(block, line_numbered=True))
             if idx != len(renderable) - 1:
                 s.write("\n")
         s.write("\n</memory_blocks>")
 
+    def _render_block_section(self, block: Block, line_numbered: bool) -> str:
+        return _render_block_section(
+            label=self._display_label(block.label or "block"),
+            value=block.value or "",
+            desc=block.description or "",
+            limit=block.limit if block.limit is not None else 0,
+            read_only=bool(getattr(block, "read_only", False)),
+            line_numbered=line_numbered,
+        )
+
     def _render_memory_blocks_git(self, s: StringIO):
         """Render git-backed system memory with structured tags.
 
@@ -686,9 +695,11 @@ class Memory(BaseModel, validate_assignment=True):
         s.write("</directories>")
 
     def compile(self, tool_usage_rules=None, sources=None, max_files_open=None, llm_config=None, client_skills=None) -> str:
-        """Efficiently render memory, tool rules, and sources into a prompt string."""
-        s = StringIO()
+        """Efficiently render memory, tool rules, and sources into a prompt string.
 
+        Results are memoized on a fingerprint of everything that affects the rendered output, so repeated
+        compiles of unchanged memory (e.g. every agent step) skip rendering entirely.
+        """
         raw_type = self.agent_type.value if hasattr(self.agent_type, "value") else (self.agent_type or "")
         norm_type = raw_type.lower()
         is_react = norm_type in ("react_agent", "workflow_agent")
@@ -701,6 +712,24 @@ class Memory(BaseModel, validate_assignment=True):
             # Only use line numbers for specific agent types AND Anthropic models
             is_line_numbered = is_line_numbered_agent_type and is_anthropic
 
+        fingerprint = self.compile_fingerprint(
+            is_react=is_react,
+            is_line_numbered=is_line_numbered,
+            tool_usage_rules=tool_usage_rules,
+            sources=sources,
+            max_files_open=max_files_open,
+        )
+        with _compiled_memory_cache_lock:
+            cached = _compiled_memory_cache.get(fingerprint)
+            if cached is not None:
+                try:
+                    _compiled_memory_cache.move_to_end(fingerprint)
+                except KeyError:
+                    pass
+                return cached
+
+        s = StringIO()
+
         # Memory blocks (not for react/workflow). Always include wrapper for preview/tests.
         if not is_react:
             if self.git_enabled:
@@ -729,7 +758,39 @@ class Memory(BaseModel, validate_assignment=True):
             else:
                 self._render_directories_common(s, sources, max_files_open)
 
-        return s.getvalue()
+        compiled = s.getvalue()
+        with _compiled_memory_cache_lock:
+            _compiled_memory_cache[fingerprint] = compiled
+            _compiled_memory_cache.move_to_end(fingerprint)
+            while len(_compiled_memory_cache) > COMPILED_MEMORY_CACHE_SIZE:
+                _compiled_memory_cache.popitem(last=False)
+        return compiled
+
+    def compile_fingerprint(self, is_react: bool, is_line_numbered: bool, tool_usage_rules=None, sources=None, max_files_open=None) -> str:
+        """Hash of every input that affects `compile` output: render mode, block contents, file blocks, sources and limits."""
+        h = hashlib.blake2b(digest_size=16)
+
+        def _feed(*parts):
+            for part in parts:
+                h.update(str(part).encode("utf-8", "surrogatepass"))
+                h.update(b"\x1f")
+
+        _feed(type(self).__name__, is_react, is_line_numbered, self.git_enabled, max_files_open)
+        for block in self.blocks:
+            _feed("block", block.id, block.label, block.value, block.description, block.limit, getattr(block, "read_only", False))
+        for fb in self.file_blocks:
+            _feed("file", fb.id, fb.label, fb.value, fb.description, fb.limit, fb.read_only, getattr(fb, "source_id", None))
+        for source in sources or []:
+            _feed(
+                "source",
+                getattr(source, "id", None),
+                getattr(source, "name", ""),
+                getattr(source, "description", None),
+                getattr(source, "instructions", None),
+            )
+        if tool_usage_rules is not None:
+            _feed("rules", getattr(tool_usage_rules, "description", None), getattr(tool_usage_rules, "value", None))
+        return h.hexdigest()
 
     @trace_method
     async def compile_async(self, tool_usage_rules=None, sources=None, max_files_open=None, llm_config=None, client_skills=None) -> str:
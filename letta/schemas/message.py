@@ -306,6 +306,9 @@ class Message(BaseMessage):
     approve: Optional[bool] = Field(default=None, description="Whether tool call is approved.")
     denial_reason: Optional[str] = Field(default=None, description="The reason the tool call request was denied.")
     approvals: Optional[List[ApprovalReturn | ToolReturn]] = Field(default=None, description="The list of approvals for this message.")
+    token_counts: Optional[Dict[str, int]] = Field(
+        default=None, description="Token counts for this message computed at creation, keyed by tokenizer family."
+    )
     # This overrides the optional base orm schema, created_at MUST exist on all messages objects
     created_at: datetime = Field(default_factory=get_utc_time, description="The timestamp when the object was created.")
 
@@ -2708,3 +2711,32 @@ class MessageSearchResult(BaseModel):
     fts_rank: Optional[int] = Field(None, description="Full-text search rank position if FTS was used")
     vector_rank: Optional[int] = Field(None, description="Vector search rank position if vector search was used")
     rrf_score: float = Field(..., description="Reciprocal Rank Fusion combined score")
+
+
+# Message columns that can be selected by projection listings
+MessageField = Literal[
+    "id",
+    "agent_id",
+    "role",
+    "content",
+    "name",
+    "model",
+    "tool_calls",
+    "tool_call_id",
+    "tool_returns",
+    "step_id",
+    "run_id",
+    "group_id",
+    "conversation_id",
+    "sender_id",
+    "otid",
+    "created_at",
+]
+
+
+class MessageFieldsPage(BaseModel):
+    """A page of messages restricted to the requested fields."""
+
+    messages: List[Dict[str, Any]] = Field(..., description="The requested fields of each message, in the requested order")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page (opaque, pass as `after`)")
+    has_more: bool = Field(..., description="Whether more results exist after this page")
@@ -32,7 +32,7 @@ class Secret(BaseModel):
     model_config = ConfigDict(frozen=True)
 
     @classmethod
-    def from_plaintext(cls, value: Optional[str]) -> "Secret":
+    def from_plaintext(cls, value: Optional[str], organization_id: Optional[str] = None) -> "Secret":
         """
         Create a Secret from a plaintext value, encrypting it if possible.
 
@@ -41,6 +41,7 @@ class Secret(BaseModel):
 
         Args:
             value: The plaintext value to encrypt
+            organization_id: Optional organization whose data key encrypts the value (envelope format only)
 
         Returns:
             A Secret instance with the encrypted (or plaintext) value
@@ -54,7 +55,7 @@ class Secret(BaseModel):
 
         # Try to encrypt, but fall back to storing plaintext if no encryption key
         try:
-            encrypted = CryptoUtils.encrypt(value)
+            encrypted = CryptoUtils.encrypt(value, organization_id=organization_id)
             return cls.model_construct(encrypted_value=encrypted)
         except ValueError as e:
             # No encryption key available, store as plaintext in the _enc column
@@ -69,7 +70,7 @@ class Secret(BaseModel):
             raise  # Re-raise if it's a different error
 
     @classmethod
-    async def from_plaintext_async(cls, value: Optional[str]) -> "Secret":
+    async def from_plaintext_async(cls, value: Optional[str], organization_id: Optional[str] = None) -> "Secret":
         """
         Create a Secret from a plaintext value, encrypting it asynchronously.
 
@@ -81,6 +82,7 @@ class Secret(BaseModel):
 
         Args:
             value: The plaintext value to encrypt
+            organization_id: Optional organization whose data key encrypts the value (envelope format only)
 
         Returns:
             A Secret instance with the encrypted (or plaintext) value
@@ -94,7 +96,7 @@ class Secret(BaseModel):
 
         # Try to encrypt asynchronously, but fall back to storing plaintext if no encryption key
         try:
-            encrypted = await CryptoUtils.encrypt_async(value)
+            encrypted = await CryptoUtils.encrypt_async(value, organization_id=organization_id)
             return cls.model_construct(encrypted_value=encrypted)
         except ValueError as e:
             # No encryption key available, store as plaintext in the _enc column
@@ -109,7 +111,9 @@ class Secret(BaseModel):
             raise  # Re-raise if it's a different error
 
     @classmethod
-    async def from_plaintexts_async(cls, values: dict[str, str], max_concurrency: int = 10) -> dict[str, "Secret"]:
+    async def from_plaintexts_async(
+        cls, values: dict[str, str], max_concurrency: int = 10, organization_id: Optional[str] = None
+    ) -> dict[str, "Secret"]:
         """
         Create multiple Secrets from plaintexts concurrently with bounded concurrency.
 
@@ -119,6 +123,7 @@ class Secret(BaseModel):
         Args:
             values: Dict of key -> plaintext value
             max_concurrency: Maximum number of concurrent encryption operations (default: 10)
+            organization_id: Optional organization whose data key encrypts the values (envelope format only)
 
         Returns:
             Dict of key -> Secret
@@ -129,7 +134,7 @@ class Secret(BaseModel):
         keys = list(values.keys())
 
         async def encrypt_one(key: str) -> "Secret":
-            return await cls.from_plaintext_async(values[key])
+            return await cls.from_plaintext_async(values[key], organization_id=organization_id)
 
         secrets = await bounded_gather([encrypt_one(k) for k in keys], max_concurrency=max_concurrency)
         return dict(zip(keys, secrets))
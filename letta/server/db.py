@@ -1,19 +1,22 @@
 import asyncio
+import itertools
 import uuid
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from typing import AsyncGenerator, List
 
-from sqlalchemy import NullPool
+from sqlalchemy import NullPool, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 
 from letta.database_utils import get_database_uri_for_context
 from letta.log import get_logger
-from letta.settings import settings
+from letta.settings import PgPoolerMode, settings
 
 logger = get_logger(__name__)
 
@@ -40,19 +43,48 @@ else:
         }
     )
 
-# Add asyncpg-specific settings for connection
-if not settings.disable_sqlalchemy_pooling:
-    connect_args = {
-        "timeout": settings.pg_pool_timeout,
+
+def statement_caching_enabled() -> bool:
+    """Prepared statements are only safe to cache when each client keeps its server connection for the whole session."""
+    return settings.pg_pooler_mode in (PgPoolerMode.SESSION, PgPoolerMode.DIRECT)
+
+
+def build_statement_cache_connect_args() -> dict:
+    """Build the asyncpg prepared statement settings for the configured pooler mode.
+
+    With statement caching enabled, asyncpg's default per-connection statement names
+    (``__asyncpg_stmt_<n>__``) are used so hot queries are parsed and planned once per
+    connection. For transaction-mode pgbouncer, caching is disabled and every statement
+    gets a unique name so it can never collide with one prepared by another client.
+    """
+    if statement_caching_enabled():
+        return {
+            "statement_cache_size": settings.pg_statement_cache_size,
+            "prepared_statement_cache_size": settings.pg_statement_cache_size,
+        }
+    return {
         "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
         "statement_cache_size": 0,
         "prepared_statement_cache_size": 0,
     }
+
+
+def build_asyncpg_connect_args(uri: str) -> dict:
+    """Build asyncpg connect args for an engine, for the configured pooling and pooler mode."""
+    if settings.disable_sqlalchemy_pooling:
+        # Connections are not reused across sessions, but each one still goes through the
+        # pooler, so the prepared statement settings apply all the same.
+        return build_statement_cache_connect_args()
+
+    connect_args = {"timeout": settings.pg_pool_timeout, **build_statement_cache_connect_args()}
     # Only add SSL if not already specified in connection string
-    if "sslmode" not in async_pg_uri and "ssl" not in async_pg_uri:
+    if "sslmode" not in uri and "ssl" not in uri:
         connect_args["ssl"] = "require"
+    return connect_args
+
 
-    engine_args["connect_args"] = connect_args
+# Add asyncpg-specific settings for connection
+engine_args["connect_args"] = build_asyncpg_connect_args(async_pg_uri)
 
 # Create the engine once at module level
 engine: AsyncEngine = create_async_engine(async_pg_uri, **engine_args)
@@ -67,13 +99,66 @@ async_session_factory = async_sessionmaker(
 )
 
 
+def _build_replica_engines() -> List[AsyncEngine]:
+    if not settings.pg_replica_uris:
+        return []
+    replica_engines = []
+    for uri in settings.pg_replica_uris.split(","):
+        uri = uri.strip()
+        if not uri:
+            continue
+        replica_uri = get_database_uri_for_context(uri, "async")
+        replica_engine_args = dict(engine_args)
+        replica_engine_args["connect_args"] = build_asyncpg_connect_args(replica_uri)
+        replica_engines.append(create_async_engine(replica_uri, **replica_engine_args))
+    return replica_engines
+
+
+# Optional read replica engines; read-only sessions are spread across them round-robin
+replica_engines: List[AsyncEngine] = _build_replica_engines()
+replica_session_factories = [
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False, autocommit=False, autoflush=False)
+    for replica_engine in replica_engines
+]
+_replica_cycle = itertools.cycle(replica_session_factories) if replica_session_factories else None
+
+# Read-your-writes: once a request (asyncio task context) has written to the primary,
+# its later read-only sessions are pinned to the primary so replica lag can't hide the write.
+_pinned_to_primary: ContextVar[bool] = ContextVar("db_pinned_to_primary", default=False)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_session_write(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_flush(session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+
+def pin_to_primary() -> None:
+    """Route the rest of the current request's reads to the primary."""
+    _pinned_to_primary.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    return _pinned_to_primary.get()
+
+
 class DatabaseRegistry:
     """Dummy registry to maintain the existing interface."""
 
     @asynccontextmanager
-    async def async_session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def async_session(self, read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
         """Get an async database session.
 
+        With ``read_only=True`` the session is served by a read replica when replicas are
+        configured (``LETTA_PG_REPLICA_URIS``) and the current request has not written yet;
+        otherwise it falls back to the primary. Read-only sessions are rolled back instead of
+        committed.
+
         Note: We explicitly handle asyncio.CancelledError separately because it's
         a BaseException (not Exception) in Python 3.8+. Without this, cancelled
         tasks would skip rollback() and return connections to the pool with
@@ -84,12 +169,20 @@ class DatabaseRegistry:
         max_retries = 3
         retry_delay = 0.1
 
+        use_replica = read_only and _replica_cycle is not None and not _pinned_to_primary.get()
+        session_factory = next(_replica_cycle) if use_replica else async_session_factory
+
         for attempt in range(max_retries):
             try:
-                async with async_session_factory() as session:
+                async with session_factory() as session:
                     try:
                         yield session
-                        await session.commit()
+                        if use_replica:
+                            await session.rollback()
+                        else:
+                            if session.info.get("has_writes"):
+                                _pinned_to_primary.set(True)
+                            await session.commit()
                     except asyncio.CancelledError:
                         # Task was cancelled (client disconnect, timeout, explicit cancellation)
                         # Must rollback to avoid returning connection with open transaction
@@ -137,6 +230,8 @@ async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
 async def close_db() -> None:
     """Close the database engine."""
     await engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
 
 
 # Usage remains the same:
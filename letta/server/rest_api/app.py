@@ -270,6 +270,15 @@ async def lifespan(app_: FastAPI):
     except Exception as e:
         logger.warning(f"[Worker {worker_id}] Failed to stop watchdog: {e}")
 
+    if settings.step_write_buffer_enabled:
+        try:
+            from letta.services.step_write_buffer import get_step_write_buffer
+
+            await get_step_write_buffer().close()
+            logger.info(f"[Worker {worker_id}] Flushed buffered step writes")
+        except Exception as e:
+            logger.error(f"[Worker {worker_id}] Failed to flush buffered step writes: {e}", exc_info=True)
+
     try:
         from letta.jobs.scheduler import shutdown_scheduler_and_release_lock
 
@@ -1,6 +1,7 @@
 import json
+import re
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic_core import from_json
 
@@ -228,6 +229,243 @@ class OptimisticJSONParser(JSONParser):
         raise decode_error
 
 
+# states of IncrementalJSONParser
+_BEFORE_OBJECT = "before_object"
+_BEFORE_KEY = "before_key"
+_KEY = "key"
+_AFTER_KEY = "after_key"
+_BEFORE_VALUE = "before_value"
+_STRING_VALUE = "string_value"
+_OTHER_VALUE = "other_value"
+_AFTER_VALUE = "after_value"
+_DONE = "done"
+
+_WHITESPACE = " \t\r\n"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NESTED_SPECIAL = re.compile(r'["{}\[\],]')
+
+
+class IncrementalJSONParser:
+    """
+    Resumable parser for a JSON object that is streamed in fragments, such as the arguments of a tool call.
+
+    Re-parsing the accumulated text on every fragment with a `JSONParser` is quadratic in the length of the
+    arguments. `feed` keeps the tokenizer state between fragments and only looks at the new fragment. It returns the
+    text appended to each top-level string value (e.g. the growing `message` of `send_message`), so each fragment
+    costs O(fragment). Other values (numbers, lists, nested objects, ...) are decoded once complete.
+
+    Like the optimistic parsers, it is lenient: unexpected characters between tokens are skipped.
+    """
+
+    def __init__(self):
+        self._state = _BEFORE_OBJECT
+        self._key: Optional[str] = None
+        self._key_parts: List[str] = []
+        # top-level keys whose value has started, in order
+        self._keys: List[str] = []
+        # string values are kept as parts until read
+        self._string_parts: Dict[str, List[str]] = {}
+        self._values: Dict[str, Any] = {}
+        # raw text of the non-string value being read, with its nesting state
+        self._raw_parts: List[str] = []
+        self._depth = 0
+        self._in_nested_string = False
+        self._nested_escape = False
+        # escape sequence being read (starting with the backslash), and a high surrogate waiting for its pair
+        self._escape: Optional[str] = None
+        self._high_surrogate: Optional[str] = None
+        # whether the closing brace of the object was read
+        self.complete = False
+
+    @property
+    def keys(self) -> List[str]:
+        """Top-level keys whose value has started, in order."""
+        return list(self._keys)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The value of a top-level key so far: partial for a string that is still streaming."""
+        if key in self._string_parts:
+            return "".join(self._string_parts[key])
+        return self._values.get(key, default)
+
+    @property
+    def value(self) -> Dict[str, Any]:
+        """The object parsed so far."""
+        return {key: self.get(key) for key in self._keys}
+
+    def feed(self, fragment: str) -> Dict[str, str]:
+        """Parse the next fragment of the object and return the text appended to each top-level string value."""
+        appended: Dict[str, List[str]] = {}
+        i, n = 0, len(fragment)
+        while i < n and self._state != _DONE:
+            state = self._state
+            if state in (_KEY, _STRING_VALUE):
+                out = self._key_parts if state == _KEY else appended.setdefault(self._key, [])
+                i, closed = self._read_string(fragment, i, out)
+                if closed:
+                    if state == _KEY:
+                        self._key = "".join(self._key_parts)
+                        self._state = _AFTER_KEY
+                    else:
+                        self._state = _AFTER_VALUE
+                continue
+            if state == _OTHER_VALUE:
+                i = self._read_other_value(fragment, i)
+                continue
+
+            char = fragment[i]
+            i += 1
+            if char in _WHITESPACE:
+                continue
+            if state == _BEFORE_OBJECT:
+                # anything but an object has no top-level keys to stream
+                self._state = _BEFORE_KEY if char == "{" else _DONE
+            elif state == _BEFORE_KEY:
+                if char == '"':
+                    self._key_parts = []
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                    self.complete = True
+            elif state == _AFTER_KEY:
+                if char == ":":
+                    self._state = _BEFORE_VALUE
+            elif state == _BEFORE_VALUE:
+                self._start_value(self._key)
+                if char == '"':
+                    self._string_parts[self._key] = []
+                    self._state = _STRING_VALUE
+                else:
+                    self._raw_parts = []
+                    self._depth = 0
+                    self._state = _OTHER_VALUE
+                    i -= 1
+            elif state == _AFTER_VALUE:
+                if char == ",":
+                    self._key = None
+                    self._state = _BEFORE_KEY
+                elif char == "}":
+                    self._key = None
+                    self._state = _DONE
+                    self.complete = True
+
+        fragments = {}
+        for key, parts in appended.items():
+            text = "".join(parts)
+            if text:
+                self._string_parts[key].append(text)
+                fragments[key] = text
+        return fragments
+
+    def _start_value(self, key: str) -> None:
+        # a repeated key replaces the earlier value, as with json.loads
+        if key in self._keys:
+            self._keys.remove(key)
+        self._keys.append(key)
+        self._string_parts.pop(key, None)
+        self._values.pop(key, None)
+
+    def _read_string(self, text: str, i: int, out: List[str]) -> Tuple[int, bool]:
+        """Read string characters from `text[i:]` into `out`; returns the next position and whether the string closed."""
+        n = len(text)
+        while i < n:
+            if self._escape is not None:
+                self._escape += text[i]
+                i += 1
+                if self._escape[1] == "u" and len(self._escape) < 6:
+                    continue
+                self._decode_escape(out)
+                continue
+            match = _STRING_SPECIAL.search(text, i)
+            end = match.start() if match else n
+            if end > i:
+                self._flush_high_surrogate(out)
+                out.append(text[i:end])
+            if match is None:
+                return n, False
+            i = end + 1
+            if text[end] == '"':
+                self._flush_high_surrogate(out)
+                return i, True
+            self._escape = "\\"
+        return i, False
+
+    def _decode_escape(self, out: List[str]) -> None:
+        escape, self._escape = self._escape, None
+        try:
+            char = json.loads(f'"{escape}"')
+        except json.JSONDecodeError:
+            # keep invalid escapes as written
+            char = escape
+        if len(char) == 1 and "\ud800" <= char <= "\udbff":
+            # wait for the low surrogate, so a fragment never ends in half a character
+            self._flush_high_surrogate(out)
+            self._high_surrogate = escape
+        elif len(char) == 1 and "\udc00" <= char <= "\udfff" and self._high_surrogate is not None:
+            out.append(json.loads(f'"{self._high_surrogate}{escape}"'))
+            self._high_surrogate = None
+        else:
+            self._flush_high_surrogate(out)
+            out.append(char)
+
+    def _flush_high_surrogate(self, out: List[str]) -> None:
+        if self._high_surrogate is not None:
+            out.append(json.loads(f'"{self._high_surrogate}"'))
+            self._high_surrogate = None
+
+    def _read_other_value(self, text: str, i: int) -> int:
+        """Read a non-string value from `text[i:]` until it ends; returns the next position."""
+        n = len(text)
+        start = i
+        while i < n:
+            if self._in_nested_string:
+                if self._nested_escape:
+                    self._nested_escape = False
+                    i += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    i = n
+                    break
+                i = match.end()
+                if match.group() == "\\":
+                    self._nested_escape = True
+                else:
+                    self._in_nested_string = False
+                continue
+            match = _NESTED_SPECIAL.search(text, i)
+            if match is None:
+                i = n
+                break
+            char = match.group()
+            i = match.end()
+            if char == '"':
+                self._in_nested_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]" and self._depth > 0:
+                self._depth -= 1
+            elif self._depth == 0:
+                # a `,` or `}` of the top-level object ends the value
+                self._raw_parts.append(text[start : i - 1])
+                self._end_other_value()
+                self._state = _BEFORE_KEY if char == "," else _DONE
+                self.complete = char == "}"
+                return i
+        self._raw_parts.append(text[start:i])
+        return i
+
+    def _end_other_value(self) -> None:
+        raw = "".join(self._raw_parts).strip()
+        self._raw_parts = []
+        try:
+            self._values[self._key] = json.loads(raw)
+        except json.JSONDecodeError:
+            # keep malformed values as written
+            self._values[self._key] = raw or None
+        self._key = None
+
+
 # TODO: Keeping this around for posterity
 # def main():
 #     test_string = '{"inner_thoughts":}'
@@ -6,9 +6,11 @@ import time
 from collections import defaultdict
 from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import aclosing
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
 
-from letta.data_sources.redis_client import AsyncRedisClient
+from letta.constants import SSE_LIVE_RUNS_CHANNEL
+from letta.data_sources.redis_client import AsyncRedisClient, NoopAsyncRedisClient
 from letta.errors import LettaError
 from letta.log import get_logger
 from letta.schemas.enums import RunStatus
@@ -16,12 +18,24 @@ from letta.schemas.letta_message import LettaErrorMessage
 from letta.schemas.letta_stop_reason import LettaStopReason, StopReasonType
 from letta.schemas.run import RunUpdate
 from letta.schemas.user import User
+from letta.server.rest_api.sse_chunk_encoding import COMPACT_ENCODING, SSEChunkDecoder, SSEChunkEncoder
 from letta.server.rest_api.streaming_response import RunCancelledException
 from letta.services.run_manager import RunManager
+from letta.settings import settings
 from letta.utils import safe_create_task
 
 logger = get_logger(__name__)
 
+# how long a blocking stream read waits for new entries (below the Redis client's socket timeout)
+_XREAD_BLOCK_MS = 1000
+# runs with subscribers are re-announced this often, and considered to have subscribers until announced again
+_LIVE_ANNOUNCE_SECONDS = 5.0
+_LIVE_TTL_SECONDS = 3 * _LIVE_ANNOUNCE_SECONDS
+_LISTENER_RETRY_SECONDS = 5
+# a failing stream read is retried with exponential backoff before the error is raised to the subscribers
+_XREAD_MAX_ATTEMPTS = 5
+_XREAD_RETRY_DELAY_SECONDS = 0.2
+
 
 class RedisSSEStreamWriter:
     """
@@ -64,6 +78,8 @@ class RedisSSEStreamWriter:
         self.seq_counters: Dict[str, int] = defaultdict(lambda: 1)
         # Track last flush time per run
         self.last_flush: Dict[str, float] = defaultdict(float)
+        # Compact chunk encoders per run (see sse_stream_compact_encoding)
+        self.encoders: Dict[str, SSEChunkEncoder] = defaultdict(SSEChunkEncoder)
 
         # Background flush task
         self._flush_task = None
@@ -74,6 +90,8 @@ class RedisSSEStreamWriter:
         if not self._running:
             self._running = True
             self._flush_task = safe_create_task(self._periodic_flush(), label="redis_periodic_flush")
+            if settings.sse_subscription_hub_enabled:
+                get_sse_subscription_hub().ensure_listener(self.redis)
 
     async def stop(self):
         """Stop the background flush task and flush remaining data."""
@@ -118,10 +136,18 @@ class RedisSSEStreamWriter:
         if is_complete:
             chunk["complete"] = "true"
 
+        if settings.sse_stream_compact_encoding and isinstance(data, str):
+            chunk["data"] = self.encoders[run_id].encode(data)
+            chunk["encoding"] = COMPACT_ENCODING
+
         self.buffer[run_id].append(chunk)
 
         should_flush = (
-            len(self.buffer[run_id]) >= self.flush_size or is_complete or (time.time() - self.last_flush[run_id]) > self.flush_interval
+            len(self.buffer[run_id]) >= self.flush_size
+            or is_complete
+            or (time.time() - self.last_flush[run_id]) > self.flush_interval
+            # someone is watching the run, so don't keep them waiting for the batch
+            or (settings.sse_subscription_hub_enabled and get_sse_subscription_hub().has_subscribers(run_id))
         )
 
         if should_flush:
@@ -189,6 +215,7 @@ class RedisSSEStreamWriter:
         self.buffer.pop(run_id, None)
         self.seq_counters.pop(run_id, None)
         self.last_flush.pop(run_id, None)
+        self.encoders.pop(run_id, None)
 
     async def mark_complete(self, run_id: str):
         """Mark a stream as complete and flush."""
@@ -196,6 +223,222 @@ class RedisSSEStreamWriter:
         await self.write_chunk(run_id, "data: [DONE]\n\n", is_complete=True)
 
 
+def _stream_id(entry_id: str) -> Tuple[int, int]:
+    """Parse a Redis stream entry ID ("<milliseconds>-<sequence>") for comparison."""
+    milliseconds, _, sequence = entry_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+async def _read_stream_range(
+    redis_client: AsyncRedisClient, run_id: str, after_id: str, end_id: str = "+", batch_size: Optional[int] = None
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """Yield the entries of a run's stream after `after_id` and up to `end_id` (inclusive), in batches."""
+    stream_key = f"sse:run:{run_id}"
+    while True:
+        entries = await redis_client.xrange(stream_key, start=after_id, end=end_id, count=batch_size or 100)
+        entries = [(entry_id, fields) for entry_id, fields in entries if _stream_id(entry_id) > _stream_id(after_id)]
+        if not entries:
+            return
+        for entry in entries:
+            yield entry
+        after_id = entries[-1][0]
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue
+    # entries were dropped because the queue was full; the subscriber re-reads them from the stream
+    lagging: bool = False
+    error: Optional[Exception] = None
+
+
+@dataclass
+class _RunFeed:
+    # ID of the last stream entry handed to the subscribers
+    position: str
+    subscribers: Set[_Subscriber] = field(default_factory=set)
+
+
+class RedisSSESubscriptionHub:
+    """
+    Fans the chunks of each run's Redis stream out to all SSE subscribers in this server process.
+
+    Instead of every subscriber polling the stream, a single task reads the streams of all runs with subscribers with
+    one blocking XREAD over their stream keys and hands each new entry to the subscribers' queues, so the process holds
+    one blocking Redis connection however many runs and clients it serves. Subscribers read the chunks written before
+    they subscribed themselves, and a subscriber whose bounded queue fills up re-reads what it missed from the stream.
+
+    Runs with subscribers are also announced on a Redis channel, so the writer of a run, in whichever process it
+    runs, flushes each chunk as soon as it is written instead of batching it.
+    """
+
+    def __init__(self, block_ms: int = _XREAD_BLOCK_MS, batch_size: int = 100, queue_size: int = 1000):
+        self.block_ms = block_ms
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self._feeds: Dict[str, _RunFeed] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._redis_client: Optional[AsyncRedisClient] = None
+        # runs announced to have subscribers (possibly in other processes), until when
+        self._live: Dict[str, float] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def has_subscribers(self, run_id: str) -> bool:
+        """Whether the run has SSE subscribers in this or (as far as announced) another server process."""
+        if run_id in self._feeds:
+            return True
+        live_until = self._live.get(run_id)
+        if live_until is not None and live_until < time.monotonic():
+            del self._live[run_id]
+            return False
+        return live_until is not None
+
+    async def subscribe(self, redis_client: AsyncRedisClient, run_id: str, after_id: str) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Yield the entries of a run's stream after `after_id` (the ID of the last entry the caller read, or "0-0") as
+        (entry ID, fields) pairs as they are written, until the caller stops iterating.
+        """
+        feed = self._feeds.get(run_id)
+        if feed is None:
+            feed = _RunFeed(position=after_id)
+            self._feeds[run_id] = feed
+        self._ensure_reader(redis_client)
+
+        subscriber = _Subscriber(queue=asyncio.Queue(maxsize=self.queue_size))
+        feed.subscribers.add(subscriber)
+        # entries up to the feed's position were handed out before we subscribed
+        position = feed.position
+        try:
+            while True:
+                if _stream_id(after_id) < _stream_id(position):
+                    async for entry in _read_stream_range(redis_client, run_id, after_id, position, self.batch_size):
+                        yield entry
+                    after_id = position
+                if subscriber.queue.empty():
+                    if subscriber.error is not None:
+                        raise subscriber.error
+                    if subscriber.lagging:
+                        # everything up to the feed's position that was dropped is re-read above; later entries are queued again
+                        subscriber.lagging = False
+                        position = feed.position
+                        continue
+                entry = await subscriber.queue.get()
+                if isinstance(entry, Exception):
+                    raise entry
+                if _stream_id(entry[0]) > _stream_id(after_id):
+                    after_id = entry[0]
+                    yield entry
+        finally:
+            feed.subscribers.discard(subscriber)
+            if not feed.subscribers and self._feeds.get(run_id) is feed:
+                del self._feeds[run_id]
+
+    def _ensure_reader(self, redis_client: AsyncRedisClient) -> None:
+        self._redis_client = redis_client
+        loop = asyncio.get_running_loop()
+        if self._reader is None or self._reader.done() or self._reader.get_loop() is not loop:
+            self._reader = loop.create_task(self._read(), name="sse_subscription_hub_reader")
+
+    async def _read(self) -> None:
+        """Read the streams of all runs with subscribers with one XREAD at a time, until no run has subscribers."""
+        announced_at: Dict[str, float] = {}
+        failures = 0
+        while self._feeds:
+            redis_client = self._redis_client
+            now = time.monotonic()
+            for run_id in list(self._feeds):
+                if now - announced_at.get(run_id, 0.0) >= _LIVE_ANNOUNCE_SECONDS:
+                    announced_at[run_id] = now
+                    try:
+                        await redis_client.publish(SSE_LIVE_RUNS_CHANNEL, run_id)
+                    except Exception as e:
+                        logger.warning(f"Failed to announce SSE subscribers for run {run_id}: {e}")
+            announced_at = {run_id: at for run_id, at in announced_at.items() if run_id in self._feeds}
+
+            feeds = dict(self._feeds)
+            streams = {f"sse:run:{run_id}": feed.position for run_id, feed in feeds.items()}
+            try:
+                response = await redis_client.xread(streams, count=self.batch_size, block=self.block_ms)
+            except Exception as e:
+                failures += 1
+                if failures < _XREAD_MAX_ATTEMPTS:
+                    logger.warning(f"Failed to read {len(streams)} Redis SSE stream(s), retrying ({failures}/{_XREAD_MAX_ATTEMPTS}): {e}")
+                    await asyncio.sleep(_XREAD_RETRY_DELAY_SECONDS * 2 ** (failures - 1))
+                    continue
+                logger.error(f"Failed to read {len(streams)} Redis SSE stream(s): {e}")
+                for run_id, feed in feeds.items():
+                    self._end_feed(run_id, feed, error=e)
+                failures = 0
+                continue
+            failures = 0
+
+            for stream_key, entries in response or []:
+                run_id = stream_key.removeprefix("sse:run:")
+                feed = feeds.get(run_id)
+                if feed is None or self._feeds.get(run_id) is not feed:
+                    # the last subscriber left while the read was blocked
+                    continue
+                for entry_id, fields in entries:
+                    feed.position = entry_id
+                    for subscriber in feed.subscribers:
+                        if subscriber.lagging:
+                            continue
+                        try:
+                            subscriber.queue.put_nowait((entry_id, fields))
+                        except asyncio.QueueFull:
+                            subscriber.lagging = True
+                    if fields.get("complete") == "true":
+                        # subscribers finish with the entries already queued
+                        self._end_feed(run_id, feed)
+                        break
+
+    def _end_feed(self, run_id: str, feed: _RunFeed, error: Optional[Exception] = None) -> None:
+        if self._feeds.get(run_id) is feed:
+            del self._feeds[run_id]
+        if error is not None:
+            for subscriber in feed.subscribers:
+                subscriber.error = error
+                try:
+                    subscriber.queue.put_nowait(error)
+                except asyncio.QueueFull:
+                    # raised once the subscriber has drained its queue
+                    pass
+
+    def ensure_listener(self, redis_client: AsyncRedisClient) -> None:
+        """Follow the announcements of runs with subscribers in other processes, if not already."""
+        if isinstance(redis_client, NoopAsyncRedisClient):
+            return
+        # the subscription is bound to the event loop it was opened on
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen(redis_client), name="sse_live_runs_listener")
+
+    async def _listen(self, redis_client: AsyncRedisClient) -> None:
+        while True:
+            try:
+                async for message in redis_client.subscribe(SSE_LIVE_RUNS_CHANNEL):
+                    now = time.monotonic()
+                    self._live[message["data"]] = now + _LIVE_TTL_SECONDS
+                    if len(self._live) > 1000:
+                        self._live = {run_id: live_until for run_id, live_until in self._live.items() if live_until >= now}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"SSE live runs listener failed, resubscribing: {e}")
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+_hub: Optional[RedisSSESubscriptionHub] = None
+
+
+def get_sse_subscription_hub() -> RedisSSESubscriptionHub:
+    """The process-wide SSE subscription hub."""
+    global _hub
+    if _hub is None:
+        _hub = RedisSSESubscriptionHub()
+    return _hub
+
+
 async def create_background_stream_processor(
     stream_generator: AsyncGenerator[str | bytes | tuple[str | bytes, int], None],
     redis_client: AsyncRedisClient,
@@ -472,6 +715,8 @@ async def redis_sse_stream_generator(
 
     This generator reads chunks stored in Redis streams and yields them as SSE events.
     It supports cursor-based recovery by allowing you to start from a specific seq_id.
+    With `sse_subscription_hub_enabled`, new chunks are received through the process's
+    subscription hub instead of by polling.
 
     Args:
         redis_client: Redis client instance
@@ -486,9 +731,22 @@ async def redis_sse_stream_generator(
     stream_key = f"sse:run:{run_id}"
     last_redis_id = "-"
     cursor_seq_id = starting_after or 0
+    # compactly encoded chunks refer to earlier ones, so every entry is decoded, including those before the cursor
+    decoder = SSEChunkDecoder()
 
     logger.debug(f"Starting redis_sse_stream_generator for run_id={run_id}, stream_key={stream_key}")
 
+    if settings.sse_subscription_hub_enabled:
+        async with aclosing(_subscribed_stream_entries(redis_client, run_id, batch_size)) as entries:
+            async for _, fields in entries:
+                chunk_seq_id = int(fields.get("seq_id", 0))
+                data = decoder.decode(fields)
+                if chunk_seq_id > cursor_seq_id and data:
+                    yield _fill_chunk_ids(data, run_id, chunk_seq_id)
+                if fields.get("complete") == "true":
+                    return
+        return
+
     while True:
         entries = await redis_client.xrange(stream_key, start=last_redis_id, count=batch_size)
 
@@ -499,19 +757,13 @@ async def redis_sse_stream_generator(
                     continue
 
                 chunk_seq_id = int(fields.get("seq_id", 0))
+                data = decoder.decode(fields)
                 if chunk_seq_id > cursor_seq_id:
-                    data = fields.get("data", "")
                     if not data:
                         logger.debug(f"No data found for chunk {chunk_seq_id} in run {run_id}")
                         continue
 
-                    if '"run_id":null' in data:
-                        data = data.replace('"run_id":null', f'"run_id":"{run_id}"')
-
-                    if '"seq_id":null' in data:
-                        data = data.replace('"seq_id":null', f'"seq_id":{chunk_seq_id}')
-
-                    yield data
+                    yield _fill_chunk_ids(data, run_id, chunk_seq_id)
                     yielded_any = True
 
                     if fields.get("complete") == "true":
@@ -524,3 +776,28 @@ async def redis_sse_stream_generator(
 
         if not entries or (len(entries) == 1 and entries[0][0] == last_redis_id):
             await asyncio.sleep(poll_interval)
+
+
+def _fill_chunk_ids(data: str, run_id: str, seq_id: int) -> str:
+    """Fill in the run and sequence IDs of a chunk written without them."""
+    if '"run_id":null' in data:
+        data = data.replace('"run_id":null', f'"run_id":"{run_id}"')
+
+    if '"seq_id":null' in data:
+        data = data.replace('"seq_id":null', f'"seq_id":{seq_id}')
+
+    return data
+
+
+async def _subscribed_stream_entries(
+    redis_client: AsyncRedisClient, run_id: str, batch_size: Optional[int]
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """Yield the entries of a run's stream written so far, then the new ones as the subscription hub receives them."""
+    last_id = "0-0"
+    async for entry in _read_stream_range(redis_client, run_id, last_id, batch_size=batch_size):
+        last_id = entry[0]
+        yield entry
+
+    async with aclosing(get_sse_subscription_hub().subscribe(redis_client, run_id, last_id)) as entries:
+        async for entry in entries:
+            yield entry
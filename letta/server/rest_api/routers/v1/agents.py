@@ -47,7 +47,15 @@ from letta.schemas.memory import (
     CreateArchivalMemory,
     Memory,
 )
-from letta.schemas.message import Message, MessageCreate, MessageCreateType, MessageSearchRequest, MessageSearchResult
+from letta.schemas.message import (
+    Message,
+    MessageCreate,
+    MessageCreateType,
+    MessageField,
+    MessageFieldsPage,
+    MessageSearchRequest,
+    MessageSearchResult,
+)
 from letta.schemas.passage import Passage
 from letta.schemas.provider_trace import BillingContext
 from letta.schemas.run import Run as PydanticRun, RunUpdate
@@ -60,6 +68,7 @@ from letta.serialize_schemas.pydantic_agent_schema import AgentSchema
 from letta.server.rest_api.dependencies import HeaderParams, get_headers, get_letta_server
 from letta.server.server import SyncServer
 from letta.services.lettuce import LettuceClient
+from letta.services.message_manager import decode_message_cursor
 from letta.services.run_manager import RunManager
 from letta.services.streaming_service import StreamingService
 from letta.services.summarizer.summarizer_config import CompactionSettings
@@ -1624,6 +1633,54 @@ async def list_messages(
     )
 
 
+@router.get("/{agent_id}/messages/fields", response_model=MessageFieldsPage, operation_id="list_message_fields")
+async def list_message_fields(
+    agent_id: AgentId,
+    server: "SyncServer" = Depends(get_letta_server),
+    fields: List[MessageField] = Query(["id", "role", "content", "created_at"], description="Message fields to return"),
+    after: Optional[str] = Query(None, description="Cursor for pagination, the `next_cursor` of the previous page"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of messages to return (ignored when streaming)"),
+    order: Literal["asc", "desc"] = Query(
+        "desc", description="Sort order for messages by creation time. 'asc' for oldest first, 'desc' for newest first"
+    ),
+    conversation_id: str | None = Query(None, description="Conversation ID to filter messages by."),
+    group_id: str | None = Query(None, description="Group ID to filter messages by."),
+    stream: bool = Query(False, description="Stream every message after the cursor as newline-delimited JSON instead of returning a page"),
+    headers: HeaderParams = Depends(get_headers),
+):
+    """
+    Retrieve selected fields of an agent's message history.
+
+    Only the requested fields are read, and pages are keyset paginated, which keeps long histories cheap to page
+    through. With `stream`, all matching messages are streamed as newline-delimited JSON, for exports.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=headers.actor_id)
+    list_kwargs = dict(
+        actor=actor,
+        fields=fields,
+        agent_id=agent_id,
+        conversation_id=conversation_id,
+        group_id=group_id,
+        after=after,
+        ascending=(order == "asc"),
+    )
+
+    if stream:
+        # validate the request before the response starts
+        await server.agent_manager.validate_agent_exists_async(agent_id=agent_id, actor=actor)
+        if after:
+            decode_message_cursor(after)
+
+        async def ndjson_rows():
+            async for row in server.message_manager.stream_message_fields_async(**list_kwargs):
+                yield orjson.dumps(row) + b"\n"
+
+        return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
+
+    rows, next_cursor, has_more = await server.message_manager.list_message_fields_async(limit=limit, **list_kwargs)
+    return MessageFieldsPage(messages=rows, next_cursor=next_cursor, has_more=has_more)
+
+
 @router.patch("/{agent_id}/messages/{message_id}", response_model=LettaMessageUnion, operation_id="modify_message", deprecated=True)
 async def modify_message(
     agent_id: AgentId,  # backwards compatible. Consider removing for v1
@@ -435,6 +435,7 @@ async def list_mcp_servers(
 @router.get("/mcp/servers/{mcp_server_name}/tools", response_model=List[MCPTool], operation_id="list_mcp_tools_by_server")
 async def list_mcp_tools_by_server(
     mcp_server_name: str,
+    refresh: bool = Query(False, description="Fetch the tool list from the MCP server instead of the tool cache"),
     server: SyncServer = Depends(get_letta_server),
     headers: HeaderParams = Depends(get_headers),
 ):
@@ -443,7 +444,7 @@ async def list_mcp_tools_by_server(
     """
     actor = await server.user_manager.get_actor_or_default_async(actor_id=headers.actor_id)
     try:
-        mcp_tools = await server.mcp_manager.list_mcp_server_tools(mcp_server_name=mcp_server_name, actor=actor)
+        mcp_tools = await server.mcp_manager.list_mcp_server_tools(mcp_server_name=mcp_server_name, actor=actor, refresh=refresh)
         return mcp_tools
     except (ConnectError, ConnectionError) as e:
         raise LettaMCPConnectionError(str(e), server_name=mcp_server_name)
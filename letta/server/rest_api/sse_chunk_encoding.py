@@ -0,0 +1,162 @@
+"""Compact encoding of the SSE chunks stored in Redis streams."""
+
+import base64
+import zlib
+from typing import Any, Dict, Optional
+
+import orjson
+
+from letta.log import get_logger
+
+logger = get_logger(__name__)
+
+# value of the `encoding` field of stream entries written with the compact encoding
+COMPACT_ENCODING = "c1"
+
+# Short codes for the top-level fields of streamed messages. Entries are read back after deploys, so this list is
+# append-only: never reorder or remove a field. Codes can't clash with field names, which don't start with a digit.
+_FIELDS = [
+    "id",
+    "date",
+    "name",
+    "message_type",
+    "otid",
+    "sender_id",
+    "step_id",
+    "is_err",
+    "seq_id",
+    "run_id",
+    "content",
+    "reasoning",
+    "source",
+    "signature",
+    "tool_call",
+    "tool_calls",
+    "tool_return",
+    "tool_returns",
+    "status",
+    "tool_call_id",
+    "stdout",
+    "stderr",
+    "stop_reason",
+    "state",
+    "hidden_reasoning",
+]
+_FIELD_CODES = {name: str(i) for i, name in enumerate(_FIELDS)}
+_FIELD_NAMES = {code: name for name, code in _FIELD_CODES.items()}
+
+# Fields that usually repeat from one chunk to the next (all chunks of a message share its id, date, ...). A value equal
+# to the previous chunk's is written as 0, which none of these fields can otherwise hold.
+_REPEATED_FIELDS = {"id", "date", "name", "message_type", "otid", "sender_id", "step_id", "run_id"}
+_REPEATED = 0
+# every this many chunks, repeated values are written out in full, so a reader of a trimmed stream can pick up again
+_KEYFRAME_INTERVAL = 64
+
+# payloads at least this large are also compressed, with a preset dictionary of common stream content
+_COMPRESS_MIN_BYTES = 256
+_ZLIB_DICTIONARY = (
+    b'"reasoner_model""non_reasoner_model""success""error""end_turn""requires_approval""max_steps"'
+    b'"tool_call_id":"arguments":"name":{"message": "request_heartbeat": true}"message-"step-"run-"agent-"'
+    b'"reasoning_message""assistant_message""tool_call_message""tool_return_message""stop_reason"null,'
+)
+
+# prefixes of the encoded payload
+_RAW = "r"
+_JSON = "j"
+_COMPRESSED = "z"
+
+_DATA_PREFIX = "data: "
+_DATA_SUFFIX = "\n\n"
+
+
+class SSEChunkEncoder:
+    """
+    Encodes the SSE chunks of one run for storage, in the order they are written.
+
+    A `data: {...}` chunk is stored as its JSON body with short field codes, values repeated from the previous chunk
+    written as a marker and, if large, zlib-compressed (as base85 text, since stream entries are read back as strings).
+    A chunk is only encoded if it decodes back to exactly the same text; anything else is stored as is.
+    """
+
+    def __init__(self):
+        self._previous: Dict[str, Any] = {}
+        self._count = 0
+
+    def encode(self, data: str) -> str:
+        body = _parse_data_chunk(data)
+        if body is None:
+            return _RAW + data
+
+        keyframe = self._count % _KEYFRAME_INTERVAL == 0
+        self._count += 1
+        compact = {}
+        for key, value in body.items():
+            if key in _REPEATED_FIELDS:
+                if not keyframe and key in self._previous and self._previous[key] == value:
+                    value = _REPEATED
+                else:
+                    self._previous[key] = value
+            compact[_FIELD_CODES.get(key, key)] = value
+
+        payload = orjson.dumps(compact)
+        if len(payload) >= _COMPRESS_MIN_BYTES:
+            compressor = zlib.compressobj(zdict=_ZLIB_DICTIONARY)
+            compressed = base64.b85encode(compressor.compress(payload) + compressor.flush())
+            if len(compressed) < len(payload):
+                return _COMPRESSED + compressed.decode()
+        return _JSON + payload.decode()
+
+
+class SSEChunkDecoder:
+    """Decodes the stored SSE chunks of one run, which must be passed in the order they were written."""
+
+    def __init__(self):
+        self._previous: Dict[str, Any] = {}
+
+    def decode(self, fields: Dict[str, str]) -> str:
+        """
+        The SSE chunk of a stream entry. Returns an empty string if the chunk refers to values of chunks that were
+        never seen (the start of the stream was trimmed), until the next keyframe.
+        """
+        data = fields.get("data", "")
+        if fields.get("encoding") != COMPACT_ENCODING:
+            return data
+
+        kind, payload = data[:1], data[1:]
+        if kind == _RAW:
+            return payload
+        if kind == _COMPRESSED:
+            decompressor = zlib.decompressobj(zdict=_ZLIB_DICTIONARY)
+            payload = decompressor.decompress(base64.b85decode(payload)) + decompressor.flush()
+
+        body = {}
+        missing = False
+        for code, value in orjson.loads(payload).items():
+            key = _FIELD_NAMES.get(code, code)
+            if key in _REPEATED_FIELDS:
+                if value == _REPEATED and type(value) is int:
+                    if key not in self._previous:
+                        missing = True
+                    value = self._previous.get(key)
+                else:
+                    self._previous[key] = value
+            body[key] = value
+
+        if missing:
+            logger.debug(f"Skipping stream chunk {fields.get('seq_id')} that refers to chunks no longer in the stream")
+            return ""
+        return _DATA_PREFIX + orjson.dumps(body).decode() + _DATA_SUFFIX
+
+
+def _parse_data_chunk(data: str) -> Optional[Dict[str, Any]]:
+    """The JSON object of a `data: {...}` chunk, if serializing it back reproduces the chunk exactly."""
+    if not (data.startswith(_DATA_PREFIX + "{") and data.endswith("}" + _DATA_SUFFIX)):
+        return None
+    body_json = data[len(_DATA_PREFIX) : -len(_DATA_SUFFIX)]
+    try:
+        body = orjson.loads(body_json)
+    except orjson.JSONDecodeError:
+        return None
+    if orjson.dumps(body).decode() != body_json or any(key in _FIELD_NAMES for key in body):
+        return None
+    return body
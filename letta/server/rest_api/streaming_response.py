@@ -8,7 +8,7 @@ import re
 import time
 from collections.abc import AsyncIterator
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Optional
 from uuid import uuid4
 
 import anyio
@@ -22,22 +22,17 @@ from letta.schemas.enums import RunStatus
 from letta.schemas.letta_message import LettaPing
 from letta.schemas.user import User
 from letta.server.rest_api.utils import capture_sentry_exception
+from letta.services.run_cancellation import get_run_cancellation_signals, is_run_cancelled_by_signal
 from letta.services.run_manager import RunManager
 from letta.settings import settings
 from letta.utils import safe_create_task
 
 logger = get_logger(__name__)
 
-# Global registry of cancellation events per run_id
-# Note: Events are small and we don't bother cleaning them up
-_cancellation_events: Dict[str, asyncio.Event] = {}
-
 
 def get_cancellation_event_for_run(run_id: str) -> asyncio.Event:
-    """Get or create a cancellation event for a run."""
-    if run_id not in _cancellation_events:
-        _cancellation_events[run_id] = asyncio.Event()
-    return _cancellation_events[run_id]
+    """Get or create a cancellation event for a run; it stays registered while the caller holds a reference to it."""
+    return get_run_cancellation_signals().event(run_id)
 
 
 class RunCancelledException(Exception):
@@ -178,15 +173,22 @@ async def cancellation_aware_stream_wrapper(
         asyncio.CancelledError: If the run is cancelled during streaming
     """
     last_cancellation_check = asyncio.get_event_loop().time()
+    # held for the lifetime of the stream, so pushed cancellations of the run are delivered to it
+    pushed_event = get_cancellation_event_for_run(run_id) if settings.run_cancellation_push_enabled else None
 
     try:
         async for chunk in stream_generator:
-            # Check for cancellation periodically (not on every chunk for performance)
+            # Check for cancellation periodically (not on every chunk for performance),
+            # or right away once a pushed cancellation has set the run's event
             current_time = asyncio.get_event_loop().time()
-            if current_time - last_cancellation_check >= cancellation_check_interval:
+            pushed = pushed_event is not None and pushed_event.is_set()
+            if pushed or current_time - last_cancellation_check >= cancellation_check_interval:
                 try:
-                    run = await run_manager.get_run_by_id(run_id=run_id, actor=actor)
-                    if run.status == RunStatus.cancelled:
+                    cancelled = await is_run_cancelled_by_signal(run_id)
+                    if cancelled is None:
+                        run = await run_manager.get_run_by_id(run_id=run_id, actor=actor)
+                        cancelled = run.status == RunStatus.cancelled
+                    if cancelled:
                         logger.info(f"Stream cancelled for run {run_id}, interrupting stream")
 
                         # Signal cancellation via shared event if available
@@ -90,6 +90,7 @@ from letta.services.helpers.agent_manager_helper import (
     build_agent_passage_query,
     build_passage_query,
     build_source_passage_query,
+    bump_agent_versions_async,
     calculate_base_tools,
     calculate_multi_agent_tools,
     check_supports_structured_output,
@@ -100,9 +101,15 @@ from letta.services.helpers.agent_manager_helper import (
     package_initial_message_sequence,
     validate_agent_exists_async,
 )
+from letta.services.helpers.agent_state_cache import AgentStateCache
 from letta.services.identity_manager import IdentityManager
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
+from letta.services.passage_vector_index_manager import (
+    ann_index_exists_async,
+    apply_ann_search_settings_async,
+    estimate_filter_selectivity_async,
+)
 from letta.services.source_manager import SourceManager
 from letta.services.tool_manager import ToolManager
 from letta.settings import DatabaseChoice, settings
@@ -117,6 +124,9 @@ from letta.validators import raise_on_invalid_id
 
 logger = get_logger(__name__)
 
+# Shared by all AgentManager instances in the process
+_agent_state_cache = AgentStateCache(maxsize=settings.agent_state_cache_size)
+
 
 class AgentManager:
     """Manager class to handle business logic related to Agents."""
@@ -587,7 +597,7 @@ class AgentManager:
 
                 if agent_secrets:
                     # Encrypt environment variable values concurrently (async to avoid blocking event loop)
-                    secrets_dict = await Secret.from_plaintexts_async(agent_secrets)
+                    secrets_dict = await Secret.from_plaintexts_async(agent_secrets, organization_id=actor.organization_id)
                     env_rows = [
                         {
                             "agent_id": aid,
@@ -953,7 +963,7 @@ class AgentManager:
                 }
 
                 # Batch encrypt new/changed values concurrently (async to avoid blocking event loop)
-                new_secrets = await Secret.from_plaintexts_async(to_encrypt) if to_encrypt else {}
+                new_secrets = await Secret.from_plaintexts_async(to_encrypt, organization_id=actor.organization_id) if to_encrypt else {}
 
                 # Build rows, reusing existing encrypted values where unchanged
                 env_rows = []
@@ -1069,7 +1079,7 @@ class AgentManager:
         Returns:
             List[PydanticAgentState]: The filtered list of matching agents.
         """
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
             query = select(AgentModel)
             query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
 
@@ -1223,8 +1233,28 @@ class AgentManager:
     ) -> PydanticAgentState:
         """Fetch an agent by its ID."""
 
+        # pending approvals are derived from messages, which don't bump the agent version
+        use_cache = _agent_state_cache.maxsize > 0 and "agent.pending_approval" not in (include or [])
+        cache_key = (
+            agent_id,
+            actor.organization_id,
+            None if include_relationships is None else tuple(sorted(include_relationships)),
+            tuple(sorted(include or [])),
+        )
+
         try:
             async with db_registry.async_session() as session:
+                if use_cache:
+                    # Cheap version probe; only do the full eager load when the cached state is stale
+                    version_query = select(AgentModel.version)
+                    version_query = AgentModel.apply_access_predicate(version_query, actor, ["read"], AccessType.ORGANIZATION)
+                    version = (await session.execute(version_query.where(AgentModel.id == agent_id))).scalar_one_or_none()
+                    if version is None:
+                        raise NoResultFound(f"Agent with ID {agent_id} not found")
+                    cached = _agent_state_cache.get(cache_key, version)
+                    if cached is not None:
+                        return cached
+
                 query = select(AgentModel)
                 query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
                 query = query.where(AgentModel.id == agent_id)
@@ -1236,11 +1266,15 @@ class AgentManager:
                 if agent is None:
                     raise NoResultFound(f"Agent with ID {agent_id} not found")
 
+                version = agent.version
                 # Convert without decrypting to release DB connection before PBKDF2
                 agent_encrypted = await agent.to_pydantic_async(include_relationships=include_relationships, include=include, decrypt=False)
 
             # Decrypt secrets outside session
-            return (await decrypt_agent_secrets([agent_encrypted]))[0]
+            agent_state = (await decrypt_agent_secrets([agent_encrypted]))[0]
+            if use_cache:
+                _agent_state_cache.put(cache_key, version, agent_state)
+            return agent_state
         except NoResultFound:
             # Re-raise NoResultFound without logging to preserve 404 handling
             raise
@@ -2057,6 +2091,7 @@ class AgentManager:
                 # Delete the association directly from the junction table
                 delete_query = delete(SourcesAgents).where(SourcesAgents.agent_id == agent_id, SourcesAgents.source_id == source_id)
                 await session.execute(delete_query)
+                await bump_agent_versions_async(session, agent_ids=[agent_id])
                 await session.commit()
 
             # Get agent without loading relationships for return value
@@ -2138,6 +2173,8 @@ class AgentManager:
                         [{"block_id": matched_block.id, "tag": tag} for tag in new_tags],
                     )
 
+                await bump_agent_versions_async(session, block_ids=[matched_block.id])
+
                 pydantic_block = matched_block.to_pydantic()
                 if new_tags is not None:
                     pydantic_block.tags = new_tags
@@ -2321,7 +2358,7 @@ class AgentManager:
             stacklevel=2,
         )
 
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
             main_query = await build_passage_query(
                 actor=actor,
                 agent_id=agent_id,
@@ -2383,7 +2420,27 @@ class AgentManager:
         embedding_config: Optional[EmbeddingConfig] = None,
     ) -> List[PydanticPassage]:
         """Lists all passages attached to an agent."""
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
+            use_ann_index = (
+                embed_query
+                and query_text is not None
+                and source_id is not None
+                and embedding_config is not None
+                and settings.pg_ann_search_enabled
+                and settings.database_engine is DatabaseChoice.POSTGRES
+                and await ann_index_exists_async(session, "source", source_id)
+            )
+            if use_ann_index:
+                selectivity = 1.0
+                if file_id or start_date or end_date:
+                    filtered_query = await build_source_passage_query(
+                        actor=actor, source_id=source_id, file_id=file_id, start_date=start_date, end_date=end_date
+                    )
+                    selectivity = await estimate_filter_selectivity_async(
+                        session, filtered_query, SourcePassage.id, SourcePassage.source_id == source_id
+                    )
+                await apply_ann_search_settings_async(session, top_k=limit, selectivity=selectivity)
+
             main_query = await build_source_passage_query(
                 actor=actor,
                 agent_id=agent_id,
@@ -2397,6 +2454,7 @@ class AgentManager:
                 embed_query=embed_query,
                 ascending=ascending,
                 embedding_config=embedding_config,
+                use_ann_index=use_ann_index,
             )
 
             # Add limit (enforce default if not provided)
@@ -2433,9 +2491,8 @@ class AgentManager:
         """Lists all passages attached to an agent."""
         # Check if we should use Turbopuffer for vector search
         # Support searching by either agent_id or archive_id directly
+        target_archive_id = None
         if embed_query and query_text and embedding_config:
-            target_archive_id = None
-
             if agent_id:
                 # Get archive IDs for the agent
                 archive_ids = await self.get_agent_archive_ids_async(agent_id=agent_id, actor=actor)
@@ -2476,11 +2533,34 @@ class AgentManager:
                     return passages_with_scores
 
         # Fall back to SQL-based search for non-vector queries or NATIVE archives
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
+            # Use the archive's partial ANN index (if one was built) instead of an exact scan
+            use_ann_index = (
+                target_archive_id is not None
+                and settings.pg_ann_search_enabled
+                and settings.database_engine is DatabaseChoice.POSTGRES
+                and await ann_index_exists_async(session, "archive", target_archive_id)
+            )
+            if use_ann_index:
+                selectivity = 1.0
+                if tags or start_date or end_date:
+                    filtered_query = await build_agent_passage_query(
+                        actor=actor,
+                        archive_id=target_archive_id,
+                        start_date=start_date,
+                        end_date=end_date,
+                        tags=tags,
+                        tag_match_mode=tag_match_mode,
+                    )
+                    selectivity = await estimate_filter_selectivity_async(
+                        session, filtered_query, ArchivalPassage.id, ArchivalPassage.archive_id == target_archive_id
+                    )
+                await apply_ann_search_settings_async(session, top_k=limit, selectivity=selectivity)
+
             main_query = await build_agent_passage_query(
                 actor=actor,
-                agent_id=agent_id,
-                archive_id=archive_id,
+                agent_id=None if use_ann_index else agent_id,
+                archive_id=target_archive_id if use_ann_index else archive_id,
                 query_text=query_text,
                 start_date=start_date,
                 end_date=end_date,
@@ -2489,6 +2569,9 @@ class AgentManager:
                 embed_query=embed_query,
                 ascending=ascending,
                 embedding_config=embedding_config,
+                tags=tags,
+                tag_match_mode=tag_match_mode,
+                use_ann_index=use_ann_index,
             )
 
             # Add limit
@@ -2504,28 +2587,6 @@ class AgentManager:
             # Convert to Pydantic models
             pydantic_passages = [p.to_pydantic() for p in passages]
 
-            # TODO: Integrate tag filtering directly into the SQL query for better performance.
-            # Currently using post-filtering which is less efficient but simpler to implement.
-            # Future optimization: Add JOIN with passage_tags table and WHERE clause for tag filtering.
-            if tags:
-                filtered_passages = []
-                for passage in pydantic_passages:
-                    if passage.tags:
-                        passage_tags = set(passage.tags)
-                        query_tags = set(tags)
-
-                        if tag_match_mode == TagMatchMode.ALL:
-                            # ALL mode: passage must have all query tags
-                            if query_tags.issubset(passage_tags):
-                                filtered_passages.append(passage)
-                        else:
-                            # ANY mode (default): passage must have at least one query tag
-                            if query_tags.intersection(passage_tags):
-                                filtered_passages.append(passage)
-
-                # Return as tuples with empty metadata for SQL path
-                return [(p, 0.0, {}) for p in filtered_passages]
-
             # Return as tuples with empty metadata for SQL path
             return [(p, 0.0, {}) for p in pydantic_passages]
 
@@ -2818,6 +2879,8 @@ class AgentManager:
                     agent.tool_rules = tool_rules
                     session.add(agent)
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
+
             # context manager now handles commits
             # await session.commit()
 
@@ -2892,6 +2955,8 @@ class AgentManager:
                 else:
                     logger.info(f"All {len(tool_ids)} tools already attached to agent {agent_id}")
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
+
             # context manager now handles commits
             # await session.commit()
 
@@ -3017,6 +3082,8 @@ class AgentManager:
             else:
                 logger.debug(f"Detached tool id={tool_id} from agent id={agent_id}")
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
+
             # context manager now handles commits
             # await session.commit()
 
@@ -3055,6 +3122,8 @@ class AgentManager:
             else:
                 logger.info(f"Detached all {detached_count} tools from agent {agent_id}")
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
+
             # context manager now handles commits
             # await session.commit()
 
@@ -15,6 +15,7 @@ from letta.schemas.passage import Passage as PydanticPassage
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.helpers.agent_manager_helper import validate_agent_exists_async
+from letta.services.passage_vector_index_manager import PassageVectorIndexManager
 from letta.settings import DatabaseChoice, settings
 from letta.utils import bounded_gather, decrypt_agent_secrets, enforce_types
 from letta.validators import raise_on_invalid_id
@@ -48,7 +49,9 @@ class ArchiveManager:
                     embedding_config=embedding_config,
                 )
                 await archive.create_async(session, actor=actor)
-                return archive.to_pydantic()
+                pydantic_archive = archive.to_pydantic()
+            PassageVectorIndexManager().schedule_ensure_index("archive", pydantic_archive.id, embedding_config)
+            return pydantic_archive
         except Exception as e:
             logger.exception(f"Failed to create archive {name}. error={e}")
             raise
@@ -277,6 +280,7 @@ class ArchiveManager:
             )
             await archive_model.hard_delete_async(session, actor=actor)
             logger.info(f"Deleted archive {archive_id}")
+        PassageVectorIndexManager().schedule_drop_index("archive", archive_id)
 
     @enforce_types
     @raise_on_invalid_id(param_name="archive_id", expected_prefix=PrimitiveType.ARCHIVE)
@@ -306,7 +310,7 @@ class ArchiveManager:
         Raises:
             NoResultFound: If archive not found
         """
-        from letta.llm_api.llm_client import LLMClient
+        from letta.services.embedding_batcher import embed_texts
         from letta.services.passage_manager import PassageManager
 
         # Verify the archive exists and user has access
@@ -315,11 +319,7 @@ class ArchiveManager:
         # Generate embeddings for the text if embedding config is available
         embedding = None
         if archive.embedding_config is not None:
-            embedding_client = LLMClient.create(
-                provider_type=archive.embedding_config.embedding_endpoint_type,
-                actor=actor,
-            )
-            embeddings = await embedding_client.request_embeddings([text], archive.embedding_config)
+            embeddings = await embed_texts([text], archive.embedding_config, actor)
             embedding = embeddings[0] if embeddings else None
 
         # Parse created_at from ISO string if provided
@@ -396,17 +396,13 @@ class ArchiveManager:
         if not passages:
             return []
 
-        from letta.llm_api.llm_client import LLMClient
+        from letta.services.embedding_batcher import embed_texts
         from letta.services.passage_manager import PassageManager
 
         archive = await self.get_archive_by_id_async(archive_id=archive_id, actor=actor)
 
         texts = [passage["text"] for passage in passages]
-        embedding_client = LLMClient.create(
-            provider_type=archive.embedding_config.embedding_endpoint_type,
-            actor=actor,
-        )
-        embeddings = await embedding_client.request_embeddings(texts, archive.embedding_config)
+        embeddings = await embed_texts(texts, archive.embedding_config, actor)
 
         if len(embeddings) != len(passages):
             raise ValueError("Embedding response count does not match passages count")
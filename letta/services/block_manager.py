@@ -23,6 +23,7 @@ from letta.schemas.block import Block as PydanticBlock, BlockUpdate
 from letta.schemas.enums import ActorType, PrimitiveType
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
 from letta.settings import DatabaseChoice, settings
 from letta.utils import bounded_gather, decrypt_agent_secrets, enforce_types
 from letta.validators import raise_on_invalid_id
@@ -253,6 +254,8 @@ class BlockManager:
                     [{"block_id": block_id, "tag": tag, "organization_id": block.organization_id} for tag in new_tags],
                 )
 
+            await bump_agent_versions_async(session, block_ids=[block_id])
+
             pydantic_block = block.to_pydantic()
             if new_tags is not None:
                 pydantic_block.tags = new_tags
@@ -275,6 +278,8 @@ class BlockManager:
     async def delete_block_async(self, block_id: str, actor: PydanticUser) -> None:
         """Delete a block by its ID."""
         async with db_registry.async_session() as session:
+            await bump_agent_versions_async(session, block_ids=[block_id])
+
             # First, delete all references in blocks_agents table
             await session.execute(delete(BlocksAgents).where(BlocksAgents.block_id == block_id))
             # Also delete all tags associated with this block
@@ -826,6 +831,8 @@ class BlockManager:
                 new_val = updates[block.id]
                 block.value = new_val
 
+            await bump_agent_versions_async(session, block_ids=list(found_ids))
+
             # context manager now handles commits
             # await session.commit()
 
@@ -994,6 +1001,8 @@ class BlockManager:
             block = await self._move_block_to_sequence(session, block, previous_entry.sequence_number, actor)
 
             # 4) Commit
+            await bump_agent_versions_async(session, block_ids=[block_id])
+
             # context manager now handles commits
             # await session.commit()
             return block.to_pydantic()
@@ -1043,6 +1052,8 @@ class BlockManager:
 
             block = await self._move_block_to_sequence(session, block, next_entry.sequence_number, actor)
 
+            await bump_agent_versions_async(session, block_ids=[block_id])
+
             # context manager now handles commits
             # await session.commit()
             return block.to_pydantic()
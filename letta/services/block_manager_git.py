@@ -18,6 +18,7 @@ from letta.schemas.block import Block as PydanticBlock, BlockUpdate, CreateBlock
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.block_manager import BlockManager
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
 from letta.services.memory_repo import MemfsClient
 from letta.utils import enforce_types
 
@@ -119,7 +120,8 @@ class GitEnabledBlockManager(BlockManager):
                     block.read_only = read_only
                 if metadata is not None:
                     block.metadata_ = metadata
-                await block.update_async(db_session=session, actor=actor)
+                await block.update_async(db_session=session, actor=actor, no_commit=True)
+                await bump_agent_versions_async(session, block_ids=[block.id])
             else:
                 # Create new block and link to agent in a single transaction
                 from letta.schemas.block import BaseBlock
@@ -145,6 +147,7 @@ class GitEnabledBlockManager(BlockManager):
                     block_label=label,
                 )
                 session.add(blocks_agents)
+                await bump_agent_versions_async(session, agent_ids=[agent_id])
                 await session.commit()
 
             return block.to_pydantic()
@@ -174,8 +177,11 @@ class GitEnabledBlockManager(BlockManager):
             block = result.scalar_one_or_none()
 
             if block:
+                result = await session.execute(select(BlocksAgents.agent_id).where(BlocksAgents.block_id == block.id))
+                attached_agent_ids = list(result.scalars().all())
                 # Delete from blocks_agents
                 await session.execute(delete(BlocksAgents).where(BlocksAgents.block_id == block.id))
+                await bump_agent_versions_async(session, agent_ids=attached_agent_ids)
                 # Delete the block
                 await block.hard_delete_async(db_session=session, actor=actor)
 
@@ -261,6 +267,7 @@ class GitEnabledBlockManager(BlockManager):
                         block_id,
                         [{"block_id": block_id, "tag": tag, "organization_id": actor.organization_id} for tag in block_update.tags],
                     )
+                    await bump_agent_versions_async(session, block_ids=[block_id])
                 result.tags = block_update.tags
             else:
                 async with db_registry.async_session() as session:
@@ -430,6 +437,7 @@ class GitEnabledBlockManager(BlockManager):
                         async with db_registry.async_session() as session:
                             block_orm = await BlockModel.read_async(db_session=session, identifier=block.id, actor=actor)
                             block_orm.label = new_label
+                            await bump_agent_versions_async(session, block_ids=[block.id])
                             await session.commit()
                         block.label = new_label
                         logger.info(f"Transformed block label '{old_label}' -> '{new_label}' during backfill for agent {agent_id}")
@@ -456,6 +464,7 @@ class GitEnabledBlockManager(BlockManager):
                 async with db_registry.async_session() as session:
                     block_orm = await BlockModel.read_async(db_session=session, identifier=block.id, actor=actor)
                     block_orm.label = new_label
+                    await bump_agent_versions_async(session, block_ids=[block.id])
                     await session.commit()
 
                 block.label = new_label
@@ -476,6 +485,7 @@ class GitEnabledBlockManager(BlockManager):
                 tag=GIT_MEMORY_ENABLED_TAG,
             )
             session.add(tag)
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             await session.commit()
 
         logger.info(f"Enabled git memory for agent {agent_id} with {len(blocks)} blocks")
@@ -502,6 +512,7 @@ class GitEnabledBlockManager(BlockManager):
                     AgentsTags.tag == GIT_MEMORY_ENABLED_TAG,
                 )
             )
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
 
         logger.info(f"Disabled git memory for agent {agent_id}")
 
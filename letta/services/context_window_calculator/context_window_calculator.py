@@ -277,9 +277,6 @@ class ContextWindowCalculator:
                 f"This typically indicates missing system message or corrupted message data."
             )
 
-        # Convert messages to appropriate format
-        converted_messages = token_counter.convert_messages(in_context_messages)
-
         # Extract system components
         components: Dict[str, Optional[str]] = {
             "system_prompt": None,
@@ -326,8 +323,8 @@ class ContextWindowCalculator:
             token_counter.count_text_tokens(external_memory_summary) if external_memory_summary else asyncio.sleep(0, result=0),
             token_counter.count_text_tokens(summary_memory) if summary_memory else asyncio.sleep(0, result=0),
             (
-                token_counter.count_message_tokens(converted_messages[message_start_index:])
-                if len(converted_messages) > message_start_index
+                token_counter.count_messages(in_context_messages[message_start_index:])
+                if len(in_context_messages) > message_start_index
                 else asyncio.sleep(0, result=0)
             ),
             (
@@ -1,7 +1,9 @@
 import hashlib
 import json
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional
 
 from letta.helpers.decorators import async_redis_cache
 from letta.llm_api.anthropic_client import AnthropicClient
@@ -13,6 +15,7 @@ from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_request import Tool as OpenAITool
 
 if TYPE_CHECKING:
+    from letta.schemas.llm_config import LLMConfig
     from letta.schemas.user import User
 
 logger = get_logger(__name__)
@@ -37,6 +40,12 @@ class TokenCounter(ABC):
     def convert_messages(self, messages: List[Any]) -> List[Dict[str, Any]]:
         """Convert messages to the appropriate format for this counter"""
 
+    async def count_messages(self, messages: List[Message]) -> int:
+        """Count tokens in a list of Letta messages (converts, then counts)"""
+        if not messages:
+            return 0
+        return await self.count_message_tokens(self.convert_messages(messages))
+
 
 class AnthropicTokenCounter(TokenCounter):
     """Token counter using Anthropic's API"""
@@ -265,6 +274,234 @@ class TiktokenCounter(TokenCounter):
         return Message.to_openai_dicts_from_list(messages)
 
 
+class TokenCountLRUCache:
+    """Bounded in-process LRU of token counts, keyed by tokenizer + message id + content hash.
+
+    Lives at module scope so every counter instance in the process shares it; counters are
+    created per request, but the messages they count are mostly the same from step to step.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[int]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: int) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_count_cache: Optional[TokenCountLRUCache] = None
+
+
+def get_token_count_cache() -> TokenCountLRUCache:
+    global _token_count_cache
+    if _token_count_cache is None:
+        from letta.settings import settings
+
+        _token_count_cache = TokenCountLRUCache(maxsize=settings.local_token_counter_cache_size)
+    return _token_count_cache
+
+
+@lru_cache(maxsize=32)
+def _get_tiktoken_encoding(model: Optional[str]):
+    """Load (once per process) the tiktoken encoding for a model, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # e.g. tiktoken not installed, or BPE files can't be fetched in an offline deployment
+        logger.warning(f"Could not load tiktoken encoding for model={model}, falling back to byte approximation: {e}")
+        return None
+
+
+def _content_hash(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class LocalTokenCounter(TokenCounter):
+    """Token counter that runs a local BPE tokenizer (tiktoken) for every provider.
+
+    Provider tokenizers differ from cl100k_base, so raw counts are scaled by a per-provider
+    calibration factor. The factor starts from a static default and, when a remote counter is
+    supplied, is refined by sampling the provider API once every
+    `settings.local_token_counter_calibration_interval` counts in the background.
+
+    Counts are cached per message (id + content hash) in a process-wide LRU, so counting a
+    list of messages only tokenizes the messages that changed since the last count.
+    """
+
+    # Approximate ratio of provider tokens to cl100k_base tokens (tuned conservatively high)
+    DEFAULT_CALIBRATION_FACTORS: ClassVar[Dict[str, float]] = {
+        ProviderType.anthropic.value: 1.2,
+        ProviderType.google_ai.value: 1.1,
+        ProviderType.google_vertex.value: 1.1,
+    }
+    # Smoothing for calibration updates (weight given to the newest sample)
+    CALIBRATION_EMA_ALPHA = 0.2
+    CALIBRATION_BOUNDS = (0.5, 2.0)
+    # Per-message framing overhead (role markers / separators)
+    TOKENS_PER_MESSAGE = 3
+
+    # Learned calibration factors, shared by all instances in the process
+    _calibration_factors: ClassVar[Dict[str, float]] = {}
+    _calls_since_calibration: int = 0
+
+    def __init__(self, model: Optional[str] = None, provider_type: Optional[str] = None, remote_counter: Optional[TokenCounter] = None):
+        self.model = model
+        self.provider_type = provider_type.value if isinstance(provider_type, ProviderType) else provider_type
+        self.remote_counter = remote_counter
+        self.encoding = _get_tiktoken_encoding(model)
+        self.encoding_name = self.encoding.name if self.encoding is not None else "approx"
+        self.cache = get_token_count_cache()
+
+    @property
+    def calibration_factor(self) -> float:
+        if self.provider_type in self._calibration_factors:
+            return self._calibration_factors[self.provider_type]
+        return self.DEFAULT_CALIBRATION_FACTORS.get(self.provider_type, 1.0)
+
+    def _calibrate(self, raw_count: int) -> int:
+        if raw_count <= 0:
+            return 0
+        return int(raw_count * self.calibration_factor + 0.5)
+
+    def _encode_len(self, text: str) -> int:
+        if self.encoding is None:
+            byte_len = len(text.encode("utf-8"))
+            return (byte_len + ApproxTokenCounter.APPROX_BYTES_PER_TOKEN - 1) // ApproxTokenCounter.APPROX_BYTES_PER_TOKEN
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def _raw_text_tokens(self, text: str) -> int:
+        key = f"{self.encoding_name}:text:{hashlib.sha256(text.encode()).hexdigest()[:16]}"
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self._encode_len(text)
+            self.cache.put(key, cached)
+        return cached
+
+    def _raw_message_dict_tokens(self, message: Dict[str, Any], message_id: Optional[str] = None) -> int:
+        key = f"{self.encoding_name}:msg:{message_id or ''}:{_content_hash(message)}"
+        cached = self.cache.get(key)
+        if cached is None:
+            cached = self.TOKENS_PER_MESSAGE + self._encode_len(json.dumps(message, ensure_ascii=False, default=str))
+            self.cache.put(key, cached)
+        return cached
+
+    def _should_sample(self) -> bool:
+        from letta.settings import settings
+
+        interval = settings.local_token_counter_calibration_interval
+        if self.remote_counter is None or interval <= 0:
+            return False
+        LocalTokenCounter._calls_since_calibration += 1
+        if LocalTokenCounter._calls_since_calibration < interval:
+            return False
+        LocalTokenCounter._calls_since_calibration = 0
+        return True
+
+    async def _sample_remote(self, raw_count: int, messages: Optional[List[Message]] = None, text: Optional[str] = None) -> None:
+        """Compare a local raw count against the provider API and update the calibration factor."""
+        if messages is not None:
+            remote_count = await self.remote_counter.count_message_tokens(self.remote_counter.convert_messages(messages))
+        else:
+            remote_count = await self.remote_counter.count_text_tokens(text)
+        if not remote_count or raw_count <= 0:
+            return
+        ratio = min(max(remote_count / raw_count, self.CALIBRATION_BOUNDS[0]), self.CALIBRATION_BOUNDS[1])
+        alpha = self.CALIBRATION_EMA_ALPHA
+        updated = (1 - alpha) * self.calibration_factor + alpha * ratio
+        LocalTokenCounter._calibration_factors[self.provider_type] = updated
+        logger.debug(
+            f"LocalTokenCounter calibration: provider={self.provider_type}, model={self.model}, local={raw_count}, "
+            f"remote={remote_count}, factor={updated:.3f}"
+        )
+
+    def _maybe_sample_remote(self, raw_count: int, messages: Optional[List[Message]] = None, text: Optional[str] = None) -> None:
+        if not self._should_sample():
+            return
+        from letta.utils import safe_create_task
+
+        safe_create_task(self._sample_remote(raw_count, messages=messages, text=text), label="token counter calibration")
+
+    async def count_text_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        raw = self._raw_text_tokens(text)
+        self._maybe_sample_remote(raw, text=text)
+        return self._calibrate(raw)
+
+    async def count_message_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        if not messages:
+            return 0
+        return self._calibrate(sum(self._raw_message_dict_tokens(m) for m in messages))
+
+    def raw_message_tokens(self, message: Message) -> int:
+        """Uncalibrated token count for a single message, preferring the count persisted at creation."""
+        if message.token_counts and self.encoding_name in message.token_counts:
+            return message.token_counts[self.encoding_name]
+        return sum(self._raw_message_dict_tokens(d, message_id=message.id) for d in self.convert_messages([message]))
+
+    async def count_messages(self, messages: List[Message]) -> int:
+        if not messages:
+            return 0
+        raw = sum(self.raw_message_tokens(m) for m in messages)
+        self._maybe_sample_remote(raw, messages=messages)
+        return self._calibrate(raw)
+
+    async def count_tool_tokens(self, tools: List[OpenAITool]) -> int:
+        if not tools:
+            return 0
+        raw = sum(self._raw_text_tokens(json.dumps(t.model_dump(), sort_keys=True)) for t in tools)
+        return self._calibrate(raw)
+
+    def convert_messages(self, messages: List[Any]) -> List[Dict[str, Any]]:
+        return Message.to_openai_dicts_from_list(messages)
+
+
+def compute_message_token_counts(
+    message: Message, llm_config: Optional["LLMConfig"] = None, counter: Optional[LocalTokenCounter] = None
+) -> Dict[str, int]:
+    """Compute the per-message token counts persisted on the message row, keyed by tokenizer encoding.
+
+    Counts use the encoding of the agent's model (`llm_config`, or an explicit `counter`) and are raw
+    (uncalibrated); LocalTokenCounter applies the provider calibration factor when summing them and
+    recounts messages that have no count for its own encoding.
+    """
+    if counter is None:
+        if llm_config is not None:
+            counter = LocalTokenCounter(model=llm_config.model, provider_type=llm_config.model_endpoint_type)
+        else:
+            counter = LocalTokenCounter()
+    return {**(message.token_counts or {}), counter.encoding_name: counter.raw_message_tokens(message)}
+
+
 def create_token_counter(
     model_endpoint_type: ProviderType,
     model: Optional[str] = None,
@@ -288,7 +525,18 @@ def create_token_counter(
     # 2. We're in PRODUCTION and anthropic_api_key is available (and not using Gemini)
     use_anthropic = model_endpoint_type == "anthropic"
 
-    if use_gemini:
+    if settings.use_local_token_counter:
+        remote_counter = None
+        if use_gemini:
+            remote_counter = GeminiTokenCounter(LLMClient.create(provider_type=model_endpoint_type, actor=actor), model)
+        elif use_anthropic:
+            remote_counter = AnthropicTokenCounter(LLMClient.create(provider_type=ProviderType.anthropic, actor=actor), model)
+        token_counter = LocalTokenCounter(model=model, provider_type=model_endpoint_type, remote_counter=remote_counter)
+        logger.debug(
+            f"Using LocalTokenCounter for agent_id={agent_id}, model={model}, "
+            f"model_endpoint_type={model_endpoint_type}, calibrated={remote_counter is not None}"
+        )
+    elif use_gemini:
         client = LLMClient.create(provider_type=model_endpoint_type, actor=actor)
         token_counter = GeminiTokenCounter(client, model)
         logger.debug(
@@ -1,10 +1,11 @@
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from letta.server.server import SyncServer
 
 # Import AgentState outside TYPE_CHECKING for @enforce_types decorator
-from sqlalchemy import and_, asc, delete, desc, func, nulls_last, or_, select, update
+from sqlalchemy import Integer, and_, asc, case, cast, delete, desc, func, nulls_last, or_, select, union_all, update
+from sqlalchemy.orm import aliased
 
 from letta.errors import LettaInvalidArgumentError
 from letta.helpers.datetime_helpers import get_utc_time
@@ -114,6 +115,11 @@ class ConversationManager:
         - A NEW system message compiled from the latest block values
         - The same in-context Message objects as the source (shared, not copied)
 
+        Forks are copy-on-write: the fork records the source and the position up to which it shares the source's
+        in-context messages (`parent_conversation_id`, `fork_position`) instead of copying the source's message
+        associations, so forking costs the same regardless of history length. The shared prefix is only copied into
+        the fork once either conversation changes it (see `_copy_forked_prefixes_with_session`).
+
         Args:
             conversation_id: The ID of the conversation to fork
             actor: The user performing the action
@@ -130,33 +136,23 @@ class ConversationManager:
             )
             agent_id = source_conversation.agent_id
 
+            # The fork shares the source's in-context messages after its system message (always position 0);
+            # the fork gets its own system message.
+            source_messages = self._conversation_messages_query(conversation_id=conversation_id, actor=actor)
+            last_position = (await session.execute(select(func.max(source_messages.c.position)))).scalar()
+            shares_messages = last_position is not None and last_position >= 1
+
             new_conversation = ConversationModel(
                 agent_id=agent_id,
                 summary=None,
                 organization_id=actor.organization_id,
                 model=source_conversation.model,
                 model_settings=source_conversation.model_settings,
+                parent_conversation_id=conversation_id if shares_messages else None,
+                fork_position=last_position + 1 if shares_messages else None,
             )
             await new_conversation.create_async(session, actor=actor, no_commit=True)
 
-            source_message_ids = await self._get_message_ids_for_conversation_with_session(
-                session=session,
-                conversation_id=conversation_id,
-                actor=actor,
-            )
-
-            # Skip the system message (always position 0); the fork gets its own.
-            message_ids_to_copy = source_message_ids[1:] if source_message_ids else []
-
-            await self._add_messages_to_conversation_with_session(
-                session=session,
-                conversation_id=new_conversation.id,
-                agent_id=agent_id,
-                message_ids=message_ids_to_copy,
-                actor=actor,
-                starting_position=1,
-            )
-
             await session.commit()
             await session.refresh(new_conversation)
             pydantic_conversation = new_conversation.to_pydantic()
@@ -570,6 +566,10 @@ class ConversationManager:
             # Get isolated blocks before modifying conversation
             isolated_blocks = list(conversation.isolated_blocks)
 
+            # Forks sharing messages of this conversation get their own copy of them first
+            await self._copy_forked_prefixes_with_session(session=session, conversation_id=conversation_id, actor=actor)
+            await session.flush()
+
             # Bulk soft-delete conversation message associations.
             await session.execute(
                 update(ConversationMessageModel)
@@ -610,24 +610,134 @@ class ConversationManager:
 
     # ==================== Message Management Methods ====================
 
+    def _conversation_messages_query(self, conversation_id: str, actor: PydanticUser, in_context_only: bool = True):
+        """The (message_id, position) of the messages of a conversation: its own messages, and for a fork the
+        in-context messages at positions 1..fork_position-1 of the conversations up its fork chain."""
+        # The fork chain, with the position below which each ancestor's messages are shared (NULL for the
+        # conversation itself): the smallest fork_position between the ancestor and the conversation
+        chain = (
+            select(
+                ConversationModel.id,
+                ConversationModel.parent_conversation_id,
+                ConversationModel.fork_position,
+                cast(None, Integer).label("bound"),
+            )
+            .where(ConversationModel.id == conversation_id, ConversationModel.organization_id == actor.organization_id)
+            .cte("fork_chain", recursive=True)
+        )
+        parent = aliased(ConversationModel)
+        chain = chain.union_all(
+            select(
+                parent.id,
+                parent.parent_conversation_id,
+                parent.fork_position,
+                case((chain.c.bound < chain.c.fork_position, chain.c.bound), else_=chain.c.fork_position),
+            ).where(parent.id == chain.c.parent_conversation_id, parent.organization_id == actor.organization_id)
+        )
+
+        own = select(ConversationMessageModel.message_id, ConversationMessageModel.position).where(
+            ConversationMessageModel.conversation_id == conversation_id,
+            ConversationMessageModel.organization_id == actor.organization_id,
+            ConversationMessageModel.is_deleted == False,
+        )
+        if in_context_only:
+            own = own.where(ConversationMessageModel.in_context == True)
+        shared = (
+            select(ConversationMessageModel.message_id, ConversationMessageModel.position)
+            .join(chain, ConversationMessageModel.conversation_id == chain.c.id)
+            .where(
+                chain.c.bound.is_not(None),
+                ConversationMessageModel.organization_id == actor.organization_id,
+                ConversationMessageModel.in_context == True,
+                ConversationMessageModel.is_deleted == False,
+                ConversationMessageModel.position >= 1,
+                ConversationMessageModel.position < chain.c.bound,
+            )
+        )
+        return union_all(own, shared).subquery()
+
+    async def _get_message_entries_for_conversation_with_session(
+        self,
+        session,
+        conversation_id: str,
+        actor: PydanticUser,
+    ) -> List[Tuple[int, str]]:
+        """The in-context messages of a conversation as (position, message_id), in order."""
+        messages = self._conversation_messages_query(conversation_id=conversation_id, actor=actor)
+        query = select(messages.c.position, messages.c.message_id).order_by(messages.c.position)
+        return [tuple(row) for row in await session.execute(query)]
+
     async def _get_message_ids_for_conversation_with_session(
         self,
         session,
         conversation_id: str,
         actor: PydanticUser,
     ) -> List[str]:
-        query = (
-            select(ConversationMessageModel.message_id)
-            .where(
-                ConversationMessageModel.conversation_id == conversation_id,
-                ConversationMessageModel.organization_id == actor.organization_id,
-                ConversationMessageModel.in_context == True,
-                ConversationMessageModel.is_deleted == False,
+        entries = await self._get_message_entries_for_conversation_with_session(
+            session=session, conversation_id=conversation_id, actor=actor
+        )
+        return [message_id for _, message_id in entries]
+
+    async def _copy_forked_prefixes_with_session(
+        self,
+        session,
+        conversation_id: str,
+        actor: PydanticUser,
+        new_message_ids: Optional[List[str]] = None,
+    ) -> List[Tuple[str, int]]:
+        """Copy-on-write of shared messages: give the forks of a conversation their own copy of the messages they share
+        with it, before it changes them to `new_message_ids` (or goes away, if None). Forks whose shared messages are
+        unchanged keep sharing them; returns those forks as (fork id, number of shared messages)."""
+        query = select(ConversationModel.id, ConversationModel.agent_id, ConversationModel.fork_position).where(
+            ConversationModel.parent_conversation_id == conversation_id,
+            ConversationModel.organization_id == actor.organization_id,
+            ConversationModel.is_deleted == False,
+        )
+        forks = (await session.execute(query)).all()
+        if not forks:
+            return []
+
+        entries = await self._get_message_entries_for_conversation_with_session(
+            session=session, conversation_id=conversation_id, actor=actor
+        )
+        sharing_forks = []
+        for fork in forks:
+            # positions may have gaps (messages taken out of context keep theirs), so the shared messages are counted
+            shared_message_ids = [message_id for position, message_id in entries if 1 <= position < fork.fork_position]
+            if new_message_ids is not None and new_message_ids[1 : len(shared_message_ids) + 1] == shared_message_ids:
+                sharing_forks.append((fork.id, len(shared_message_ids)))
+                continue
+            await self._detach_fork_with_session(
+                session=session,
+                conversation_id=fork.id,
+                agent_id=fork.agent_id,
+                shared_message_ids=shared_message_ids,
+                actor=actor,
             )
-            .order_by(ConversationMessageModel.position)
+        return sharing_forks
+
+    async def _detach_fork_with_session(
+        self,
+        session,
+        conversation_id: str,
+        agent_id: str,
+        shared_message_ids: List[str],
+        actor: PydanticUser,
+    ) -> None:
+        """Copy the messages a fork shares with its parent into the fork, which then stands on its own."""
+        await self._add_messages_to_conversation_with_session(
+            session=session,
+            conversation_id=conversation_id,
+            agent_id=agent_id,
+            message_ids=shared_message_ids,
+            actor=actor,
+            starting_position=1,
+        )
+        await session.execute(
+            update(ConversationModel)
+            .where(ConversationModel.id == conversation_id)
+            .values({ConversationModel.parent_conversation_id: None, ConversationModel.fork_position: None})
         )
-        result = await session.execute(query)
-        return list(result.scalars().all())
 
     @enforce_types
     @trace_method
@@ -663,22 +773,20 @@ class ConversationManager:
         Only returns messages that are currently in_context.
         """
         async with db_registry.async_session() as session:
-            query = (
-                select(MessageModel)
-                .join(
-                    ConversationMessageModel,
-                    MessageModel.id == ConversationMessageModel.message_id,
-                )
-                .where(
-                    ConversationMessageModel.conversation_id == conversation_id,
-                    ConversationMessageModel.organization_id == actor.organization_id,
-                    ConversationMessageModel.in_context == True,
-                    ConversationMessageModel.is_deleted == False,
-                )
-                .order_by(ConversationMessageModel.position)
+            message_ids = await self._get_message_ids_for_conversation_with_session(
+                session=session,
+                conversation_id=conversation_id,
+                actor=actor,
             )
-            result = await session.execute(query)
-            return [msg.to_pydantic() for msg in result.scalars().all()]
+            return await self._get_messages_by_ids_with_session(session=session, message_ids=message_ids)
+
+    async def _get_messages_by_ids_with_session(self, session, message_ids: List[str]) -> List[PydanticMessage]:
+        """Messages in the order of `message_ids`."""
+        if not message_ids:
+            return []
+        result = await session.execute(select(MessageModel).where(MessageModel.id.in_(message_ids)))
+        messages_by_id = {msg.id: msg for msg in result.scalars().all()}
+        return [messages_by_id[message_id].to_pydantic() for message_id in message_ids if message_id in messages_by_id]
 
     async def _add_messages_to_conversation_with_session(
         self,
@@ -693,14 +801,20 @@ class ConversationManager:
             return
 
         if starting_position is None:
-            query = select(func.coalesce(func.max(ConversationMessageModel.position), -1)).where(
+            query = select(
+                func.coalesce(func.max(ConversationMessageModel.position), -1),
+                # a fork's own messages are positioned after the messages it shares with its parent
+                select(ConversationModel.fork_position).where(ConversationModel.id == conversation_id).scalar_subquery(),
+            ).where(
                 ConversationMessageModel.conversation_id == conversation_id,
                 ConversationMessageModel.organization_id == actor.organization_id,
             )
             result = await session.execute(query)
-            max_position = result.scalar()
+            max_position, fork_position = result.one()
             if max_position is None:
                 max_position = -1
+            if fork_position is not None:
+                max_position = max(max_position, fork_position - 1)
             starting_position = max_position + 1
 
         for i, message_id in enumerate(message_ids):
@@ -771,7 +885,47 @@ class ConversationManager:
             actor: The user performing the action
         """
         async with db_registry.async_session() as session:
-            # Get all conversation messages for this conversation
+            # Copy-on-write: forks sharing messages that this update changes get their own copy of them first
+            sharing_forks = await self._copy_forked_prefixes_with_session(
+                session=session,
+                conversation_id=conversation_id,
+                actor=actor,
+                new_message_ids=in_context_message_ids,
+            )
+
+            # Likewise, if this conversation is a fork and the update changes the messages it shares with its parent
+            conversation = (
+                await session.execute(
+                    select(ConversationModel.agent_id, ConversationModel.parent_conversation_id, ConversationModel.fork_position).where(
+                        ConversationModel.id == conversation_id,
+                        ConversationModel.organization_id == actor.organization_id,
+                    )
+                )
+            ).first()
+            # the offset of this conversation's own positions from the indices in `in_context_message_ids`, if it keeps
+            # sharing messages at (possibly gapped) positions of its parent: its own messages stay after them
+            position_offset = 0
+            if conversation is not None and conversation.parent_conversation_id is not None:
+                entries = await self._get_message_entries_for_conversation_with_session(
+                    session=session,
+                    conversation_id=conversation_id,
+                    actor=actor,
+                )
+                shared_message_ids = [message_id for position, message_id in entries if 1 <= position < conversation.fork_position]
+                if in_context_message_ids[1 : len(shared_message_ids) + 1] == shared_message_ids:
+                    position_offset = conversation.fork_position - 1 - len(shared_message_ids)
+                else:
+                    await self._detach_fork_with_session(
+                        session=session,
+                        conversation_id=conversation_id,
+                        agent_id=conversation.agent_id,
+                        shared_message_ids=shared_message_ids,
+                        actor=actor,
+                    )
+            await session.flush()
+
+            # Get all conversation messages for this conversation (the messages shared with a parent keep their
+            # positions there)
             query = select(ConversationMessageModel).where(
                 ConversationMessageModel.conversation_id == conversation_id,
                 ConversationMessageModel.organization_id == actor.organization_id,
@@ -792,7 +946,24 @@ class ConversationManager:
             # This ensures ORDER BY position returns messages in the correct order
             for position, message_id in enumerate(in_context_message_ids):
                 if message_id in conv_msg_dict:
-                    conv_msg_dict[message_id].position = position
+                    conv_msg_dict[message_id].position = position + position_offset if position > 0 else position
+
+            # Forks that keep sharing messages with this conversation share them up to their new positions
+            if sharing_forks:
+                await session.flush()
+                entries = await self._get_message_entries_for_conversation_with_session(
+                    session=session,
+                    conversation_id=conversation_id,
+                    actor=actor,
+                )
+                positions = {message_id: position for position, message_id in entries}
+                for fork_id, shared_count in sharing_forks:
+                    fork_position = positions[in_context_message_ids[shared_count]] + 1 if shared_count else 1
+                    await session.execute(
+                        update(ConversationModel)
+                        .where(ConversationModel.id == fork_id)
+                        .values({ConversationModel.fork_position: fork_position})
+                    )
 
             await session.commit()
 
@@ -830,6 +1001,33 @@ class ConversationManager:
             List of LettaMessage objects
         """
         async with db_registry.async_session() as session:
+            parent_conversation_id = (
+                await session.execute(
+                    select(ConversationModel.parent_conversation_id).where(
+                        ConversationModel.id == conversation_id,
+                        ConversationModel.organization_id == actor.organization_id,
+                    )
+                )
+            ).scalar_one_or_none()
+            if parent_conversation_id is not None:
+                messages = await self._list_fork_messages_with_session(
+                    session=session,
+                    conversation_id=conversation_id,
+                    actor=actor,
+                    limit=limit,
+                    before=before,
+                    after=after,
+                    reverse=reverse,
+                    group_id=group_id,
+                )
+                return PydanticMessage.to_letta_messages_from_list(
+                    messages,
+                    reverse=False,
+                    include_err=include_err,
+                    text_is_assistant_message=True,
+                    include_return_message_types=include_return_message_types,
+                )
+
             # Build base query joining Message with ConversationMessage
             query = (
                 select(MessageModel)
@@ -889,6 +1087,43 @@ class ConversationManager:
                 messages, reverse=False, include_err=include_err, text_is_assistant_message=True, include_return_message_types=include_return_message_types
             )
 
+    async def _list_fork_messages_with_session(
+        self,
+        session,
+        conversation_id: str,
+        actor: PydanticUser,
+        limit: Optional[int],
+        before: Optional[str],
+        after: Optional[str],
+        reverse: bool,
+        group_id: Optional[str],
+    ) -> List[PydanticMessage]:
+        """The page of `list_conversation_messages` for a fork: its own messages and the in-context messages it shares
+        with its fork chain, paged in SQL."""
+        messages = self._conversation_messages_query(conversation_id=conversation_id, actor=actor, in_context_only=False)
+        query = select(MessageModel).join(messages, MessageModel.id == messages.c.message_id)
+
+        if group_id:
+            query = query.where(MessageModel.group_id == group_id)
+
+        if before:
+            cursor_query = select(messages.c.position).where(messages.c.message_id == before)
+            cursor_position = (await session.execute(cursor_query)).scalars().first()
+            if cursor_position is not None:
+                query = query.where(messages.c.position < cursor_position)
+        if after:
+            cursor_query = select(messages.c.position).where(messages.c.message_id == after)
+            cursor_position = (await session.execute(cursor_query)).scalars().first()
+            if cursor_position is not None:
+                query = query.where(messages.c.position > cursor_position)
+
+        query = query.order_by(messages.c.position.desc() if reverse else messages.c.position.asc())
+        if limit is not None:
+            query = query.limit(limit)
+
+        result = await session.execute(query)
+        return [msg.to_pydantic() for msg in result.scalars().all()]
+
     # ==================== Isolated Blocks Methods ====================
 
     async def _create_isolated_blocks(
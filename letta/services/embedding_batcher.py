@@ -0,0 +1,173 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional
+
+from letta.log import get_logger
+from letta.otel.metric_registry import MetricRegistry
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.settings import settings
+from letta.utils import safe_create_task
+
+if TYPE_CHECKING:
+    from letta.schemas.user import User as PydanticUser
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _EmbeddingRequest:
+    texts: List[str]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _PendingBatch:
+    embedding_config: EmbeddingConfig
+    actor: Optional["PydanticUser"]
+    requests: List[_EmbeddingRequest] = field(default_factory=list)
+    num_texts: int = 0
+    num_tokens: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def _approx_tokens(texts: List[str]) -> int:
+    return sum(len(text) // 4 + 1 for text in texts)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests that share an embedding config (and organization, since provider
+    credentials are resolved per actor) into a single provider call.
+
+    Texts are held for at most `max_wait_ms`, or until the pending batch reaches `max_batch_size` texts or
+    `max_batch_tokens` approximate tokens, then sent as one `request_embeddings` call whose results are fanned
+    back out to the waiting callers in order.
+    """
+
+    def __init__(self, max_wait_ms: int, max_batch_size: int, max_batch_tokens: int):
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+
+    @staticmethod
+    def _batch_key(embedding_config: EmbeddingConfig, actor: Optional["PydanticUser"]) -> Hashable:
+        return (
+            actor.organization_id if actor else None,
+            embedding_config.embedding_endpoint_type,
+            embedding_config.embedding_endpoint,
+            embedding_config.embedding_model,
+            embedding_config.embedding_dim,
+            embedding_config.handle,
+        )
+
+    async def embed(self, texts: List[str], embedding_config: EmbeddingConfig, actor: Optional["PydanticUser"]) -> List[List[float]]:
+        """Embed `texts`, sharing the provider request with other callers using the same config."""
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(embedding_config, actor)
+        num_tokens = _approx_tokens(texts)
+        request = _EmbeddingRequest(texts=texts, future=loop.create_future(), enqueued_at=time.perf_counter())
+
+        batch = self._pending.get(key)
+        if batch is not None and (
+            batch.num_texts + len(texts) > self.max_batch_size or batch.num_tokens + num_tokens > self.max_batch_tokens
+        ):
+            # this request would overflow the pending batch; send what we have and start a new one
+            self._flush(key)
+            batch = None
+
+        if batch is None:
+            batch = _PendingBatch(embedding_config=embedding_config, actor=actor)
+            batch.timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+            self._pending[key] = batch
+
+        batch.requests.append(request)
+        batch.num_texts += len(texts)
+        batch.num_tokens += num_tokens
+        if batch.num_texts >= self.max_batch_size or batch.num_tokens >= self.max_batch_tokens:
+            self._flush(key)
+
+        return await request.future
+
+    def _flush(self, key: Hashable) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        safe_create_task(self._send(batch), label=f"embedding batch {batch.embedding_config.embedding_model}")
+
+    async def _send(self, batch: _PendingBatch) -> None:
+        from letta.llm_api.llm_client import LLMClient
+
+        sent_at = time.perf_counter()
+        metric_attributes = {"embedding_model": batch.embedding_config.embedding_model}
+        registry = MetricRegistry()
+        registry.embedding_batch_size_histogram.record(batch.num_texts, metric_attributes)
+        registry.embedding_batch_fill_ratio_histogram.record(batch.num_texts / max(self.max_batch_size, 1), metric_attributes)
+        for request in batch.requests:
+            registry.embedding_batch_queue_wait_ms_histogram.record((sent_at - request.enqueued_at) * 1000, metric_attributes)
+
+        texts = [text for request in batch.requests for text in request.texts]
+        try:
+            embedding_client = LLMClient.create(provider_type=batch.embedding_config.embedding_endpoint_type, actor=batch.actor)
+            embeddings = await embedding_client.request_embeddings(texts, batch.embedding_config)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"Embedding provider returned {len(embeddings)} embeddings for {len(texts)} texts")
+
+            offset = 0
+            for request in batch.requests:
+                result = embeddings[offset : offset + len(request.texts)]
+                offset += len(request.texts)
+                if not request.future.done():  # the caller may have been cancelled while waiting
+                    request.future.set_result(result)
+        except Exception as e:
+            for request in batch.requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            # the batch task itself was cancelled (e.g. on shutdown); don't leave its callers waiting forever
+            for request in batch.requests:
+                if not request.future.done():
+                    request.future.set_exception(RuntimeError("The embedding batch was cancelled before it completed"))
+
+
+_embedding_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        _embedding_batcher = EmbeddingBatcher(
+            max_wait_ms=settings.embedding_batch_max_wait_ms,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_batch_tokens=settings.embedding_batch_max_tokens,
+        )
+    return _embedding_batcher
+
+
+async def _embed_uncached(texts: List[str], embedding_config: EmbeddingConfig, actor: Optional["PydanticUser"]) -> List[List[float]]:
+    if settings.embedding_batching_enabled:
+        return await get_embedding_batcher().embed(texts, embedding_config, actor)
+
+    from letta.llm_api.llm_client import LLMClient
+
+    embedding_client = LLMClient.create(provider_type=embedding_config.embedding_endpoint_type, actor=actor)
+    return await embedding_client.request_embeddings(texts, embedding_config)
+
+
+async def embed_texts(texts: List[str], embedding_config: EmbeddingConfig, actor: Optional["PydanticUser"]) -> List[List[float]]:
+    """Embed texts, reusing cached embeddings when `embedding_cache_enabled` is set and coalescing the remaining
+    provider calls with concurrent callers when `embedding_batching_enabled` is set."""
+    if settings.embedding_cache_enabled and actor is not None:
+        from letta.services.embedding_cache_manager import EmbeddingCacheManager
+
+        return await EmbeddingCacheManager().embed_with_cache_async(
+            texts, embedding_config, actor, embed_fn=lambda missing: _embed_uncached(missing, embedding_config, actor)
+        )
+    return await _embed_uncached(texts, embedding_config, actor)
@@ -0,0 +1,236 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from letta.log import get_logger
+from letta.orm.embedding_cache import EmbeddingCache as EmbeddingCacheModel
+from letta.otel.tracing import trace_method
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.user import User as PydanticUser
+from letta.server.db import db_registry
+from letta.settings import settings
+from letta.utils import fire_and_forget
+
+logger = get_logger(__name__)
+
+# keep IN clauses and multi-row inserts well under driver parameter limits
+_DB_CHUNK_SIZE = 1000
+
+# rows deleted per statement when pruning expired entries
+_PRUNE_BATCH_SIZE = 10_000
+
+
+class _LocalEmbeddingCache:
+    """LRU of embeddings packed as float32 bytes (as stored in the table), bounded by their total size."""
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        packed = self._entries.get(key)
+        if packed is None:
+            return None
+        self._entries.move_to_end(key)
+        return np.frombuffer(packed, dtype=np.float32).tolist()
+
+    def put(self, key: str, packed: bytes, max_bytes: int) -> None:
+        if len(packed) > max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = packed
+        self.size_bytes += len(packed)
+        while self.size_bytes > max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+
+# process-local tier in front of the embedding_cache table
+_local_embedding_cache = _LocalEmbeddingCache()
+
+# monotonic time of this process's last prune of the embedding_cache table
+_last_prune_at: Optional[float] = None
+
+
+def _expiry_cutoff() -> Optional[datetime]:
+    """Rows created before this are expired, or None when entries never expire."""
+    if settings.embedding_cache_ttl_days <= 0:
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=settings.embedding_cache_ttl_days)
+
+
+def embedding_cache_key(text: str, embedding_config: EmbeddingConfig, organization_id: str) -> str:
+    """Content address for an embedding: the organization, the embedding model identity and sha256(text)."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    identity = "\x1f".join(
+        [
+            organization_id,
+            str(embedding_config.embedding_endpoint_type),
+            embedding_config.embedding_endpoint or "",
+            embedding_config.embedding_model,
+            str(embedding_config.embedding_dim),
+            text_hash,
+        ]
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCacheManager:
+    """Manager for the content-addressed embedding cache (`embedding_cache` table plus a process-local LRU tier)."""
+
+    def _local_get(self, key: str) -> Optional[List[float]]:
+        return _local_embedding_cache.get(key)
+
+    def _local_put(self, key: str, packed: bytes) -> None:
+        if settings.embedding_cache_local_max_mb <= 0:
+            return
+        _local_embedding_cache.put(key, packed, settings.embedding_cache_local_max_mb * 1024 * 1024)
+
+    @trace_method
+    async def get_embeddings_async(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up cached embeddings by cache key, checking the local tier before the database."""
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in keys:
+            embedding = self._local_get(key)
+            if embedding is not None:
+                found[key] = embedding
+            else:
+                missing.append(key)
+
+        if missing:
+            cutoff = _expiry_cutoff()
+            async with db_registry.async_session(read_only=True) as session:
+                for i in range(0, len(missing), _DB_CHUNK_SIZE):
+                    chunk = missing[i : i + _DB_CHUNK_SIZE]
+                    query = select(EmbeddingCacheModel.cache_key, EmbeddingCacheModel.embedding).where(
+                        EmbeddingCacheModel.cache_key.in_(chunk)
+                    )
+                    if cutoff is not None:
+                        # expired rows may not be pruned yet
+                        query = query.where(EmbeddingCacheModel.created_at >= cutoff)
+                    result = await session.execute(query)
+                    for key, packed in result.all():
+                        found[key] = np.frombuffer(packed, dtype=np.float32).tolist()
+                        self._local_put(key, packed)
+        return found
+
+    @trace_method
+    async def store_embeddings_async(self, entries: Dict[str, List[float]], embedding_config: EmbeddingConfig, actor: PydanticUser) -> None:
+        """Persist embeddings by cache key. Existing (expired) keys are overwritten and their expiry restarts."""
+        if not entries:
+            return
+
+        rows = []
+        for key, embedding in entries.items():
+            packed = np.asarray(embedding, dtype=np.float32).tobytes()
+            self._local_put(key, packed)
+            rows.append(
+                {
+                    "cache_key": key,
+                    "organization_id": actor.organization_id,
+                    "embedding_model": embedding_config.embedding_model,
+                    "embedding_dim": embedding_config.embedding_dim,
+                    "embedding": packed,
+                }
+            )
+
+        async with db_registry.async_session() as session:
+            dialect = session.bind.dialect.name
+            for i in range(0, len(rows), _DB_CHUNK_SIZE):
+                chunk = rows[i : i + _DB_CHUNK_SIZE]
+                if dialect == "postgresql":
+                    stmt = pg_insert(EmbeddingCacheModel).values(chunk)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["cache_key"], set_={"embedding": stmt.excluded.embedding, "created_at": func.now()}
+                    )
+                else:
+                    stmt = sa.insert(EmbeddingCacheModel).values(chunk).prefix_with("OR REPLACE")
+                await session.execute(stmt)
+            await session.commit()
+
+        self._maybe_schedule_prune()
+
+    @trace_method
+    async def prune_expired_async(self) -> int:
+        """Delete expired rows from the embedding_cache table, in batches. Returns the number of rows deleted."""
+        cutoff = _expiry_cutoff()
+        if cutoff is None:
+            return 0
+
+        deleted = 0
+        while True:
+            expired_keys = select(EmbeddingCacheModel.cache_key).where(EmbeddingCacheModel.created_at < cutoff).limit(_PRUNE_BATCH_SIZE)
+            async with db_registry.async_session() as session:
+                result = await session.execute(delete(EmbeddingCacheModel).where(EmbeddingCacheModel.cache_key.in_(expired_keys)))
+                await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < _PRUNE_BATCH_SIZE:
+                break
+        if deleted:
+            logger.info(f"Pruned {deleted} expired embeddings from the embedding cache")
+        return deleted
+
+    def _maybe_schedule_prune(self) -> None:
+        """Prune expired rows in the background, at most once per `embedding_cache_prune_interval_seconds` per process."""
+        global _last_prune_at
+        if settings.embedding_cache_ttl_days <= 0:
+            return
+        now = time.monotonic()
+        if _last_prune_at is not None and now - _last_prune_at < settings.embedding_cache_prune_interval_seconds:
+            return
+        _last_prune_at = now
+        fire_and_forget(self.prune_expired_async(), task_name="prune_embedding_cache")
+
+    @trace_method
+    async def embed_with_cache_async(
+        self,
+        texts: List[str],
+        embedding_config: EmbeddingConfig,
+        actor: PydanticUser,
+        embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+    ) -> List[List[float]]:
+        """Return embeddings for `texts` in order, calling `embed_fn` only for distinct texts that are not cached yet."""
+        if not texts:
+            return []
+
+        keys = [embedding_cache_key(text, embedding_config, actor.organization_id) for text in texts]
+        try:
+            cached = await self.get_embeddings_async(list(dict.fromkeys(keys)))
+        except Exception as e:
+            # the cache is an optimization; never fail an embedding request because of it
+            logger.warning(f"Embedding cache lookup failed, embedding all {len(texts)} texts: {e}")
+            cached = {}
+
+        to_embed: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in to_embed:
+                to_embed[key] = text
+
+        if to_embed:
+            new_embeddings = await embed_fn(list(to_embed.values()))
+            computed = dict(zip(to_embed.keys(), new_embeddings))
+            try:
+                await self.store_embeddings_async(computed, embedding_config, actor)
+            except Exception as e:
+                logger.warning(f"Failed to store {len(computed)} embeddings in the embedding cache: {e}")
+            cached.update(computed)
+
+        logger.debug(f"Embedding cache served {len(texts) - len(to_embed)}/{len(texts)} texts for {embedding_config.embedding_model}")
+        return [cached[key] for key in keys]
@@ -10,8 +10,9 @@ from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.enums import ProviderType
 from letta.schemas.passage import Passage
 from letta.schemas.user import User
+from letta.services.embedding_cache_manager import EmbeddingCacheManager
 from letta.services.file_processor.embedder.base_embedder import BaseEmbedder
-from letta.settings import model_settings
+from letta.settings import model_settings, settings
 
 logger = get_logger(__name__)
 
@@ -106,6 +107,54 @@ class OpenAIEmbedder(BaseEmbedder):
 
         return is_token_limit
 
+    async def _embed_chunks(self, chunks_to_embed: List[str]) -> List[List[float]]:
+        """Embed chunks in concurrent batches under the global embedding semaphore, preserving order"""
+        # Create batches with their original indices
+        batches = []
+        batch_indices = []
+
+        for i in range(0, len(chunks_to_embed), self.embedding_config.batch_size):
+            batch = chunks_to_embed[i : i + self.embedding_config.batch_size]
+            indices = list(range(i, min(i + self.embedding_config.batch_size, len(chunks_to_embed))))
+            batches.append(batch)
+            batch_indices.append(indices)
+
+        logger.info(f"Processing {len(batches)} batches")
+        log_event(
+            "embedder.batching_completed",
+            {"total_batches": len(batches), "batch_size": self.embedding_config.batch_size, "total_chunks": len(chunks_to_embed)},
+        )
+
+        # Use global semaphore to limit concurrent embedding requests across ALL file processing
+        # This prevents rate limiting even when processing multiple files simultaneously
+        async def process(batch: List[str], indices: List[int]):
+            async with _GLOBAL_EMBEDDING_SEMAPHORE:
+                try:
+                    return await self._embed_batch(batch, indices)
+                except Exception as e:
+                    logger.error("Failed to embed batch of size %s: %s", len(batch), e)
+                    log_event("embedder.batch_failed", {"batch_size": len(batch), "error": str(e), "error_type": type(e).__name__})
+                    raise
+
+        # Execute all batches with global semaphore control to limit concurrency
+        tasks = [process(batch, indices) for batch, indices in zip(batches, batch_indices)]
+
+        log_event(
+            "embedder.concurrent_processing_started",
+            {"concurrent_tasks": len(tasks), "max_concurrent_global": 3},
+        )
+        results = await asyncio.gather(*tasks)
+        log_event("embedder.concurrent_processing_completed", {"batches_processed": len(results)})
+
+        # Flatten results and sort by original index
+        indexed_embeddings = []
+        for batch_result in results:
+            indexed_embeddings.extend(batch_result)
+
+        # Sort by index to maintain original order
+        indexed_embeddings.sort(key=lambda x: x[0])
+        return [embedding for _, embedding in indexed_embeddings]
+
     @trace_method
     async def generate_embedded_passages(self, file_id: str, source_id: str, chunks: List[str], actor: User) -> List[Passage]:
         """Generate embeddings for chunks with batching and concurrent processing"""
@@ -153,54 +202,16 @@ class OpenAIEmbedder(BaseEmbedder):
             },
         )
 
-        # Create batches with their original indices
-        batches = []
-        batch_indices = []
-
-        for i in range(0, len(chunks_to_embed), self.embedding_config.batch_size):
-            batch = chunks_to_embed[i : i + self.embedding_config.batch_size]
-            indices = list(range(i, min(i + self.embedding_config.batch_size, len(chunks_to_embed))))
-            batches.append(batch)
-            batch_indices.append(indices)
-
-        logger.info(f"Processing {len(batches)} batches")
-        log_event(
-            "embedder.batching_completed",
-            {"total_batches": len(batches), "batch_size": self.embedding_config.batch_size, "total_chunks": len(chunks_to_embed)},
-        )
-
-        # Use global semaphore to limit concurrent embedding requests across ALL file processing
-        # This prevents rate limiting even when processing multiple files simultaneously
-        async def process(batch: List[str], indices: List[int]):
-            async with _GLOBAL_EMBEDDING_SEMAPHORE:
-                try:
-                    return await self._embed_batch(batch, indices)
-                except Exception as e:
-                    logger.error("Failed to embed batch of size %s: %s", len(batch), e)
-                    log_event("embedder.batch_failed", {"batch_size": len(batch), "error": str(e), "error_type": type(e).__name__})
-                    raise
-
-        # Execute all batches with global semaphore control to limit concurrency
-        tasks = [process(batch, indices) for batch, indices in zip(batches, batch_indices)]
-
-        log_event(
-            "embedder.concurrent_processing_started",
-            {"concurrent_tasks": len(tasks), "max_concurrent_global": 3},
-        )
-        results = await asyncio.gather(*tasks)
-        log_event("embedder.concurrent_processing_completed", {"batches_processed": len(results)})
-
-        # Flatten results and sort by original index
-        indexed_embeddings = []
-        for batch_result in results:
-            indexed_embeddings.extend(batch_result)
-
-        # Sort by index to maintain original order
-        indexed_embeddings.sort(key=lambda x: x[0])
+        if settings.embedding_cache_enabled:
+            embeddings = await EmbeddingCacheManager().embed_with_cache_async(
+                chunks_to_embed, self.embedding_config, actor, embed_fn=self._embed_chunks
+            )
+        else:
+            embeddings = await self._embed_chunks(chunks_to_embed)
 
         # Create Passage objects in original order
         passages = []
-        for (idx, embedding), text in zip(indexed_embeddings, chunks_to_embed):
+        for embedding, text in zip(embeddings, chunks_to_embed):
             passage = Passage(
                 text=text,
                 file_id=file_id,
@@ -20,6 +20,7 @@ from letta.services.file_processor.parser.base_parser import FileParser
 from letta.services.job_manager import JobManager
 from letta.services.passage_manager import PassageManager
 from letta.services.source_manager import SourceManager
+from letta.settings import settings
 
 logger = get_logger(__name__)
 
@@ -46,111 +47,140 @@ class FileProcessor:
         # get vector db type from the embedder
         self.vector_db_type = embedder.vector_db_type
 
-    async def _chunk_and_embed_with_fallback(self, file_metadata: FileMetadata, ocr_response, source_id: str) -> List:
-        """Chunk text and generate embeddings with fallback to default chunker if needed"""
-        filename = file_metadata.file_name
-
-        # Create file-type-specific chunker in thread pool to avoid blocking event loop
-        text_chunker = await asyncio.to_thread(
-            LlamaIndexChunker, file_type=file_metadata.file_type, chunk_size=self.embedder.embedding_config.embedding_chunk_size
-        )
-
-        # First attempt with file-specific chunker
+    async def _chunk_page(self, text_chunker: LlamaIndexChunker, page, page_index: int, filename: str) -> List[str]:
+        """Chunk a single page with the file-specific chunker, falling back to the default chunker for that page"""
         try:
-            all_chunks = []
-            for page in ocr_response.pages:
-                # Run CPU-intensive chunking in thread pool to avoid blocking event loop
-                chunking_start = time.time()
-                chunks = await asyncio.to_thread(text_chunker.chunk_text, page)
-                chunking_duration = time.time() - chunking_start
-
-                if chunking_duration > 0.5:
-                    logger.warning(f"Slow chunking operation for {filename}: {chunking_duration:.2f}s")
-
-                if not chunks:
-                    log_event(
-                        "file_processor.chunking_failed",
-                        {
-                            "filename": filename,
-                            "page_index": ocr_response.pages.index(page),
-                        },
-                    )
-                    raise ValueError("No chunks created from text")
-                all_chunks.extend(chunks)
+            # Run CPU-intensive chunking in thread pool to avoid blocking event loop
+            chunking_start = time.time()
+            chunks = await asyncio.to_thread(text_chunker.chunk_text, page)
+            chunking_duration = time.time() - chunking_start
 
-            # Update with chunks length
-            file_metadata = await self.file_manager.update_file_status(
-                file_id=file_metadata.id,
-                actor=self.actor,
-                processing_status=FileProcessingStatus.EMBEDDING,
-                total_chunks=len(all_chunks),
-                chunks_embedded=0,
-            )
+            if chunking_duration > 0.5:
+                logger.warning(f"Slow chunking operation for {filename}: {chunking_duration:.2f}s")
 
-            all_passages = await self.embedder.generate_embedded_passages(
-                file_id=file_metadata.id,
-                source_id=source_id,
-                chunks=all_chunks,
-                actor=self.actor,
+            if chunks:
+                return chunks
+            log_event("file_processor.chunking_failed", {"filename": filename, "page_index": page_index})
+        except Exception as e:
+            logger.warning(
+                f"Failed to chunk page {page_index} of {filename} with file-specific chunker: {str(e)}. Retrying with default chunker."
             )
-            return all_passages
+            log_event(
+                "file_processor.chunking_failed_retrying",
+                {"filename": filename, "page_index": page_index, "error": str(e), "error_type": type(e).__name__},
+            )
+
+        chunks = await asyncio.to_thread(text_chunker.default_chunk_text, page)
+        if not chunks:
+            log_event("file_processor.default_chunking_failed", {"filename": filename, "page_index": page_index})
+            raise ValueError("No chunks created from text with default chunker")
+        return chunks
 
+    async def _embed_batch_with_fallback(
+        self, text_chunker: LlamaIndexChunker, chunks: List[str], file_metadata: FileMetadata, source_id: str
+    ) -> List[Passage]:
+        """Embed one batch of chunks; if the provider rejects it, re-split the batch with the default chunker and retry once"""
+        try:
+            return await self.embedder.generate_embedded_passages(
+                file_id=file_metadata.id, source_id=source_id, chunks=chunks, actor=self.actor
+            )
         except Exception as e:
-            logger.warning(f"Failed to chunk/embed with file-specific chunker for {filename}: {str(e)}. Retrying with default chunker.")
+            logger.warning(f"Failed to embed batch for {file_metadata.file_name}: {str(e)}. Retrying with default chunker.")
             log_event(
                 "file_processor.embedding_failed_retrying",
-                {"filename": filename, "error": str(e), "error_type": type(e).__name__},
+                {"filename": file_metadata.file_name, "error": str(e), "error_type": type(e).__name__},
+            )
+            rechunked = [c for chunk in chunks for c in await asyncio.to_thread(text_chunker.default_chunk_text, chunk)]
+            passages = await self.embedder.generate_embedded_passages(
+                file_id=file_metadata.id, source_id=source_id, chunks=rechunked, actor=self.actor
             )
+            log_event("file_processor.default_chunking_success", {"filename": file_metadata.file_name, "total_chunks": len(rechunked)})
+            return passages
 
-            # Retry with default chunker
-            try:
-                logger.info(f"Retrying chunking with default SentenceSplitter for {filename}")
-                all_chunks = []
-
-                for page in ocr_response.pages:
-                    # Run CPU-intensive default chunking in thread pool to avoid blocking event loop
-                    chunking_start = time.time()
-                    chunks = await asyncio.to_thread(text_chunker.default_chunk_text, page)
-                    chunking_duration = time.time() - chunking_start
-
-                    if chunking_duration > 0.5:
-                        logger.warning(f"Slow default chunking operation for {filename}: {chunking_duration:.2f}s")
-
-                    if not chunks:
-                        log_event(
-                            "file_processor.default_chunking_failed",
-                            {
-                                "filename": filename,
-                                "page_index": ocr_response.pages.index(page),
-                            },
-                        )
-                        raise ValueError("No chunks created from text with default chunker")
-                    all_chunks.extend(chunks)
-
-                all_passages = await self.embedder.generate_embedded_passages(
-                    file_id=file_metadata.id,
-                    source_id=source_id,
-                    chunks=all_chunks,
-                    actor=self.actor,
-                )
-                logger.info(f"Successfully generated passages with default chunker for {filename}")
-                log_event(
-                    "file_processor.default_chunking_success",
-                    {"filename": filename, "total_chunks": len(all_chunks)},
-                )
-                return all_passages
+    async def _chunk_embed_and_write(self, file_metadata: FileMetadata, pages, source_id: str) -> List[Passage]:
+        """Stream pages through chunking, embedding and passage writes as a bounded pipeline.
 
-            except Exception as fallback_error:
-                logger.error("Default chunking also failed for %s: %s", filename, fallback_error)
-                log_event(
-                    "file_processor.default_chunking_also_failed",
-                    {
-                        "filename": filename,
-                        "fallback_error": str(fallback_error),
-                        "fallback_error_type": type(fallback_error).__name__,
-                    },
-                )
-                raise fallback_error
+        Each stage hands fixed-size batches to the next through a bounded queue, so chunking of later pages, embedding
+        and database writes overlap, at most `file_processing_queue_size` batches are buffered between stages, and
+        passages become searchable batch by batch. Progress is reported through `chunks_embedded` on the file.
+        """
+        filename = file_metadata.file_name
+        batch_size = max(settings.file_processing_batch_size, 1)
+        track_progress = self.vector_db_type != VectorDBProvider.PINECONE  # pinecone progress is polled from the index
+
+        # Create file-type-specific chunker in thread pool to avoid blocking event loop
+        text_chunker = await asyncio.to_thread(
+            LlamaIndexChunker, file_type=file_metadata.file_type, chunk_size=self.embedder.embedding_config.embedding_chunk_size
+        )
+        await self.file_manager.update_file_status(
+            file_id=file_metadata.id, actor=self.actor, processing_status=FileProcessingStatus.EMBEDDING, chunks_embedded=0
+        )
+
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.file_processing_queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.file_processing_queue_size)
+        all_passages: List[Passage] = []
+        progress = {"chunked": 0, "embedded": 0}
+
+        async def chunk_stage():
+            batch: List[str] = []
+            for page_index, page in enumerate(pages):
+                for chunk in await self._chunk_page(text_chunker, page, page_index, filename):
+                    batch.append(chunk)
+                    if len(batch) >= batch_size:
+                        progress["chunked"] += len(batch)
+                        await chunk_queue.put(batch)
+                        batch = []
+            if batch:
+                progress["chunked"] += len(batch)
+                await chunk_queue.put(batch)
+            await chunk_queue.put(None)
+
+            # chunks_embedded belongs to write_stage; writing it here could overwrite a newer count
+            await self.file_manager.update_file_status(file_id=file_metadata.id, actor=self.actor, total_chunks=progress["chunked"])
+
+        async def embed_stage():
+            while (chunks := await chunk_queue.get()) is not None:
+                await write_queue.put(await self._embed_batch_with_fallback(text_chunker, chunks, file_metadata, source_id))
+            await write_queue.put(None)
+
+        async def write_stage():
+            while (passages := await write_queue.get()) is not None:
+                if self.vector_db_type == VectorDBProvider.NATIVE:
+                    passages = await self.passage_manager.create_many_source_passages_async(
+                        passages=passages, file_metadata=file_metadata, actor=self.actor
+                    )
+                all_passages.extend(passages)
+                progress["embedded"] += len(passages)
+                if track_progress:
+                    await self.file_manager.update_file_status(
+                        file_id=file_metadata.id, actor=self.actor, chunks_embedded=progress["embedded"]
+                    )
+
+        tasks = [asyncio.create_task(stage()) for stage in (chunk_stage, embed_stage, write_stage)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # don't leave a partially ingested file searchable
+            if all_passages and self.vector_db_type == VectorDBProvider.NATIVE:
+                try:
+                    await self.passage_manager.delete_source_passages_async(actor=self.actor, passages=all_passages)
+                except Exception as cleanup_error:
+                    logger.warning(f"Failed to clean up partial passages for {filename}: {cleanup_error}")
+            raise
+
+        # final counts once every stage is done; total_chunks differs from the chunked count if the embedding fallback re-split batches
+        await self.file_manager.update_file_status(
+            file_id=file_metadata.id,
+            actor=self.actor,
+            total_chunks=progress["embedded"],
+            chunks_embedded=progress["embedded"] if track_progress else 0,
+        )
+
+        log_event("file_processor.passages_created", {"filename": filename, "total_passages": len(all_passages)})
+        return all_passages
 
     # TODO: Factor this function out of SyncServer
     @trace_method
@@ -229,24 +259,13 @@ class FileProcessor:
                 {"filename": filename, "pages_to_process": len(ocr_response.pages)},
             )
 
-            # Chunk and embed with fallback logic
-            all_passages = await self._chunk_and_embed_with_fallback(
+            # Chunk, embed and write passages as a streaming pipeline
+            all_passages = await self._chunk_embed_and_write(
                 file_metadata=file_metadata,
-                ocr_response=ocr_response,
+                pages=ocr_response.pages,
                 source_id=source_id,
             )
 
-            if self.vector_db_type == VectorDBProvider.NATIVE:
-                all_passages = await self.passage_manager.create_many_source_passages_async(
-                    passages=all_passages,
-                    file_metadata=file_metadata,
-                    actor=self.actor,
-                )
-                log_event(
-                    "file_processor.passages_created",
-                    {"filename": filename, "total_passages": len(all_passages)},
-                )
-
             # Handle case where no passages were created (e.g., image-only PDF)
             if len(all_passages) == 0:
                 logger.warning(f"No passages created for {filename}. File may contain only images without extractable text.")
@@ -339,17 +358,8 @@ class FileProcessor:
             logger.info(f"Chunking imported file content for {filename}")
             log_event("file_processor.import_chunking_started", {"filename": filename, "content_length": len(content)})
 
-            # Chunk and embed using existing logic
-            all_passages = await self._chunk_and_embed_with_fallback(
-                file_metadata=file_metadata, ocr_response=ocr_response, source_id=source_id
-            )
-
-            # Create passages in database (unless using Pinecone)
-            if self.vector_db_type == VectorDBProvider.NATIVE:
-                all_passages = await self.passage_manager.create_many_source_passages_async(
-                    passages=all_passages, file_metadata=file_metadata, actor=self.actor
-                )
-                log_event("file_processor.import_passages_created", {"filename": filename, "total_passages": len(all_passages)})
+            # Chunk, embed and write passages (passages are only stored in the database for the native vector db)
+            all_passages = await self._chunk_embed_and_write(file_metadata=file_metadata, pages=ocr_response.pages, source_id=source_id)
 
             # Update file status to completed (valid transition from EMBEDDING)
             # pinecone completes slowly, so gets updated later
@@ -12,6 +12,7 @@ from letta.schemas.block import Block as PydanticBlock, FileBlock as PydanticFil
 from letta.schemas.file import FileAgent as PydanticFileAgent, FileMetadata
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
@@ -92,7 +93,9 @@ class FileAgentManager:
                     existing.start_line = start_line
                     existing.end_line = end_line
 
-                    await existing.update_async(session, actor=actor)
+                    await existing.update_async(session, actor=actor, no_commit=True)
+                    # file open/close state is rendered into the agent's memory
+                    await bump_agent_versions_async(session, agent_ids=[agent_id])
                     return existing.to_pydantic(), []
 
                 assoc = FileAgentModel(
@@ -107,7 +110,8 @@ class FileAgentManager:
                     start_line=start_line,
                     end_line=end_line,
                 )
-                await assoc.create_async(session, actor=actor)
+                await assoc.create_async(session, actor=actor, no_commit=True)
+                await bump_agent_versions_async(session, agent_ids=[agent_id])
                 return assoc.to_pydantic(), []
 
     @enforce_types
@@ -139,7 +143,8 @@ class FileAgentManager:
             # touch timestamp
             assoc.last_accessed_at = datetime.now(timezone.utc)
 
-            await assoc.update_async(session, actor=actor)
+            await assoc.update_async(session, actor=actor, no_commit=True)
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             return assoc.to_pydantic()
 
     @enforce_types
@@ -165,7 +170,8 @@ class FileAgentManager:
             # touch timestamp
             assoc.last_accessed_at = datetime.now(timezone.utc)
 
-            await assoc.update_async(session, actor=actor)
+            await assoc.update_async(session, actor=actor, no_commit=True)
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             return assoc.to_pydantic()
 
     @enforce_types
@@ -174,7 +180,9 @@ class FileAgentManager:
         """Soft-delete the association."""
         async with db_registry.async_session() as session:
             assoc = await self._get_association_by_file_id(session, agent_id, file_id, actor)
-            await assoc.delete_async(session, actor=actor)
+            assoc.is_deleted = True
+            await assoc.update_async(session, actor=actor, no_commit=True)
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
 
     @enforce_types
     @trace_method
@@ -214,6 +222,7 @@ class FileAgentManager:
                 )
                 result = await session.execute(stmt)
                 total_deleted += result.rowcount
+                await bump_agent_versions_async(session, agent_ids=[agent_id for agent_id, _ in batch])
 
         return total_deleted
 
@@ -504,6 +513,7 @@ class FileAgentManager:
             )
 
             closed_file_names = [row.file_name for row in (await session.execute(stmt))]
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             # context manager now handles commits
             # await session.commit()
             return closed_file_names
@@ -622,7 +632,7 @@ class FileAgentManager:
                 file_to_open.last_accessed_at = now_ts
                 file_to_open.start_line = start_line
                 file_to_open.end_line = end_line
-                await file_to_open.update_async(session, actor=actor)
+                await file_to_open.update_async(session, actor=actor, no_commit=True)
             else:
                 # Create new file association
                 new_file_agent = FileAgentModel(
@@ -637,8 +647,9 @@ class FileAgentManager:
                     start_line=start_line,
                     end_line=end_line,
                 )
-                await new_file_agent.create_async(session, actor=actor)
+                await new_file_agent.create_async(session, actor=actor, no_commit=True)
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             return closed_file_names, file_was_already_open, previous_ranges
 
     @enforce_types
@@ -767,6 +778,7 @@ class FileAgentManager:
                     .values(is_open=False, visible_content=None)
                 )
 
+            await bump_agent_versions_async(session, agent_ids=[agent_id])
             # context manager now handles commits
             # await session.commit()
             return closed_file_names
@@ -17,6 +17,7 @@ from letta.schemas.letta_message import LettaMessage, MessageType
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
 from letta.settings import DatabaseChoice, settings
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
@@ -128,6 +129,8 @@ class GroupManager:
     async def modify_group_async(self, group_id: str, group_update: GroupUpdate, actor: PydanticUser) -> PydanticGroup:
         async with db_registry.async_session() as session:
             group = await GroupModel.read_async(db_session=session, identifier=group_id, actor=actor)
+            # agents leaving the group (or losing the manager role) see the change too
+            await bump_agent_versions_async(session, group_ids=[group_id])
 
             sleeptime_agent_frequency = None
             max_message_buffer_length = None
@@ -183,6 +186,7 @@ class GroupManager:
                     session=session, group=group, agent_ids=group_update.agent_ids, allow_partial=False, replace=True
                 )
 
+            await bump_agent_versions_async(session, agent_ids=[group.manager_agent_id, *(group_update.agent_ids or [])])
             await group.update_async(session, actor=actor)
             return group.to_pydantic()
 
@@ -192,6 +196,7 @@ class GroupManager:
     async def delete_group_async(self, group_id: str, actor: PydanticUser) -> None:
         async with db_registry.async_session() as session:
             group = await GroupModel.read_async(db_session=session, identifier=group_id, actor=actor)
+            await bump_agent_versions_async(session, group_ids=[group_id])
             await group.hard_delete_async(session)
 
     @enforce_types
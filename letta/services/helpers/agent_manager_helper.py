@@ -8,7 +8,7 @@ from letta.schemas.letta_stop_reason import StopReasonType
 logger = get_logger(__name__)
 
 import numpy as np
-from sqlalchemy import Select, and_, asc, desc, func, literal, nulls_last, or_, select, union_all
+from sqlalchemy import Select, and_, asc, desc, func, literal, nulls_last, or_, select, union_all, update
 from sqlalchemy.orm import noload
 from sqlalchemy.sql.expression import exists
 
@@ -34,18 +34,20 @@ from letta.orm.archives_agents import ArchivesAgents
 from letta.orm.errors import NoResultFound
 from letta.orm.identity import Identity
 from letta.orm.passage import ArchivalPassage, SourcePassage
+from letta.orm.passage_tag import PassageTag
 from letta.orm.sources_agents import SourcesAgents
 from letta.otel.tracing import trace_method
 from letta.prompts import gpt_system
 from letta.prompts.prompt_generator import PromptGenerator
 from letta.schemas.agent import AgentState
 from letta.schemas.embedding_config import EmbeddingConfig
-from letta.schemas.enums import AgentType, MessageRole
+from letta.schemas.enums import AgentType, MessageRole, TagMatchMode
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.memory import Memory
 from letta.schemas.message import Message, MessageCreate, ToolReturn
 from letta.schemas.tool_rule import ToolRule
 from letta.schemas.user import User
+from letta.services.passage_vector_index_manager import ann_embedding_expression
 from letta.settings import DatabaseChoice, settings
 from letta.system import get_initial_boot_messages, get_login_event, package_function_response
 
@@ -1084,8 +1086,13 @@ async def build_source_passage_query(
     embed_query: bool = False,
     ascending: bool = True,
     embedding_config: Optional[EmbeddingConfig] = None,
+    use_ann_index: bool = False,
 ) -> Select:
-    """Build query for source passages with all filters applied."""
+    """Build query for source passages with all filters applied.
+
+    With `use_ann_index` (Postgres only), vector ordering uses the expression covered by the source's partial
+    ANN index, so `source_id` must be provided.
+    """
 
     # Handle embedding for vector search
     embedded_text = None
@@ -1122,7 +1129,11 @@ async def build_source_passage_query(
 
     # Handle text search or vector search
     if embedded_text:
-        if settings.database_engine is DatabaseChoice.POSTGRES:
+        if settings.database_engine is DatabaseChoice.POSTGRES and use_ann_index and embedding_config is not None:
+            # order by the exact expression of the source's partial ANN index so the planner can use it
+            ann_expression = ann_embedding_expression(SourcePassage.embedding, embedding_config.embedding_dim)
+            query = query.order_by(ann_expression.cosine_distance(embedded_text[: embedding_config.embedding_dim]).asc())
+        elif settings.database_engine is DatabaseChoice.POSTGRES:
             # PostgreSQL with pgvector
             query = query.order_by(SourcePassage.embedding.cosine_distance(embedded_text).asc())
         else:
@@ -1189,11 +1200,17 @@ async def build_agent_passage_query(
     embed_query: bool = False,
     ascending: bool = True,
     embedding_config: Optional[EmbeddingConfig] = None,
+    tags: Optional[List[str]] = None,
+    tag_match_mode: Optional[TagMatchMode] = None,
+    use_ann_index: bool = False,
 ) -> Select:
     """Build query for agent/archive passages with all filters applied.
 
     Can provide agent_id, archive_id, both, or neither (org-wide search).
     If both are provided, agent_id takes precedence.
+
+    With `use_ann_index` (Postgres only), vector ordering uses the expression covered by the archive's partial
+    ANN index (see `PassageVectorIndexManager`), so `archive_id` must be provided.
     """
 
     # Handle embedding for vector search
@@ -1237,10 +1254,20 @@ async def build_agent_passage_query(
         query = query.where(ArchivalPassage.created_at >= start_date)
     if end_date:
         query = query.where(ArchivalPassage.created_at <= end_date)
+    if tags:
+        # pre-filter through the passage_tags junction table so the limit applies to matching passages
+        tag_subquery = select(PassageTag.passage_id).where(PassageTag.tag.in_(tags), PassageTag.is_deleted == False)
+        if tag_match_mode == TagMatchMode.ALL:
+            tag_subquery = tag_subquery.group_by(PassageTag.passage_id).having(func.count(func.distinct(PassageTag.tag)) == len(set(tags)))
+        query = query.where(ArchivalPassage.id.in_(tag_subquery))
 
     # Handle text search or vector search
     if embedded_text:
-        if settings.database_engine is DatabaseChoice.POSTGRES:
+        if settings.database_engine is DatabaseChoice.POSTGRES and use_ann_index and embedding_config is not None:
+            # order by the exact expression of the archive's partial ANN index so the planner can use it
+            ann_expression = ann_embedding_expression(ArchivalPassage.embedding, embedding_config.embedding_dim)
+            query = query.order_by(ann_expression.cosine_distance(embedded_text[: embedding_config.embedding_dim]).asc())
+        elif settings.database_engine is DatabaseChoice.POSTGRES:
             # PostgreSQL with pgvector
             query = query.order_by(ArchivalPassage.embedding.cosine_distance(embedded_text).asc())
         else:
@@ -1330,3 +1357,64 @@ async def validate_agent_exists_async(session, agent_id: str, actor: User) -> No
 
     if not result.scalar():
         raise LettaAgentNotFoundError(f"Agent with ID {agent_id} not found")
+
+
+async def bump_agent_versions_async(
+    session,
+    agent_ids: Optional[List[str]] = None,
+    block_ids: Optional[List[str]] = None,
+    tool_ids: Optional[List[str]] = None,
+    source_ids: Optional[List[str]] = None,
+    group_ids: Optional[List[str]] = None,
+    identity_ids: Optional[List[str]] = None,
+) -> None:
+    """
+    Increment the version of agents whose attached state changed without an update to the agents row
+    (block contents, tools, sources, groups, identities and their attachments), invalidating cached AgentStates.
+
+    The agent rows stay locked until the caller commits, so call this last in the transaction. They are locked in id
+    order, so concurrent bumps of overlapping agents can't deadlock.
+
+    Args:
+        session: Database session (the bump commits with the caller's write)
+        agent_ids: Agents to bump directly
+        block_ids: Bump every agent these blocks are attached to
+        tool_ids: Bump every agent these tools are attached to
+        source_ids: Bump every agent these sources are attached to
+        group_ids: Bump the members and manager agents of these groups
+        identity_ids: Bump every agent these identities are attached to
+    """
+    from letta.orm.blocks_agents import BlocksAgents
+    from letta.orm.group import Group as GroupModel
+    from letta.orm.groups_agents import GroupsAgents
+    from letta.orm.identities_agents import IdentitiesAgents
+    from letta.orm.sources_agents import SourcesAgents
+    from letta.orm.tools_agents import ToolsAgents
+
+    conditions = []
+    if agent_ids:
+        conditions.append(AgentModel.id.in_({agent_id for agent_id in agent_ids if agent_id}))
+    if block_ids:
+        conditions.append(AgentModel.id.in_(select(BlocksAgents.agent_id).where(BlocksAgents.block_id.in_(block_ids))))
+    if tool_ids:
+        conditions.append(AgentModel.id.in_(select(ToolsAgents.agent_id).where(ToolsAgents.tool_id.in_(tool_ids))))
+    if source_ids:
+        conditions.append(AgentModel.id.in_(select(SourcesAgents.agent_id).where(SourcesAgents.source_id.in_(source_ids))))
+    if group_ids:
+        conditions.append(AgentModel.id.in_(select(GroupsAgents.agent_id).where(GroupsAgents.group_id.in_(group_ids))))
+        conditions.append(AgentModel.id.in_(select(GroupModel.manager_agent_id).where(GroupModel.id.in_(group_ids))))
+    if identity_ids:
+        conditions.append(AgentModel.id.in_(select(IdentitiesAgents.agent_id).where(IdentitiesAgents.identity_id.in_(identity_ids))))
+    if not conditions:
+        return
+
+    result = await session.execute(select(AgentModel.id).where(or_(*conditions)).order_by(AgentModel.id).with_for_update())
+    locked_agent_ids = list(result.scalars().all())
+    if not locked_agent_ids:
+        return
+    await session.execute(
+        update(AgentModel)
+        .where(AgentModel.id.in_(locked_agent_ids))
+        .values(version=AgentModel.version + 1)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from letta.schemas.agent import AgentState
+
+
+class AgentStateCache:
+    """
+    Bounded, process-local LRU of fully loaded AgentStates, validated against `agents.version`.
+
+    Entries are only served when the caller's freshly queried version matches the cached one, so the
+    database stays the source of truth (including for writes made by other processes); the cache only
+    saves the eager relationship load, Pydantic conversion and secret decryption.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[int, AgentState]]" = OrderedDict()
+
+    def get(self, key: Hashable, version: int) -> Optional[AgentState]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cached_version, agent_state = entry
+        if cached_version != version:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        # callers mutate the returned state (message_ids, isolated blocks, ...), so never hand out the cached object
+        return agent_state.model_copy(deep=True)
+
+    def put(self, key: Hashable, version: int, agent_state: AgentState) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (version, agent_state.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, agent_id: str) -> None:
+        for key in [k for k in self._entries if k[0] == agent_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
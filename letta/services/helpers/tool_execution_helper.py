@@ -31,11 +31,7 @@ def find_python_executable(local_configs: LocalSandboxConfig) -> str:
         return "python.exe" if platform.system().lower().startswith("win") else "python3"
 
     venv_path = os.path.join(sandbox_dir, local_configs.venv_name)
-    python_exec = (
-        os.path.join(venv_path, "Scripts", "python.exe")
-        if platform.system().startswith("Win")
-        else os.path.join(venv_path, "bin", "python3")
-    )
+    python_exec = venv_python_executable(venv_path)
 
     if not os.path.isfile(python_exec):
         raise FileNotFoundError(f"Python executable not found: {python_exec}. Ensure the virtual environment exists.")
@@ -43,6 +39,13 @@ def find_python_executable(local_configs: LocalSandboxConfig) -> str:
     return python_exec
 
 
+def venv_python_executable(venv_path: str) -> str:
+    """Path of the Python binary inside the virtual environment at `venv_path`."""
+    if platform.system().startswith("Win"):
+        return os.path.join(venv_path, "Scripts", "python.exe")
+    return os.path.join(venv_path, "bin", "python3")
+
+
 def run_subprocess(command: list, env: Optional[Dict[str, str]] = None, fail_msg: str = "Command failed"):
     """
     Helper to execute a subprocess with logging and error handling.
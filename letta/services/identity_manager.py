@@ -22,6 +22,7 @@ from letta.schemas.identity import (
 )
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
 from letta.settings import DatabaseChoice, settings
 from letta.utils import bounded_gather, decrypt_agent_secrets, enforce_types
 from letta.validators import raise_on_invalid_id
@@ -189,6 +190,8 @@ class IdentityManager:
         actor: PydanticUser,
         replace: bool = False,
     ) -> PydanticIdentity:
+        # agents attached before the update (some may be detached by it) and after it see the change
+        await bump_agent_versions_async(db_session, identity_ids=[existing_identity.id], agent_ids=identity.agent_ids)
         if identity.identifier_key is not None:
             existing_identity.identifier_key = identity.identifier_key
         if identity.name is not None:
@@ -255,6 +258,7 @@ class IdentityManager:
                 raise HTTPException(status_code=404, detail="Identity not found")
             if identity.organization_id != actor.organization_id:
                 raise HTTPException(status_code=403, detail="Forbidden")
+            await bump_agent_versions_async(session, identity_ids=[identity_id])
             await session.delete(identity)
             # context manager now handles commits
             # await session.commit()
@@ -393,6 +397,7 @@ class IdentityManager:
             if agent not in identity.agents:
                 identity.agents.append(agent)
                 await identity.update_async(db_session=session, actor=actor)
+                await bump_agent_versions_async(session, agent_ids=[agent_id])
 
     @enforce_types
     @raise_on_invalid_id(param_name="identity_id", expected_prefix=PrimitiveType.IDENTITY)
@@ -411,6 +416,7 @@ class IdentityManager:
             if agent in identity.agents:
                 identity.agents.remove(agent)
                 await identity.update_async(db_session=session, actor=actor)
+                await bump_agent_versions_async(session, agent_ids=[agent_id])
 
     @enforce_types
     @raise_on_invalid_id(param_name="identity_id", expected_prefix=PrimitiveType.IDENTITY)
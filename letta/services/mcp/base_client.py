@@ -1,9 +1,9 @@
 from contextlib import AsyncExitStack
-from typing import Optional, Tuple
+from typing import Any, Awaitable, Callable, Optional, Tuple
 
 from mcp import ClientSession, Tool as MCPTool
 from mcp.client.auth import OAuthClientProvider
-from mcp.types import TextContent
+from mcp.types import TextContent, ToolListChangedNotification
 
 from letta.errors import LettaMCPConnectionError
 from letta.functions.mcp_client.types import BaseServerConfig
@@ -37,6 +37,17 @@ def _log_mcp_tool_error(log: "get_logger", tool_name: str, exc: Exception) -> No
         log.warning(f"MCP tool '{tool_name}' execution failed with unexpected error ({exc_name}): {exc}", exc_info=True)
 
 
+async def _dispatch_tools_list_changed(message: Any, on_tools_list_changed: Optional[Callable[[], Awaitable[None]]]) -> None:
+    """Message handler body shared by the MCP clients: runs the callback on `notifications/tools/list_changed`."""
+    # server notifications are wrapped in a RootModel in some versions of the mcp package
+    if on_tools_list_changed is None or not isinstance(getattr(message, "root", message), ToolListChangedNotification):
+        return
+    try:
+        await on_tools_list_changed()
+    except Exception as e:
+        logger.warning(f"Handling MCP tools/list_changed notification failed: {e}")
+
+
 # TODO: Get rid of Async prefix on this class name once we deprecate old sync code
 class AsyncBaseMCPClient:
     # HTTP headers
@@ -51,6 +62,8 @@ class AsyncBaseMCPClient:
         self.exit_stack = AsyncExitStack()
         self.session: Optional[ClientSession] = None
         self.initialized = False
+        # called when the server announces that its tool list changed
+        self.on_tools_list_changed: Optional[Callable[[], Awaitable[None]]] = None
 
     async def connect_to_server(self):
         try:
@@ -80,6 +93,9 @@ class AsyncBaseMCPClient:
     async def _initialize_connection(self, server_config: BaseServerConfig) -> None:
         raise NotImplementedError("Subclasses must implement _initialize_connection")
 
+    async def _handle_message(self, message: Any) -> None:
+        await _dispatch_tools_list_changed(message, self.on_tools_list_changed)
+
     async def list_tools(self, serialize: bool = False) -> list[MCPTool]:
         self._check_initialized()
         response = await self.session.list_tools()
@@ -128,6 +144,10 @@ class AsyncBaseMCPClient:
 
         return final_content, not result.isError
 
+    async def ping(self) -> None:
+        self._check_initialized()
+        await self.session.send_ping()
+
     def _check_initialized(self):
         if not self.initialized:
             logger.error("MCPClient has not been initialized")
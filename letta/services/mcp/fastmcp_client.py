@@ -9,7 +9,7 @@ implementations that used the lower-level MCP SDK directly.
 """
 
 from contextlib import AsyncExitStack
-from typing import List, Optional, Tuple
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 
 import httpx
 from fastmcp import Client
@@ -19,7 +19,7 @@ from mcp import Tool as MCPTool
 from letta.errors import LettaMCPConnectionError
 from letta.functions.mcp_client.types import SSEServerConfig, StreamableHTTPServerConfig
 from letta.log import get_logger
-from letta.services.mcp.base_client import _log_mcp_tool_error
+from letta.services.mcp.base_client import _dispatch_tools_list_changed, _log_mcp_tool_error
 from letta.services.mcp.server_side_oauth import ServerSideOAuth
 
 logger = get_logger(__name__)
@@ -52,6 +52,8 @@ class AsyncFastMCPSSEClient:
         self.client: Optional[Client] = None
         self.initialized = False
         self.exit_stack = AsyncExitStack()
+        # called when the server announces that its tool list changed
+        self.on_tools_list_changed: Optional[Callable[[], Awaitable[None]]] = None
 
     async def connect_to_server(self):
         """Establish connection to the MCP server.
@@ -74,7 +76,7 @@ class AsyncFastMCPSSEClient:
                 auth=self.oauth,  # Pass ServerSideOAuth instance (or None)
             )
 
-            self.client = Client(transport)
+            self.client = Client(transport, message_handler=self._handle_message)
             await self.client._connect()
             self.initialized = True
         except httpx.HTTPStatusError as e:
@@ -166,6 +168,14 @@ class AsyncFastMCPSSEClient:
 
         return final_content, not result.is_error
 
+    async def _handle_message(self, message: Any) -> None:
+        await _dispatch_tools_list_changed(message, self.on_tools_list_changed)
+
+    async def ping(self) -> None:
+        """Check that the server still answers on this connection."""
+        self._check_initialized()
+        await self.client.ping()
+
     def _check_initialized(self):
         """Check if the client has been initialized."""
         if not self.initialized:
@@ -209,6 +219,8 @@ class AsyncFastMCPStreamableHTTPClient:
         self.client: Optional[Client] = None
         self.initialized = False
         self.exit_stack = AsyncExitStack()
+        # called when the server announces that its tool list changed
+        self.on_tools_list_changed: Optional[Callable[[], Awaitable[None]]] = None
 
     async def connect_to_server(self):
         """Establish connection to the MCP server.
@@ -231,7 +243,7 @@ class AsyncFastMCPStreamableHTTPClient:
                 auth=self.oauth,  # Pass ServerSideOAuth instance (or None)
             )
 
-            self.client = Client(transport)
+            self.client = Client(transport, message_handler=self._handle_message)
             await self.client._connect()
             self.initialized = True
         except httpx.HTTPStatusError as e:
@@ -323,6 +335,14 @@ class AsyncFastMCPStreamableHTTPClient:
 
         return final_content, not result.is_error
 
+    async def _handle_message(self, message: Any) -> None:
+        await _dispatch_tools_list_changed(message, self.on_tools_list_changed)
+
+    async def ping(self) -> None:
+        """Check that the server still answers on this connection."""
+        self._check_initialized()
+        await self.client.ping()
+
     def _check_initialized(self):
         """Check if the client has been initialized."""
         if not self.initialized:
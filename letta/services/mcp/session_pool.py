@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar, Union
+
+from letta.errors import LettaMCPConnectionError
+from letta.functions.mcp_client.types import SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig
+from letta.log import get_logger
+from letta.schemas.user import User as PydanticUser
+from letta.services.mcp.base_client import AsyncBaseMCPClient
+from letta.services.mcp.fastmcp_client import AsyncFastMCPSSEClient, AsyncFastMCPStreamableHTTPClient
+from letta.settings import tool_settings
+
+logger = get_logger(__name__)
+
+MCPClient = Union[AsyncBaseMCPClient, AsyncFastMCPSSEClient, AsyncFastMCPStreamableHTTPClient]
+T = TypeVar("T")
+
+# errors (by class name, like EXPECTED_MCP_TOOL_ERRORS) that mean the underlying transport is gone
+_BROKEN_SESSION_ERRORS = {
+    "ClosedResourceError",
+    "BrokenResourceError",
+    "EndOfStream",
+    "ConnectError",
+    "ReadError",
+    "RemoteProtocolError",
+    "ConnectionError",
+    "BrokenPipeError",
+    "ConnectionResetError",
+}
+
+
+def mcp_session_pool_key(
+    server_config: Union[SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig], actor: PydanticUser, agent_id: Optional[str]
+) -> Hashable:
+    """
+    Pool key for a resolved server config: the organization and server name (see `invalidate_mcp_sessions`), the config
+    itself (which includes resolved auth headers and env vars), the user for URL servers (OAuth sessions are per user)
+    and the agent id, which is sent as a per-connection header unless `mcp_session_share_across_agents` is set.
+    """
+    config_hash = hashlib.sha256(server_config.model_dump_json().encode("utf-8")).hexdigest()
+    user_id = actor.id if getattr(server_config, "server_url", None) else None
+    return (actor.organization_id, server_config.server_name, config_hash, user_id, agent_id)
+
+
+def _is_broken_session_error(e: BaseException) -> bool:
+    if isinstance(e, LettaMCPConnectionError):
+        return True
+    if hasattr(e, "exceptions") and e.exceptions and len(e.exceptions) == 1:
+        e = e.exceptions[0]
+    return type(e).__name__ in _BROKEN_SESSION_ERRORS
+
+
+@dataclass
+class _PooledSession:
+    client: MCPClient
+    ready: asyncio.Future
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+    owner: Optional[asyncio.Task] = None
+    last_used: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    broken: bool = False
+    # no longer handed out; the connection closes once in_flight drops to 0
+    retired: bool = False
+
+
+class MCPSessionPool:
+    """
+    Keeps initialized MCP client sessions open and shares them across tool calls, instead of connecting (and running the
+    MCP `initialize` handshake, plus spawning a process for stdio servers) on every call.
+
+    Each session is owned by a dedicated task that connects, waits until the session is closed and then cleans up, since
+    the MCP transports require connect and cleanup to happen in the same task. Calls through a session are bounded by a
+    per-server semaphore; sessions idle for longer than the health check interval are pinged before reuse; sessions that
+    fail with a transport error are dropped and reconnected; and sessions idle for longer than the TTL are closed.
+    Sessions closed by invalidation or a failed health check finish the calls already running on them first.
+    """
+
+    def __init__(self, idle_ttl_seconds: float, health_check_interval_seconds: float, max_concurrent_calls: int):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.max_concurrent_calls = max(max_concurrent_calls, 1)
+        self.loop = asyncio.get_running_loop()
+        self._sessions: Dict[Hashable, _PooledSession] = {}
+        self._semaphores: Dict[Hashable, asyncio.Semaphore] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # calls inside run() per key, including those still waiting on the key's semaphore
+        self._callers: Dict[Hashable, int] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def _own(self, entry: _PooledSession) -> None:
+        try:
+            await entry.client.connect_to_server()
+        except BaseException as e:
+            if not entry.ready.done():
+                entry.ready.set_exception(e)
+            await entry.client.cleanup()
+            return
+        entry.ready.set_result(None)
+        try:
+            await entry.closed.wait()
+        finally:
+            await entry.client.cleanup()
+
+    def _open(self, key: Hashable, client: MCPClient) -> _PooledSession:
+        entry = _PooledSession(client=client, ready=self.loop.create_future())
+        entry.owner = asyncio.create_task(self._own(entry), name=f"mcp_session[{getattr(client.server_config, 'server_name', '')}]")
+        self._sessions[key] = entry
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle(), name="mcp_session_pool_reaper")
+        return entry
+
+    def _close(self, key: Hashable, entry: _PooledSession, force: bool = False) -> None:
+        """Stop handing out `entry`; its connection closes when the calls running on it finish, or right away if `force`."""
+        if self._sessions.get(key) is entry:
+            del self._sessions[key]
+        entry.retired = True
+        if force or entry.in_flight == 0:
+            entry.closed.set()
+
+    async def _healthy(self, entry: _PooledSession) -> bool:
+        if entry.broken or entry.owner.done() or entry.ready.cancelled() or entry.ready.exception():
+            return False
+        if time.monotonic() - entry.last_checked < self.health_check_interval_seconds:
+            return True
+        try:
+            await asyncio.wait_for(entry.client.ping(), timeout=tool_settings.mcp_connect_to_server_timeout)
+        except Exception as e:
+            logger.info(f"Pooled MCP session failed its health check, reconnecting: {e}")
+            return False
+        entry.last_checked = time.monotonic()
+        return True
+
+    async def _acquire(self, key: Hashable, client_factory: Callable[[], Awaitable[MCPClient]]) -> _PooledSession:
+        # one opener per key, so concurrent first calls share a single connection
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = self._sessions.get(key)
+            if entry is not None and entry.ready.done() and not await self._healthy(entry):
+                self._close(key, entry)
+                entry = None
+            if entry is None:
+                entry = self._open(key, await client_factory())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(entry.ready), timeout=tool_settings.mcp_connect_to_server_timeout)
+        except BaseException:
+            self._close(key, entry)
+            raise
+        return entry
+
+    async def run(
+        self,
+        key: Hashable,
+        client_factory: Callable[[], Awaitable[MCPClient]],
+        fn: Callable[[MCPClient], Awaitable[T]],
+        idempotent: bool = False,
+    ) -> T:
+        """
+        Run `fn` against a warm session for `key`, opening one with `client_factory` if needed.
+
+        If the session turns out to be broken it is dropped (the next call reconnects); `idempotent` calls such as tool
+        listing are retried once on a fresh session right away.
+        """
+        # counted before waiting on the semaphore, so the reaper keeps this key's semaphore and lock while calls queue
+        self._callers[key] = self._callers.get(key, 0) + 1
+        try:
+            semaphore = self._semaphores.setdefault(key, asyncio.Semaphore(self.max_concurrent_calls))
+            async with semaphore:
+                for attempt in range(2 if idempotent else 1):
+                    entry = await self._acquire(key, client_factory)
+                    entry.in_flight += 1
+                    try:
+                        return await fn(entry.client)
+                    except BaseException as e:
+                        if not _is_broken_session_error(e):
+                            raise
+                        entry.broken = True
+                        self._close(key, entry, force=True)
+                        if attempt == 1 or not idempotent:
+                            raise
+                        logger.info(f"Pooled MCP session broke ({type(e).__name__}), retrying on a new session")
+                    finally:
+                        entry.in_flight -= 1
+                        entry.last_used = time.monotonic()
+                        if entry.retired and entry.in_flight == 0:
+                            entry.closed.set()
+        finally:
+            self._callers[key] -= 1
+            if not self._callers[key]:
+                del self._callers[key]
+
+    async def _reap_idle(self) -> None:
+        while self._sessions:
+            await asyncio.sleep(max(min(self.idle_ttl_seconds, 60), 1))
+            self._close_idle_sessions()
+
+    def _close_idle_sessions(self) -> None:
+        now = time.monotonic()
+        for key, entry in list(self._sessions.items()):
+            if key not in self._callers and now - entry.last_used >= self.idle_ttl_seconds:
+                logger.debug(f"Closing idle MCP session for {getattr(entry.client.server_config, 'server_name', key)}")
+                self._close(key, entry)
+        for key in list(self._semaphores):
+            if key not in self._callers and key not in self._sessions:
+                self._semaphores.pop(key, None)
+                self._locks.pop(key, None)
+
+    async def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Close every session whose key matches `predicate` (e.g. after the server config changed)."""
+        for key, entry in list(self._sessions.items()):
+            if predicate(key):
+                self._close(key, entry)
+
+    async def close(self) -> None:
+        entries = list(self._sessions.values())
+        for key, entry in list(self._sessions.items()):
+            self._close(key, entry, force=True)
+        await asyncio.gather(*(entry.owner for entry in entries if entry.owner), return_exceptions=True)
+        if self._reaper:
+            self._reaper.cancel()
+
+
+_session_pool: Optional[MCPSessionPool] = None
+
+
+def get_mcp_session_pool() -> MCPSessionPool:
+    """The process-wide MCP session pool for the running event loop."""
+    global _session_pool
+    # sessions are bound to the loop that opened them
+    if _session_pool is None or _session_pool.loop is not asyncio.get_running_loop():
+        _session_pool = MCPSessionPool(
+            idle_ttl_seconds=tool_settings.mcp_session_idle_ttl_seconds,
+            health_check_interval_seconds=tool_settings.mcp_session_health_check_interval_seconds,
+            max_concurrent_calls=tool_settings.mcp_session_max_concurrent_calls,
+        )
+    return _session_pool
+
+
+async def invalidate_mcp_sessions(organization_id: str, server_name: str) -> None:
+    """Close the pooled sessions to an MCP server after it was updated or deleted, so none keeps using the old config."""
+    if _session_pool is None or _session_pool.loop is not asyncio.get_running_loop():
+        return
+    await _session_pool.invalidate(lambda key: key[0] == organization_id and key[1] == server_name)
+
+
+async def run_with_pooled_mcp_client(
+    get_mcp_client: Callable[..., Awaitable[MCPClient]],
+    server_config: Union[SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig],
+    actor: PydanticUser,
+    agent_id: Optional[str],
+    fn: Callable[[MCPClient], Awaitable[T]],
+    idempotent: bool = False,
+    on_tools_list_changed: Optional[Callable[[], Awaitable[None]]] = None,
+) -> T:
+    """
+    Run `fn` on a pooled session for `server_config`, creating the client (and resolving OAuth) only on connect.
+
+    `on_tools_list_changed` is registered on newly opened sessions and called when the server sends
+    `notifications/tools/list_changed`.
+    """
+    if tool_settings.mcp_session_share_across_agents:
+        agent_id = None
+
+    async def client_factory() -> MCPClient:
+        client = await get_mcp_client(server_config, actor, agent_id=agent_id)
+        client.on_tools_list_changed = on_tools_list_changed
+        return client
+
+    return await get_mcp_session_pool().run(
+        key=mcp_session_pool_key(server_config, actor, agent_id),
+        client_factory=client_factory,
+        fn=fn,
+        idempotent=idempotent,
+    )
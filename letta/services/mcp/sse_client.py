@@ -47,5 +47,5 @@ class AsyncSSEMCPClient(AsyncBaseMCPClient):
         self.stdio, self.write = sse_transport
 
         # Create and enter the ClientSession context manager
-        session_cm = ClientSession(self.stdio, self.write)
+        session_cm = ClientSession(self.stdio, self.write, message_handler=self._handle_message)
         self.session = await self.exit_stack.enter_async_context(session_cm)
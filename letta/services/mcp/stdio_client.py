@@ -22,4 +22,6 @@ class AsyncStdioMCPClient(AsyncBaseMCPClient):
         server_params = StdioServerParameters(command=server_config.command, args=args, env=server_config.env)
         stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
         self.stdio, self.write = stdio_transport
-        self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
+        self.session = await self.exit_stack.enter_async_context(
+            ClientSession(self.stdio, self.write, message_handler=self._handle_message)
+        )
@@ -56,7 +56,7 @@ class AsyncStreamableHTTPMCPClient(AsyncBaseMCPClient):
             read_stream, write_stream, _ = await self.exit_stack.enter_async_context(streamable_http_cm)
 
             # Create and enter the ClientSession context manager
-            session_cm = ClientSession(read_stream, write_stream)
+            session_cm = ClientSession(read_stream, write_stream, message_handler=self._handle_message)
             self.session = await self.exit_stack.enter_async_context(session_cm)
         except Exception as e:
             # Provide more helpful error messages for specific error types
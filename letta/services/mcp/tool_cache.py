@@ -0,0 +1,89 @@
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from letta.constants import MCP_TOOL_CACHE_PREFIX
+from letta.data_sources.redis_client import get_redis_client
+from letta.functions.mcp_client.types import MCPTool
+from letta.log import get_logger
+from letta.settings import tool_settings
+
+logger = get_logger(__name__)
+
+
+class MCPToolCache:
+    """
+    Cache of MCP server tool listings, keyed by organization and server id.
+
+    Listings live in Redis (shared by every server process, expiring after `mcp_tool_cache_ttl_seconds`) with a
+    short-lived in-process tier in front of it, so repeated listings neither connect to the remote server nor round-trip
+    to Redis. Entries are dropped when the server is updated or deleted, when it sends `notifications/tools/list_changed`
+    and when a resync is forced. Failures to read or write Redis are logged and treated as a miss.
+    """
+
+    def __init__(self, ttl_seconds: int, local_ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = min(local_ttl_seconds, ttl_seconds)
+        self._local: Dict[Tuple[str, str], Tuple[float, List[MCPTool]]] = {}
+
+    @staticmethod
+    def _redis_key(organization_id: str, mcp_server_id: str) -> str:
+        return f"{MCP_TOOL_CACHE_PREFIX}{organization_id}:{mcp_server_id}"
+
+    async def get(self, organization_id: str, mcp_server_id: str) -> Optional[List[MCPTool]]:
+        """The cached tool listing for the server, or None on a miss."""
+        key = (organization_id, mcp_server_id)
+        local = self._local.get(key)
+        if local is not None:
+            expires_at, tools = local
+            if time.monotonic() < expires_at:
+                return [tool.model_copy(deep=True) for tool in tools]
+            self._local.pop(key, None)
+
+        try:
+            redis_client = await get_redis_client()
+            cached = await redis_client.get(self._redis_key(organization_id, mcp_server_id))
+            if cached is None:
+                return None
+            tools = [MCPTool.model_validate(tool) for tool in json.loads(cached)]
+        except Exception as e:
+            logger.warning(f"Failed to read MCP tool cache for server {mcp_server_id}: {e}")
+            return None
+
+        self._local[key] = (time.monotonic() + self.local_ttl_seconds, tools)
+        return [tool.model_copy(deep=True) for tool in tools]
+
+    async def set(self, organization_id: str, mcp_server_id: str, tools: List[MCPTool]) -> None:
+        tools = [tool if isinstance(tool, MCPTool) else MCPTool.model_validate(tool.model_dump()) for tool in tools]
+        self._local[(organization_id, mcp_server_id)] = (
+            time.monotonic() + self.local_ttl_seconds,
+            [tool.model_copy(deep=True) for tool in tools],
+        )
+        try:
+            redis_client = await get_redis_client()
+            payload = json.dumps([tool.model_dump(mode="json", exclude_none=True) for tool in tools])
+            await redis_client.set(self._redis_key(organization_id, mcp_server_id), payload, ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to write MCP tool cache for server {mcp_server_id}: {e}")
+
+    async def invalidate(self, organization_id: str, mcp_server_id: str) -> None:
+        self._local.pop((organization_id, mcp_server_id), None)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.delete(self._redis_key(organization_id, mcp_server_id))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate MCP tool cache for server {mcp_server_id}: {e}")
+
+
+_tool_cache: Optional[MCPToolCache] = None
+
+
+def get_mcp_tool_cache() -> MCPToolCache:
+    """The process-wide MCP tool listing cache."""
+    global _tool_cache
+    if _tool_cache is None:
+        _tool_cache = MCPToolCache(
+            ttl_seconds=tool_settings.mcp_tool_cache_ttl_seconds,
+            local_ttl_seconds=tool_settings.mcp_tool_cache_local_ttl_seconds,
+        )
+    return _tool_cache
@@ -46,11 +46,13 @@ from letta.server.db import db_registry
 from letta.services.mcp.base_client import AsyncBaseMCPClient
 from letta.services.mcp.fastmcp_client import AsyncFastMCPSSEClient, AsyncFastMCPStreamableHTTPClient
 from letta.services.mcp.server_side_oauth import ServerSideOAuth
+from letta.services.mcp.session_pool import invalidate_mcp_sessions, run_with_pooled_mcp_client
 from letta.services.mcp.sse_client import MCP_CONFIG_TOPLEVEL_KEY
 from letta.services.mcp.stdio_client import AsyncStdioMCPClient
+from letta.services.mcp.tool_cache import get_mcp_tool_cache
 from letta.services.tool_manager import ToolManager
 from letta.settings import tool_settings
-from letta.utils import enforce_types, printd, safe_create_task_with_return
+from letta.utils import enforce_types, printd, safe_create_task, safe_create_task_with_return
 from letta.validators import raise_on_invalid_id
 
 logger = get_logger(__name__)
@@ -66,18 +68,40 @@ class MCPManager:
 
     @enforce_types
     @raise_on_invalid_id(param_name="agent_id", expected_prefix=PrimitiveType.AGENT)
-    async def list_mcp_server_tools(self, mcp_server_name: str, actor: PydanticUser, agent_id: Optional[str] = None) -> List[MCPTool]:
-        """Get a list of all tools for a specific MCP server."""
+    async def list_mcp_server_tools(
+        self, mcp_server_name: str, actor: PydanticUser, agent_id: Optional[str] = None, refresh: bool = False
+    ) -> List[MCPTool]:
+        """
+        Get a list of all tools for a specific MCP server.
+
+        Served from the MCP tool cache when it is enabled, unless `refresh` is set, in which case the listing is fetched
+        from the server and the cache is updated.
+        """
         mcp_client = None
         try:
             mcp_server_id = await self.get_mcp_server_id_by_name(mcp_server_name, actor=actor)
+            if tool_settings.mcp_tool_cache_enabled and not refresh:
+                cached_tools = await get_mcp_tool_cache().get(actor.organization_id, mcp_server_id)
+                if cached_tools is not None:
+                    return cached_tools
+
             mcp_config = await self.get_mcp_server_by_id_async(mcp_server_id, actor=actor)
             server_config = await mcp_config.to_config_async()
-            mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
-            await mcp_client.connect_to_server()
-
             # list tools
-            tools = await mcp_client.list_tools()
+            if tool_settings.mcp_session_pool_enabled:
+                tools = await run_with_pooled_mcp_client(
+                    self.get_mcp_client,
+                    server_config,
+                    actor,
+                    agent_id,
+                    lambda client: client.list_tools(),
+                    idempotent=True,
+                    on_tools_list_changed=self._on_tools_list_changed_callback(mcp_server_name, mcp_server_id, actor),
+                )
+            else:
+                mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
+                await mcp_client.connect_to_server()
+                tools = await mcp_client.list_tools()
             # Add health information to each tool
             for tool in tools:
                 # Try to normalize the schema and re-validate
@@ -86,6 +110,8 @@ class MCPManager:
                     health_status, reasons = validate_complete_json_schema(tool.inputSchema)
                     tool.health = MCPToolHealth(status=health_status.value, reasons=reasons)
 
+            if tool_settings.mcp_tool_cache_enabled:
+                await get_mcp_tool_cache().set(actor.organization_id, mcp_server_id, tools)
             return tools
         except Exception as e:
             # MCP tool listing errors are often due to connection/configuration issues, not system errors
@@ -96,6 +122,20 @@ class MCPManager:
             if mcp_client:
                 await mcp_client.cleanup()
 
+    def _on_tools_list_changed_callback(self, mcp_server_name: str, mcp_server_id: str, actor: PydanticUser):
+        """Callback for pooled sessions: drop the server's cached tool listing and re-fetch it in the background."""
+
+        async def on_tools_list_changed():
+            if not tool_settings.mcp_tool_cache_enabled:
+                return
+            logger.info(f"MCP server {mcp_server_name} reported a tool list change, refreshing its cached tools")
+            await get_mcp_tool_cache().invalidate(actor.organization_id, mcp_server_id)
+            safe_create_task(
+                self.list_mcp_server_tools(mcp_server_name, actor=actor, refresh=True), label=f"refresh MCP tools for {mcp_server_name}"
+            )
+
+        return on_tools_list_changed
+
     @enforce_types
     async def execute_mcp_server_tool(
         self,
@@ -121,11 +161,24 @@ class MCPManager:
                     raise ValueError(f"MCP server {mcp_server_name} not found in config.")
                 server_config = mcp_config[mcp_server_name]
 
-            mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
-            await mcp_client.connect_to_server()
-
             # call tool
-            result, success = await mcp_client.execute_tool(tool_name, tool_args)
+            if tool_settings.mcp_session_pool_enabled:
+                result, success = await run_with_pooled_mcp_client(
+                    self.get_mcp_client,
+                    server_config,
+                    actor,
+                    agent_id,
+                    lambda client: client.execute_tool(tool_name, tool_args),
+                    on_tools_list_changed=(
+                        self._on_tools_list_changed_callback(mcp_server_name, mcp_server_id, actor)
+                        if not tool_settings.mcp_read_from_config
+                        else None
+                    ),
+                )
+            else:
+                mcp_client = await self.get_mcp_client(server_config, actor, agent_id=agent_id)
+                await mcp_client.connect_to_server()
+                result, success = await mcp_client.execute_tool(tool_name, tool_args)
             logger.info(f"MCP Result: {result}, Success: {success}")
             # TODO: change to pydantic tool
             return result, success
@@ -209,7 +262,7 @@ class MCPManager:
 
         # Fetch current tools from MCP server
         try:
-            current_mcp_tools = await self.list_mcp_server_tools(mcp_server_name, actor=actor, agent_id=agent_id)
+            current_mcp_tools = await self.list_mcp_server_tools(mcp_server_name, actor=actor, agent_id=agent_id, refresh=True)
         except Exception as e:
             logger.error(f"Failed to fetch tools from MCP server {mcp_server_name}: {e}")
             raise HTTPException(
@@ -541,6 +594,7 @@ class MCPManager:
         async with db_registry.async_session() as session:
             # Fetch the tool by ID
             mcp_server = await MCPServerModel.read_async(db_session=session, identifier=mcp_server_id, actor=actor)
+            previous_server_name = mcp_server.server_name
 
             # Update tool attributes with only the fields that were explicitly set
             update_data = mcp_server_update.model_dump(to_orm=True, exclude_unset=True)
@@ -590,6 +644,13 @@ class MCPManager:
 
             mcp_server = await mcp_server.update_async(db_session=session, actor=actor)
 
+            # the server may now list different tools (e.g. a new URL or credentials)
+            if tool_settings.mcp_tool_cache_enabled:
+                await get_mcp_tool_cache().invalidate(actor.organization_id, mcp_server_id)
+            # pooled sessions were opened with the old config (and possibly under the old name)
+            if tool_settings.mcp_session_pool_enabled:
+                await invalidate_mcp_sessions(actor.organization_id, previous_server_name)
+
             # Save the updated tool to the database mcp_server = await mcp_server.update_async(db_session=session, actor=actor)
             return mcp_server.to_pydantic()
 
@@ -667,6 +728,7 @@ class MCPManager:
                 if not mcp_server:
                     raise NoResultFound(f"MCP server with id {mcp_server_id} not found.")
 
+                server_name = mcp_server.server_name
                 server_url = getattr(mcp_server, "server_url", None)
                 # Get all tools with matching metadata
                 stmt = select(ToolModel).where(ToolModel.organization_id == actor.organization_id)
@@ -735,6 +797,11 @@ class MCPManager:
                 logger.error(f"Failed to delete MCP server {mcp_server_id}: {e}")
                 raise
 
+        if tool_settings.mcp_tool_cache_enabled:
+            await get_mcp_tool_cache().invalidate(actor.organization_id, mcp_server_id)
+        if tool_settings.mcp_session_pool_enabled:
+            await invalidate_mcp_sessions(actor.organization_id, server_name)
+
     async def read_mcp_config(self) -> dict[str, Union[SSEServerConfig, StdioServerConfig, StreamableHTTPServerConfig]]:
         mcp_server_list = {}
 
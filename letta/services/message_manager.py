@@ -1,30 +1,36 @@
+import base64
 import json
 import uuid
-from datetime import datetime
-from typing import List, Optional, Sequence, Set, Tuple
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple, get_args
 
-from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy import JSON, and_, delete, exists, func, literal_column, or_, select, text, type_coerce, update
 
-from letta.constants import CONVERSATION_SEARCH_TOOL_NAME, DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG
+from letta.constants import CONVERSATION_SEARCH_TOOL_NAME, DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG, MESSAGE_EMBEDDING_DIM
+from letta.errors import LettaInvalidArgumentError
 from letta.log import get_logger
 from letta.orm.conversation_messages import ConversationMessage
 from letta.orm.errors import NoResultFound
-from letta.orm.message import Message as MessageModel
+from letta.orm.message import MESSAGE_SEARCH_VECTOR_SQL, Message as MessageModel
 from letta.otel.tracing import trace_method
 from letta.schemas.enums import MessageRole, PrimitiveType
 from letta.schemas.letta_message import LettaMessageUpdateUnion
-from letta.schemas.letta_message_content import ImageSourceType, LettaImage, MessageContentType
-from letta.schemas.message import Message as PydanticMessage, MessageSearchResult, MessageUpdate
+from letta.schemas.letta_message_content import ImageSourceType, LettaImage, MessageContentType, TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message as PydanticMessage, MessageField, MessageSearchResult, MessageUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.file_manager import FileManager
 from letta.services.helpers.agent_manager_helper import validate_agent_exists_async
+from letta.services.step_write_buffer import get_step_write_buffer
 from letta.settings import DatabaseChoice, settings
 from letta.utils import enforce_types, fire_and_forget
 from letta.validators import raise_on_invalid_id
 
 logger = get_logger(__name__)
 
+MESSAGE_FIELDS = get_args(MessageField)
+
 
 @trace_method
 def backfill_missing_tool_call_ids(messages: list, agent_id: Optional[str] = None, actor: Optional[PydanticUser] = None) -> list:
@@ -119,6 +125,20 @@ def backfill_missing_tool_call_ids(messages: list, agent_id: Optional[str] = Non
     return updated_messages
 
 
+def encode_message_cursor(created_at: datetime, sequence_id: int) -> str:
+    """Opaque keyset cursor of a message position, its (created_at, sequence_id)."""
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), sequence_id]).encode()).decode()
+
+
+def decode_message_cursor(cursor: str) -> Tuple[datetime, int]:
+    """The (created_at, sequence_id) of a cursor from `encode_message_cursor`."""
+    try:
+        created_at, sequence_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(sequence_id)
+    except (ValueError, TypeError) as e:
+        raise LettaInvalidArgumentError(f"Invalid message cursor: {cursor}", argument_name="after") from e
+
+
 class MessageManager:
     """Manager class to handle business logic related to Messages."""
 
@@ -472,6 +492,16 @@ class MessageManager:
 
         return new_messages, existing_messages
 
+    async def _get_agent_llm_configs_async(self, agent_ids: Set[str]) -> Dict[str, LLMConfig]:
+        """The LLM configs of the given agents, by agent ID."""
+        if not agent_ids:
+            return {}
+        from letta.orm.agent import Agent as AgentModel
+
+        async with db_registry.async_session(read_only=True) as session:
+            result = await session.execute(select(AgentModel.id, AgentModel.llm_config).where(AgentModel.id.in_(agent_ids)))
+            return {agent_id: llm_config for agent_id, llm_config in result.all() if llm_config}
+
     @enforce_types
     @trace_method
     async def create_many_messages_async(
@@ -568,6 +598,18 @@ class MessageManager:
                     if msg.run_id in missing_run_ids:
                         msg.run_id = None
 
+        if settings.use_local_token_counter:
+            from letta.services.context_window_calculator.token_counter import compute_message_token_counts
+
+            # count with the tokenizer of each agent's model, so the persisted counts match its context window checks
+            llm_configs = await self._get_agent_llm_configs_async({msg.agent_id for msg in messages_to_create if msg.agent_id})
+            for message in messages_to_create:
+                message.token_counts = compute_message_token_counts(message, llm_config=llm_configs.get(message.agent_id))
+
+        if settings.step_write_buffer_enabled:
+            # messages reference their step, so buffered steps must be written first
+            await get_step_write_buffer().flush_steps({msg.step_id for msg in messages_to_create if msg.step_id})
+
         orm_messages = self._create_many_preprocess(messages_to_create, actor)
         async with db_registry.async_session() as session:
             created_messages = await MessageModel.batch_create_async(orm_messages, session, actor=actor, no_commit=True, no_refresh=True)
@@ -591,6 +633,16 @@ class MessageManager:
                             self._embed_messages_background(messages_to_embed, actor, agent_id, project_id, template_id),
                             task_name=f"embed_messages_for_agent_{agent_id}",
                         )
+        elif settings.embed_messages_in_postgres and settings.database_engine is DatabaseChoice.POSTGRES and result:
+            messages_to_embed = [msg for msg in result if msg.role != MessageRole.system]
+            if messages_to_embed:
+                if strict_mode:
+                    await self._embed_messages_in_postgres(messages_to_embed, actor)
+                else:
+                    fire_and_forget(
+                        self._embed_messages_in_postgres(messages_to_embed, actor),
+                        task_name=f"embed_messages_in_postgres_for_agent_{result[0].agent_id}",
+                    )
 
         if allow_partial and existing_messages:
             async with db_registry.async_session() as session:
@@ -661,6 +713,46 @@ class MessageManager:
             logger.error(f"Failed to embed messages in Turbopuffer for agent {agent_id}: {e}")
             # don't re-raise the exception in background mode - just log it
 
+    async def _embed_message_texts(self, texts: List[str], actor: PydanticUser) -> List[List[float]]:
+        """Embed message texts for the (MESSAGE_EMBEDDING_DIM-dimensional, HNSW-indexed) embedding column of the messages table."""
+        from letta.helpers.tpuf_client import TurbopufferClient
+        from letta.services.embedding_batcher import embed_texts
+
+        # same model as Turbopuffer message search, so switching between the two doesn't change results much
+        embeddings = await embed_texts(texts, TurbopufferClient.default_embedding_config, actor)
+        for embedding in embeddings:
+            if len(embedding) != MESSAGE_EMBEDDING_DIM:
+                raise ValueError(f"Expected {MESSAGE_EMBEDDING_DIM}-dimensional message embeddings, got {len(embedding)}")
+        return [list(embedding) for embedding in embeddings]
+
+    async def _embed_messages_in_postgres(self, messages: List[PydanticMessage], actor: PydanticUser) -> None:
+        """Background task to embed messages and store the embeddings in the messages table, for hybrid SQL search.
+
+        Args:
+            messages: List of messages to embed
+            actor: User performing the action
+        """
+        try:
+            message_ids = []
+            message_texts = []
+            for msg in messages:
+                message_text = self._extract_message_text(msg).strip()
+                if message_text:
+                    message_ids.append(msg.id)
+                    message_texts.append(message_text)
+
+            if message_texts:
+                embeddings = await self._embed_message_texts(message_texts, actor)
+                async with db_registry.async_session() as session:
+                    # bulk UPDATE by primary key
+                    await session.execute(
+                        update(MessageModel),
+                        [{"id": message_id, "embedding": embedding} for message_id, embedding in zip(message_ids, embeddings)],
+                    )
+        except Exception as e:
+            logger.error(f"Failed to embed messages in Postgres: {e}")
+            # don't re-raise the exception in background mode - just log it
+
     @enforce_types
     @trace_method
     async def update_message_by_letta_message_async(
@@ -814,6 +906,10 @@ class MessageManager:
 
         for key, value in update_data.items():
             setattr(message, key, value)
+
+        # Persisted token counts are only valid for the content they were computed from
+        if update_data.keys() & {"content", "tool_calls", "tool_returns", "role", "name"}:
+            message.token_counts = None
         return message
 
     @enforce_types
@@ -890,6 +986,27 @@ class MessageManager:
             run_id=run_id,
         )
 
+    @staticmethod
+    def _apply_conversation_filter(query, conversation_id: Optional[str], agent_id: Optional[str]):
+        """
+        Filter a message query by conversation. Three cases:
+        1. conversation_id=None (omitted) -> all messages (no filter)
+        2. conversation_id="default" -> only default messages (not in any conversation)
+        3. conversation_id="xyz" -> only messages in that conversation
+        """
+        if conversation_id == "default":
+            query = query.where(MessageModel.conversation_id.is_(None))
+
+            # Exclude messages that are in conversation_messages table
+            conversation_messages_subquery = select(ConversationMessage.message_id)
+            if agent_id:
+                conversation_messages_subquery = conversation_messages_subquery.where(ConversationMessage.agent_id == agent_id)
+            query = query.where(~MessageModel.id.in_(conversation_messages_subquery))
+        elif conversation_id is not None:
+            # Specific conversation
+            query = query.where(MessageModel.conversation_id == conversation_id)
+        return query
+
     @enforce_types
     @trace_method
     async def list_messages(
@@ -936,7 +1053,7 @@ class MessageManager:
             NoResultFound: If the provided after/before message IDs do not exist.
         """
 
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
             # Permission check: raise if the agent doesn't exist or actor is not allowed.
 
             # Build a query that directly filters the Message table by agent_id.
@@ -954,22 +1071,7 @@ class MessageManager:
             if run_id:
                 query = query.where(MessageModel.run_id == run_id)
 
-            # Handle conversation_id filter
-            # Three cases:
-            # 1. conversation_id=None (omitted) -> return all messages (no filter)
-            # 2. conversation_id="default" -> return only default messages (not in any conversation)
-            # 3. conversation_id="xyz" -> return only messages in that conversation
-            if conversation_id == "default":
-                query = query.where(MessageModel.conversation_id.is_(None))
-
-                # Exclude messages that are in conversation_messages table
-                conversation_messages_subquery = select(ConversationMessage.message_id)
-                if agent_id:
-                    conversation_messages_subquery = conversation_messages_subquery.where(ConversationMessage.agent_id == agent_id)
-                query = query.where(~MessageModel.id.in_(conversation_messages_subquery))
-            elif conversation_id is not None:
-                # Specific conversation
-                query = query.where(MessageModel.conversation_id == conversation_id)
+            query = self._apply_conversation_filter(query, conversation_id=conversation_id, agent_id=agent_id)
 
             # if not include_err:
             #    query = query.where((MessageModel.is_err == False) | (MessageModel.is_err.is_(None)))
@@ -1040,6 +1142,163 @@ class MessageManager:
             # backfill missing tool_call_ids from historical bug (oct 1-6, 2025)
             return backfill_missing_tool_call_ids(messages, agent_id=agent_id, actor=actor)
 
+    @enforce_types
+    @trace_method
+    async def list_message_fields_async(
+        self,
+        actor: PydanticUser,
+        fields: Sequence[str],
+        agent_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        roles: Optional[Sequence[MessageRole]] = None,
+        after: Optional[str] = None,
+        limit: int = 100,
+        ascending: bool = True,
+    ) -> Tuple[List[dict], Optional[str], bool]:
+        """
+        List messages restricted to the requested fields, for history views and exports.
+
+        Only the columns of the requested fields are selected, and JSON columns (content, tool calls, tool returns)
+        are returned as stored, without building message objects. Pages are keyset paginated on
+        (created_at, sequence_id), so fetching a page deep into a long history costs the same as the first one.
+
+        Args:
+            actor: The user performing the action.
+            fields: The message fields to return (see `MessageField`).
+            agent_id: Optional agent ID to filter messages by.
+            conversation_id: Optional conversation ID to filter messages by ("default" for messages outside of any conversation).
+            run_id: Optional run ID to filter messages by.
+            group_id: Optional group ID to filter messages by.
+            roles: Optional roles to filter messages by.
+            after: A cursor returned with a previous page; only messages after it are returned.
+            limit: Maximum number of messages to return.
+            ascending: If True, oldest messages first; if False, newest first.
+
+        Returns:
+            Tuple of (rows, next_cursor, has_more), where next_cursor is None when there are no more messages.
+        """
+        columns = self._message_field_columns(fields)
+        cursor = decode_message_cursor(after) if after else None
+
+        async with db_registry.async_session(read_only=True) as session:
+            if agent_id:
+                await validate_agent_exists_async(session, agent_id, actor)
+
+            query = select(*columns, MessageModel.created_at.label("_created_at"), MessageModel.sequence_id.label("_sequence_id")).where(
+                MessageModel.organization_id == actor.organization_id,
+                MessageModel.is_deleted == False,
+            )
+            if agent_id:
+                query = query.where(MessageModel.agent_id == agent_id)
+            if group_id:
+                query = query.where(MessageModel.group_id == group_id)
+            if run_id:
+                query = query.where(MessageModel.run_id == run_id)
+            if roles:
+                query = query.where(MessageModel.role.in_([r.value for r in roles]))
+            query = self._apply_conversation_filter(query, conversation_id=conversation_id, agent_id=agent_id)
+
+            if cursor:
+                created_at, sequence_id = cursor
+                if ascending:
+                    query = query.where(
+                        or_(
+                            MessageModel.created_at > created_at,
+                            and_(MessageModel.created_at == created_at, MessageModel.sequence_id > sequence_id),
+                        )
+                    )
+                else:
+                    query = query.where(
+                        or_(
+                            MessageModel.created_at < created_at,
+                            and_(MessageModel.created_at == created_at, MessageModel.sequence_id < sequence_id),
+                        )
+                    )
+
+            if ascending:
+                query = query.order_by(MessageModel.created_at.asc(), MessageModel.sequence_id.asc())
+            else:
+                query = query.order_by(MessageModel.created_at.desc(), MessageModel.sequence_id.desc())
+
+            # fetch one extra row to know whether there is a next page
+            result = await session.execute(query.limit(limit + 1))
+            records = result.mappings().all()
+
+        has_more = len(records) > limit
+        records = records[:limit]
+        rows = [self._message_fields_row(record, fields) for record in records]
+        next_cursor = encode_message_cursor(records[-1]["_created_at"], records[-1]["_sequence_id"]) if has_more else None
+        return rows, next_cursor, has_more
+
+    async def stream_message_fields_async(
+        self,
+        actor: PydanticUser,
+        fields: Sequence[str],
+        agent_id: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        roles: Optional[Sequence[MessageRole]] = None,
+        after: Optional[str] = None,
+        ascending: bool = True,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield the requested fields of every matching message, for exporting whole histories.
+
+        Messages are fetched one keyset page of `batch_size` rows at a time, each in its own short session, so memory
+        stays bounded by the batch size and no transaction is held open while the caller consumes the rows.
+        """
+        while True:
+            rows, after, has_more = await self.list_message_fields_async(
+                actor=actor,
+                fields=fields,
+                agent_id=agent_id,
+                conversation_id=conversation_id,
+                run_id=run_id,
+                group_id=group_id,
+                roles=roles,
+                after=after,
+                limit=batch_size,
+                ascending=ascending,
+            )
+            for row in rows:
+                yield row
+            if not has_more:
+                return
+
+    @staticmethod
+    def _message_field_columns(fields: Sequence[str]) -> list:
+        """The labeled columns selected for the requested message fields."""
+        invalid = [field for field in fields if field not in MESSAGE_FIELDS]
+        if invalid or not fields:
+            raise LettaInvalidArgumentError(
+                f"Invalid message fields {invalid}, must be one or more of {list(MESSAGE_FIELDS)}", argument_name="fields"
+            )
+        columns = []
+        for field in dict.fromkeys(fields):
+            column = getattr(MessageModel, field)
+            if field in ("content", "tool_calls", "tool_returns"):
+                # read the stored JSON as is instead of deserializing it into pydantic models
+                column = type_coerce(column, JSON)
+            columns.append(column.label(field))
+        if "content" in fields:
+            # legacy messages keep their content in the text column
+            columns.append(MessageModel.text.label("_text"))
+        return columns
+
+    @staticmethod
+    def _message_fields_row(record, fields: Sequence[str]) -> dict:
+        """A projection listing row, with the legacy fallbacks of `MessageModel.to_pydantic`."""
+        row = {field: record[field] for field in fields}
+        if "content" in row and not row["content"] and record["_text"]:
+            row["content"] = [TextContent(text=record["_text"]).model_dump(mode="json")]
+        if "tool_calls" in row and not row["tool_calls"]:
+            row["tool_calls"] = None
+        return row
+
     @enforce_types
     @trace_method
     async def delete_all_messages_for_agent_async(
@@ -1219,27 +1478,38 @@ class MessageManager:
 
             except Exception as e:
                 logger.error(f"Failed to search messages with Turbopuffer, falling back to SQL: {e}")
-                # fall back to SQL search
-                messages = await self.list_messages(
-                    agent_id=agent_id,
-                    actor=actor,
-                    query_text=query_text,
-                    roles=roles,
-                    limit=limit,
-                    ascending=False,
-                )
-                combined_messages = self._combine_assistant_tool_messages(messages)
-                # Add basic metadata for SQL fallback
-                message_tuples = []
-                for message in combined_messages:
-                    metadata = {
-                        "search_mode": "sql_fallback",
-                        "combined_score": None,  # SQL doesn't provide scores
-                    }
-                    message_tuples.append((message, metadata))
-                return message_tuples
-        else:
-            # use sql-based search
+
+        return await self._search_messages_sql_async(
+            agent_id=agent_id,
+            actor=actor,
+            query_text=query_text,
+            search_mode=search_mode,
+            roles=roles,
+            limit=limit,
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    async def _search_messages_sql_async(
+        self,
+        agent_id: str,
+        actor: PydanticUser,
+        query_text: Optional[str],
+        search_mode: str,
+        roles: Optional[List[MessageRole]],
+        limit: int,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Tuple[PydanticMessage, dict]]:
+        """
+        Search messages in the database, with the same modes and result metadata as Turbopuffer message search.
+
+        On Postgres, "fts" ranks messages by their full-text search vector, "vector" by the similarity of their
+        embeddings (only stored if `embed_messages_in_postgres` is set, otherwise "fts" is used) and "hybrid" fuses
+        both rankings with RRF. Without a query, or in "timestamp" mode, the most recent messages are returned.
+        SQLite only supports an unranked substring match.
+        """
+        if settings.database_engine is not DatabaseChoice.POSTGRES:
             messages = await self.list_messages(
                 agent_id=agent_id,
                 actor=actor,
@@ -1249,15 +1519,138 @@ class MessageManager:
                 ascending=False,
             )
             combined_messages = self._combine_assistant_tool_messages(messages)
-            # Add basic metadata for SQL search
-            message_tuples = []
-            for message in combined_messages:
-                metadata = {
-                    "search_mode": "sql",
-                    "combined_score": None,  # SQL doesn't provide scores
-                }
-                message_tuples.append((message, metadata))
-            return message_tuples
+            # SQL substring matching doesn't provide scores
+            return [(message, {"search_mode": "sql", "combined_score": None}) for message in combined_messages]
+
+        from letta.helpers.tpuf_client import reciprocal_rank_fusion
+
+        searchable_roles = [MessageRole.assistant, MessageRole.user, MessageRole.tool]
+        filters = [
+            MessageModel.agent_id == agent_id,
+            MessageModel.organization_id == actor.organization_id,
+            MessageModel.is_deleted == False,
+            MessageModel.role.in_([role.value for role in (roles or searchable_roles) if role in searchable_roles]),
+        ]
+        if start_date:
+            filters.append(MessageModel.created_at >= start_date)
+        if end_date:
+            # a date without a time component includes the whole day
+            if end_date.hour == 0 and end_date.minute == 0 and end_date.second == 0 and end_date.microsecond == 0:
+                end_date = end_date + timedelta(days=1) - timedelta(microseconds=1)
+            filters.append(MessageModel.created_at <= end_date)
+
+        if not query_text:
+            search_mode = "timestamp"
+        query_embedding = None
+        if search_mode in ("vector", "hybrid") and settings.embed_messages_in_postgres:
+            try:
+                [query_embedding] = await self._embed_message_texts([query_text], actor)
+            except Exception as e:
+                logger.warning(f"Failed to embed message search query, using full-text search only: {e}")
+        if search_mode == "vector" and query_embedding is None:
+            search_mode = "fts"
+
+        async with db_registry.async_session(read_only=True) as session:
+            await validate_agent_exists_async(session, agent_id, actor)
+            query = select(MessageModel).where(*filters)
+            # merging tool results into their tool call hits drops at most half of the candidates
+            candidate_limit = 2 * limit
+
+            rankings = {}
+            if search_mode == "timestamp":
+                timestamp_query = query.order_by(MessageModel.created_at.desc(), MessageModel.id.desc())
+                rankings["timestamp"] = await self._fetch_searchable_messages(session, timestamp_query, candidate_limit)
+            if search_mode in ("fts", "hybrid"):
+                # the exact expression of the ix_messages_search_vector GIN index
+                search_vector = literal_column(f"({MESSAGE_SEARCH_VECTOR_SQL})")
+                ts_query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), query_text)
+                fts_query = query.where(search_vector.op("@@")(ts_query)).order_by(
+                    func.ts_rank_cd(search_vector, ts_query).desc(), MessageModel.id
+                )
+                rankings["fts"] = await self._fetch_searchable_messages(session, fts_query, candidate_limit)
+            if query_embedding is not None:
+                from letta.services.passage_vector_index_manager import apply_ann_search_settings_async
+
+                # ix_messages_embedding spans all agents; iterative scans keep the agent filter from starving the limit
+                await apply_ann_search_settings_async(session, top_k=candidate_limit)
+                vector_query = query.where(MessageModel.embedding.is_not(None)).order_by(
+                    MessageModel.embedding.cosine_distance(query_embedding), MessageModel.id
+                )
+                rankings["vector"] = await self._fetch_searchable_messages(session, vector_query, candidate_limit)
+
+            if search_mode == "hybrid":
+                fused = reciprocal_rank_fusion(
+                    vector_results=rankings.get("vector", []),
+                    fts_results=rankings["fts"],
+                    get_id_func=lambda message: message.id,
+                    vector_weight=0.5,
+                    fts_weight=0.5,
+                    top_k=candidate_limit,
+                )
+                results = [(message, metadata) for message, _, metadata in fused]
+            else:
+                results = [
+                    (message, {"combined_score": 1.0 / (idx + 1), "search_mode": search_mode, f"{search_mode}_rank": idx + 1})
+                    for idx, message in enumerate(rankings[search_mode])
+                ]
+
+            return (await self._combine_ranked_assistant_tool_messages(session, agent_id, results))[:limit]
+
+    async def _fetch_searchable_messages(self, session, query, limit: int) -> List[PydanticMessage]:
+        """
+        The first `limit` messages of an ordered query that conversation search can show, skipping heartbeats and
+        send_message / conversation_search tool returns (like the Turbopuffer index does). Over-fetches in pages so
+        skipped rows don't eat into the limit.
+        """
+        page_size = max(2 * limit, 20)
+        offset = 0
+        messages = []
+        while len(messages) < limit:
+            page = (await session.execute(query.offset(offset).limit(page_size))).scalars().all()
+            messages.extend(message for message in (row.to_pydantic() for row in page) if self._extract_message_text(message))
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return messages[:limit]
+
+    async def _combine_ranked_assistant_tool_messages(
+        self, session, agent_id: str, results: List[Tuple[PydanticMessage, dict]]
+    ) -> List[Tuple[PydanticMessage, dict]]:
+        """
+        Ranked counterpart of `_combine_assistant_tool_messages`: each assistant tool call hit is merged with its tool
+        result (loaded by tool_call_id, since ranked hits are not adjacent), and tool results already merged into a
+        hit are dropped. Each combined message keeps the metadata of its assistant hit.
+        """
+        tool_call_ids = [
+            tool_call.id
+            for message, _ in results
+            if message.role == MessageRole.assistant and message.tool_calls
+            for tool_call in message.tool_calls
+        ]
+        tool_returns = {}
+        if tool_call_ids:
+            rows = await session.execute(
+                select(MessageModel).where(
+                    MessageModel.agent_id == agent_id,
+                    MessageModel.role == MessageRole.tool.value,
+                    MessageModel.tool_call_id.in_(tool_call_ids),
+                    MessageModel.is_deleted == False,
+                )
+            )
+            tool_returns = {row.tool_call_id: row.to_pydantic() for row in rows.scalars().all()}
+        merged_tool_return_ids = {tool_return.id for tool_return in tool_returns.values()}
+
+        combined = []
+        for message, metadata in results:
+            if message.id in merged_tool_return_ids:
+                continue
+            pair = [message]
+            if message.role == MessageRole.assistant and message.tool_calls:
+                tool_return = next((tool_returns[tc.id] for tc in message.tool_calls if tc.id in tool_returns), None)
+                if tool_return is not None:
+                    pair.append(tool_return)
+            combined.extend((combined_message, metadata) for combined_message in self._combine_assistant_tool_messages(pair))
+        return combined
 
     async def search_messages_org_async(
         self,
@@ -12,7 +12,6 @@ from sqlalchemy.orm import noload
 
 from letta.constants import MAX_EMBEDDING_DIM
 from letta.helpers.decorators import async_redis_cache
-from letta.llm_api.llm_client import LLMClient
 from letta.log import get_logger
 from letta.orm import ArchivesAgents
 from letta.orm.errors import NoResultFound
@@ -26,6 +25,8 @@ from letta.schemas.passage import Passage as PydanticPassage
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.archive_manager import ArchiveManager
+from letta.services.embedding_batcher import embed_texts
+from letta.services.passage_vector_index_manager import PassageVectorIndexManager
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
@@ -46,6 +47,13 @@ class PassageManager:
     def __init__(self):
         self.archive_manager = ArchiveManager()
 
+    def _schedule_ensure_ann_indexes(self, passages: List[PydanticPassage]) -> None:
+        """Make sure every archive or source that just received passages has its ANN index (no-op unless enabled)."""
+        index_manager = PassageVectorIndexManager()
+        scopes = {("archive", p.archive_id) if p.archive_id else ("source", p.source_id): p.embedding_config for p in passages}
+        for (scope, scope_id), embedding_config in scopes.items():
+            index_manager.schedule_ensure_index(scope, scope_id, embedding_config)
+
     async def _create_tags_for_passage(
         self,
         session: AsyncSession,
@@ -192,7 +200,9 @@ class PassageManager:
                     actor=actor,
                 )
 
-            return passage.to_pydantic()
+            created = passage.to_pydantic()
+        PassageVectorIndexManager().schedule_ensure_index("archive", created.archive_id, created.embedding_config)
+        return created
 
     @enforce_types
     @trace_method
@@ -279,7 +289,9 @@ class PassageManager:
                     actor=actor,
                 )
 
-            return [p.to_pydantic() for p in created_passages]
+            created = [p.to_pydantic() for p in created_passages]
+        self._schedule_ensure_ann_indexes(created)
+        return created
 
     @enforce_types
     @trace_method
@@ -338,7 +350,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            created = passage.to_pydantic()
+        PassageVectorIndexManager().schedule_ensure_index("source", created.source_id, created.embedding_config)
+        return created
 
     @enforce_types
     @trace_method
@@ -433,7 +447,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             archival_created = await ArchivalPassage.batch_create_async(items=archival_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in archival_created]
+            created = [p.to_pydantic() for p in archival_created]
+        self._schedule_ensure_ann_indexes(created)
+        return created
 
     @enforce_types
     @trace_method
@@ -491,7 +507,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             source_created = await SourcePassage.batch_create_async(items=source_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in source_created]
+            created = [p.to_pydantic() for p in source_created]
+        self._schedule_ensure_ann_indexes(created)
+        return created
 
     # DEPRECATED - Use specific methods above
     @enforce_types
@@ -572,11 +590,7 @@ class PassageManager:
         try:
             # Generate embeddings if embedding config is available
             if agent_state.embedding_config is not None:
-                embedding_client = LLMClient.create(
-                    provider_type=agent_state.embedding_config.embedding_endpoint_type,
-                    actor=actor,
-                )
-                embeddings = await embedding_client.request_embeddings(text_chunks, agent_state.embedding_config)
+                embeddings = await embed_texts(text_chunks, agent_state.embedding_config, actor)
             else:
                 # No embedding config - store passages without embeddings (text search only)
                 embeddings = [None] * len(text_chunks)
@@ -637,15 +651,8 @@ class PassageManager:
             raise e
 
     async def _generate_embeddings_concurrent(self, text_chunks: List[str], embedding_config, actor: PydanticUser) -> List[List[float]]:
-        """Generate embeddings for all text chunks concurrently using LLMClient"""
-
-        embedding_client = LLMClient.create(
-            provider_type=embedding_config.embedding_endpoint_type,
-            actor=actor,
-        )
-
-        embeddings = await embedding_client.request_embeddings(text_chunks, embedding_config)
-        return embeddings
+        """Generate embeddings for all text chunks, coalesced with other agents' requests when embedding batching is enabled"""
+        return await embed_texts(text_chunks, embedding_config, actor)
 
     @enforce_types
     @trace_method
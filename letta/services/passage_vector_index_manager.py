@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import math
+import re
+import time
+from typing import Literal, Optional
+
+from sqlalchemy import Select, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from letta.errors import LettaInvalidArgumentError
+from letta.log import get_logger
+from letta.otel.tracing import trace_method
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.user import User as PydanticUser
+from letta.settings import DatabaseChoice, PgVectorIndexType, settings
+from letta.utils import fire_and_forget
+
+logger = get_logger(__name__)
+
+# pgvector can index at most 2000 dims as `vector` and 4000 as `halfvec`
+MAX_VECTOR_INDEX_DIM = 2000
+MAX_HALFVEC_INDEX_DIM = 4000
+# upper bound of hnsw.ef_search, and of the IVFFlat lists we build (so probes beyond it scan every list)
+MAX_HNSW_EF_SEARCH = 1000
+MAX_IVFFLAT_LISTS = 4000
+# rows sampled from a scope to estimate how selective a query's tag/date filters are
+SELECTIVITY_SAMPLE_SIZE = 1000
+
+PassageScope = Literal["archive", "source"]
+
+_SCOPE_TABLES = {"archive": ("archival_passages", "archive_id"), "source": ("source_passages", "source_id")}
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+# (scope, scope_id) -> monotonic time this process last checked the scope's index (or found it below the row
+# threshold); writes don't re-check a scope until `pg_ann_index_recheck_seconds` have passed
+_checked_scopes: dict[tuple[PassageScope, str], float] = {}
+# scopes with a background check or build in flight
+_pending_scopes: set[tuple[PassageScope, str]] = set()
+_MAX_CHECKED_SCOPES = 10_000
+_build_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_build_semaphore() -> asyncio.Semaphore:
+    global _build_semaphore
+    if _build_semaphore is None:
+        _build_semaphore = asyncio.Semaphore(max(settings.pg_ann_index_max_concurrent_builds, 1))
+    return _build_semaphore
+
+
+def _recently_checked(key: tuple[PassageScope, str]) -> bool:
+    checked_at = _checked_scopes.get(key)
+    return checked_at is not None and time.monotonic() - checked_at < settings.pg_ann_index_recheck_seconds
+
+
+def _mark_checked(key: tuple[PassageScope, str]) -> None:
+    now = time.monotonic()
+    if len(_checked_scopes) >= _MAX_CHECKED_SCOPES:
+        for stale in [k for k, checked_at in _checked_scopes.items() if now - checked_at >= settings.pg_ann_index_recheck_seconds]:
+            del _checked_scopes[stale]
+    _checked_scopes[key] = now
+
+
+def ann_index_name(scope: PassageScope, scope_id: str) -> str:
+    """Deterministic (and <= 63 char) name of the partial ANN index covering one archive or source."""
+    digest = hashlib.sha1(scope_id.encode("utf-8")).hexdigest()[:20]
+    return f"ix_ann_{scope}_{digest}"
+
+
+def ann_embedding_expression(embedding_column, embedding_dim: int) -> ColumnElement:
+    """The indexed expression: the stored (zero-padded) embedding truncated back to the model's real dimension.
+
+    Padding zeros contribute nothing to dot products or norms, so cosine distance over the truncated vector equals
+    cosine distance over the stored one, while the dimension stays within pgvector's index limits.
+    """
+    from pgvector.sqlalchemy import HALFVEC, Vector
+
+    vector_type = Vector(embedding_dim) if embedding_dim <= MAX_VECTOR_INDEX_DIM else HALFVEC(embedding_dim)
+    return cast(func.subvector(embedding_column, 1, embedding_dim), vector_type)
+
+
+async def ann_index_exists_async(session: AsyncSession, scope: PassageScope, scope_id: str) -> bool:
+    """Whether a valid (fully built) ANN index covers the archive or source."""
+    return await _ann_index_state_async(session, ann_index_name(scope, scope_id)) is True
+
+
+async def _ann_index_state_async(conn, index_name: str) -> Optional[bool]:
+    """None if the index does not exist, else whether it is valid (a failed CONCURRENTLY build leaves it invalid)."""
+    result = await conn.execute(
+        text("SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name"),
+        {"name": index_name},
+    )
+    return result.scalar()
+
+
+async def _scope_row_count_async(conn, scope: PassageScope, scope_id: str, cap: int) -> int:
+    """Number of passages in the archive or source, counting at most `cap` rows."""
+    table, scope_column = _SCOPE_TABLES[scope]
+    result = await conn.execute(
+        text(f"SELECT count(*) FROM (SELECT 1 FROM {table} WHERE {scope_column} = :scope_id LIMIT :cap) AS scope_rows"),
+        {"scope_id": scope_id, "cap": cap},
+    )
+    return result.scalar()
+
+
+async def estimate_filter_selectivity_async(session: AsyncSession, filtered_query: Select, id_column, scope_criterion) -> float:
+    """Fraction of a scope's rows that pass a query's filters, estimated over a bounded sample of the scope.
+
+    `filtered_query` selects the scope's rows (restricted by `scope_criterion`) with the query's tag/date filters applied.
+    """
+    sample = select(id_column).where(scope_criterion).limit(SELECTIVITY_SAMPLE_SIZE)
+    sampled = (await session.execute(select(func.count()).select_from(sample.subquery()))).scalar()
+    if not sampled:
+        return 1.0
+    matched_query = filtered_query.with_only_columns(id_column).where(id_column.in_(sample.scalar_subquery())).order_by(None).limit(None)
+    matched = (await session.execute(select(func.count()).select_from(matched_query.subquery()))).scalar()
+    return max(matched, 1) / sampled
+
+
+def ann_search_params(top_k: Optional[int] = None, selectivity: float = 1.0) -> tuple[int, int]:
+    """hnsw.ef_search and ivfflat.probes for a query returning `top_k` rows of which `selectivity` pass its filters.
+
+    The configured values are tuned for an unfiltered query with a small limit. The index has to surface roughly
+    top_k / selectivity candidates for enough of them to survive the filters, so both knobs grow with that.
+    """
+    selectivity = min(max(selectivity, 1e-3), 1.0)
+    ef_search = settings.pg_hnsw_ef_search
+    if top_k:
+        ef_search = max(ef_search, math.ceil(2 * top_k / selectivity))
+    probes = math.ceil(settings.pg_ivfflat_probes / selectivity)
+    return min(ef_search, MAX_HNSW_EF_SEARCH), min(probes, MAX_IVFFLAT_LISTS)
+
+
+async def apply_ann_search_settings_async(session: AsyncSession, top_k: Optional[int] = None, selectivity: float = 1.0) -> None:
+    """Set per-transaction recall/latency knobs for the ANN query that follows on this session."""
+    ef_search, probes = ann_search_params(top_k, selectivity)
+    await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+    await session.execute(text(f"SET LOCAL ivfflat.probes = {int(probes)}"))
+    if settings.pg_ann_iterative_scan:
+        # pgvector >= 0.8: keep scanning the index until enough rows pass the tag/date filters
+        try:
+            async with session.begin_nested():
+                await session.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+                await session.execute(text("SET LOCAL ivfflat.iterative_scan = relaxed_order"))
+        except Exception as e:
+            logger.debug(f"pgvector iterative scans unavailable, filtered ANN queries may return fewer rows: {e}")
+
+
+class PassageVectorIndexManager:
+    """Manages partial pgvector HNSW/IVFFlat indexes over the passages of individual archives and sources."""
+
+    def _check_postgres(self) -> None:
+        if settings.database_engine is not DatabaseChoice.POSTGRES:
+            raise LettaInvalidArgumentError("ANN vector indexes require a Postgres (pgvector) database")
+
+    async def _resolve_scope(
+        self, actor: PydanticUser, archive_id: Optional[str], source_id: Optional[str]
+    ) -> tuple[PassageScope, str, int]:
+        if bool(archive_id) == bool(source_id):
+            raise LettaInvalidArgumentError("Exactly one of archive_id or source_id must be provided", argument_name="archive_id")
+
+        if archive_id:
+            from letta.services.archive_manager import ArchiveManager
+
+            scope, scope_id = "archive", archive_id
+            embedding_config = (await ArchiveManager().get_archive_by_id_async(archive_id=archive_id, actor=actor)).embedding_config
+        else:
+            from letta.services.source_manager import SourceManager
+
+            scope, scope_id = "source", source_id
+            embedding_config = (await SourceManager().get_source_by_id(source_id=source_id, actor=actor)).embedding_config
+
+        if embedding_config is None:
+            raise LettaInvalidArgumentError(f"{scope} {scope_id} has no embedding config to index", argument_name=f"{scope}_id")
+        if not _SAFE_ID.match(scope_id):
+            raise LettaInvalidArgumentError(f"Invalid {scope} id: {scope_id}", argument_name=f"{scope}_id")
+        if embedding_config.embedding_dim > MAX_HALFVEC_INDEX_DIM:
+            raise LettaInvalidArgumentError(
+                f"Embedding dimension {embedding_config.embedding_dim} exceeds pgvector's index limit of {MAX_HALFVEC_INDEX_DIM}",
+                argument_name=f"{scope}_id",
+            )
+        return scope, scope_id, embedding_config.embedding_dim
+
+    @trace_method
+    async def create_index_async(
+        self,
+        actor: PydanticUser,
+        archive_id: Optional[str] = None,
+        source_id: Optional[str] = None,
+        index_type: Optional[PgVectorIndexType] = None,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: Optional[int] = None,
+    ) -> str:
+        """Build (CONCURRENTLY, so writes are not blocked) a partial ANN index over one archive's or source's passages.
+
+        Returns the index name. Creating an index that already exists is a no-op.
+        """
+        self._check_postgres()
+        scope, scope_id, embedding_dim = await self._resolve_scope(actor, archive_id, source_id)
+        return await self._create_index_for_scope_async(
+            scope, scope_id, embedding_dim, index_type=index_type, m=m, ef_construction=ef_construction, lists=lists
+        )
+
+    @trace_method
+    async def drop_index_async(self, actor: PydanticUser, archive_id: Optional[str] = None, source_id: Optional[str] = None) -> None:
+        self._check_postgres()
+        scope, scope_id, _ = await self._resolve_scope(actor, archive_id, source_id)
+        await self._drop_index_for_scope_async(scope, scope_id)
+
+    def schedule_ensure_index(self, scope: PassageScope, scope_id: Optional[str], embedding_config: Optional[EmbeddingConfig]) -> None:
+        """Build the archive's or source's ANN index in the background if ANN search is enabled and it has none yet.
+
+        Called when an archive or source is created and whenever passages are inserted into one, so archives that
+        predate ANN search, or grow past `pg_ann_index_min_rows`, get their index on a later write. A scope is
+        re-checked at most once per `pg_ann_index_recheck_seconds`.
+        """
+        key = (scope, scope_id)
+        if not self._manages_indexes() or not scope_id or embedding_config is None or key in _pending_scopes or _recently_checked(key):
+            return
+        _pending_scopes.add(key)
+        fire_and_forget(
+            self._ensure_index_in_background(scope, scope_id, embedding_config), task_name=f"ensure_ann_index_{scope}_{scope_id}"
+        )
+
+    def schedule_drop_index(self, scope: PassageScope, scope_id: str) -> None:
+        """Drop a deleted archive's or source's ANN index in the background (DROP INDEX CONCURRENTLY can be slow)."""
+        if not self._manages_indexes():
+            return
+        _checked_scopes.pop((scope, scope_id), None)
+        fire_and_forget(self._drop_index_for_scope_async(scope, scope_id), task_name=f"drop_ann_index_{scope}_{scope_id}")
+
+    async def _ensure_index_in_background(self, scope: PassageScope, scope_id: str, embedding_config: EmbeddingConfig) -> None:
+        try:
+            await self.ensure_index_async(scope, scope_id, embedding_config)
+        finally:
+            # a failed build is retried on a write after the recheck interval, not on every write
+            _mark_checked((scope, scope_id))
+            _pending_scopes.discard((scope, scope_id))
+
+    @trace_method
+    async def ensure_index_async(self, scope: PassageScope, scope_id: str, embedding_config: EmbeddingConfig) -> Optional[str]:
+        """Make sure a valid ANN index covers the archive or source once it holds `pg_ann_index_min_rows` passages.
+
+        Smaller scopes are searched exactly, which is fast enough and avoids one index per tiny archive. Builds are
+        limited to `pg_ann_index_max_concurrent_builds` at a time per process. IVFFlat needs existing rows to train
+        its lists, so automatically built indexes are always HNSW; use `create_index_async` to build an IVFFlat index
+        once an archive is loaded. Returns the index name, or None if the archive or source is not (yet) indexed.
+        """
+        if not _SAFE_ID.match(scope_id) or embedding_config.embedding_dim > MAX_HALFVEC_INDEX_DIM:
+            return None
+
+        from letta.server.db import engine
+
+        async with engine.connect() as conn:
+            state = await _ann_index_state_async(conn, ann_index_name(scope, scope_id))
+            if state is not True:
+                min_rows = settings.pg_ann_index_min_rows
+                if min_rows > 0 and await _scope_row_count_async(conn, scope, scope_id, cap=min_rows) < min_rows:
+                    return None
+        if state is not True:
+            async with _get_build_semaphore():
+                await self._create_index_for_scope_async(scope, scope_id, embedding_config.embedding_dim, index_type=PgVectorIndexType.HNSW)
+        return ann_index_name(scope, scope_id)
+
+    def _manages_indexes(self) -> bool:
+        return settings.pg_ann_search_enabled and settings.database_engine is DatabaseChoice.POSTGRES
+
+    async def _create_index_for_scope_async(
+        self,
+        scope: PassageScope,
+        scope_id: str,
+        embedding_dim: int,
+        index_type: Optional[PgVectorIndexType] = None,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: Optional[int] = None,
+    ) -> str:
+        table, scope_column = _SCOPE_TABLES[scope]
+        index_type = index_type or settings.pg_ann_index_type
+        index_name = ann_index_name(scope, scope_id)
+
+        opclass = "vector_cosine_ops" if embedding_dim <= MAX_VECTOR_INDEX_DIM else "halfvec_cosine_ops"
+        cast_type = f"vector({embedding_dim})" if embedding_dim <= MAX_VECTOR_INDEX_DIM else f"halfvec({embedding_dim})"
+        expression = f"(subvector(embedding, 1, {embedding_dim})::{cast_type})"
+
+        from letta.server.db import engine
+
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if await _ann_index_state_async(conn, index_name) is False:
+                # a previous CONCURRENTLY build failed part-way; IF NOT EXISTS would keep the invalid index
+                await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+            if index_type == PgVectorIndexType.HNSW:
+                with_clause = f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+            else:
+                if lists is None:
+                    # pgvector guidance: rows / 1000 for up to 1M rows
+                    row_count = (
+                        await conn.execute(text(f"SELECT count(*) FROM {table} WHERE {scope_column} = :scope_id"), {"scope_id": scope_id})
+                    ).scalar()
+                    lists = min(max(row_count // 1000, 10), 4000)
+                with_clause = f"WITH (lists = {int(lists)})"
+
+            logger.info(f"Creating {index_type.value} index {index_name} on {table} for {scope} {scope_id} (dim={embedding_dim})")
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} "
+                    f"USING {index_type.value} ({expression} {opclass}) {with_clause} "
+                    f"WHERE {scope_column} = '{scope_id}' AND embedding IS NOT NULL"
+                )
+            )
+        return index_name
+
+    async def _drop_index_for_scope_async(self, scope: PassageScope, scope_id: str) -> None:
+        _checked_scopes.pop((scope, scope_id), None)
+
+        from letta.server.db import engine
+
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {ann_index_name(scope, scope_id)}"))
@@ -1,7 +1,8 @@
 import hashlib
-from typing import List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, or_, select
 
 from letta.log import get_logger
 from letta.model_aliases import get_deprecated_google_handle_replacement
@@ -16,6 +17,8 @@ from letta.schemas.providers import Provider as PydanticProvider, ProviderCheck,
 from letta.schemas.secret import Secret
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.provider_model_catalog import get_provider_model_catalog
+from letta.settings import model_settings, settings
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
 
@@ -25,6 +28,104 @@ logger = get_logger(__name__)
 AUTO_MODE_HANDLES = ["letta/auto", "letta/auto-fast", "letta/auto-chat"]
 
 
+@dataclass
+class ProviderModelSyncPlan:
+    """The writes needed to bring a provider's stored models in line with the models it currently lists."""
+
+    to_create: List[PydanticProviderModel] = field(default_factory=list)
+    # existing rows with their changed column values
+    to_update: List[Tuple[ProviderModelORM, Dict[str, Any]]] = field(default_factory=list)
+    to_remove: List[ProviderModelORM] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.to_create or self.to_update or self.to_remove)
+
+
+def plan_provider_model_sync(
+    provider_id: str,
+    organization_id: Optional[str],
+    existing_models: List[ProviderModelORM],
+    llm_models: List[LLMConfig],
+    embedding_models: List[EmbeddingConfig],
+) -> ProviderModelSyncPlan:
+    """
+    Diff a provider's listed models against its stored (non-deleted) models.
+
+    `existing_models` must contain the provider's models plus any model in the same organization scope with a listed
+    handle. A listed model matches a stored one by handle and model type within the organization scope, or else by name
+    and model type within the provider (the unique_model_per_provider_and_type constraint). Stored models of the
+    provider that are no longer listed are removed; matched models are only updated if their endpoint type (or, for
+    LLMs, their context window) changed.
+    """
+    plan = ProviderModelSyncPlan()
+    incoming_handles = {llm.handle for llm in llm_models} | {emb.handle for emb in embedding_models}
+
+    by_handle = {}
+    by_name = {}
+    for model in existing_models:
+        if model.provider_id == provider_id and model.organization_id == organization_id and model.handle not in incoming_handles:
+            plan.to_remove.append(model)
+            continue
+        if model.organization_id == organization_id:
+            by_handle.setdefault((model.handle, model.model_type), model)
+        if model.provider_id == provider_id:
+            by_name.setdefault((model.name, model.model_type), model)
+
+    seen = set()
+
+    def is_stored(model_type: str, handle: str, name: str, desired: Dict[str, Any]) -> bool:
+        # duplicates in the listing count as stored, so each handle is only created once
+        if (handle, model_type) in seen:
+            return True
+        seen.add((handle, model_type))
+        existing = by_handle.get((handle, model_type)) or by_name.get((name, model_type))
+        if existing is None:
+            return False
+        changes = {key: value for key, value in desired.items() if getattr(existing, key) != value}
+        if changes:
+            plan.to_update.append((existing, changes))
+        return True
+
+    for llm in llm_models:
+        desired = {"max_context_window": llm.context_window, "model_endpoint_type": llm.model_endpoint_type}
+        if is_stored("llm", llm.handle, llm.model, desired):
+            continue
+        plan.to_create.append(
+            PydanticProviderModel(
+                handle=llm.handle,
+                display_name=llm.model,
+                name=llm.model,
+                provider_id=provider_id,
+                organization_id=organization_id,
+                model_type="llm",
+                enabled=True,
+                model_endpoint_type=llm.model_endpoint_type,
+                max_context_window=llm.context_window,
+                supports_token_streaming=llm.model_endpoint_type in ["openai", "anthropic", "deepseek", "openrouter"],
+                supports_tool_calling=True,  # Assume true for LLMs for now
+            )
+        )
+
+    for emb in embedding_models:
+        if is_stored("embedding", emb.handle, emb.embedding_model, {"model_endpoint_type": emb.embedding_endpoint_type}):
+            continue
+        plan.to_create.append(
+            PydanticProviderModel(
+                handle=emb.handle,
+                display_name=emb.embedding_model,
+                name=emb.embedding_model,
+                provider_id=provider_id,
+                organization_id=organization_id,
+                model_type="embedding",
+                enabled=True,
+                model_endpoint_type=emb.embedding_endpoint_type,
+                embedding_dim=emb.embedding_dim if hasattr(emb, "embedding_dim") else None,
+            )
+        )
+    return plan
+
+
 class ProviderManager:
     @enforce_types
     @trace_method
@@ -95,10 +196,10 @@ class ProviderManager:
 
                 # Update encrypted fields (async to avoid blocking event loop)
                 if request.api_key is not None:
-                    api_key_secret = await Secret.from_plaintext_async(request.api_key)
+                    api_key_secret = await Secret.from_plaintext_async(request.api_key, organization_id=actor.organization_id)
                     deleted_provider.api_key_enc = api_key_secret.get_encrypted()
                 if request.access_key is not None:
-                    access_key_secret = await Secret.from_plaintext_async(request.access_key)
+                    access_key_secret = await Secret.from_plaintext_async(request.access_key, organization_id=actor.organization_id)
                     deleted_provider.access_key_enc = access_key_secret.get_encrypted()
 
                 await deleted_provider.update_async(session, actor=actor)
@@ -128,6 +229,7 @@ class ProviderManager:
                 await session.commit()
 
                 provider_pydantic = deleted_provider.to_pydantic()
+                await self._invalidate_model_catalog(org_id)
 
                 # For BYOK providers, automatically sync available models
                 # This will add any new models and remove any that are no longer available
@@ -167,13 +269,14 @@ class ProviderManager:
 
             # Explicitly populate encrypted fields from plaintext (async to avoid blocking event loop)
             if request.api_key is not None:
-                provider.api_key_enc = await Secret.from_plaintext_async(request.api_key)
+                provider.api_key_enc = await Secret.from_plaintext_async(request.api_key, organization_id=actor.organization_id)
             if request.access_key is not None:
-                provider.access_key_enc = await Secret.from_plaintext_async(request.access_key)
+                provider.access_key_enc = await Secret.from_plaintext_async(request.access_key, organization_id=actor.organization_id)
 
             new_provider = ProviderModel(**provider.model_dump(to_orm=True, exclude_unset=True))
             await new_provider.create_async(session, actor=actor)
             provider_pydantic = new_provider.to_pydantic()
+            await self._invalidate_model_catalog(org_id)
 
             # For BYOK providers, automatically sync available models
             if is_byok:
@@ -206,7 +309,7 @@ class ProviderManager:
 
                 # Only re-encrypt if different (async to avoid blocking event loop)
                 if existing_api_key != update_data["api_key"]:
-                    api_key_secret = await Secret.from_plaintext_async(update_data["api_key"])
+                    api_key_secret = await Secret.from_plaintext_async(update_data["api_key"], organization_id=actor.organization_id)
                     existing_provider.api_key_enc = api_key_secret.get_encrypted()
 
                 # Remove from update_data since we set directly on existing_provider
@@ -224,7 +327,7 @@ class ProviderManager:
 
                 # Only re-encrypt if different (async to avoid blocking event loop)
                 if existing_access_key != update_data["access_key"]:
-                    access_key_secret = await Secret.from_plaintext_async(update_data["access_key"])
+                    access_key_secret = await Secret.from_plaintext_async(update_data["access_key"], organization_id=actor.organization_id)
                     existing_provider.access_key_enc = access_key_secret.get_encrypted()
 
                 # Remove from update_data since we set directly on existing_provider
@@ -237,6 +340,7 @@ class ProviderManager:
 
             # Commit the updated provider
             await existing_provider.update_async(session, actor=actor)
+            await self._invalidate_model_catalog(existing_provider.organization_id)
             return existing_provider.to_pydantic()
 
     @enforce_types
@@ -286,6 +390,7 @@ class ProviderManager:
 
             # Soft delete in provider table
             await existing_provider.delete_async(session, actor=actor)
+            await self._invalidate_model_catalog(existing_provider.organization_id)
 
             # context manager now handles commits
             # await session.commit()
@@ -618,216 +723,60 @@ class ProviderManager:
         embedding_models: List[EmbeddingConfig],
         organization_id: Optional[str] = None,
     ) -> None:
-        """Sync models from a provider to the database - adds new models and removes old ones."""
-        from letta.log import get_logger
-
-        logger = get_logger(__name__)
-        logger.info(f"=== Starting sync for provider '{provider.name}' (ID: {provider.id}) ===")
-        logger.info(f"  Organization ID: {organization_id}")
-        logger.info(f"  LLM models to sync: {[m.handle for m in llm_models]}")
-        logger.info(f"  Embedding models to sync: {[m.handle for m in embedding_models]}")
+        """Sync models from a provider to the database - adds new models, updates changed ones and removes old ones."""
+        logger.info(
+            f"Syncing {len(llm_models)} LLM and {len(embedding_models)} embedding models for provider '{provider.name}' "
+            f"(ID: {provider.id}, organization ID: {organization_id})"
+        )
 
         async with db_registry.async_session() as session:
-            # Get all existing models for this provider and organization
-            # We need to handle None organization_id specially for SQL NULL comparisons
-            from sqlalchemy import and_, select
-
-            # Build the query conditions
+            # Load every row the incoming models can match in one query: the provider's own models, plus models of
+            # other providers in the same scope with an incoming handle (handles are unique per organization)
+            incoming_handles = {llm.handle for llm in llm_models} | {emb.handle for emb in embedding_models}
             if organization_id is None:
-                # For global models (organization_id IS NULL), excluding soft-deleted
-                stmt = select(ProviderModelORM).where(
-                    and_(
-                        ProviderModelORM.provider_id == provider.id,
-                        ProviderModelORM.organization_id.is_(None),
-                        ProviderModelORM.is_deleted == False,  # Filter out soft-deleted models
-                    )
-                )
-                result = await session.execute(stmt)
-                existing_models = list(result.scalars().all())
+                scope_condition = ProviderModelORM.organization_id.is_(None)
             else:
-                # For org-specific models
-                existing_models = await ProviderModelORM.list_async(
-                    db_session=session,
-                    check_is_deleted=True,  # Filter out soft-deleted models
-                    **{
-                        "provider_id": provider.id,
-                        "organization_id": organization_id,
-                    },
-                )
-
-            # Build sets of handles for incoming models
-            incoming_llm_handles = {llm.handle for llm in llm_models}
-            incoming_embedding_handles = {emb.handle for emb in embedding_models}
-            all_incoming_handles = incoming_llm_handles | incoming_embedding_handles
-
-            # Determine which models to remove (existing models not in the incoming list)
-            models_to_remove = []
-            for existing_model in existing_models:
-                if existing_model.handle not in all_incoming_handles:
-                    models_to_remove.append(existing_model)
-
-            # Remove models that are no longer in the sync list
-            for model_to_remove in models_to_remove:
-                await model_to_remove.delete_async(session)
-                logger.debug(f"Removed model {model_to_remove.handle} from provider {provider.name}")
+                scope_condition = ProviderModelORM.organization_id == organization_id
+            stmt = select(ProviderModelORM).where(
+                ProviderModelORM.is_deleted == False,  # Filter out soft-deleted models
+                or_(
+                    ProviderModelORM.provider_id == provider.id,
+                    and_(scope_condition, ProviderModelORM.handle.in_(incoming_handles)),
+                ),
+            )
+            result = await session.execute(stmt)
+            existing_models = list(result.scalars().all())
 
-            # Commit the deletions
+            plan = plan_provider_model_sync(
+                provider_id=provider.id,
+                organization_id=organization_id,
+                existing_models=existing_models,
+                llm_models=llm_models,
+                embedding_models=embedding_models,
+            )
+            if not plan.changed:
+                logger.info(f"Models of provider '{provider.name}' are up to date")
+                return
+
+            for model in plan.to_remove:
+                logger.debug(f"Removing model {model.handle} from provider {provider.name}")
+                model.is_deleted = True
+            for model, changes in plan.to_update:
+                logger.info(f"Updating {model.model_type} model {model.handle}: {changes}")
+                for key, value in changes.items():
+                    setattr(model, key, value)
+            for pydantic_model in plan.to_create:
+                logger.info(f"Creating new {pydantic_model.model_type} model {pydantic_model.handle}")
+                model = ProviderModelORM(**pydantic_model.model_dump(to_orm=True))
+                if not await model.create_async(session, no_commit=True, ignore_conflicts=True):
+                    logger.info(f"Model {pydantic_model.handle} already exists (concurrent insert), skipping")
             await session.commit()
 
-            # Process LLM models - add new ones
-            logger.info(f"Processing {len(llm_models)} LLM models for provider {provider.name}")
-            for llm_config in llm_models:
-                logger.info(f"  Checking LLM model: {llm_config.handle} (name: {llm_config.model})")
-
-                # Check if model already exists by handle (excluding soft-deleted ones)
-                existing = await ProviderModelORM.list_async(
-                    db_session=session,
-                    limit=1,
-                    check_is_deleted=True,  # Filter out soft-deleted models
-                    **{
-                        "handle": llm_config.handle,
-                        "organization_id": organization_id,
-                        "model_type": "llm",  # Must check model_type since handle can be same for LLM and embedding
-                    },
-                )
-
-                # Also check by name+provider_id (covers unique_model_per_provider_and_type constraint)
-                if not existing:
-                    existing = await ProviderModelORM.list_async(
-                        db_session=session,
-                        limit=1,
-                        check_is_deleted=True,
-                        **{
-                            "name": llm_config.model,
-                            "provider_id": provider.id,
-                            "model_type": "llm",
-                        },
-                    )
-
-                if not existing:
-                    logger.info(f"    Creating new LLM model {llm_config.handle}")
-                    # Create new model entry
-                    pydantic_model = PydanticProviderModel(
-                        handle=llm_config.handle,
-                        display_name=llm_config.model,
-                        name=llm_config.model,
-                        provider_id=provider.id,
-                        organization_id=organization_id,
-                        model_type="llm",
-                        enabled=True,
-                        model_endpoint_type=llm_config.model_endpoint_type,
-                        max_context_window=llm_config.context_window,
-                        supports_token_streaming=llm_config.model_endpoint_type in ["openai", "anthropic", "deepseek", "openrouter"],
-                        supports_tool_calling=True,  # Assume true for LLMs for now
-                    )
-
-                    logger.info(
-                        f"    Model data: handle={pydantic_model.handle}, name={pydantic_model.name}, "
-                        f"model_type={pydantic_model.model_type}, provider_id={pydantic_model.provider_id}, "
-                        f"org_id={pydantic_model.organization_id}"
-                    )
-
-                    model = ProviderModelORM(**pydantic_model.model_dump(to_orm=True))
-                    result = await model.create_async(session, ignore_conflicts=True)
-                    if result:
-                        logger.info(f"    ✓ Successfully created LLM model {llm_config.handle}")
-                    else:
-                        logger.info(f"    LLM model {llm_config.handle} already exists (concurrent insert), skipping")
-                else:
-                    # Check if max_context_window or model_endpoint_type needs to be updated
-                    existing_model = existing[0]
-                    needs_update = False
-
-                    if existing_model.max_context_window != llm_config.context_window:
-                        logger.info(
-                            f"    Updating LLM model {llm_config.handle} max_context_window: "
-                            f"{existing_model.max_context_window} -> {llm_config.context_window}"
-                        )
-                        existing_model.max_context_window = llm_config.context_window
-                        needs_update = True
-
-                    if existing_model.model_endpoint_type != llm_config.model_endpoint_type:
-                        logger.info(
-                            f"    Updating LLM model {llm_config.handle} model_endpoint_type: "
-                            f"{existing_model.model_endpoint_type} -> {llm_config.model_endpoint_type}"
-                        )
-                        existing_model.model_endpoint_type = llm_config.model_endpoint_type
-                        needs_update = True
-
-                    if needs_update:
-                        await existing_model.update_async(session)
-                    else:
-                        logger.info(f"    LLM model {llm_config.handle} already exists (ID: {existing[0].id}), skipping")
-
-            # Process embedding models - add new ones
-            logger.info(f"Processing {len(embedding_models)} embedding models for provider {provider.name}")
-            for embedding_config in embedding_models:
-                logger.info(f"  Checking embedding model: {embedding_config.handle} (name: {embedding_config.embedding_model})")
-
-                # Check if model already exists by handle (excluding soft-deleted ones)
-                existing = await ProviderModelORM.list_async(
-                    db_session=session,
-                    limit=1,
-                    check_is_deleted=True,  # Filter out soft-deleted models
-                    **{
-                        "handle": embedding_config.handle,
-                        "organization_id": organization_id,
-                        "model_type": "embedding",  # Must check model_type since handle can be same for LLM and embedding
-                    },
-                )
-
-                # Also check by name+provider_id (covers unique_model_per_provider_and_type constraint)
-                if not existing:
-                    existing = await ProviderModelORM.list_async(
-                        db_session=session,
-                        limit=1,
-                        check_is_deleted=True,
-                        **{
-                            "name": embedding_config.embedding_model,
-                            "provider_id": provider.id,
-                            "model_type": "embedding",
-                        },
-                    )
-
-                if not existing:
-                    logger.info(f"    Creating new embedding model {embedding_config.handle}")
-                    # Create new model entry
-                    pydantic_model = PydanticProviderModel(
-                        handle=embedding_config.handle,
-                        display_name=embedding_config.embedding_model,
-                        name=embedding_config.embedding_model,
-                        provider_id=provider.id,
-                        organization_id=organization_id,
-                        model_type="embedding",
-                        enabled=True,
-                        model_endpoint_type=embedding_config.embedding_endpoint_type,
-                        embedding_dim=embedding_config.embedding_dim if hasattr(embedding_config, "embedding_dim") else None,
-                    )
-
-                    logger.info(
-                        f"    Model data: handle={pydantic_model.handle}, name={pydantic_model.name}, "
-                        f"model_type={pydantic_model.model_type}, provider_id={pydantic_model.provider_id}, "
-                        f"org_id={pydantic_model.organization_id}"
-                    )
-
-                    model = ProviderModelORM(**pydantic_model.model_dump(to_orm=True))
-                    result = await model.create_async(session, ignore_conflicts=True)
-                    if result:
-                        logger.info(f"    ✓ Successfully created embedding model {embedding_config.handle}")
-                    else:
-                        logger.info(f"    Embedding model {embedding_config.handle} already exists (concurrent insert), skipping")
-                else:
-                    # Check if model_endpoint_type needs to be updated
-                    existing_model = existing[0]
-                    if existing_model.model_endpoint_type != embedding_config.embedding_endpoint_type:
-                        logger.info(
-                            f"    Updating embedding model {embedding_config.handle} model_endpoint_type: "
-                            f"{existing_model.model_endpoint_type} -> {embedding_config.embedding_endpoint_type}"
-                        )
-                        existing_model.model_endpoint_type = embedding_config.embedding_endpoint_type
-                        await existing_model.update_async(session)
-                    else:
-                        logger.info(f"    Embedding model {embedding_config.handle} already exists (ID: {existing[0].id}), skipping")
+        logger.info(
+            f"Synced provider '{provider.name}': {len(plan.to_create)} created, {len(plan.to_update)} updated, "
+            f"{len(plan.to_remove)} removed"
+        )
+        await self._invalidate_model_catalog(organization_id)
 
     @enforce_types
     @trace_method
@@ -838,9 +787,12 @@ class ProviderManager:
         model_type: Optional[str] = None,
     ) -> Optional[PydanticProviderModel]:
         """Get a model by its handle. Handles are unique per organization."""
-        async with db_registry.async_session() as session:
-            from sqlalchemy import and_, or_, select
+        if settings.provider_catalog_enabled:
+            return await get_provider_model_catalog().get_model(
+                actor.organization_id, handle, model_type, loader=self._list_catalog_models_async
+            )
 
+        async with db_registry.async_session() as session:
             # Build conditions for the query
             conditions = [
                 ProviderModelORM.handle == handle,
@@ -889,6 +841,56 @@ class ProviderManager:
         limit: Optional[int] = None,
     ) -> List[PydanticProviderModel]:
         """List models available to an actor (both global and org-scoped)."""
+        if settings.provider_catalog_enabled:
+            org_models, global_models = await get_provider_model_catalog().list_models(
+                actor.organization_id,
+                loader=self._list_catalog_models_async,
+                model_type=model_type,
+                provider_id=provider_id,
+                enabled=enabled,
+                limit=limit,
+            )
+        else:
+            org_models, global_models = await self._list_models_from_db_async(actor, model_type, provider_id, enabled, limit)
+
+        # Combine and deduplicate by handle AND model_type (org-scoped takes precedence)
+        # Use (handle, model_type) tuple as key since same handle can exist for LLM and embedding
+        all_models = {(m.handle, m.model_type): m for m in global_models}
+        all_models.update({(m.handle, m.model_type): m for m in org_models})
+
+        models = list(all_models.values())
+
+        if model_settings.auto_mode_enabled and not provider_id and (model_type is None or model_type == "llm"):
+            for handle in AUTO_MODE_HANDLES:
+                # Generate deterministic 8-char hex ID from handle
+                handle_hash = hashlib.sha256(handle.encode()).hexdigest()[:8]
+                models.append(
+                    PydanticProviderModel(
+                        id=f"model-{handle_hash}",
+                        handle=handle,
+                        name=handle.split("/")[1],
+                        display_name=handle.split("/")[1],
+                        provider_id="letta",
+                        model_type="llm",
+                        model_endpoint_type="openai",
+                        enabled=True,
+                        max_context_window=180000,
+                        supports_token_streaming=True,
+                        supports_tool_calling=True,
+                    )
+                )
+
+        return models
+
+    async def _list_models_from_db_async(
+        self,
+        actor: PydanticUser,
+        model_type: Optional[str],
+        provider_id: Optional[str],
+        enabled: Optional[bool],
+        limit: Optional[int],
+    ) -> Tuple[List[PydanticProviderModel], List[PydanticProviderModel]]:
+        """List the org-scoped and the global models matching the filters, each up to `limit`."""
         async with db_registry.async_session() as session:
             # Build filters
             filters = {}
@@ -909,8 +911,6 @@ class ProviderManager:
             )
 
             # Get global models - need to handle NULL organization_id specially
-            from sqlalchemy import and_, select
-
             # Build conditions for global models query
             conditions = [
                 ProviderModelORM.organization_id.is_(None),
@@ -929,36 +929,27 @@ class ProviderManager:
             result = await session.execute(stmt)
             global_models = list(result.scalars().all())
 
-            # Combine and deduplicate by handle AND model_type (org-scoped takes precedence)
-            # Use (handle, model_type) tuple as key since same handle can exist for LLM and embedding
-            all_models = {(m.handle, m.model_type): m for m in global_models}
-            all_models.update({(m.handle, m.model_type): m for m in org_models})
-
-            models = [m.to_pydantic() for m in all_models.values()]
-
-            from letta.settings import model_settings
-
-            if model_settings.auto_mode_enabled and not provider_id and (model_type is None or model_type == "llm"):
-                for handle in AUTO_MODE_HANDLES:
-                    # Generate deterministic 8-char hex ID from handle
-                    handle_hash = hashlib.sha256(handle.encode()).hexdigest()[:8]
-                    models.append(
-                        PydanticProviderModel(
-                            id=f"model-{handle_hash}",
-                            handle=handle,
-                            name=handle.split("/")[1],
-                            display_name=handle.split("/")[1],
-                            provider_id="letta",
-                            model_type="llm",
-                            model_endpoint_type="openai",
-                            enabled=True,
-                            max_context_window=180000,
-                            supports_token_streaming=True,
-                            supports_tool_calling=True,
-                        )
-                    )
+            return [m.to_pydantic() for m in org_models], [m.to_pydantic() for m in global_models]
 
-            return models
+    async def _list_catalog_models_async(self, organization_id: Optional[str]) -> List[PydanticProviderModel]:
+        """Load the (non-deleted) models of an organization, or the global models, for the model catalog."""
+        if organization_id is None:
+            scope_condition = ProviderModelORM.organization_id.is_(None)
+        else:
+            scope_condition = ProviderModelORM.organization_id == organization_id
+        async with db_registry.async_session() as session:
+            stmt = (
+                select(ProviderModelORM)
+                .where(scope_condition, ProviderModelORM.is_deleted == False)
+                .order_by(ProviderModelORM.created_at, ProviderModelORM.id)
+            )
+            result = await session.execute(stmt)
+            return [m.to_pydantic() for m in result.scalars().all()]
+
+    async def _invalidate_model_catalog(self, organization_id: Optional[str]) -> None:
+        """Drop cached models and configs of an organization (or of every organization, for global providers)."""
+        if settings.provider_catalog_enabled:
+            await get_provider_model_catalog().invalidate(organization_id)
 
     @enforce_types
     @trace_method
@@ -980,7 +971,6 @@ class ProviderManager:
             NoResultFound: If the handle doesn't exist in the database or BYOK provider
         """
         from letta.orm.errors import NoResultFound
-        from letta.settings import model_settings
 
         # Auto mode handles return a placeholder config for storage/persistence
         if handle in AUTO_MODE_HANDLES:
@@ -1003,6 +993,21 @@ class ProviderManager:
                 provider_category=ProviderCategory.base,
             )
 
+        if not settings.provider_catalog_enabled:
+            return await self._resolve_llm_config_from_handle(handle, actor)
+
+        catalog = get_provider_model_catalog()
+        llm_config = catalog.get_config(actor.organization_id, "llm", handle)
+        if llm_config is None:
+            generation = catalog.generation
+            llm_config = await self._resolve_llm_config_from_handle(handle, actor)
+            catalog.set_config(actor.organization_id, "llm", handle, llm_config, generation)
+        return llm_config
+
+    async def _resolve_llm_config_from_handle(self, handle: str, actor: PydanticUser) -> LLMConfig:
+        """Build an LLMConfig for a (non auto mode) handle from its stored model, or else from its BYOK provider's listing."""
+        from letta.orm.errors import NoResultFound
+
         # Look up the model by handle in the database (for base providers)
         model = await self.get_model_by_handle_async(handle=handle, actor=actor, model_type="llm")
 
@@ -1106,6 +1111,19 @@ class ProviderManager:
         Raises:
             NoResultFound: If the handle doesn't exist in the database or BYOK provider
         """
+        if not settings.provider_catalog_enabled:
+            return await self._resolve_embedding_config_from_handle(handle, actor)
+
+        catalog = get_provider_model_catalog()
+        embedding_config = catalog.get_config(actor.organization_id, "embedding", handle)
+        if embedding_config is None:
+            generation = catalog.generation
+            embedding_config = await self._resolve_embedding_config_from_handle(handle, actor)
+            catalog.set_config(actor.organization_id, "embedding", handle, embedding_config, generation)
+        return embedding_config
+
+    async def _resolve_embedding_config_from_handle(self, handle: str, actor: PydanticUser) -> EmbeddingConfig:
+        """Build an EmbeddingConfig for a handle from its stored model, or else from its BYOK provider's listing."""
         from letta.orm.errors import NoResultFound
 
         # Look up the model by handle in the database (for base providers)
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from letta.constants import PROVIDER_CATALOG_INVALIDATION_CHANNEL
+from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+from letta.log import get_logger
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.provider_model import ProviderModel as PydanticProviderModel
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+ModelConfig = Union[LLMConfig, EmbeddingConfig]
+ModelLoader = Callable[[Optional[str]], Awaitable[List[PydanticProviderModel]]]
+
+# model types, in the order a handle lookup without a model type tries them
+MODEL_TYPES = ("llm", "embedding")
+
+_LISTENER_RETRY_SECONDS = 5
+
+
+@dataclass
+class _CatalogSnapshot:
+    """The (non-deleted) models of one scope: the global providers, or one organization's BYOK providers."""
+
+    models: List[PydanticProviderModel]
+    expires_at: float
+    by_handle: Dict[Tuple[str, str], PydanticProviderModel] = field(default_factory=dict)
+    by_provider: Dict[str, List[PydanticProviderModel]] = field(default_factory=dict)
+    # configs resolved from a handle for this organization (org snapshots only)
+    configs: Dict[Tuple[str, str], ModelConfig] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for model in self.models:
+            self.by_handle.setdefault((model.handle, model.model_type), model)
+            self.by_provider.setdefault(model.provider_id, []).append(model)
+
+
+class ProviderModelCatalog:
+    """
+    In-memory catalog of provider models, indexed by handle and by provider.
+
+    The models of global (base) providers form one snapshot, overlaid by a snapshot per organization with its BYOK
+    models, which take precedence. Each organization snapshot also caches the LLM and embedding configs resolved from
+    handles, so resolving a handle on the hot path is a dictionary lookup instead of database queries (and, for BYOK
+    providers, credential decryption and a remote model listing).
+
+    Snapshots are loaded lazily and dropped when providers or their models change: the change is applied locally and
+    published on a Redis channel, which every server process listens on. Snapshots also expire after
+    `provider_catalog_ttl_seconds`, which bounds staleness if an invalidation is missed (e.g. without Redis). Only the
+    `provider_catalog_max_organizations` most recently used organization snapshots are kept.
+    """
+
+    def __init__(self, ttl_seconds: float, max_organizations: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_organizations = max(max_organizations, 1)
+        self._global: Optional[_CatalogSnapshot] = None
+        self._organizations: "OrderedDict[str, _CatalogSnapshot]" = OrderedDict()
+        # bumped on every invalidation, so loads and resolutions that raced with one are not stored
+        self.generation = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    def _fresh(self, snapshot: Optional[_CatalogSnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() < snapshot.expires_at
+
+    def _cached_snapshot(self, organization_id: Optional[str]) -> Optional[_CatalogSnapshot]:
+        if organization_id is None:
+            return self._global if self._fresh(self._global) else None
+        snapshot = self._organizations.get(organization_id)
+        if not self._fresh(snapshot):
+            return None
+        self._organizations.move_to_end(organization_id)
+        return snapshot
+
+    async def _snapshot(self, organization_id: Optional[str], loader: ModelLoader) -> _CatalogSnapshot:
+        snapshot = self._cached_snapshot(organization_id)
+        if snapshot is not None:
+            return snapshot
+
+        self._ensure_listener()
+        generation = self.generation
+        snapshot = _CatalogSnapshot(models=await loader(organization_id), expires_at=time.monotonic() + self.ttl_seconds)
+        if generation == self.generation:
+            if organization_id is None:
+                self._global = snapshot
+            else:
+                self._organizations[organization_id] = snapshot
+                self._organizations.move_to_end(organization_id)
+                while len(self._organizations) > self.max_organizations:
+                    self._organizations.popitem(last=False)
+        return snapshot
+
+    async def get_model(
+        self, organization_id: str, handle: str, model_type: Optional[str], loader: ModelLoader
+    ) -> Optional[PydanticProviderModel]:
+        """The model for a handle visible to the organization, preferring the organization's own models."""
+        model_types = (model_type,) if model_type else MODEL_TYPES
+        for snapshot in (await self._snapshot(organization_id, loader), await self._snapshot(None, loader)):
+            for t in model_types:
+                model = snapshot.by_handle.get((handle, t))
+                if model is not None:
+                    return model.model_copy()
+        return None
+
+    async def list_models(
+        self,
+        organization_id: str,
+        loader: ModelLoader,
+        model_type: Optional[str] = None,
+        provider_id: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[PydanticProviderModel], List[PydanticProviderModel]]:
+        """The organization's own matching models and the global matching models, each up to `limit`, as copies."""
+        results = []
+        for snapshot in (await self._snapshot(organization_id, loader), await self._snapshot(None, loader)):
+            models = snapshot.by_provider.get(provider_id, []) if provider_id else snapshot.models
+            matching = [m for m in models if (not model_type or m.model_type == model_type) and (enabled is None or m.enabled == enabled)]
+            results.append([m.model_copy() for m in matching[:limit]])
+        return results[0], results[1]
+
+    def get_config(self, organization_id: str, model_type: str, handle: str) -> Optional[ModelConfig]:
+        """A config previously resolved from the handle for the organization, or None."""
+        snapshot = self._cached_snapshot(organization_id)
+        if snapshot is None or not self._fresh(self._global):
+            return None
+        config = snapshot.configs.get((model_type, handle))
+        return config.model_copy(deep=True) if config is not None else None
+
+    def set_config(self, organization_id: str, model_type: str, handle: str, config: ModelConfig, generation: int) -> None:
+        """Cache a config resolved from the handle, unless the catalog was invalidated since `generation`."""
+        snapshot = self._cached_snapshot(organization_id)
+        if snapshot is not None and generation == self.generation:
+            snapshot.configs[(model_type, handle)] = config.model_copy(deep=True)
+
+    def invalidate_local(self, organization_id: Optional[str]) -> None:
+        """Drop the snapshot of an organization, or everything if `organization_id` is None (global providers)."""
+        self.generation += 1
+        if organization_id is None:
+            self._global = None
+            self._organizations.clear()
+        else:
+            self._organizations.pop(organization_id, None)
+
+    async def invalidate(self, organization_id: Optional[str]) -> None:
+        """Drop a scope locally and in every other server process."""
+        self.invalidate_local(organization_id)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.publish(PROVIDER_CATALOG_INVALIDATION_CHANNEL, organization_id or "")
+        except Exception as e:
+            logger.warning(f"Failed to publish provider catalog invalidation for {organization_id or 'global providers'}: {e}")
+
+    def _ensure_listener(self) -> None:
+        # the subscription is bound to the event loop it was opened on
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.get_loop() is not loop:
+            self._listener = loop.create_task(self._listen(), name="provider_catalog_invalidation_listener")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis_client = await get_redis_client()
+                if isinstance(redis_client, NoopAsyncRedisClient):
+                    return
+                async for message in redis_client.subscribe(PROVIDER_CATALOG_INVALIDATION_CHANNEL):
+                    self.invalidate_local(message.get("data") or None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Provider catalog invalidation listener failed, resubscribing: {e}")
+            # invalidations may have been missed while unsubscribed
+            self.invalidate_local(None)
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+
+_catalog: Optional[ProviderModelCatalog] = None
+
+
+def get_provider_model_catalog() -> ProviderModelCatalog:
+    """The process-wide provider model catalog."""
+    global _catalog
+    if _catalog is None:
+        _catalog = ProviderModelCatalog(
+            ttl_seconds=settings.provider_catalog_ttl_seconds,
+            max_organizations=settings.provider_catalog_max_organizations,
+        )
+    return _catalog
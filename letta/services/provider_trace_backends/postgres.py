@@ -1,13 +1,17 @@
 """PostgreSQL provider trace backend."""
 
+from datetime import datetime, timezone
+
 from letta.helpers.json_helpers import json_dumps, json_loads
 from letta.orm.provider_trace import ProviderTrace as ProviderTraceModel
 from letta.orm.provider_trace_metadata import ProviderTraceMetadata as ProviderTraceMetadataModel
+from letta.orm.sqlalchemy_base import SqlalchemyBase
 from letta.schemas.provider_trace import ProviderTrace, ProviderTraceMetadata
 from letta.schemas.user import User
 from letta.server.db import db_registry
 from letta.services.provider_trace_backends.base import ProviderTraceBackendClient
-from letta.settings import telemetry_settings
+from letta.services.step_write_buffer import get_step_write_buffer
+from letta.settings import settings, telemetry_settings
 
 
 class PostgresProviderTraceBackend(ProviderTraceBackendClient):
@@ -28,18 +32,21 @@ class PostgresProviderTraceBackend(ProviderTraceBackendClient):
         provider_trace: ProviderTrace,
     ) -> ProviderTrace:
         """Write full provider trace to provider_traces table."""
-        async with db_registry.async_session() as session:
-            provider_trace_model = ProviderTraceModel(**provider_trace.model_dump(exclude={"billing_context"}))
-            provider_trace_model.organization_id = actor.organization_id
+        provider_trace_model = ProviderTraceModel(**provider_trace.model_dump(exclude={"billing_context"}))
+        provider_trace_model.organization_id = actor.organization_id
+
+        if provider_trace.request_json:
+            request_json_str = json_dumps(provider_trace.request_json)
+            provider_trace_model.request_json = json_loads(request_json_str)
 
-            if provider_trace.request_json:
-                request_json_str = json_dumps(provider_trace.request_json)
-                provider_trace_model.request_json = json_loads(request_json_str)
+        if provider_trace.response_json:
+            response_json_str = json_dumps(provider_trace.response_json)
+            provider_trace_model.response_json = json_loads(response_json_str)
 
-            if provider_trace.response_json:
-                response_json_str = json_dumps(provider_trace.response_json)
-                provider_trace_model.response_json = json_loads(response_json_str)
+        if settings.step_write_buffer_enabled:
+            return self._buffer(actor, provider_trace_model, provider_trace.step_id)
 
+        async with db_registry.async_session() as session:
             await provider_trace_model.create_async(session, actor=actor, no_commit=True, no_refresh=True)
             return provider_trace_model.to_pydantic()
 
@@ -63,16 +70,29 @@ class PostgresProviderTraceBackend(ProviderTraceBackendClient):
         metadata_model = ProviderTraceMetadataModel(**metadata.model_dump())
         metadata_model.organization_id = actor.organization_id
 
+        if settings.step_write_buffer_enabled:
+            return self._buffer(actor, metadata_model, provider_trace.step_id)
+
         async with db_registry.async_session() as session:
             await metadata_model.create_async(session, actor=actor, no_commit=True, no_refresh=True)
             return metadata_model.to_pydantic()
 
+    @staticmethod
+    def _buffer(actor: User, model: SqlalchemyBase, step_id: str | None):
+        """Hand the trace row to the step write buffer, which writes it together with its step."""
+        model._set_created_and_updated_by_fields(actor.id)
+        model.created_at = datetime.now(timezone.utc)
+        get_step_write_buffer().add_row(step_id, model)
+        return model.to_pydantic()
+
     async def get_by_step_id_async(
         self,
         step_id: str,
         actor: User,
     ) -> ProviderTrace | None:
         """Read from provider_traces table. Always reads from full table regardless of write flag."""
+        if settings.step_write_buffer_enabled:
+            await get_step_write_buffer().flush_steps([step_id])
         return await self._get_full_by_step_id_async(step_id, actor)
 
     async def _get_full_by_step_id_async(
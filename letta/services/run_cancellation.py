@@ -0,0 +1,123 @@
+import asyncio
+import weakref
+from typing import Optional
+
+from letta.constants import RUN_CANCELLATION_CHANNEL, RUN_CANCELLED_KEY_PREFIX, RUN_CANCELLED_KEY_TTL_SECONDS
+from letta.data_sources.redis_client import NoopAsyncRedisClient, get_redis_client
+from letta.log import get_logger
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+_LISTENER_RETRY_SECONDS = 5
+
+
+class RunCancellationSignals:
+    """
+    Per-process cancellation events of runs, set by pushes over Redis instead of by polling the run's status.
+
+    `cancel` records the cancellation in a Redis key and publishes it on a channel that every server process listens
+    on; the listener sets the event of the run, which the agent loop and the streams of the run check (or await). While
+    the listener is subscribed, whether a run is cancelled is answered from its event, with no query. Otherwise it is
+    answered from the Redis key, and callers fall back to the run's status if Redis isn't configured.
+
+    Cancellations published while the listener was not subscribed are picked up from the Redis keys when it subscribes.
+
+    Events are held weakly: a run's event stays registered while something waiting on the run (its stream, or the agent
+    running it) holds a reference, and is dropped with the last one, so finished runs leave nothing behind.
+    """
+
+    def __init__(self):
+        self._events: "weakref.WeakValueDictionary[str, asyncio.Event]" = weakref.WeakValueDictionary()
+        self._listener: Optional[asyncio.Task] = None
+        self.listening = False
+
+    def event(self, run_id: str) -> asyncio.Event:
+        """The cancellation event of a run, created if needed. Callers keep a reference for as long as they watch the run."""
+        event = self._events.get(run_id)
+        if event is None:
+            event = asyncio.Event()
+            self._events[run_id] = event
+        return event
+
+    async def is_cancelled(self, run_id: str) -> Optional[bool]:
+        """Whether the run was cancelled, or None if that is unknown without checking the run's status."""
+        new = run_id not in self._events
+        event = self.event(run_id)
+        if event.is_set():
+            return True
+
+        redis_client = await get_redis_client()
+        if isinstance(redis_client, NoopAsyncRedisClient):
+            return None
+        self._ensure_listener()
+        # a run seen for the first time may have been cancelled before its event existed
+        if self.listening and not new:
+            return False
+        if await redis_client.get(f"{RUN_CANCELLED_KEY_PREFIX}{run_id}"):
+            event.set()
+            return True
+        return False
+
+    async def cancel(self, run_id: str) -> None:
+        """Signal the cancellation of a run to every server process."""
+        self.event(run_id).set()
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.set(f"{RUN_CANCELLED_KEY_PREFIX}{run_id}", 1, ex=RUN_CANCELLED_KEY_TTL_SECONDS)
+            await redis_client.publish(RUN_CANCELLATION_CHANNEL, run_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish the cancellation of run {run_id}: {e}")
+
+    def _ensure_listener(self) -> None:
+        # the subscription is bound to the event loop it was opened on
+        loop = asyncio.get_running_loop()
+        if self._listener is None or self._listener.done() or self._listener.get_loop() is not loop:
+            self.listening = False
+            self._listener = loop.create_task(self._listen(), name="run_cancellation_listener")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis_client = await get_redis_client()
+                async for message in redis_client.subscribe(RUN_CANCELLATION_CHANNEL, on_subscribe=self._on_subscribe):
+                    event = self._events.get(message["data"])
+                    if event is not None:
+                        event.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Run cancellation listener failed, resubscribing: {e}")
+            finally:
+                self.listening = False
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
+    async def _on_subscribe(self) -> None:
+        # cancellations published while we were not subscribed are only in the Redis keys
+        redis_client = await get_redis_client()
+        # only runs something still waits on (their events are alive)
+        pending = {run_id: event for run_id, event in self._events.items() if not event.is_set()}
+        if pending:
+            values = await redis_client.mget(*(f"{RUN_CANCELLED_KEY_PREFIX}{run_id}" for run_id in pending))
+            for (run_id, event), value in zip(pending.items(), values):
+                if value:
+                    event.set()
+        self.listening = True
+
+
+_signals: Optional[RunCancellationSignals] = None
+
+
+def get_run_cancellation_signals() -> RunCancellationSignals:
+    """The process-wide run cancellation signals."""
+    global _signals
+    if _signals is None:
+        _signals = RunCancellationSignals()
+    return _signals
+
+
+async def is_run_cancelled_by_signal(run_id: str) -> Optional[bool]:
+    """Whether the run was cancelled according to pushed cancellations, or None if its status must be checked."""
+    if not settings.run_cancellation_push_enabled:
+        return None
+    return await get_run_cancellation_signals().is_cancelled(run_id)
@@ -24,11 +24,13 @@ from letta.schemas.run_metrics import RunMetrics as PydanticRunMetrics
 from letta.schemas.step import Step as PydanticStep
 from letta.schemas.usage import LettaUsageStatistics, normalize_cache_tokens, normalize_reasoning_tokens
 from letta.schemas.user import User as PydanticUser
-from letta.server.db import db_registry
+from letta.server.db import db_registry, pin_to_primary
 from letta.services.agent_manager import AgentManager
 from letta.services.helpers.agent_manager_helper import validate_agent_exists_async
 from letta.services.message_manager import MessageManager
+from letta.services.run_cancellation import get_run_cancellation_signals
 from letta.services.step_manager import StepManager
+from letta.settings import settings
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
 
@@ -156,7 +158,7 @@ class RunManager:
         end_date: Optional[datetime] = None,
     ) -> List[PydanticRun]:
         """List runs with filtering options."""
-        async with db_registry.async_session() as session:
+        async with db_registry.async_session(read_only=True) as session:
             from sqlalchemy import func, select
 
             # Always join with run_metrics to get duration data
@@ -518,6 +520,8 @@ class RunManager:
             if not run:
                 raise NoResultFound(f"Run with id {run_id} not found")
 
+        # the run's steps were written by the task executing it, not by this request; replicas can lag behind them
+        pin_to_primary()
         steps = await self.step_manager.list_steps_async(run_id=run_id, actor=actor)
         total_usage = LettaUsageStatistics()
         for step in steps:
@@ -665,6 +669,8 @@ class RunManager:
             actor=actor,
             conversation_id=run.conversation_id,
         )
+        if settings.run_cancellation_push_enabled:
+            await get_run_cancellation_signals().cancel(run_id)
 
         # cleanup the agent's state
         # if was pending approval, we need to cleanup the approval state
@@ -212,7 +212,7 @@ class SandboxConfigManager:
                 from letta.schemas.secret import Secret
 
                 if env_var.value:
-                    env_var.value_enc = await Secret.from_plaintext_async(env_var.value)
+                    env_var.value_enc = await Secret.from_plaintext_async(env_var.value, organization_id=actor.organization_id)
                     env_var.value = ""  # Don't store plaintext, use empty string for NOT NULL constraint
 
                 env_var = SandboxEnvVarModel(**env_var.model_dump(to_orm=True))
@@ -242,7 +242,7 @@ class SandboxConfigManager:
 
                 # Only re-encrypt if different (async to avoid blocking event loop)
                 if existing_value != update_data["value"]:
-                    value_secret = await Secret.from_plaintext_async(update_data["value"])
+                    value_secret = await Secret.from_plaintext_async(update_data["value"], organization_id=actor.organization_id)
                     env_var.value_enc = value_secret.get_encrypted()
                     # Don't store plaintext anymore
 
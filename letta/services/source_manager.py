@@ -14,6 +14,8 @@ from letta.schemas.enums import PrimitiveType, VectorDBProvider
 from letta.schemas.source import Source as PydanticSource, SourceUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
+from letta.services.passage_vector_index_manager import PassageVectorIndexManager
 from letta.utils import bounded_gather, decrypt_agent_secrets, enforce_types, printd
 from letta.validators import raise_on_invalid_id
 
@@ -77,7 +79,9 @@ class SourceManager:
                 source.vector_db_provider = vector_db_provider
                 source = SourceModel(**source.model_dump(to_orm=True, exclude_none=True))
                 await source.create_async(session, actor=actor)
-                return source.to_pydantic()
+                pydantic_source = source.to_pydantic()
+            PassageVectorIndexManager().schedule_ensure_index("source", pydantic_source.id, pydantic_source.embedding_config)
+            return pydantic_source
 
     @enforce_types
     @trace_method
@@ -220,6 +224,7 @@ class SourceManager:
             if update_data:
                 for key, value in update_data.items():
                     setattr(source, key, value)
+                await bump_agent_versions_async(session, source_ids=[source_id])
                 await source.update_async(db_session=session, actor=actor)
             else:
                 printd(
@@ -235,8 +240,11 @@ class SourceManager:
         """Delete a source by its ID."""
         async with db_registry.async_session() as session:
             source = await SourceModel.read_async(db_session=session, identifier=source_id)
+            await bump_agent_versions_async(session, source_ids=[source_id])
             await source.hard_delete_async(db_session=session, actor=actor)
-            return source.to_pydantic()
+            pydantic_source = source.to_pydantic()
+        PassageVectorIndexManager().schedule_drop_index("source", source_id)
+        return pydantic_source
 
     @enforce_types
     @trace_method
@@ -25,9 +25,11 @@ from letta.schemas.step import Step as PydanticStep
 from letta.schemas.step_metrics import StepMetrics as PydanticStepMetrics
 from letta.schemas.usage import normalize_cache_tokens, normalize_reasoning_tokens
 from letta.schemas.user import User as PydanticUser
-from letta.server.db import db_registry
+from letta.server.db import db_registry, pin_to_primary
 from letta.server.rest_api.middleware.request_id import get_request_id
+from letta.services.step_write_buffer import get_step_write_buffer
 from letta.services.webhook_service import WebhookService
+from letta.settings import settings
 from letta.utils import enforce_types
 from letta.validators import raise_on_invalid_id
 
@@ -60,7 +62,11 @@ class StepManager:
         run_id: Optional[str] = None,
     ) -> List[PydanticStep]:
         """List all jobs with optional pagination and status filter."""
-        async with db_registry.async_session() as session:
+        if settings.step_write_buffer_enabled:
+            await get_step_write_buffer().flush()
+            # buffered steps may have been written moments ago by a background flush, which replicas can lag behind
+            pin_to_primary()
+        async with db_registry.async_session(read_only=True) as session:
             filter_kwargs = {"organization_id": actor.organization_id}
             if model:
                 filter_kwargs["model"] = model
@@ -228,6 +234,15 @@ class StepManager:
         if stop_reason:
             step_data["stop_reason"] = stop_reason.stop_reason
 
+        if settings.step_write_buffer_enabled:
+            step_buffer = get_step_write_buffer()
+            buffered_step = step_buffer.get_step(actor.organization_id, step_id) if allow_partial and step_id else None
+            if buffered_step is not None:
+                return buffered_step
+            if not allow_partial:
+                step_data.setdefault("id", PydanticStep.generate_id())
+                return step_buffer.add_step(step_data)
+
         async with db_registry.async_session() as session:
             if allow_partial:
                 try:
@@ -251,6 +266,8 @@ class StepManager:
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
     @trace_method
     async def get_step_async(self, step_id: str, actor: PydanticUser) -> PydanticStep:
+        if settings.step_write_buffer_enabled:
+            await get_step_write_buffer().flush_steps([step_id])
         async with db_registry.async_session() as session:
             step = await StepModel.read_async(db_session=session, identifier=step_id, actor=actor)
             return step.to_pydantic()
@@ -259,6 +276,8 @@ class StepManager:
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
     @trace_method
     async def get_step_metrics_async(self, step_id: str, actor: PydanticUser) -> PydanticStepMetrics:
+        if settings.step_write_buffer_enabled:
+            await get_step_write_buffer().flush_steps([step_id])
         async with db_registry.async_session() as session:
             metrics = await StepMetricsModel.read_async(db_session=session, identifier=step_id, actor=actor)
             return metrics.to_pydantic()
@@ -269,6 +288,8 @@ class StepManager:
     async def add_feedback_async(
         self, step_id: str, feedback: FeedbackType | None, actor: PydanticUser, tags: list[str] | None = None
     ) -> PydanticStep:
+        if settings.step_write_buffer_enabled:
+            await get_step_write_buffer().flush_steps([step_id])
         async with db_registry.async_session() as session:
             step = await StepModel.read_async(db_session=session, identifier=step_id, actor=actor)
             if not step:
@@ -277,7 +298,10 @@ class StepManager:
             if tags:
                 step.tags = tags
             step = await step.update_async(session)
-            return step.to_pydantic()
+            pydantic_step = step.to_pydantic()
+        if settings.step_write_buffer_enabled:
+            get_step_write_buffer().forget(step_id)
+        return pydantic_step
 
     @enforce_types
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
@@ -296,17 +320,7 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
-
-            step.tid = transaction_id
-            # context manager now handles commits
-            # await session.commit()
-            return step.to_pydantic()
+        return await self._update_step_async(actor, step_id, {"tid": transaction_id})
 
     @enforce_types
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
@@ -350,17 +364,7 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
-
-            step.stop_reason = stop_reason
-            # context manager now handles commits
-            # await session.commit()
-            return step
+        return await self._update_step_async(actor, step_id, {"stop_reason": stop_reason})
 
     @enforce_types
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
@@ -392,25 +396,16 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
-
-            step.status = StepStatus.FAILED
-            step.error_type = error_type
-            step.error_data = {"message": error_message, "traceback": error_traceback, "details": error_details}
-            if stop_reason:
-                step.stop_reason = stop_reason.stop_reason
+        changes = {
+            "status": StepStatus.FAILED,
+            "error_type": error_type,
+            "error_data": {"message": error_message, "traceback": error_traceback, "details": error_details},
+        }
+        if stop_reason:
+            changes["stop_reason"] = stop_reason.stop_reason
 
-            # context manager now handles commits
-            # await session.commit()
-            pydantic_step = step.to_pydantic()
-        # Send webhook notification for step completion outside the DB session
-        webhook_service = WebhookService()
-        await webhook_service.notify_step_complete(step_id)
+        pydantic_step = await self._update_step_async(actor, step_id, changes)
+        await self._notify_step_complete(step_id)
         return pydantic_step
 
     @enforce_types
@@ -437,42 +432,33 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
+        changes = {
+            "status": StepStatus.SUCCESS,
+            "completion_tokens": usage.completion_tokens,
+            "prompt_tokens": usage.prompt_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+        if stop_reason:
+            changes["stop_reason"] = stop_reason.stop_reason
 
-            step.status = StepStatus.SUCCESS
-            step.completion_tokens = usage.completion_tokens
-            step.prompt_tokens = usage.prompt_tokens
-            step.total_tokens = usage.total_tokens
-            if stop_reason:
-                step.stop_reason = stop_reason.stop_reason
-
-            # Persist detailed token breakdowns if available
-            if usage.prompt_tokens_details:
-                step.prompt_tokens_details = usage.prompt_tokens_details.model_dump()
-                # Extract normalized cache tokens
-                cached_input, cache_write = normalize_cache_tokens(usage.prompt_tokens_details)
-                if cached_input > 0:
-                    step.cached_input_tokens = cached_input
-                if cache_write > 0:
-                    step.cache_write_tokens = cache_write
-            if usage.completion_tokens_details:
-                step.completion_tokens_details = usage.completion_tokens_details.model_dump()
-                # Extract normalized reasoning tokens
-                reasoning = normalize_reasoning_tokens(usage.completion_tokens_details)
-                if reasoning > 0:
-                    step.reasoning_tokens = reasoning
+        # Persist detailed token breakdowns if available
+        if usage.prompt_tokens_details:
+            changes["prompt_tokens_details"] = usage.prompt_tokens_details.model_dump()
+            # Extract normalized cache tokens
+            cached_input, cache_write = normalize_cache_tokens(usage.prompt_tokens_details)
+            if cached_input > 0:
+                changes["cached_input_tokens"] = cached_input
+            if cache_write > 0:
+                changes["cache_write_tokens"] = cache_write
+        if usage.completion_tokens_details:
+            changes["completion_tokens_details"] = usage.completion_tokens_details.model_dump()
+            # Extract normalized reasoning tokens
+            reasoning = normalize_reasoning_tokens(usage.completion_tokens_details)
+            if reasoning > 0:
+                changes["reasoning_tokens"] = reasoning
 
-            # context manager now handles commits
-            # await session.commit()
-            pydantic_step = step.to_pydantic()
-        # Send webhook notification for step completion outside the DB session
-        webhook_service = WebhookService()
-        await webhook_service.notify_step_complete(step_id)
+        pydantic_step = await self._update_step_async(actor, step_id, changes)
+        await self._notify_step_complete(step_id)
         return pydantic_step
 
     @enforce_types
@@ -499,19 +485,15 @@ class StepManager:
             model_endpoint: The resolved model endpoint
             model_handle: The resolved model handle
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
-
-            step.provider_name = provider_name
-            step.provider_category = provider_category
-            step.model = model
-            step.model_endpoint = model_endpoint
-            if model_handle is not None:
-                step.model_handle = model_handle
+        changes = {
+            "provider_name": provider_name,
+            "provider_category": provider_category,
+            "model": model,
+            "model_endpoint": model_endpoint,
+        }
+        if model_handle is not None:
+            changes["model_handle"] = model_handle
+        await self._update_step_async(actor, step_id, changes)
 
     @enforce_types
     @raise_on_invalid_id(param_name="step_id", expected_prefix=PrimitiveType.STEP)
@@ -535,23 +517,12 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
-        async with db_registry.async_session() as session:
-            step = await session.get(StepModel, step_id)
-            if not step:
-                raise NoResultFound(f"Step with id {step_id} does not exist")
-            if step.organization_id != actor.organization_id:
-                raise Exception("Unauthorized")
-
-            step.status = StepStatus.CANCELLED
-            if stop_reason:
-                step.stop_reason = stop_reason.stop_reason
+        changes = {"status": StepStatus.CANCELLED}
+        if stop_reason:
+            changes["stop_reason"] = stop_reason.stop_reason
 
-            # context manager now handles commits
-            # await session.commit()
-            pydantic_step = step.to_pydantic()
-        # Send webhook notification for step completion outside the DB session
-        webhook_service = WebhookService()
-        await webhook_service.notify_step_complete(step_id)
+        pydantic_step = await self._update_step_async(actor, step_id, changes)
+        await self._notify_step_complete(step_id)
         return pydantic_step
 
     @enforce_types
@@ -593,6 +564,25 @@ class StepManager:
         Raises:
             NoResultFound: If the step does not exist
         """
+        if settings.step_write_buffer_enabled:
+            buffered_metrics = get_step_write_buffer().record_metrics(
+                actor.organization_id,
+                step_id,
+                {
+                    "llm_request_ns": llm_request_ns,
+                    "tool_execution_ns": tool_execution_ns,
+                    "step_ns": step_ns,
+                    "agent_id": agent_id,
+                    "run_id": run_id,
+                    "project_id": project_id,
+                    "template_id": template_id,
+                    "base_template_id": base_template_id,
+                },
+                allow_partial=allow_partial,
+            )
+            if buffered_metrics is not None:
+                return buffered_metrics
+
         async with db_registry.async_session() as session:
             step = await session.get(StepModel, step_id)
             if not step:
@@ -651,6 +641,33 @@ class StepManager:
             await metrics.create_async(session)
             return metrics.to_pydantic()
 
+    async def _update_step_async(self, actor: PydanticUser, step_id: str, changes: Dict) -> PydanticStep:
+        """Apply column changes to a step, through the write buffer if it tracks the step."""
+        if settings.step_write_buffer_enabled:
+            buffered_step = get_step_write_buffer().update_step(actor.organization_id, step_id, changes)
+            if buffered_step is not None:
+                return buffered_step
+
+        async with db_registry.async_session() as session:
+            step = await session.get(StepModel, step_id)
+            if not step:
+                raise NoResultFound(f"Step with id {step_id} does not exist")
+            if step.organization_id != actor.organization_id:
+                raise Exception("Unauthorized")
+
+            for key, value in changes.items():
+                setattr(step, key, value)
+            # context manager now handles commits
+            return step.to_pydantic()
+
+    async def _notify_step_complete(self, step_id: str) -> None:
+        # Send webhook notification for step completion outside the DB session
+        webhook_service = WebhookService()
+        if webhook_service.webhook_url and settings.step_write_buffer_enabled:
+            # the receiver may read the step back right away
+            await get_step_write_buffer().flush_steps([step_id])
+        await webhook_service.notify_step_complete(step_id)
+
     def _verify_run_access(
         self,
         session: Session,
@@ -0,0 +1,330 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select, update
+
+from letta.log import get_logger
+from letta.orm.run import Run as RunModel
+from letta.orm.sqlalchemy_base import SqlalchemyBase
+from letta.orm.step import Step as StepModel
+from letta.orm.step_metrics import StepMetrics as StepMetricsModel
+from letta.schemas.step import Step as PydanticStep
+from letta.schemas.step_metrics import StepMetrics as PydanticStepMetrics
+from letta.server.db import db_registry
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+# flushed steps stay tracked (so later updates can be buffered too) up to this many, least recently used first out
+_MAX_TRACKED_STEPS = 10000
+
+
+@dataclass
+class _TrackedStep:
+    organization_id: str
+    # current column values of the step and of its metrics
+    values: Dict[str, Any]
+    metrics: Optional[Dict[str, Any]] = None
+    # whether the rows exist in the database yet, and the columns changed since they were written
+    inserted: bool = False
+    changes: Dict[str, Any] = field(default_factory=dict)
+    metrics_inserted: bool = False
+    metrics_changes: Dict[str, Any] = field(default_factory=dict)
+    # insert-only rows belonging to the step (e.g. provider traces)
+    rows: List[SqlalchemyBase] = field(default_factory=list)
+
+
+@dataclass
+class _Batch:
+    step_inserts: List[Dict[str, Any]] = field(default_factory=list)
+    step_updates: List[Dict[str, Any]] = field(default_factory=list)
+    metrics_inserts: List[Dict[str, Any]] = field(default_factory=list)
+    metrics_updates: List[Dict[str, Any]] = field(default_factory=list)
+    rows: List[SqlalchemyBase] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.step_inserts) + len(self.step_updates) + len(self.metrics_inserts) + len(self.metrics_updates) + len(self.rows)
+
+
+class StepWriteBuffer:
+    """
+    Write-behind buffer for step lifecycle writes: step creation and updates, step metrics and provider traces.
+
+    Instead of a transaction per write, the writes of a step are coalesced in memory (a step created and then updated is
+    inserted once, with its final values) and the writes of all buffered steps are flushed together, as multi-row inserts
+    and bulk updates in one transaction. A flush runs every `step_write_buffer_flush_interval_ms`, as soon as
+    `step_write_buffer_max_pending` steps have pending writes, before rows that reference a buffered step are written and
+    before a buffered step is read, and on shutdown.
+
+    Updates are only buffered for steps the buffer tracks (created through it, or updated through it recently); callers
+    write other steps directly. If a flush fails, the writes of each step are retried on their own, and then the step's
+    row, its metrics and each of its other rows apart, so that only the failing writes are logged and dropped.
+    """
+
+    def __init__(self, flush_interval_seconds: float, max_pending: int):
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max(max_pending, 1)
+        self._steps: "OrderedDict[str, _TrackedStep]" = OrderedDict()
+        # insert-only rows that do not belong to a step
+        self._rows: List[SqlalchemyBase] = []
+        self._pending: Set[str] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+
+    # buffering
+
+    def _bind_loop(self) -> None:
+        # the lock and flusher task are bound to the event loop that uses them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._flusher = None
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_periodically(), name="step_write_buffer_flusher")
+
+    def _mark_pending(self, step_id: Optional[str]) -> None:
+        self._bind_loop()
+        if step_id is not None:
+            self._pending.add(step_id)
+        if len(self._pending) + len(self._rows) >= self.max_pending and not self._background:
+            task = self._loop.create_task(self.flush(), name="step_write_buffer_flush")
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    def _tracked(self, organization_id: str, step_id: str) -> Optional[_TrackedStep]:
+        tracked = self._steps.get(step_id)
+        if tracked is None:
+            return None
+        if tracked.organization_id != organization_id:
+            raise Exception("Unauthorized")
+        self._steps.move_to_end(step_id)
+        return tracked
+
+    def _evict(self) -> None:
+        for step_id in list(self._steps):
+            if len(self._steps) <= _MAX_TRACKED_STEPS:
+                break
+            if step_id not in self._pending:
+                del self._steps[step_id]
+
+    def add_step(self, values: Dict[str, Any]) -> PydanticStep:
+        """Buffer the creation of a step with the given column values (which must include its id and organization)."""
+        values = {"created_at": datetime.now(timezone.utc), **values}
+        self._steps[values["id"]] = _TrackedStep(organization_id=values["organization_id"], values=values)
+        self._mark_pending(values["id"])
+        self._evict()
+        return StepModel(**values).to_pydantic()
+
+    def get_step(self, organization_id: str, step_id: str) -> Optional[PydanticStep]:
+        """The current state of a tracked step, or None if the step is not tracked."""
+        tracked = self._tracked(organization_id, step_id)
+        return StepModel(**tracked.values).to_pydantic() if tracked else None
+
+    def update_step(self, organization_id: str, step_id: str, changes: Dict[str, Any]) -> Optional[PydanticStep]:
+        """Buffer an update of a tracked step and return its new state, or return None if the step is not tracked."""
+        tracked = self._tracked(organization_id, step_id)
+        if tracked is None:
+            return None
+        tracked.values.update(changes)
+        if tracked.inserted:
+            tracked.changes.update(changes)
+        self._mark_pending(step_id)
+        return StepModel(**tracked.values).to_pydantic()
+
+    def record_metrics(
+        self, organization_id: str, step_id: str, metrics: Dict[str, Any], allow_partial: bool = False
+    ) -> Optional[PydanticStepMetrics]:
+        """
+        Buffer the creation or update of a tracked step's metrics and return their new state, or return None if the
+        step is not tracked. As with direct writes, only the given (non-None) metrics overwrite existing values.
+        """
+        tracked = self._tracked(organization_id, step_id)
+        if tracked is None:
+            return None
+        if tracked.metrics is None:
+            tracked.metrics = {
+                "id": step_id,
+                "organization_id": organization_id,
+                "created_at": datetime.now(timezone.utc),
+                **metrics,
+                "agent_id": metrics.get("agent_id") or tracked.values.get("agent_id"),
+                "project_id": metrics.get("project_id") or tracked.values.get("project_id"),
+            }
+        elif not allow_partial:
+            changes = {key: value for key, value in metrics.items() if value is not None}
+            tracked.metrics.update(changes)
+            if tracked.metrics_inserted:
+                tracked.metrics_changes.update(changes)
+        self._mark_pending(step_id)
+        return StepMetricsModel(**tracked.metrics).to_pydantic()
+
+    def add_row(self, step_id: Optional[str], row: SqlalchemyBase) -> None:
+        """Buffer the insertion of a row, written together with (and after) the writes of its step."""
+        tracked = self._steps.get(step_id) if step_id else None
+        if tracked is not None:
+            tracked.rows.append(row)
+            self._mark_pending(step_id)
+        else:
+            self._rows.append(row)
+            self._mark_pending(None)
+
+    def forget(self, step_id: str) -> None:
+        """Stop tracking a step whose row was changed outside the buffer (its pending writes must be flushed first)."""
+        if step_id not in self._pending:
+            self._steps.pop(step_id, None)
+
+    def has_pending(self, step_ids: Optional[Iterable[str]] = None) -> bool:
+        """Whether any of the given steps (or any step at all, or any other row) has buffered writes."""
+        if step_ids is None:
+            return bool(self._pending or self._rows)
+        return any(step_id in self._pending for step_id in step_ids)
+
+    # flushing
+
+    def _flushing(self) -> bool:
+        return self._lock is not None and self._lock.locked()
+
+    async def flush_steps(self, step_ids: Iterable[str]) -> None:
+        """Make sure the buffered writes of the given steps are written, including any that are being flushed right now."""
+        if self.has_pending(step_ids) or self._flushing():
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far, after any flush in progress."""
+        if not self.has_pending() and not self._flushing():
+            return
+        self._bind_loop()
+        # flushes are serialized, so a step's insert is always committed before a later flush updates it
+        async with self._lock:
+            groups: Dict[Optional[str], _Batch] = {}
+            for step_id in list(self._pending):
+                tracked = self._steps.get(step_id)
+                if tracked is not None:
+                    groups[step_id] = self._take(step_id, tracked)
+            self._pending.clear()
+            if self._rows:
+                groups[None] = _Batch(rows=self._rows)
+                self._rows = []
+            if not groups:
+                return
+
+            batch = _Batch()
+            for group in groups.values():
+                for name in ("step_inserts", "step_updates", "metrics_inserts", "metrics_updates", "rows"):
+                    getattr(batch, name).extend(getattr(group, name))
+            try:
+                await self._write(batch)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to flush {len(batch)} buffered step writes, retrying step by step: {e}")
+
+            for step_id, group in groups.items():
+                try:
+                    await self._write(group)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Failed to flush {len(group)} buffered writes for step {step_id}, retrying them one by one: {e}")
+
+                for part in self._split(group):
+                    try:
+                        await self._write(part)
+                    except Exception as e:
+                        logger.error(f"Dropping {len(part)} buffered writes for step {step_id}: {e}")
+                        if part.step_inserts or part.step_updates:
+                            # later writes of the step go to the database directly (and fail there if it does not exist)
+                            self._steps.pop(step_id, None)
+
+    @staticmethod
+    def _take(step_id: str, tracked: _TrackedStep) -> _Batch:
+        batch = _Batch()
+        if not tracked.inserted:
+            batch.step_inserts.append(dict(tracked.values))
+            tracked.inserted = True
+        elif tracked.changes:
+            batch.step_updates.append({"id": step_id, **tracked.changes, "updated_at": datetime.now(timezone.utc)})
+        tracked.changes = {}
+        if tracked.metrics is not None:
+            if not tracked.metrics_inserted:
+                batch.metrics_inserts.append(dict(tracked.metrics))
+                tracked.metrics_inserted = True
+            elif tracked.metrics_changes:
+                batch.metrics_updates.append({"id": step_id, **tracked.metrics_changes, "updated_at": datetime.now(timezone.utc)})
+            tracked.metrics_changes = {}
+        batch.rows, tracked.rows = tracked.rows, []
+        return batch
+
+    @staticmethod
+    def _split(batch: _Batch) -> List[_Batch]:
+        """The writes of a batch in write order: those of the steps, those of their metrics, then each other row alone."""
+        parts = [
+            _Batch(step_inserts=batch.step_inserts, step_updates=batch.step_updates),
+            _Batch(metrics_inserts=batch.metrics_inserts, metrics_updates=batch.metrics_updates),
+            *(_Batch(rows=[row]) for row in batch.rows),
+        ]
+        return [part for part in parts if part]
+
+    @staticmethod
+    async def _write(batch: _Batch) -> None:
+        async with db_registry.async_session() as session:
+            # runs can be deleted while their steps are buffered
+            run_ids = {values["run_id"] for values in batch.step_inserts + batch.metrics_inserts if values.get("run_id")}
+            if run_ids:
+                result = await session.execute(select(RunModel.id).where(RunModel.id.in_(run_ids)))
+                missing_run_ids = run_ids - set(result.scalars().all())
+                if missing_run_ids:
+                    logger.warning("Buffered steps reference non-existent run(s) %s, setting run_id to None", missing_run_ids)
+                    for values in batch.step_inserts + batch.metrics_inserts:
+                        if values.get("run_id") in missing_run_ids:
+                            values["run_id"] = None
+
+            # inserts of the same table are batched into multi-row statements; steps go first for the foreign keys
+            if batch.step_inserts:
+                session.add_all([StepModel(**values) for values in batch.step_inserts])
+                await session.flush()
+            if batch.step_updates:
+                await session.execute(update(StepModel), batch.step_updates)
+            if batch.metrics_inserts:
+                session.add_all([StepMetricsModel(**values) for values in batch.metrics_inserts])
+                await session.flush()
+            if batch.metrics_updates:
+                await session.execute(update(StepMetricsModel), batch.metrics_updates)
+            if batch.rows:
+                session.add_all(batch.rows)
+            await session.commit()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Periodic flush of buffered step writes failed: {e}")
+
+    async def close(self) -> None:
+        """Stop the periodic flush and write everything still buffered."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+        await self.flush()
+
+
+_step_write_buffer: Optional[StepWriteBuffer] = None
+
+
+def get_step_write_buffer() -> StepWriteBuffer:
+    """The process-wide step write buffer."""
+    global _step_write_buffer
+    if _step_write_buffer is None:
+        _step_write_buffer = StepWriteBuffer(
+            flush_interval_seconds=settings.step_write_buffer_flush_interval_ms / 1000,
+            max_pending=settings.step_write_buffer_max_pending,
+        )
+    return _step_write_buffer
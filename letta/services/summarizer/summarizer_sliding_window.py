@@ -31,8 +31,7 @@ async def count_tokens(actor: User, llm_config: LLMConfig, messages: List[Messag
         model=llm_config.model,
         actor=actor,
     )
-    converted_messages = token_counter.convert_messages(messages)
-    tokens = await token_counter.count_message_tokens(converted_messages)
+    tokens = await token_counter.count_messages(messages)
 
     # Apply safety margin for approximate counting to avoid underestimating
     from letta.services.context_window_calculator.token_counter import ApproxTokenCounter
@@ -36,7 +36,7 @@ from letta.schemas.enums import PrimitiveType, SandboxType, ToolType
 from letta.schemas.tool import Tool as PydanticTool, ToolCreate, ToolUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
-from letta.services.helpers.agent_manager_helper import calculate_multi_agent_tools
+from letta.services.helpers.agent_manager_helper import bump_agent_versions_async, calculate_multi_agent_tools
 from letta.services.mcp.types import SSEServerConfig, StdioServerConfig
 from letta.services.tool_schema_generator import generate_schema_for_tool_creation, generate_schema_for_tool_update
 from letta.settings import settings, tool_settings
@@ -344,6 +344,7 @@ class ToolManager:
 
             result = await session.execute(upsert_stmt)
             tool_id = result.scalar_one()
+            await bump_agent_versions_async(session, tool_ids=[tool_id])
             await session.commit()
 
             # Fetch the upserted tool
@@ -1044,6 +1045,7 @@ class ToolManager:
             # Save the updated tool to the database
             tool = await tool.update_async(db_session=session, actor=actor)
             updated_tool = tool.to_pydantic()
+            await bump_agent_versions_async(session, tool_ids=[tool_id])
 
             # Update Modal hash in metadata if needed (inside session context)
             if needs_modal_deployment:
@@ -1114,6 +1116,8 @@ class ToolManager:
                     # Skip Modal cleanup and just delete the tool from database
                     logger.warning(f"Skipping Modal cleanup for corrupted tool {tool_id}: {e}")
 
+                # bump before the delete cascades the tool's agent attachments away
+                await bump_agent_versions_async(session, tool_ids=[tool_id])
                 await tool.hard_delete_async(db_session=session, actor=actor)
 
                 # Delete from Turbopuffer if enabled
@@ -1253,12 +1257,15 @@ class ToolManager:
                     else:
                         update_dict[col.name] = excluded[col.name]
 
-            upsert_stmt = stmt.on_conflict_do_update(index_elements=["name", "organization_id"], set_=update_dict)
+            upsert_stmt = stmt.on_conflict_do_update(index_elements=["name", "organization_id"], set_=update_dict).returning(table.c.id)
         else:
             # on conflict, do nothing (skip existing tools)
             upsert_stmt = stmt.on_conflict_do_nothing(index_elements=["name", "organization_id"])
 
-        await session.execute(upsert_stmt)
+        result = await session.execute(upsert_stmt)
+        if override_existing_tools:
+            # agents with an overwritten tool must not keep serving a cached copy of it
+            await bump_agent_versions_async(session, tool_ids=list(result.scalars()))
         # context manager now handles commits
         # await session.commit()
 
@@ -4,7 +4,7 @@ import os
 import struct
 import sys
 import tempfile
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from pydantic.config import JsonDict
 
@@ -19,14 +19,19 @@ from letta.services.helpers.tool_execution_helper import (
     create_venv_for_local_sandbox,
     find_python_executable,
     install_pip_requirements_for_sandbox,
+    venv_python_executable,
 )
 from letta.services.helpers.tool_parser_helper import parse_stdout_best_effort
 from letta.services.tool_sandbox.base import AsyncToolSandboxBase
+from letta.services.tool_sandbox.venv_store import VenvLease, VenvStore
 from letta.settings import tool_settings
-from letta.utils import get_friendly_error_msg, parse_stderr_error_msg, safe_create_task
+from letta.utils import get_friendly_error_msg, parse_stderr_error_msg, safe_create_task_with_return
 
 logger = get_logger(__name__)
 
+# the only server environment variables sandbox worker processes inherit at startup
+_WORKER_SPAWN_ENV_KEYS = ("PATH", "HOME", "USER", "LANG", "LC_ALL", "LC_CTYPE", "TMPDIR", "TZ", "SYSTEMROOT")
+
 
 class AsyncToolSandboxLocal(AsyncToolSandboxBase):
     METADATA_CONFIG_STATE_KEY = "config_state"
@@ -87,9 +92,11 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
 
         # If using a virtual environment, ensure it's prepared in parallel
         venv_preparation_task = None
+        venv_path = None
+        venv_lease = None
         if use_venv:
             venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
-            venv_preparation_task = safe_create_task(self._prepare_venv(local_configs, venv_path, env), label="prepare_venv")
+            venv_preparation_task = safe_create_task_with_return(self._prepare_venv(local_configs, venv_path, env), label="prepare_venv")
 
         # Generate and write execution script (always with markers, since we rely on stdout)
         code = await self.generate_execution_script(agent_state=agent_state, wrap_print_with_markers=True)
@@ -103,37 +110,36 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
 
             return await asyncio.to_thread(_write)
 
-        temp_file_path = await write_temp_file(sandbox_dir, code)
+        # Warm workers execute the script from memory, so only the one-shot subprocess path needs a file
+        use_worker_pool = tool_settings.local_sandbox_worker_pool_enabled and not self.force_recreate_venv and not self.is_typescript_tool()
+        temp_file_path = None if use_worker_pool else await write_temp_file(sandbox_dir, code)
 
         try:
-            # If we started a venv preparation task, wait for it to complete
+            # If we started a venv preparation task, wait for it to complete (it may resolve to a leased venv store venv)
             if venv_preparation_task:
-                await venv_preparation_task
+                venv_path, venv_lease = await venv_preparation_task
 
             # Determine the python executable and environment for the subprocess
-            exec_env = env.copy()
-            if use_venv:
-                venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
+            if use_venv and venv_path == os.path.join(sandbox_dir, local_configs.venv_name):
                 python_executable = find_python_executable(local_configs)
-                exec_env["VIRTUAL_ENV"] = venv_path
-                exec_env["PATH"] = os.path.join(venv_path, "bin") + ":" + exec_env["PATH"]
+            elif use_venv:
+                python_executable = venv_python_executable(venv_path)
             else:
                 # If not using venv, use whatever Python we are running on
                 python_executable = sys.executable
-                # For embedded/desktop environments, preserve Python paths
-                # This ensures the subprocess can find bundled modules
-                if "PYTHONPATH" in os.environ:
-                    exec_env["PYTHONPATH"] = os.environ["PYTHONPATH"]
-
-            # handle unwanted terminal behavior
-            exec_env.update(
-                {
-                    "PYTHONWARNINGS": "ignore",
-                    "NO_COLOR": "1",
-                    "TERM": "dumb",
-                    "PYTHONUNBUFFERED": "1",
-                }
-            )
+            exec_env = self._build_exec_env(env, venv_path)
+
+            if use_worker_pool:
+                return await self._execute_tool_in_worker(
+                    sbx_config=sbx_config,
+                    local_configs=local_configs,
+                    venv_path=venv_path,
+                    python_executable=python_executable,
+                    code=code,
+                    env=exec_env,
+                    cwd=sandbox_dir,
+                    leased_venv=venv_lease is not None,
+                )
 
             # Execute in subprocess
             return await self._execute_tool_subprocess(
@@ -149,16 +155,60 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             print(f"Auto-generated code for debugging:\n\n{code}")
             raise e
         finally:
+            if venv_lease:
+                venv_lease.release()
+
             # Clean up the temp file if not debugging
             from letta.settings import settings
 
-            if not settings.debug:
+            if temp_file_path and not settings.debug:
                 await asyncio.to_thread(os.remove, temp_file_path)
 
-    async def _prepare_venv(self, local_configs, venv_path: str, env: Dict[str, str]):
+    @staticmethod
+    def _build_exec_env(env: Dict[str, str], venv_path: Optional[str]) -> Dict[str, str]:
+        """Environment for executing the generated script: `env` plus the venv / python path and terminal settings."""
+        exec_env = env.copy()
+        if venv_path:
+            exec_env["VIRTUAL_ENV"] = venv_path
+            exec_env["PATH"] = os.path.join(venv_path, "bin") + ":" + exec_env.get("PATH", os.defpath)
+        elif "PYTHONPATH" in os.environ:
+            # For embedded/desktop environments, preserve Python paths
+            # This ensures the subprocess can find bundled modules
+            exec_env["PYTHONPATH"] = os.environ["PYTHONPATH"]
+
+        # handle unwanted terminal behavior
+        exec_env.update(
+            {
+                "PYTHONWARNINGS": "ignore",
+                "NO_COLOR": "1",
+                "TERM": "dumb",
+                "PYTHONUNBUFFERED": "1",
+            }
+        )
+        return exec_env
+
+    async def _prepare_venv(self, local_configs, venv_path: str, env: Dict[str, str]) -> Tuple[str, Optional[VenvLease]]:
         """
         Prepare virtual environment asynchronously (in a background thread).
+        Returns the path of the venv to execute in, plus the lease to release after execution if it is a venv store venv.
         """
+        if tool_settings.sandbox_venv_store_enabled and not self.force_recreate_venv:
+            await self._init_async()
+            if local_configs.pip_requirements or self.tool.pip_requirements:
+                # a venv with exactly these requirements, built once and shared instead of pip installing on every call
+                try:
+                    lease = await VenvStore(local_configs.sandbox_dir).resolve_async(local_configs, self.tool, env)
+                    return lease.venv_path, lease
+                except Exception as e:
+                    logger.warning(f"Venv store could not provide a venv for tool {self.tool_name}, using the shared sandbox venv: {e}")
+
+        try:
+            await self._prepare_shared_venv(local_configs, venv_path, env)
+        except Exception as e:
+            logger.exception(f"prepare_venv failed with {type(e).__name__}: {e}")
+        return venv_path, None
+
+    async def _prepare_shared_venv(self, local_configs, venv_path: str, env: Dict[str, str]):
         if self.force_recreate_venv or not await asyncio.to_thread(os.path.isdir, venv_path):
             sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
             log_event(name="start create_venv_for_local_sandbox", attributes={"venv_path": venv_path})
@@ -209,26 +259,7 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             stderr = stderr_bytes.decode("utf-8") if stderr_bytes else ""
             log_event(name="finish subprocess")
 
-            # Parse markers to isolate the function result
-            func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
-            func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
-
-            if process.returncode != 0 and func_return is None:
-                exception_name, msg = parse_stderr_error_msg(stderr)
-                func_return = get_friendly_error_msg(
-                    function_name=self.tool_name,
-                    exception_name=exception_name,
-                    exception_message=msg,
-                )
-
-            return ToolExecutionResult(
-                func_return=func_return,
-                agent_state=agent_state,
-                stdout=[stdout_text] if stdout_text else [],
-                stderr=[stderr] if stderr else [],
-                status="success" if process.returncode == 0 else "error",
-                sandbox_config_fingerprint=sbx_config.fingerprint(),
-            )
+            return self._build_execution_result(sbx_config, stdout_bytes, stderr, process.returncode)
 
         except (TimeoutError, Exception) as e:
             # Distinguish between timeouts and other exceptions for clarity
@@ -236,20 +267,93 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
                 raise e
 
             logger.exception(f"Subprocess execution for tool {self.tool_name} encountered an error: {e}")
+            return self._build_error_result(sbx_config, e, stdout_text)
+
+    async def _execute_tool_in_worker(
+        self,
+        sbx_config,
+        local_configs,
+        venv_path: Optional[str],
+        python_executable: str,
+        code: str,
+        env: Dict[str, str],
+        cwd: str,
+        leased_venv: bool = False,
+    ) -> ToolExecutionResult:
+        """
+        Execute the generated script in a pre-warmed worker process (see `LocalSandboxWorkerPool`).
+        Output handling is identical to `_execute_tool_subprocess`.
+        """
+        from letta.services.tool_sandbox.local_worker_pool import get_local_sandbox_worker_pool
+
+        requirements = sorted(str(r) for r in (local_configs.pip_requirements or []) + ((self.tool and self.tool.pip_requirements) or []))
+        pool_key = (python_executable, cwd, sbx_config.fingerprint(), hashlib.sha256("\n".join(requirements).encode()).hexdigest())
+        # workers start from a minimal environment (no server secrets or per-agent variables) that each call's full
+        # environment replaces for the duration of the call
+        spawn_env = self._build_exec_env({k: os.environ[k] for k in _WORKER_SPAWN_ENV_KEYS if k in os.environ}, venv_path)
+        pool = get_local_sandbox_worker_pool(
+            pool_key,
+            python_executable=python_executable,
+            cwd=cwd,
+            spawn_env=spawn_env,
+            # warm workers outlive this call, so each holds its own lease on a venv store venv
+            leased_venv_path=venv_path if leased_venv else None,
+        )
+
+        try:
+            log_event(name="start sandbox worker execution")
+            try:
+                stdout_bytes, stderr, returncode = await pool.execute(code, env, timeout=tool_settings.tool_sandbox_timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Executing tool {self.tool_name} timed out after {tool_settings.tool_sandbox_timeout} seconds.")
+            log_event(name="finish sandbox worker execution")
+
+            return self._build_execution_result(sbx_config, stdout_bytes, stderr, returncode)
+
+        except (TimeoutError, Exception) as e:
+            if isinstance(e, TimeoutError):
+                raise e
+
+            logger.exception(f"Sandbox worker execution for tool {self.tool_name} encountered an error: {e}")
+            return self._build_error_result(sbx_config, e, "")
+
+    def _build_execution_result(self, sbx_config, stdout_bytes: bytes, stderr: str, returncode: int) -> ToolExecutionResult:
+        # Parse markers to isolate the function result
+        func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
+        func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
+
+        if returncode != 0 and func_return is None:
+            exception_name, msg = parse_stderr_error_msg(stderr)
             func_return = get_friendly_error_msg(
                 function_name=self.tool_name,
-                exception_name=type(e).__name__,
-                exception_message=str(e),
-            )
-            return ToolExecutionResult(
-                func_return=func_return,
-                agent_state=None,
-                stdout=[stdout_text],
-                stderr=[str(e)],
-                status="error",
-                sandbox_config_fingerprint=sbx_config.fingerprint(),
+                exception_name=exception_name,
+                exception_message=msg,
             )
 
+        return ToolExecutionResult(
+            func_return=func_return,
+            agent_state=agent_state,
+            stdout=[stdout_text] if stdout_text else [],
+            stderr=[stderr] if stderr else [],
+            status="success" if returncode == 0 else "error",
+            sandbox_config_fingerprint=sbx_config.fingerprint(),
+        )
+
+    def _build_error_result(self, sbx_config, e: Exception, stdout_text: str) -> ToolExecutionResult:
+        func_return = get_friendly_error_msg(
+            function_name=self.tool_name,
+            exception_name=type(e).__name__,
+            exception_message=str(e),
+        )
+        return ToolExecutionResult(
+            func_return=func_return,
+            agent_state=None,
+            stdout=[stdout_text],
+            stderr=[str(e)],
+            status="error",
+            sandbox_config_fingerprint=sbx_config.fingerprint(),
+        )
+
     def parse_out_function_results_markers(self, data: bytes) -> tuple[bytes, str]:
         """
         Parse the function results out of the stdout using special markers.
@@ -0,0 +1,117 @@
+"""
+Long-lived worker process for the local tool sandbox.
+
+Started by `LocalSandboxWorkerPool` with the sandbox's python executable (possibly a venv without letta installed), so
+this module must only depend on the standard library. It reads length-prefixed JSON requests (`{"code", "env"}`) from
+stdin, executes each generated tool script in a fresh module namespace, and writes back the captured stdout/stderr and
+an exit code, mirroring what a one-shot `python script.py` subprocess would have produced.
+"""
+
+import base64
+import builtins
+import io
+import json
+import os
+import struct
+import sys
+import traceback
+
+_HEADER = struct.Struct(">I")
+
+# imported once per worker instead of once per tool call
+_WARM_IMPORTS = ("typing", "pickle", "json", "base64", "struct", "hashlib", "asyncio", "pydantic", "packaging.version", "letta_client")
+
+
+def _read_exact(stream, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = stream.read(n - len(buf))
+        if not chunk:
+            return b""
+        buf += chunk
+    return buf
+
+
+def _max_rss_kb() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _run(code: str, env: dict, base_env: dict, cwd: str) -> dict:
+    out = io.BytesIO()
+    err = io.StringIO()
+    stdout = io.TextIOWrapper(out, encoding="utf-8", write_through=True)
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    returncode = 0
+
+    os.environ.clear()
+    os.environ.update(env)
+    sys.stdout, sys.stderr = stdout, err
+    try:
+        exec(compile(code, "<tool>", "exec"), {"__name__": "__main__", "__builtins__": builtins})
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            returncode = e.code or 0
+        else:
+            print(e.code, file=err)
+            returncode = 1
+    except BaseException:
+        traceback.print_exc(file=err)
+        returncode = 1
+    finally:
+        try:
+            stdout.flush()
+        except Exception:
+            pass
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+        os.environ.clear()
+        os.environ.update(base_env)
+        os.chdir(cwd)
+
+    return {
+        "stdout": base64.b64encode(out.getvalue()).decode("ascii"),
+        "stderr": err.getvalue(),
+        "returncode": returncode,
+        "max_rss_kb": _max_rss_kb(),
+    }
+
+
+def main() -> None:
+    # keep the protocol on private descriptors so stray writes to fd 0/1 by tools (or C extensions) cannot corrupt it
+    requests = os.fdopen(os.dup(0), "rb", buffering=0)
+    responses = os.fdopen(os.dup(1), "wb", buffering=0)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    cwd = os.getcwd()
+    # behave like `python script.py` run from the sandbox dir, not from this module's directory
+    sys.path[0] = cwd
+    # the minimal spawn environment (no server secrets) that every call's environment replaces and is reset to
+    base_env = dict(os.environ)
+
+    for module in _WARM_IMPORTS:
+        try:
+            __import__(module)
+        except Exception:
+            pass
+
+    while True:
+        header = _read_exact(requests, _HEADER.size)
+        if not header:
+            return
+        payload = _read_exact(requests, _HEADER.unpack(header)[0])
+        if not payload:
+            return
+        request = json.loads(payload)
+        response = json.dumps(_run(request["code"], request["env"], base_env, cwd)).encode("utf-8")
+        responses.write(_HEADER.pack(len(response)) + response)
+
+
+if __name__ == "__main__":
+    main()
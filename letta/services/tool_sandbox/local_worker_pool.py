@@ -0,0 +1,209 @@
+import asyncio
+import base64
+import json
+import os
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Hashable, Optional, Set, Tuple
+
+from letta.log import get_logger
+from letta.services.tool_sandbox.venv_store import VenvLease
+from letta.settings import tool_settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+_HEADER = struct.Struct(">I")
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_worker.py")
+
+
+@dataclass
+class _Worker:
+    process: asyncio.subprocess.Process
+    started_at: float
+    calls: int = 0
+    max_rss_kb: int = 0
+    venv_lease: Optional[VenvLease] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+
+class LocalSandboxWorkerPool:
+    """
+    Pool of long-lived python processes (see `local_worker.py`) that execute generated local sandbox scripts, so short
+    tool calls skip interpreter startup and the sandbox's common imports.
+
+    One pool exists per (python executable, sandbox dir, venv, requirements, sandbox config). The pool keeps up to `size`
+    warm workers; it does not limit concurrency, so calls that find no idle worker start an extra one (like the one-shot
+    subprocess path would) that is retired after use. Workers are recycled after `max_calls` executions, once they are
+    older than `max_lifetime_seconds`, or once their peak RSS exceeds `max_rss_mb`; a replacement is started in the
+    background so the pool stays warm. With `leased_venv_path`, every worker holds a `VenvLease` on that venv store
+    venv until it is retired, so the store does not evict a venv out from under live workers.
+    """
+
+    def __init__(
+        self,
+        python_executable: str,
+        cwd: str,
+        spawn_env: Dict[str, str],
+        size: int,
+        max_calls: int,
+        max_lifetime_seconds: float,
+        max_rss_mb: int,
+        leased_venv_path: Optional[str] = None,
+    ):
+        self.python_executable = python_executable
+        self.cwd = cwd
+        self.spawn_env = spawn_env
+        self.size = max(size, 1)
+        self.max_calls = max_calls
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.max_rss_mb = max_rss_mb
+        self.leased_venv_path = leased_venv_path
+
+        self.loop = asyncio.get_running_loop()
+        self._idle: Deque[_Worker] = deque()
+        self._num_workers = 0
+        self._warm_tasks: Set[asyncio.Task] = set()
+        self._closed = False
+
+    async def _spawn(self) -> _Worker:
+        self._num_workers += 1
+        venv_lease = None
+        try:
+            if self.leased_venv_path:
+                venv_lease = VenvLease(self.leased_venv_path)
+                if not await asyncio.to_thread(venv_lease.acquire):
+                    raise RuntimeError(f"Sandbox venv {self.leased_venv_path} was evicted")
+            process = await asyncio.create_subprocess_exec(
+                self.python_executable,
+                _WORKER_SCRIPT,
+                env=self.spawn_env,
+                cwd=self.cwd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except BaseException:
+            self._num_workers -= 1
+            if venv_lease:
+                venv_lease.release()
+            raise
+        return _Worker(process=process, started_at=time.monotonic(), venv_lease=venv_lease)
+
+    async def _retire(self, worker: _Worker) -> None:
+        self._num_workers -= 1
+        if worker.alive:
+            worker.process.kill()
+            try:
+                await asyncio.wait_for(worker.process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning(f"Sandbox worker {worker.process.pid} did not exit after kill")
+        if worker.venv_lease:
+            worker.venv_lease.release()
+
+    async def warm(self) -> None:
+        """Start workers until the pool is at capacity."""
+        while not self._closed and self._num_workers < self.size:
+            self._idle.append(await self._spawn())
+
+    def warm_in_background(self) -> None:
+        task = safe_create_task(self.warm(), label="warm sandbox worker pool")
+        self._warm_tasks.add(task)
+        task.add_done_callback(self._warm_tasks.discard)
+
+    def _should_recycle(self, worker: _Worker) -> bool:
+        return (
+            not worker.alive
+            or worker.calls >= self.max_calls
+            or time.monotonic() - worker.started_at >= self.max_lifetime_seconds
+            or worker.max_rss_kb >= self.max_rss_mb * 1024
+            or self._num_workers > self.size
+        )
+
+    async def _acquire(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.popleft()
+            if worker.alive:
+                return worker
+            await self._retire(worker)
+        return await self._spawn()
+
+    async def _release(self, worker: _Worker, healthy: bool) -> None:
+        if healthy and not self._should_recycle(worker):
+            self._idle.append(worker)
+            return
+        await self._retire(worker)
+        self.warm_in_background()
+
+    @staticmethod
+    async def _call(worker: _Worker, code: str, env: Dict[str, str]) -> dict:
+        request = json.dumps({"code": code, "env": env}).encode("utf-8")
+        worker.process.stdin.write(_HEADER.pack(len(request)) + request)
+        await worker.process.stdin.drain()
+
+        header = await worker.process.stdout.readexactly(_HEADER.size)
+        return json.loads(await worker.process.stdout.readexactly(_HEADER.unpack(header)[0]))
+
+    async def execute(self, code: str, env: Dict[str, str], timeout: float) -> Tuple[bytes, str, int]:
+        """
+        Execute a generated sandbox script in a warm worker.
+
+        Returns (stdout bytes, stderr text, exit code), matching what `python script.py` would have produced.
+        Raises TimeoutError (and kills the worker) if starting a worker plus running the script takes longer than
+        `timeout` seconds.
+        """
+        deadline = self.loop.time() + timeout
+        worker = await asyncio.wait_for(self._acquire(), timeout=timeout)
+        try:
+            response = await asyncio.wait_for(self._call(worker, code, env), timeout=max(deadline - self.loop.time(), 0))
+        except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
+            # the tool took the whole interpreter down (os._exit, segfault, ...), just like a one-shot subprocess would
+            returncode = await worker.process.wait()
+            await self._release(worker, healthy=False)
+            return b"", f"Sandbox worker exited unexpectedly with code {returncode}", returncode or 1
+        except BaseException:
+            # timeouts and cancellations leave the worker mid-script, so it cannot be reused
+            await self._release(worker, healthy=False)
+            raise
+
+        worker.calls += 1
+        worker.max_rss_kb = response.get("max_rss_kb", 0)
+        await self._release(worker, healthy=True)
+        return base64.b64decode(response["stdout"]), response["stderr"], response["returncode"]
+
+    async def close(self) -> None:
+        """Stop warming and terminate the idle workers."""
+        self._closed = True
+        await asyncio.gather(*self._warm_tasks, return_exceptions=True)
+        while self._idle:
+            await self._retire(self._idle.popleft())
+
+
+_worker_pools: Dict[Hashable, LocalSandboxWorkerPool] = {}
+
+
+def get_local_sandbox_worker_pool(
+    key: Hashable, python_executable: str, cwd: str, spawn_env: Dict[str, str], leased_venv_path: Optional[str] = None
+) -> LocalSandboxWorkerPool:
+    """Return the worker pool for `key`, creating (and pre-warming) it on first use in the running event loop."""
+    pool: Optional[LocalSandboxWorkerPool] = _worker_pools.get(key)
+    # subprocess transports are bound to the loop that created them
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = LocalSandboxWorkerPool(
+            python_executable=python_executable,
+            cwd=cwd,
+            spawn_env=spawn_env,
+            size=tool_settings.local_sandbox_worker_pool_size,
+            max_calls=tool_settings.local_sandbox_worker_max_calls,
+            max_lifetime_seconds=tool_settings.local_sandbox_worker_max_lifetime_seconds,
+            max_rss_mb=tool_settings.local_sandbox_worker_max_rss_mb,
+            leased_venv_path=leased_venv_path,
+        )
+        _worker_pools[key] = pool
+        pool.warm_in_background()
+    return pool
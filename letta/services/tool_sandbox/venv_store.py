@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+import uuid
+import venv
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from letta.log import get_logger
+from letta.schemas.sandbox_config import LocalSandboxConfig
+from letta.services.helpers.tool_execution_helper import ensure_pip_is_up_to_date, run_subprocess, venv_python_executable
+from letta.settings import tool_settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, in-use venvs are protected by the OS refusing to delete open files
+    fcntl = None
+
+if TYPE_CHECKING:
+    from letta.schemas.tool import Tool
+
+logger = get_logger(__name__)
+
+VENV_STORE_DIR_NAME = ".venv_store"
+
+# flock()ed shared by every user of a store venv, and exclusively by whoever deletes it
+_LEASE_FILE_NAME = ".letta_lease"
+
+# version dirs that no link points to (e.g. the loser of a cross-process build race) are removed after this long
+_ORPHAN_MAX_AGE_SECONDS = 3600
+
+_build_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="venv-store-build")
+_builds: Dict[str, Future] = {}
+_builds_lock = threading.Lock()
+
+
+def normalize_requirements(local_configs: LocalSandboxConfig, tool: Optional["Tool"] = None) -> List[str]:
+    """The sandbox-level plus tool-level pip requirements as sorted, de-duplicated, lower-cased specifiers."""
+    packages = [f"{req.name}=={req.version}" if req.version else req.name for req in (local_configs.pip_requirements or [])]
+    if tool and tool.pip_requirements:
+        packages.extend(str(req) for req in tool.pip_requirements)
+    return sorted({package.strip().lower().replace(" ", "") for package in packages if package.strip()})
+
+
+def venv_store_key(requirements: List[str], requirements_txt: Optional[str] = None) -> str:
+    """Content address of a venv: interpreter (implementation, version, platform) plus the normalized requirement set."""
+    identity = "\n".join(
+        [
+            sys.implementation.name,
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+            platform.system(),
+            platform.machine(),
+            hashlib.sha256((requirements_txt or "").encode("utf-8")).hexdigest(),
+            *requirements,
+        ]
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:24]
+
+
+class VenvLease:
+    """
+    A shared lock on a store venv's lease file. While any process holds one, `VenvStore.evict` leaves the venv alone
+    (eviction takes the lock exclusively, without waiting, before deleting a venv).
+    """
+
+    def __init__(self, venv_path: str):
+        self.venv_path = venv_path
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        """Take the lease (blocking while the venv is being deleted). Returns False if the venv no longer exists."""
+        try:
+            fd = os.open(os.path.join(self.venv_path, _LEASE_FILE_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+        if not os.path.isfile(venv_python_executable(self.venv_path)):
+            # evicted between resolving the path and taking the lease
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _remove_unless_leased(venv_path: str, link: Optional[str] = None) -> bool:
+    """Delete a venv (and unpublish its `link`) unless some process holds a lease on it. Returns whether it was deleted."""
+    try:
+        fd = os.open(os.path.join(venv_path, _LEASE_FILE_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+    except (FileNotFoundError, NotADirectoryError):
+        fd = None
+    try:
+        if fd is not None and fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+        # still holding the lock, so anyone who resolved the venv before the unlink sees it gone once they get a lease
+        if link is not None:
+            os.unlink(link)
+        shutil.rmtree(venv_path, ignore_errors=True)
+        return True
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+class VenvStore:
+    """
+    Store of ready-to-use sandbox venvs under `<sandbox_dir>/.venv_store`, one per requirement set.
+
+    Each venv is built in a fresh `<key>-<uuid>` directory (in a background thread, shared by every caller waiting on the
+    same key) and published by atomically replacing the `<key>` symlink, so readers only ever see complete venvs and a
+    venv never has to be relocated. The least recently used venvs beyond `sandbox_venv_store_max_venvs` are evicted,
+    except those leased (see `VenvLease`) by a running tool or sandbox worker, which are retried on the next pass.
+    """
+
+    def __init__(self, sandbox_dir: str):
+        self.sandbox_dir = os.path.expanduser(sandbox_dir)
+        self.root = os.path.join(self.sandbox_dir, VENV_STORE_DIR_NAME)
+
+    def _requirements_txt(self) -> Optional[str]:
+        # the shared sandbox venv always installs requirements.txt, so store venvs do too
+        path = os.path.join(self.sandbox_dir, "requirements.txt")
+        if not os.path.isfile(path):
+            return None
+        with open(path, "r") as f:
+            return f.read()
+
+    def _link_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def get_ready_venv(self, key: str) -> Optional[str]:
+        """Path of the published venv for `key`, or None if it has not been built yet."""
+        link = self._link_path(key)
+        if not os.path.islink(link):
+            return None
+        venv_path = os.path.realpath(link)
+        if not os.path.isfile(venv_python_executable(venv_path)):
+            return None
+        # the link's mtime is the LRU clock
+        os.utime(link, follow_symlinks=False)
+        return venv_path
+
+    def _build(self, key: str, requirements: List[str], env: Dict[str, str]) -> str:
+        ready = self.get_ready_venv(key)
+        if ready:
+            return ready
+
+        os.makedirs(self.root, exist_ok=True)
+        venv_path = os.path.join(self.root, f"{key}-{uuid.uuid4().hex[:8]}")
+        start = time.perf_counter()
+        logger.info(f"Building sandbox venv {key} with requirements {requirements}")
+        # keeps orphan cleanup away from builds that take longer than _ORPHAN_MAX_AGE_SECONDS
+        build_lease = VenvLease(venv_path)
+        try:
+            venv.create(venv_path, with_pip=True)
+            build_lease.acquire()
+            python_exec = venv_python_executable(venv_path)
+            ensure_pip_is_up_to_date(python_exec, env=env)
+            if self._requirements_txt() is not None:
+                run_subprocess(
+                    [python_exec, "-m", "pip", "install", "-r", os.path.join(self.sandbox_dir, "requirements.txt")],
+                    env=env,
+                    fail_msg="Failed to install packages from requirements.txt",
+                )
+            if requirements:
+                run_subprocess(
+                    [python_exec, "-m", "pip", "install", *requirements],
+                    env=env,
+                    fail_msg=f"Failed to install pip packages ({', '.join(requirements)}). This may be due to package version incompatibility.",
+                )
+        except Exception:
+            build_lease.release()
+            shutil.rmtree(venv_path, ignore_errors=True)
+            raise
+
+        # publish atomically: readers resolve either the previous venv or this one, never a partial build
+        tmp_link = f"{venv_path}.link"
+        os.symlink(venv_path, tmp_link)
+        os.replace(tmp_link, self._link_path(key))
+        build_lease.release()
+        logger.info(f"Built sandbox venv {key} in {time.perf_counter() - start:.1f}s")
+
+        self.evict()
+        return venv_path
+
+    def _submit_build(self, key: str, requirements: List[str], env: Dict[str, str]) -> Future:
+        with _builds_lock:
+            future = _builds.get(key)
+            if future is None or future.done():
+                future = _build_executor.submit(self._build, key, requirements, env)
+                _builds[key] = future
+            return future
+
+    async def resolve_async(self, local_configs: LocalSandboxConfig, tool: Optional["Tool"], env: Dict[str, str]) -> VenvLease:
+        """
+        A lease on a venv with the sandbox's and tool's requirements installed. Release it once the tool has run.
+
+        Returns immediately when the venv is already in the store; otherwise waits for its build, which is shared with
+        every other request for the same requirement set.
+        """
+        requirements = normalize_requirements(local_configs, tool)
+        key = venv_store_key(requirements, await asyncio.to_thread(self._requirements_txt))
+        for _ in range(3):
+            venv_path = await asyncio.to_thread(self.get_ready_venv, key)
+            if venv_path is None:
+                venv_path = await asyncio.wrap_future(self._submit_build(key, requirements, env))
+            lease = VenvLease(venv_path)
+            if await asyncio.to_thread(lease.acquire):
+                return lease
+            # evicted by another process before we could lease it; resolve (or rebuild) again
+        raise RuntimeError(f"Sandbox venv {key} kept being evicted before it could be used")
+
+    def evict(self) -> None:
+        """Remove the least recently used venvs beyond the configured maximum, plus stale orphaned builds."""
+        if not os.path.isdir(self.root):
+            return
+
+        links = []
+        referenced = set()
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            # published links are bare keys; `<key>-<uuid>` are venvs and `*.link` are in-flight swaps
+            if os.path.islink(path) and "-" not in name and "." not in name:
+                links.append((os.lstat(path).st_mtime, path))
+                referenced.add(os.path.realpath(path))
+
+        links.sort(reverse=True)
+        for _, link in links[max(tool_settings.sandbox_venv_store_max_venvs, 1) :]:
+            target = os.path.realpath(link)
+            if _remove_unless_leased(target, link=link):
+                logger.info(f"Evicted sandbox venv {os.path.basename(link)}")
+                referenced.discard(target)
+            else:
+                # a running tool or sandbox worker uses it; a later eviction pass will retry
+                logger.info(f"Sandbox venv {os.path.basename(link)} is in use, deferring its eviction")
+
+        now = time.time()
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.islink(path) and os.path.isdir(path) and os.path.realpath(path) not in referenced:
+                if now - os.stat(path).st_mtime > _ORPHAN_MAX_AGE_SECONDS:
+                    _remove_unless_leased(path)
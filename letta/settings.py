@@ -37,11 +37,32 @@ class ToolSettings(BaseSettings):
     tool_exec_venv_name: Optional[str] = None
     tool_exec_autoreload_venv: bool = True
 
+    # Pool of pre-warmed worker processes for the local sandbox (skips interpreter startup per tool call)
+    local_sandbox_worker_pool_enabled: bool = False
+    local_sandbox_worker_pool_size: int = 4
+    local_sandbox_worker_max_calls: int = 100
+    local_sandbox_worker_max_lifetime_seconds: float = 600
+    local_sandbox_worker_max_rss_mb: int = 512
+
+    # Content-addressed store of sandbox venvs, one per (python version, pip requirement set), LRU-evicted
+    sandbox_venv_store_enabled: bool = False
+    sandbox_venv_store_max_venvs: int = 20
+
     # MCP settings
     mcp_connect_to_server_timeout: float = 30.0
     mcp_list_tools_timeout: float = 30.0
     mcp_execute_tool_timeout: float = 60.0
     mcp_read_from_config: bool = False  # if False, will throw if attempting to read/write from file
+    # Pool of initialized MCP client sessions shared across tool calls (instead of connect-per-call)
+    mcp_session_pool_enabled: bool = False
+    mcp_session_idle_ttl_seconds: float = 300
+    mcp_session_health_check_interval_seconds: float = 30
+    mcp_session_max_concurrent_calls: int = 16
+    mcp_session_share_across_agents: bool = False  # if True, sessions are not per agent and X-Agent-Id is not sent
+    # Cache of MCP server tool listings (Redis, plus a short-lived in-process tier), refreshed on tools/list_changed
+    mcp_tool_cache_enabled: bool = False
+    mcp_tool_cache_ttl_seconds: int = 600
+    mcp_tool_cache_local_ttl_seconds: float = 30
     mcp_disable_stdio: bool = Field(
         default=True,
         description=(
@@ -275,6 +296,22 @@ class DatabaseChoice(str, Enum):
     SQLITE = "sqlite"
 
 
+class PgPoolerMode(str, Enum):
+    TRANSACTION = "transaction"
+    SESSION = "session"
+    DIRECT = "direct"
+
+
+class VectorStoreBackend(str, Enum):
+    TPUF = "tpuf"
+    LOCAL = "local"
+
+
+class PgVectorIndexType(str, Enum):
+    HNSW = "hnsw"
+    IVFFLAT = "ivfflat"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="letta_", extra="ignore")
 
@@ -293,6 +330,23 @@ class Settings(BaseSettings):
     # SSE Streaming cancellation settings
     enable_cancellation_aware_streaming: bool = Field(True, description="Enable cancellation aware streaming")
 
+    # Push run cancellations over Redis pub/sub to per-run events, instead of polling the run status from the database
+    run_cancellation_push_enabled: bool = Field(
+        False, description="Signal run cancellations over Redis pub/sub instead of polling run status from the database"
+    )
+
+    # SSE resume fan-out settings
+    sse_subscription_hub_enabled: bool = Field(
+        False,
+        description="Read each run's Redis stream once per process with a blocking XREAD and fan chunks out to all of the "
+        "process's SSE subscribers, and flush runs that have subscribers on every chunk",
+    )
+    sse_stream_compact_encoding: bool = Field(
+        False,
+        description="Store SSE chunks in Redis streams in a compact encoding (short field codes, repeated values elided, "
+        "large chunks compressed). Enable only once every server can read it; all servers read both encodings",
+    )
+
     # default handles
     default_llm_handle: Optional[str] = None
     default_embedding_handle: Optional[str] = None
@@ -312,11 +366,63 @@ class Settings(BaseSettings):
     pool_pre_ping: bool = True  # Pre ping to check for dead connections
     pool_use_lifo: bool = True
     disable_sqlalchemy_pooling: bool = True
+    pg_pooler_mode: PgPoolerMode = Field(
+        default=PgPoolerMode.TRANSACTION,
+        description=(
+            "How Postgres is reached: through a transaction-mode pooler (pgbouncer default), a session-mode pooler, or directly. "
+            "Prepared statement caching is only enabled for 'session' and 'direct', since transaction-mode poolers can hand "
+            "a prepared statement's connection to another client between transactions. Applies with and without "
+            "SQLAlchemy pooling (disable_sqlalchemy_pooling)."
+        ),
+    )
+    pg_statement_cache_size: int = Field(
+        default=500, description="asyncpg/SQLAlchemy prepared statement cache size when caching is enabled."
+    )
+    pg_replica_uris: Optional[str] = Field(
+        default=None,
+        description="Comma-separated Postgres URIs of read replicas. When set, read-only sessions (list/search paths) are routed to them.",
+    )
+    pg_ann_search_enabled: bool = Field(
+        default=False,
+        description="Build per-archive/per-source pgvector HNSW indexes as archives and sources are written (dropping them on delete) and use them for passage vector search.",
+    )
+    pg_ann_index_type: PgVectorIndexType = Field(
+        default=PgVectorIndexType.HNSW, description="Default index type for ANN indexes built explicitly with PassageVectorIndexManager."
+    )
+    pg_ann_index_min_rows: int = Field(
+        default=10_000,
+        description="Archives/sources with fewer passages are searched exactly; their ANN index is built once they grow past this.",
+    )
+    pg_ann_index_max_concurrent_builds: int = Field(default=2, description="Max ANN index builds a process runs in the background at once.")
+    pg_ann_index_recheck_seconds: int = Field(
+        default=600, description="How long a process trusts its last ANN index / row count check for an archive or source."
+    )
+    pg_hnsw_ef_search: int = Field(
+        default=100, description="Baseline hnsw.ef_search for ANN queries (raised for larger limits and selective filters)."
+    )
+    pg_ivfflat_probes: int = Field(default=10, description="Baseline ivfflat.probes for ANN queries (raised for selective filters).")
+    pg_ann_iterative_scan: bool = Field(
+        default=True,
+        description="Enable pgvector iterative index scans (pgvector >= 0.8) so tag/date filtered ANN queries still return `limit` rows.",
+    )
     db_max_concurrent_sessions: Optional[int] = None
 
     redis_host: Optional[str] = Field(default=None, description="Host for Redis instance")
     redis_port: Optional[int] = Field(default=6379, description="Port for Redis instance")
 
+    # In-memory catalog of provider models and resolved model configs, so resolving a handle is a dict lookup;
+    # invalidated over Redis pub/sub when providers or their models change, and reloaded after the TTL regardless
+    provider_catalog_enabled: bool = False
+    provider_catalog_ttl_seconds: int = 300
+    provider_catalog_max_organizations: int = 1024
+
+    # Write-behind buffer for steps, step metrics and provider traces: a step's writes are coalesced in memory and the
+    # writes of all buffered steps are flushed in one transaction every interval, once max pending steps are buffered,
+    # before dependent writes and reads of a buffered step, and on shutdown
+    step_write_buffer_enabled: bool = False
+    step_write_buffer_flush_interval_ms: int = 250
+    step_write_buffer_max_pending: int = 256
+
     plugin_register: Optional[str] = None
 
     # Object storage (used for git-backed memory repos)
@@ -444,13 +550,27 @@ class Settings(BaseSettings):
     tpuf_region: str = "gcp-us-central1"
     embed_all_messages: bool = False
     embed_tools: bool = False
+    # Where the tpuf search indexes live: the Turbopuffer service, or an embedded index on local disk (no API key needed,
+    # for offline and on-prem deployments; a single server process must own the directory)
+    vector_store_backend: VectorStoreBackend = VectorStoreBackend.TPUF
+    local_vector_store_dir: Optional[Path] = None  # defaults to <letta_dir>/vector_store
+    # Without tpuf, store message embeddings in Postgres so conversation search can fuse vector and full-text rankings
+    embed_messages_in_postgres: bool = False
 
     # For encryption
     encryption_key: Optional[str] = None
+    # Encrypt new secrets with the envelope format (one derived key-encryption key per process, cached data keys);
+    # both formats are always decrypted, so this can be turned off again
+    encryption_envelope_enabled: bool = False
+    # Re-encrypt legacy (per-value PBKDF2) secrets in the envelope format in the background when they are loaded
+    encryption_reencrypt_legacy: bool = False
 
     # File processing timeout settings
     file_processing_timeout_minutes: int = 30
     file_processing_timeout_error_message: str = "File processing timed out after {} minutes. Please try again."
+    # Streaming ingestion: chunks per embed/write batch, and batches buffered between pipeline stages (backpressure)
+    file_processing_batch_size: int = 64
+    file_processing_queue_size: int = 2
 
     # Letta client settings for tool execution
     default_base_url: str = Field(default="http://localhost:8283", description="Default base URL for Letta client in tool execution")
@@ -462,6 +582,45 @@ class Settings(BaseSettings):
     # Archival memory token limit
     archival_memory_token_limit: int = 8192
 
+    # Process-local cache of loaded AgentStates, validated per request against agents.version (0 disables)
+    agent_state_cache_size: int = 0
+
+    # Local token counting (avoids provider count_tokens round trips on context window checks)
+    use_local_token_counter: bool = Field(
+        default=False,
+        description="Count tokens locally with a BPE tokenizer for all providers; provider APIs are only sampled for calibration.",
+    )
+    local_token_counter_cache_size: int = Field(default=50_000, description="Max entries in the in-process per-message token count LRU.")
+    local_token_counter_calibration_interval: int = Field(
+        default=200,
+        description="Sample the provider token counting API once every N local counts to calibrate (0 disables calibration).",
+    )
+
+    # Cross-agent embedding request coalescing (archival inserts, message indexing)
+    embedding_batching_enabled: bool = Field(
+        default=False, description="Coalesce concurrent embedding requests that share an embedding config into batched provider calls."
+    )
+    embedding_batch_max_wait_ms: int = Field(default=10, description="Max time a text waits for its batch to fill before it is flushed.")
+    embedding_batch_max_size: int = Field(default=512, description="Max number of texts per coalesced embedding request.")
+    embedding_batch_max_tokens: int = Field(
+        default=200_000, description="Approximate token budget (bytes/4) per coalesced embedding request."
+    )
+
+    # Content-addressed embedding cache (embedding_cache table + process-local LRU)
+    embedding_cache_enabled: bool = Field(
+        default=False, description="Reuse stored embeddings for identical text under the same embedding model instead of re-embedding."
+    )
+    embedding_cache_local_max_mb: int = Field(
+        default=128,
+        description="Max megabytes of embeddings (packed float32, ~6 KB each at 1536 dims) held in the process-local LRU tier (0 disables it).",
+    )
+    embedding_cache_ttl_days: int = Field(
+        default=30, description="Days a stored embedding is reused before it expires and is pruned from the table (0 keeps them forever)."
+    )
+    embedding_cache_prune_interval_seconds: int = Field(
+        default=3600, description="Minimum seconds between background prunes of expired embedding cache rows, per process."
+    )
+
     # Security: Disable default actor fallback
     no_default_actor: bool = Field(
         default=False,
@@ -71,3 +71,45 @@ async def test_modify_nonexistent_block_raises_error(server: SyncServer, default
 
     # Clean up
     await server.agent_manager.delete_agent_async(agent.id, default_user)
+
+
+@pytest.mark.asyncio
+async def test_git_block_update_invalidates_cached_agent_state(server: SyncServer, default_user, monkeypatch):
+    """Test that a block update through the git-enabled block manager is visible in the next agent load."""
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    from letta.services import agent_manager as agent_manager_module
+    from letta.services.block_manager_git import GIT_MEMORY_ENABLED_TAG, GitEnabledBlockManager
+
+    monkeypatch.setattr(agent_manager_module._agent_state_cache, "maxsize", 16)
+    memory_repo_manager = MagicMock()
+    memory_repo_manager.update_block_async = AsyncMock(return_value=SimpleNamespace(sha="0123456789abcdef"))
+    block_manager = GitEnabledBlockManager(memory_repo_manager=memory_repo_manager)
+
+    human_block = await block_manager.create_or_update_block_async(
+        PydanticBlock(label="human", value="Old user context", limit=2000), actor=default_user
+    )
+    agent = await server.agent_manager.create_agent_async(
+        CreateAgent(
+            name="test_git_block_update_agent",
+            agent_type="memgpt_v2_agent",
+            system="test system",
+            llm_config=LLMConfig.default_config("gpt-4o-mini"),
+            embedding_config=DEFAULT_EMBEDDING_CONFIG,
+            block_ids=[human_block.id],
+            tags=[GIT_MEMORY_ENABLED_TAG],
+            include_base_tools=False,
+        ),
+        actor=default_user,
+    )
+    # cache the agent state
+    await server.agent_manager.get_agent_by_id_async(agent.id, default_user)
+
+    await block_manager.update_block_async(human_block.id, BlockUpdate(value="New user context"), actor=default_user)
+
+    memory_repo_manager.update_block_async.assert_awaited_once()
+    agent_state = await server.agent_manager.get_agent_by_id_async(agent.id, default_user)
+    assert agent_state.memory.get_block("human").value == "New user context"
+
+    await server.agent_manager.delete_agent_async(agent.id, default_user)
@@ -1831,3 +1831,213 @@ async def test_fork_conversation_messages_appear_in_list(conversation_manager, s
     assert "system_message" in message_types
     assert "user_message" in message_types
     assert "assistant_message" in message_types
+
+
+async def _create_messages(server, agent_id, actor, texts):
+    from letta.schemas.letta_message_content import TextContent
+    from letta.schemas.message import Message as PydanticMessage
+
+    messages = await server.message_manager.create_many_messages_async(
+        [PydanticMessage(agent_id=agent_id, role="user", content=[TextContent(text=text)]) for text in texts],
+        actor=actor,
+    )
+    return [m.id for m in messages]
+
+
+async def _create_conversation_with_messages(conversation_manager, server, agent_id, actor, texts):
+    conversation = await conversation_manager.create_conversation(
+        agent_id=agent_id,
+        conversation_create=CreateConversation(summary="Source"),
+        actor=actor,
+    )
+    message_ids = await _create_messages(server, agent_id, actor, texts)
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=conversation.id,
+        agent_id=agent_id,
+        message_ids=message_ids,
+        actor=actor,
+    )
+    return conversation, message_ids
+
+
+async def _count_conversation_message_rows(conversation_id):
+    from sqlalchemy import func, select
+
+    from letta.orm.conversation_messages import ConversationMessage as ConversationMessageModel
+    from letta.server.db import db_registry
+
+    async with db_registry.async_session() as session:
+        result = await session.execute(select(func.count()).where(ConversationMessageModel.conversation_id == conversation_id))
+        return result.scalar()
+
+
+@pytest.mark.asyncio
+async def test_fork_conversation_is_copy_on_write(conversation_manager, server: SyncServer, sarah_agent, default_user):
+    """Test that a fork only stores its own messages and keeps the source's messages at the fork."""
+    source, message_ids = await _create_conversation_with_messages(
+        conversation_manager, server, sarah_agent.id, default_user, [f"Message {i}" for i in range(20)]
+    )
+    forked = await conversation_manager.fork_conversation(conversation_id=source.id, actor=default_user)
+
+    # only the fork's system message is stored for the fork
+    assert await _count_conversation_message_rows(forked.id) == 1
+    forked_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert forked_msg_ids[1:] == message_ids
+
+    # messages appended to the source after the fork are not in the fork, and vice versa
+    source_only_ids = await _create_messages(server, sarah_agent.id, default_user, ["later"])
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=source.id, agent_id=sarah_agent.id, message_ids=source_only_ids, actor=default_user
+    )
+    fork_only_ids = await _create_messages(server, sarah_agent.id, default_user, ["branch"])
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=forked.id, agent_id=sarah_agent.id, message_ids=fork_only_ids, actor=default_user
+    )
+    await conversation_manager.update_in_context_messages(
+        conversation_id=forked.id, in_context_message_ids=forked_msg_ids + fork_only_ids, actor=default_user
+    )
+
+    forked_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert forked_msg_ids[1:] == message_ids + fork_only_ids
+    assert await _count_conversation_message_rows(forked.id) == 2
+    source_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=source.id, actor=default_user)
+    assert source_msg_ids[1:] == message_ids + source_only_ids
+
+    forked_msgs = await conversation_manager.get_messages_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert [m.id for m in forked_msgs] == forked_msg_ids
+
+    # pagination walks the shared and own messages in order
+    letta_messages = await conversation_manager.list_conversation_messages(
+        conversation_id=forked.id, actor=default_user, after=message_ids[9], limit=5
+    )
+    assert [m.id for m in letta_messages] == message_ids[10:15]
+    letta_messages = await conversation_manager.list_conversation_messages(
+        conversation_id=forked.id, actor=default_user, reverse=True, limit=2
+    )
+    assert [m.id for m in letta_messages] == [fork_only_ids[0], message_ids[-1]]
+
+
+@pytest.mark.asyncio
+async def test_fork_conversation_copies_shared_messages_when_changed(conversation_manager, server: SyncServer, sarah_agent, default_user):
+    """Test that changing messages shared with forks gives the forks their own copy first."""
+    source, message_ids = await _create_conversation_with_messages(
+        conversation_manager, server, sarah_agent.id, default_user, [f"Message {i}" for i in range(4)]
+    )
+    forked = await conversation_manager.fork_conversation(conversation_id=source.id, actor=default_user)
+    fork_of_fork = await conversation_manager.fork_conversation(conversation_id=forked.id, actor=default_user)
+    fork_of_fork_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=fork_of_fork.id, actor=default_user)
+    assert fork_of_fork_msg_ids[1:] == message_ids
+    assert await _count_conversation_message_rows(fork_of_fork.id) == 1
+
+    # the source evicts its oldest messages (e.g. a summary)
+    source_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=source.id, actor=default_user)
+    await conversation_manager.update_in_context_messages(
+        conversation_id=source.id, in_context_message_ids=[source_msg_ids[0], *message_ids[2:]], actor=default_user
+    )
+
+    # the fork keeps the messages of the fork, now as its own; its fork still shares them
+    forked_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert forked_msg_ids[1:] == message_ids
+    assert await _count_conversation_message_rows(forked.id) == 5
+    assert await conversation_manager.get_message_ids_for_conversation(conversation_id=fork_of_fork.id, actor=default_user) == (
+        fork_of_fork_msg_ids
+    )
+
+    # the fork of the fork evicts a shared message itself
+    await conversation_manager.update_in_context_messages(
+        conversation_id=fork_of_fork.id,
+        in_context_message_ids=[fork_of_fork_msg_ids[0], *message_ids[1:]],
+        actor=default_user,
+    )
+    assert await conversation_manager.get_message_ids_for_conversation(conversation_id=fork_of_fork.id, actor=default_user) == (
+        [fork_of_fork_msg_ids[0], *message_ids[1:]]
+    )
+    assert await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user) == forked_msg_ids
+
+
+@pytest.mark.asyncio
+async def test_fork_of_fork_pages_shared_messages(conversation_manager, server: SyncServer, sarah_agent, default_user):
+    """Test that listing a fork of a fork pages through the messages shared along its fork chain."""
+    source, message_ids = await _create_conversation_with_messages(
+        conversation_manager, server, sarah_agent.id, default_user, [f"Message {i}" for i in range(6)]
+    )
+    # the source evicts its oldest messages before the fork, which keep their positions out of context
+    source_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=source.id, actor=default_user)
+    await conversation_manager.update_in_context_messages(
+        conversation_id=source.id, in_context_message_ids=[source_msg_ids[0], *message_ids[2:]], actor=default_user
+    )
+    later_ids = await _create_messages(server, sarah_agent.id, default_user, ["later"])
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=source.id, agent_id=sarah_agent.id, message_ids=later_ids, actor=default_user
+    )
+
+    forked = await conversation_manager.fork_conversation(conversation_id=source.id, actor=default_user)
+    branch_ids = await _create_messages(server, sarah_agent.id, default_user, ["branch"])
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=forked.id, agent_id=sarah_agent.id, message_ids=branch_ids, actor=default_user
+    )
+    fork_of_fork = await conversation_manager.fork_conversation(conversation_id=forked.id, actor=default_user)
+    assert await _count_conversation_message_rows(fork_of_fork.id) == 1
+
+    shared_ids = message_ids[2:] + later_ids + branch_ids
+    fork_of_fork_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=fork_of_fork.id, actor=default_user)
+    assert fork_of_fork_msg_ids[1:] == shared_ids
+
+    letta_messages = await conversation_manager.list_conversation_messages(
+        conversation_id=fork_of_fork.id, actor=default_user, after=message_ids[3], limit=3
+    )
+    assert [m.id for m in letta_messages] == [message_ids[4], message_ids[5], later_ids[0]]
+    letta_messages = await conversation_manager.list_conversation_messages(
+        conversation_id=fork_of_fork.id, actor=default_user, reverse=True, before=branch_ids[0], limit=2
+    )
+    assert [m.id for m in letta_messages] == [later_ids[0], message_ids[5]]
+
+
+@pytest.mark.asyncio
+async def test_fork_of_gapped_conversation_keeps_sharing(conversation_manager, server: SyncServer, sarah_agent, default_user):
+    """Test that a fork of a conversation with gaps in its positions keeps sharing as both sides step."""
+    source, message_ids = await _create_conversation_with_messages(
+        conversation_manager, server, sarah_agent.id, default_user, [f"Message {i}" for i in range(4)]
+    )
+    # the source drops its last message, which keeps its position out of context, so later messages leave a gap
+    source_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=source.id, actor=default_user)
+    await conversation_manager.update_in_context_messages(
+        conversation_id=source.id, in_context_message_ids=source_msg_ids[:-1], actor=default_user
+    )
+    later_ids = await _create_messages(server, sarah_agent.id, default_user, ["later"])
+    await conversation_manager.add_messages_to_conversation(
+        conversation_id=source.id, agent_id=sarah_agent.id, message_ids=later_ids, actor=default_user
+    )
+    shared_ids = message_ids[:3] + later_ids
+
+    forked = await conversation_manager.fork_conversation(conversation_id=source.id, actor=default_user)
+    forked_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert forked_msg_ids[1:] == shared_ids
+
+    async def step(conversation_id, text):
+        in_context_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=conversation_id, actor=default_user)
+        new_ids = await _create_messages(server, sarah_agent.id, default_user, [text])
+        await conversation_manager.add_messages_to_conversation(
+            conversation_id=conversation_id, agent_id=sarah_agent.id, message_ids=new_ids, actor=default_user
+        )
+        await conversation_manager.update_in_context_messages(
+            conversation_id=conversation_id, in_context_message_ids=in_context_ids + new_ids, actor=default_user
+        )
+        return new_ids
+
+    fork_step_ids = await step(forked.id, "branch 1")
+    source_step_ids = await step(source.id, "source 1")
+    fork_step_ids += await step(forked.id, "branch 2")
+    source_step_ids += await step(source.id, "source 2")
+
+    # the fork still shares the source's messages and stores only its own
+    assert await _count_conversation_message_rows(forked.id) == 3
+    forked_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=forked.id, actor=default_user)
+    assert forked_msg_ids[1:] == shared_ids + fork_step_ids
+    source_msg_ids = await conversation_manager.get_message_ids_for_conversation(conversation_id=source.id, actor=default_user)
+    assert source_msg_ids[1:] == shared_ids + source_step_ids
+
+    letta_messages = await conversation_manager.list_conversation_messages(
+        conversation_id=forked.id, actor=default_user, after=message_ids[2], limit=10
+    )
+    assert [m.id for m in letta_messages] == later_ids + fork_step_ids
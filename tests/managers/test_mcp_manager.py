@@ -1053,3 +1053,34 @@ async def test_oauth_session_tokens_encryption(server, default_user, encryption_
     finally:
         # Clean up
         await server.mcp_manager.delete_oauth_session(session_id, actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_mcp_server_update_and_delete_close_pooled_sessions(server, default_organization, default_user, monkeypatch):
+    """Updating or deleting an MCP server closes the pooled sessions opened with its old config."""
+    from letta.schemas.mcp import MCPServer as PydanticMCPServer, MCPServerType, UpdateSSEMCPServer
+    from letta.settings import tool_settings
+
+    monkeypatch.setattr(tool_settings, "mcp_session_pool_enabled", True)
+    invalidate = AsyncMock()
+    monkeypatch.setattr("letta.services.mcp_manager.invalidate_mcp_sessions", invalidate)
+
+    server_name = f"test_mcp_server_{uuid.uuid4().hex[:8]}"
+    created_server = await server.mcp_manager.create_mcp_server(
+        PydanticMCPServer(
+            server_name=server_name,
+            server_type=MCPServerType.SSE,
+            server_url="https://pooled.example.com/mcp",
+            organization_id=default_organization.id,
+        ),
+        actor=default_user,
+    )
+
+    await server.mcp_manager.update_mcp_server_by_id(
+        created_server.id, UpdateSSEMCPServer(server_url="https://pooled.example.com/v2/mcp"), actor=default_user
+    )
+    invalidate.assert_awaited_once_with(default_user.organization_id, server_name)
+
+    await server.mcp_manager.delete_mcp_server_by_id(created_server.id, actor=default_user)
+    assert invalidate.await_count == 2
+    assert invalidate.await_args.args == (default_user.organization_id, server_name)
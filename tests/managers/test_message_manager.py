@@ -1,3 +1,4 @@
+import json
 import uuid
 
 import pytest
@@ -5,6 +6,7 @@ import pytest
 # Import shared fixtures and constants from conftest
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall as OpenAIToolCall, Function as OpenAIFunction
 
+from letta.errors import LettaInvalidArgumentError
 from letta.orm.errors import UniqueConstraintViolationError
 from letta.schemas.enums import (
     MessageRole,
@@ -13,6 +15,7 @@ from letta.schemas.letta_message import UpdateAssistantMessage, UpdateReasoningM
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.message import Message as PydanticMessage, MessageUpdate
 from letta.server.server import SyncServer
+from letta.settings import DatabaseChoice, settings
 
 # ======================================================================================================================
 # AgentManager Tests - Messages Relationship
@@ -535,6 +538,34 @@ async def test_message_listing_cursor(server: SyncServer, hello_world_message_fi
     assert middle_page_desc[-1].id == first_page[1].id
 
 
+@pytest.mark.asyncio
+async def test_message_field_listing(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+    """Test projection listing of messages with keyset cursors and streaming"""
+    await create_test_messages(server, hello_world_message_fixture, default_user)
+    expected = await server.message_manager.list_user_messages_for_agent_async(agent_id=sarah_agent.id, actor=default_user, limit=10)
+    list_kwargs = dict(actor=default_user, fields=["id", "content"], agent_id=sarah_agent.id, roles=[MessageRole.user])
+
+    # only the requested fields are returned, with content as stored
+    rows, next_cursor, has_more = await server.message_manager.list_message_fields_async(limit=4, **list_kwargs)
+    assert has_more and next_cursor
+    assert rows[0] == {"id": expected[0].id, "content": [expected[0].content[0].model_dump(mode="json")]}
+
+    rows_after, next_cursor, has_more = await server.message_manager.list_message_fields_async(after=next_cursor, limit=4, **list_kwargs)
+    assert not has_more and next_cursor is None
+    assert [row["id"] for row in rows + rows_after] == [message.id for message in expected]
+
+    rows, _, _ = await server.message_manager.list_message_fields_async(ascending=False, limit=10, **list_kwargs)
+    assert [row["id"] for row in rows] == [message.id for message in reversed(expected)]
+
+    streamed = [row async for row in server.message_manager.stream_message_fields_async(batch_size=2, **list_kwargs)]
+    assert [row["id"] for row in streamed] == [message.id for message in expected]
+
+    with pytest.raises(LettaInvalidArgumentError):
+        await server.message_manager.list_message_fields_async(after="not-a-cursor", **list_kwargs)
+    with pytest.raises(LettaInvalidArgumentError):
+        await server.message_manager.list_message_fields_async(actor=default_user, fields=["id", "embedding"], agent_id=sarah_agent.id)
+
+
 @pytest.mark.asyncio
 async def test_message_listing_filtering(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
     """Test filtering messages by agent ID"""
@@ -563,6 +594,85 @@ async def test_message_listing_text_search(server: SyncServer, hello_world_messa
     assert len(search_results) == 0
 
 
+@pytest.mark.asyncio
+async def test_search_messages_sql_ranked(server: SyncServer, hello_world_message_fixture, default_user, sarah_agent):
+    """Test ranked full-text search of messages without Turbopuffer"""
+    if settings.database_engine is not DatabaseChoice.POSTGRES:
+        pytest.skip("Ranked message search requires Postgres")
+    await create_test_messages(server, hello_world_message_fixture, default_user)
+    await server.message_manager.create_many_messages_async(
+        [
+            PydanticMessage(
+                agent_id=sarah_agent.id,
+                role=MessageRole.user,
+                content=[TextContent(text=text)],
+            )
+            for text in ["I blended bananas into a smoothie", "Bananas, bananas and more bananas for the banana bread"]
+        ],
+        actor=default_user,
+    )
+
+    results = await server.message_manager.search_messages_async(
+        agent_id=sarah_agent.id, actor=default_user, query_text="banana", search_mode="hybrid", limit=10
+    )
+    assert [message.content[0].text for message, _ in results] == [
+        "Bananas, bananas and more bananas for the banana bread",
+        "I blended bananas into a smoothie",
+    ]
+    assert [metadata["fts_rank"] for _, metadata in results] == [1, 2]
+    assert results[0][1]["combined_score"] > results[1][1]["combined_score"]
+
+    # without a query, the most recent messages are returned
+    results = await server.message_manager.search_messages_async(agent_id=sarah_agent.id, actor=default_user, limit=2)
+    assert [message.content[0].text for message, _ in results] == [
+        "Bananas, bananas and more bananas for the banana bread",
+        "I blended bananas into a smoothie",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_messages_sql_skips_unsearchable_rows_before_limit(server: SyncServer, default_user, sarah_agent):
+    """Heartbeats matching the query don't eat into the limit, and tool calls come back merged with their results"""
+    if settings.database_engine is not DatabaseChoice.POSTGRES:
+        pytest.skip("Ranked message search requires Postgres")
+    heartbeats = [
+        PydanticMessage(
+            agent_id=sarah_agent.id,
+            role=MessageRole.user,
+            content=[TextContent(text=json.dumps({"type": "heartbeat", "reason": "kiwi kiwi kiwi kiwi"}))],
+        )
+        for _ in range(5)
+    ]
+    tool_call = OpenAIToolCall(id="call-kiwi", type="function", function=OpenAIFunction(name="fetch_fruit", arguments='{"fruit": "kiwi"}'))
+    await server.message_manager.create_many_messages_async(
+        [
+            *heartbeats,
+            PydanticMessage(agent_id=sarah_agent.id, role=MessageRole.user, content=[TextContent(text="Do you like kiwi?")]),
+            PydanticMessage(
+                agent_id=sarah_agent.id, role=MessageRole.assistant, content=[TextContent(text="Looking up kiwi")], tool_calls=[tool_call]
+            ),
+            PydanticMessage(
+                agent_id=sarah_agent.id,
+                role=MessageRole.tool,
+                name="fetch_fruit",
+                tool_call_id="call-kiwi",
+                content=[TextContent(text=json.dumps({"status": "OK", "message": "kiwi is green"}))],
+            ),
+        ],
+        actor=default_user,
+    )
+
+    results = await server.message_manager.search_messages_async(
+        agent_id=sarah_agent.id, actor=default_user, query_text="kiwi", search_mode="fts", limit=2
+    )
+    assert len(results) == 2
+    texts = [message.content[0].text for message, _ in results]
+    assert "Do you like kiwi?" in texts
+    # the tool call and its result come back as one combined message
+    [combined] = [json.loads(text) for text in texts if text != "Do you like kiwi?"]
+    assert combined == {"thinking": "Looking up kiwi", "tool_call": "fetch_fruit(fruit='kiwi')", "tool_result": "kiwi is green"}
+
+
 @pytest.mark.asyncio
 async def test_create_many_messages_async_basic(server: SyncServer, sarah_agent, default_user):
     """Test basic batch creation of messages"""
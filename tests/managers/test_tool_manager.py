@@ -74,6 +74,28 @@ async def test_detach_tool(server: SyncServer, sarah_agent, print_tool, default_
     await server.agent_manager.detach_tool_async(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
 
 
+@pytest.mark.asyncio
+async def test_tool_writes_invalidate_cached_agent_state(server: SyncServer, sarah_agent, print_tool, default_user, monkeypatch):
+    """Test that cached AgentStates are not served after a tool they include is overwritten or deleted."""
+    from letta.services import agent_manager
+
+    monkeypatch.setattr(agent_manager, "_agent_state_cache", agent_manager.AgentStateCache(maxsize=8))
+    await server.agent_manager.attach_tool_async(agent_id=sarah_agent.id, tool_id=print_tool.id, actor=default_user)
+    agent = await server.agent_manager.get_agent_by_id_async(agent_id=sarah_agent.id, actor=default_user)
+    assert print_tool.id in [t.id for t in agent.tools]
+    assert len(agent_manager._agent_state_cache) == 1
+
+    # overwrite the tool through the upsert path
+    upserted = print_tool.model_copy(update={"description": "an updated description"})
+    await server.tool_manager.create_or_update_tool_async(upserted, actor=default_user)
+    agent = await server.agent_manager.get_agent_by_id_async(agent_id=sarah_agent.id, actor=default_user)
+    assert [t.description for t in agent.tools if t.id == print_tool.id] == ["an updated description"]
+
+    await server.tool_manager.delete_tool_by_id_async(print_tool.id, actor=default_user)
+    agent = await server.agent_manager.get_agent_by_id_async(agent_id=sarah_agent.id, actor=default_user)
+    assert print_tool.id not in [t.id for t in agent.tools]
+
+
 @pytest.mark.asyncio
 async def test_bulk_detach_tools(server: SyncServer, sarah_agent, print_tool, other_tool, default_user):
     """Test bulk detaching multiple tools from an agent."""
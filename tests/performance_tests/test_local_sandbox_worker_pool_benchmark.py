@@ -0,0 +1,95 @@
+"""
+Benchmark: latency of a short local sandbox tool call executed as a one-shot `python script.py` subprocess (cold)
+vs. in a pre-warmed `LocalSandboxWorkerPool` worker (warm).
+
+The script mirrors what `generate_execution_script` renders for a trivial tool: typing/pickle/json imports, a pydantic
+result wrapper and the marker-framed result on stdout.
+
+    pytest -s tests/performance_tests/test_local_sandbox_worker_pool_benchmark.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+from letta.services.tool_sandbox.local_worker_pool import LocalSandboxWorkerPool
+
+NUM_CALLS = 30
+
+TOOL_SCRIPT = """
+from typing import *
+import pickle
+import json as _letta_json
+import sys
+import hashlib
+import struct
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+_function_result = add(a=1, b=2)
+from pydantic import BaseModel, ConfigDict
+
+class _TempResultWrapper(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    result: Any
+
+_pkl = _letta_json.dumps({"results": _TempResultWrapper(result=_function_result).model_dump()["result"], "agent_state": None}).encode()
+sys.stdout.buffer.write(struct.pack(">I", len(_pkl)) + hashlib.md5(_pkl).hexdigest().encode("ascii") + _pkl)
+"""
+
+
+async def _cold_call(script_path: str, cwd: str) -> bytes:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, script_path, cwd=cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    return stdout
+
+
+def _summary(label: str, timings: list[float]) -> str:
+    return (
+        f"[{label:<5}] calls={len(timings)} mean={statistics.mean(timings):.1f}ms "
+        f"p50={statistics.median(timings):.1f}ms p95={statistics.quantiles(timings, n=20)[18]:.1f}ms"
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_sandbox_cold_vs_warm_latency(tmp_path):
+    script_path = tmp_path / "tool.py"
+    script_path.write_text(TOOL_SCRIPT)
+
+    cold = []
+    for _ in range(NUM_CALLS):
+        start = time.perf_counter()
+        cold_stdout = await _cold_call(str(script_path), str(tmp_path))
+        cold.append((time.perf_counter() - start) * 1000)
+
+    pool = LocalSandboxWorkerPool(
+        python_executable=sys.executable,
+        cwd=str(tmp_path),
+        spawn_env=dict(os.environ),
+        size=1,
+        max_calls=NUM_CALLS + 1,
+        max_lifetime_seconds=600,
+        max_rss_mb=4096,
+    )
+    warm = []
+    try:
+        await pool.warm()
+        for _ in range(NUM_CALLS):
+            start = time.perf_counter()
+            warm_stdout, _, returncode = await pool.execute(TOOL_SCRIPT, dict(os.environ), timeout=30)
+            warm.append((time.perf_counter() - start) * 1000)
+            assert returncode == 0
+    finally:
+        await pool.close()
+
+    print("\n" + _summary("cold", cold))
+    print(_summary("warm", warm))
+    print(f"warm worker speedup (p50): {statistics.median(cold) / statistics.median(warm):.1f}x")
+    assert warm_stdout == cold_stdout
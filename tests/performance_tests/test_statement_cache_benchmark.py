@@ -0,0 +1,77 @@
+"""
+Benchmark: per-step DB time with asyncpg prepared statement caching disabled (transaction-mode
+pgbouncer behaviour) vs enabled (direct / session-mode pooler).
+
+Each "step" replays the read queries an agent step issues most often (agent lookup, in-context
+message fetch, message listing, step lookup). Requires a Postgres database (LETTA_PG_URI).
+
+    LETTA_PG_URI=postgresql://... pytest -s tests/performance_tests/test_statement_cache_benchmark.py
+"""
+
+import statistics
+import time
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from letta.database_utils import get_database_uri_for_context
+from letta.orm.agent import Agent as AgentModel
+from letta.orm.message import Message as MessageModel
+from letta.orm.step import Step as StepModel
+from letta.settings import DatabaseChoice, PgPoolerMode, settings
+
+NUM_STEPS = 500
+WARMUP_STEPS = 20
+
+pytestmark = pytest.mark.skipif(settings.database_engine is not DatabaseChoice.POSTGRES, reason="requires Postgres")
+
+
+def _step_queries(agent_id: str, message_ids: list[str]):
+    return [
+        select(AgentModel).where(AgentModel.id == agent_id),
+        select(MessageModel).where(MessageModel.id.in_(message_ids)),
+        select(MessageModel).where(MessageModel.agent_id == agent_id).order_by(MessageModel.sequence_id.desc()).limit(50),
+        select(StepModel).where(StepModel.agent_id == agent_id).order_by(StepModel.created_at.desc()).limit(1),
+    ]
+
+
+async def _run_steps(pooler_mode: PgPoolerMode, monkeypatch) -> list[float]:
+    from letta.server import db
+
+    monkeypatch.setattr(settings, "pg_pooler_mode", pooler_mode)
+    uri = get_database_uri_for_context(settings.letta_pg_uri, "async")
+    engine = create_async_engine(uri, pool_size=1, max_overflow=0, connect_args=db.build_asyncpg_connect_args(uri))
+
+    agent_id = f"agent-{uuid.uuid4()}"
+    message_ids = [f"message-{uuid.uuid4()}" for _ in range(20)]
+    timings = []
+    try:
+        async with engine.connect() as conn:
+            for i in range(WARMUP_STEPS + NUM_STEPS):
+                start = time.perf_counter()
+                for query in _step_queries(agent_id, message_ids):
+                    await conn.execute(query)
+                if i >= WARMUP_STEPS:
+                    timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        await engine.dispose()
+    return timings
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_per_step_db_time(monkeypatch):
+    results = {}
+    for mode in (PgPoolerMode.TRANSACTION, PgPoolerMode.DIRECT):
+        timings = await _run_steps(mode, monkeypatch)
+        results[mode] = timings
+        print(
+            f"\n[{mode.value:<11}] steps={len(timings)} "
+            f"mean={statistics.mean(timings):.2f}ms p50={statistics.median(timings):.2f}ms "
+            f"p95={statistics.quantiles(timings, n=20)[18]:.2f}ms"
+        )
+
+    speedup = statistics.median(results[PgPoolerMode.TRANSACTION]) / statistics.median(results[PgPoolerMode.DIRECT])
+    print(f"statement cache speedup (p50): {speedup:.2f}x")
+    assert all(len(t) == NUM_STEPS for t in results.values())
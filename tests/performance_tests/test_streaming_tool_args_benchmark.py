@@ -0,0 +1,51 @@
+"""
+Benchmark: streaming a long send_message argument, re-parsing the accumulated arguments on every delta
+(PydanticJSONParser, as the streaming interfaces used to) vs feeding each delta to IncrementalJSONParser.
+
+    pytest -s tests/performance_tests/test_streaming_tool_args_benchmark.py
+"""
+
+import json
+import time
+
+import pytest
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser, PydanticJSONParser
+
+DELTA_SIZE = 8
+
+
+def _deltas(message_length: int) -> list[str]:
+    arguments = json.dumps({"inner_thoughts": "The user asked for a long answer.", "message": "lorem ipsum " * (message_length // 12)})
+    return [arguments[i : i + DELTA_SIZE] for i in range(0, len(arguments), DELTA_SIZE)]
+
+
+def _reparse(deltas: list[str]) -> str:
+    parser = PydanticJSONParser()
+    parts, previous, streamed = [], "", []
+    for delta in deltas:
+        parts.append(delta)
+        current = parser.parse("".join(parts)).get("message", "")
+        streamed.append(current[len(previous) :])
+        previous = current
+    return "".join(streamed)
+
+
+def _incremental(deltas: list[str]) -> str:
+    parser = IncrementalJSONParser()
+    return "".join(parser.feed(delta).get("message", "") for delta in deltas)
+
+
+@pytest.mark.parametrize("message_length", [1_000, 10_000, 50_000])
+def test_streaming_tool_args_parse_time(message_length):
+    deltas = _deltas(message_length)
+    timings = {}
+    results = {}
+    for name, stream in (("reparse", _reparse), ("incremental", _incremental)):
+        start = time.perf_counter()
+        results[name] = stream(deltas)
+        timings[name] = (time.perf_counter() - start) * 1000
+        print(f"\n[{name:<11}] message={message_length} chars deltas={len(deltas)} total={timings[name]:.2f}ms")
+
+    print(f"speedup: {timings['reparse'] / timings['incremental']:.1f}x")
+    assert results["incremental"] == results["reparse"]
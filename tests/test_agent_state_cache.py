@@ -0,0 +1,73 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from letta.services.helpers.agent_state_cache import AgentStateCache
+
+
+class _FakeAgentState(BaseModel):
+    id: str
+    message_ids: List[str] = []
+
+
+def _key(agent_id: str):
+    return (agent_id, "org-1", None, ())
+
+
+def test_hit_requires_matching_version():
+    cache = AgentStateCache(maxsize=4)
+    cache.put(_key("agent-1"), 3, _FakeAgentState(id="agent-1"))
+
+    assert cache.get(_key("agent-1"), 3).id == "agent-1"
+    # a newer version in the database invalidates the entry
+    assert cache.get(_key("agent-1"), 4) is None
+    assert len(cache) == 0
+
+
+def test_returned_state_is_isolated_from_cache():
+    cache = AgentStateCache(maxsize=4)
+    cache.put(_key("agent-1"), 1, _FakeAgentState(id="agent-1", message_ids=["message-1"]))
+
+    state = cache.get(_key("agent-1"), 1)
+    state.message_ids.append("message-2")
+
+    assert cache.get(_key("agent-1"), 1).message_ids == ["message-1"]
+
+
+def test_evicts_least_recently_used_and_invalidates_by_agent():
+    cache = AgentStateCache(maxsize=2)
+    cache.put(_key("agent-1"), 1, _FakeAgentState(id="agent-1"))
+    cache.put(_key("agent-2"), 1, _FakeAgentState(id="agent-2"))
+    cache.get(_key("agent-1"), 1)
+    cache.put(_key("agent-3"), 1, _FakeAgentState(id="agent-3"))
+
+    assert cache.get(_key("agent-2"), 1) is None
+    assert cache.get(_key("agent-1"), 1) is not None
+
+    cache.invalidate("agent-1")
+    assert cache.get(_key("agent-1"), 1) is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache = AgentStateCache(maxsize=0)
+    cache.put(_key("agent-1"), 1, _FakeAgentState(id="agent-1"))
+    assert len(cache) == 0
+
+
+async def test_version_bumps_lock_agents_in_id_order():
+    from unittest.mock import AsyncMock, MagicMock
+
+    from sqlalchemy.dialects import postgresql
+
+    from letta.services.helpers.agent_manager_helper import bump_agent_versions_async
+
+    session = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = ["agent-1", "agent-2"]
+    session.execute = AsyncMock(return_value=result)
+
+    await bump_agent_versions_async(session, agent_ids=["agent-2", "agent-1"])
+
+    lock, bump = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in session.execute.await_args_list]
+    assert "ORDER BY agents.id FOR UPDATE" in lock
+    assert lock.startswith("SELECT agents.id") and bump.startswith("UPDATE agents SET")
@@ -453,6 +453,7 @@ def _make_mock_deps(system_text: str):
     token_counter = MagicMock()
     token_counter.count_text_tokens = AsyncMock(side_effect=lambda text: len(text) if text else 0)
     token_counter.count_message_tokens = AsyncMock(return_value=0)
+    token_counter.count_messages = AsyncMock(return_value=0)
     token_counter.count_tool_tokens = AsyncMock(return_value=0)
     token_counter.convert_messages = MagicMock(return_value=[{"role": "system", "content": system_text}])
 
@@ -3,7 +3,7 @@ import json
 
 import pytest
 
-from letta.helpers.crypto_utils import CryptoUtils
+from letta.helpers.crypto_utils import ENVELOPE_PREFIX, CryptoUtils
 
 
 class TestCryptoUtils:
@@ -240,7 +240,7 @@ class TestIsEncrypted:
 
     def test_actually_encrypted_values_detected(self):
         """Test that actually encrypted values are correctly identified."""
-        test_values = ["short", "medium length string", "a"]
+        test_values = ["short", "medium length string", "a", ""]
 
         for plaintext in test_values:
             encrypted = CryptoUtils.encrypt(plaintext, self.MOCK_KEY)
@@ -334,7 +334,7 @@ class TestIsEncrypted:
 
     def test_valid_base64_but_too_short_not_detected(self):
         """Test that valid base64 strings that are too short are not detected."""
-        # base64 encode something short (less than SALT + IV + TAG + 1 = 45 bytes)
+        # base64 encode something short (less than SALT + IV + TAG = 44 bytes)
         short_data = base64.b64encode(b"x" * 40).decode()
         assert not CryptoUtils.is_encrypted(short_data)
 
@@ -493,3 +493,92 @@ class TestBackwardsCompatibility:
             encrypted = CryptoUtils.encrypt(plaintext, self.MOCK_KEY)
             decrypted = CryptoUtils.decrypt(encrypted, self.MOCK_KEY)
             assert decrypted == plaintext, f"Roundtrip failed for: {plaintext[:50]}..."
+
+
+class TestEnvelopeEncryption:
+    """Test suite for the envelope format (derived key-encryption key, cached per-organization data keys)."""
+
+    MOCK_KEY = "test-envelope-master-key-123456"
+
+    @pytest.fixture(autouse=True)
+    def envelope_enabled(self, monkeypatch):
+        from letta.settings import settings
+
+        monkeypatch.setattr(settings, "encryption_envelope_enabled", True)
+
+    def test_roundtrip_and_format(self):
+        for plaintext in ["sk-1234567890abcdef", "密钥🔐secret", "x" * 10000, ""]:
+            encrypted = CryptoUtils.encrypt(plaintext, self.MOCK_KEY, organization_id="org-1")
+            assert encrypted.startswith(ENVELOPE_PREFIX)
+            assert CryptoUtils.decrypt(encrypted, self.MOCK_KEY) == plaintext
+
+        encrypted = CryptoUtils.encrypt("secret value", self.MOCK_KEY)
+        assert CryptoUtils.is_encrypted(encrypted)
+        assert not CryptoUtils.is_legacy_encrypted(encrypted)
+        assert CryptoUtils.is_encrypted(CryptoUtils.encrypt("", self.MOCK_KEY))
+
+    async def test_async_roundtrip_matches_sync(self):
+        encrypted = await CryptoUtils.encrypt_async("secret value", self.MOCK_KEY, organization_id="org-1")
+        assert CryptoUtils.decrypt(encrypted, self.MOCK_KEY) == "secret value"
+        assert await CryptoUtils.decrypt_async(CryptoUtils.encrypt("other", self.MOCK_KEY), self.MOCK_KEY) == "other"
+
+    def test_data_keys_are_shared_within_an_organization_only(self):
+        def wrapped_key(encrypted: str) -> bytes:
+            return base64.b64decode(encrypted[len(ENVELOPE_PREFIX) :])[: CryptoUtils.WRAPPED_KEY_SIZE]
+
+        first = CryptoUtils.encrypt("a", self.MOCK_KEY, organization_id="org-1")
+        second = CryptoUtils.encrypt("a", self.MOCK_KEY, organization_id="org-1")
+        other_org = CryptoUtils.encrypt("a", self.MOCK_KEY, organization_id="org-2")
+
+        # a random IV per value, but no new key derivation per value
+        assert first != second
+        assert wrapped_key(first) == wrapped_key(second)
+        assert wrapped_key(first) != wrapped_key(other_org)
+
+    def test_tampering_and_wrong_key_fail(self):
+        encrypted = CryptoUtils.encrypt("secret value", self.MOCK_KEY)
+        with pytest.raises(ValueError):
+            CryptoUtils.decrypt(encrypted, "a-different-master-key-123456")
+
+        data = bytearray(base64.b64decode(encrypted[len(ENVELOPE_PREFIX) :]))
+        data[-1] ^= 1
+        with pytest.raises(ValueError):
+            CryptoUtils.decrypt(ENVELOPE_PREFIX + base64.b64encode(bytes(data)).decode(), self.MOCK_KEY)
+
+        with pytest.raises(ValueError):
+            CryptoUtils.decrypt(ENVELOPE_PREFIX + "AAAA", self.MOCK_KEY)
+        assert not CryptoUtils.is_encrypted(ENVELOPE_PREFIX + "AAAA")
+
+    def test_legacy_values_still_decrypt(self, monkeypatch):
+        from letta.settings import settings
+
+        monkeypatch.setattr(settings, "encryption_envelope_enabled", False)
+        legacy = CryptoUtils.encrypt("secret value", self.MOCK_KEY)
+        assert CryptoUtils.is_legacy_encrypted(legacy)
+
+        monkeypatch.setattr(settings, "encryption_envelope_enabled", True)
+        assert CryptoUtils.decrypt(legacy, self.MOCK_KEY) == "secret value"
+
+    async def test_undecryptable_legacy_values_are_tried_once(self, monkeypatch):
+        from letta.orm import secret_reencryption
+        from letta.orm.provider import Provider
+        from letta.settings import settings
+
+        monkeypatch.setattr(settings, "encryption_key", self.MOCK_KEY)
+        monkeypatch.setattr(settings, "encryption_reencrypt_legacy", True)
+        monkeypatch.setattr(secret_reencryption, "_undecryptable", set())
+        scheduled = []
+        monkeypatch.setattr("letta.utils.safe_create_task", lambda coro, label=None: (scheduled.append(label), coro.close()))
+
+        # long base64 plaintext stored without a key looks like a legacy ciphertext
+        lookalike = base64.b64encode(b"y" * 64).decode()
+        assert CryptoUtils.is_legacy_encrypted(lookalike)
+        provider = Provider(id="provider-1", organization_id="org-1", api_key_enc=lookalike)
+
+        secret_reencryption._on_load(provider, None)
+        assert len(scheduled) == 1
+        secret_reencryption._in_flight.clear()
+
+        assert not await secret_reencryption.reencrypt_legacy_columns_async(Provider, "provider-1", "org-1", {"api_key_enc": lookalike})
+        secret_reencryption._on_load(provider, None)
+        assert len(scheduled) == 1
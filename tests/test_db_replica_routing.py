@@ -0,0 +1,72 @@
+import itertools
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from letta.server import db
+
+
+def _fake_session_factory(name: str):
+    session = MagicMock()
+    session.name = name
+    session.info = {}
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.close = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    factory = MagicMock(return_value=session)
+    return factory, session
+
+
+@pytest.fixture
+def replica_setup(monkeypatch):
+    primary_factory, primary_session = _fake_session_factory("primary")
+    replica_factory, replica_session = _fake_session_factory("replica")
+    monkeypatch.setattr(db, "async_session_factory", primary_factory)
+    monkeypatch.setattr(db, "_replica_cycle", itertools.cycle([replica_factory]))
+    return primary_session, replica_session
+
+
+@pytest.mark.asyncio
+async def test_read_only_sessions_use_replica(replica_setup):
+    primary_session, replica_session = replica_setup
+
+    async with db.db_registry.async_session(read_only=True) as session:
+        assert session is replica_session
+    replica_session.rollback.assert_awaited()
+    replica_session.commit.assert_not_awaited()
+
+    async with db.db_registry.async_session() as session:
+        assert session is primary_session
+
+
+@pytest.mark.asyncio
+async def test_reads_pinned_to_primary_after_write(replica_setup):
+    primary_session, _ = replica_setup
+
+    async with db.db_registry.async_session() as session:
+        session.info["has_writes"] = True
+    assert db.is_pinned_to_primary()
+
+    async with db.db_registry.async_session(read_only=True) as session:
+        assert session is primary_session
+
+
+@pytest.mark.asyncio
+async def test_read_only_falls_back_to_primary_without_replicas(monkeypatch):
+    primary_factory, primary_session = _fake_session_factory("primary")
+    monkeypatch.setattr(db, "async_session_factory", primary_factory)
+    monkeypatch.setattr(db, "_replica_cycle", None)
+
+    async with db.db_registry.async_session(read_only=True) as session:
+        assert session is primary_session
+
+
+@pytest.mark.asyncio
+async def test_pin_to_primary_routes_reads_to_primary(replica_setup):
+    primary_session, _ = replica_setup
+
+    db.pin_to_primary()
+    async with db.db_registry.async_session(read_only=True) as session:
+        assert session is primary_session
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.services.embedding_batcher import EmbeddingBatcher
+
+EMBEDDING_CONFIG = EmbeddingConfig(
+    embedding_endpoint_type="openai",
+    embedding_endpoint="https://api.openai.com/v1",
+    embedding_model="text-embedding-3-small",
+    embedding_dim=3,
+)
+
+
+@pytest.fixture
+def embedding_client(monkeypatch):
+    async def _request_embeddings(texts, embedding_config):
+        return [[float(len(text)), 0.0, 0.0] for text in texts]
+
+    client = MagicMock()
+    client.request_embeddings = AsyncMock(side_effect=_request_embeddings)
+    monkeypatch.setattr("letta.llm_api.llm_client.LLMClient.create", MagicMock(return_value=client))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_provider_call(embedding_client):
+    batcher = EmbeddingBatcher(max_wait_ms=20, max_batch_size=100, max_batch_tokens=10_000)
+    actor = SimpleNamespace(organization_id="org-1")
+
+    results = await asyncio.gather(
+        batcher.embed(["a", "bb"], EMBEDDING_CONFIG, actor),
+        batcher.embed(["ccc"], EMBEDDING_CONFIG, actor),
+    )
+
+    assert embedding_client.request_embeddings.await_count == 1
+    assert results == [[[1.0, 0.0, 0.0], [2.0, 0.0, 0.0]], [[3.0, 0.0, 0.0]]]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting(embedding_client):
+    batcher = EmbeddingBatcher(max_wait_ms=60_000, max_batch_size=2, max_batch_tokens=10_000)
+    actor = SimpleNamespace(organization_id="org-1")
+
+    result = await asyncio.wait_for(batcher.embed(["a", "b"], EMBEDDING_CONFIG, actor), timeout=1)
+    assert len(result) == 2
+
+
+@pytest.mark.asyncio
+async def test_organizations_are_not_coalesced(embedding_client):
+    batcher = EmbeddingBatcher(max_wait_ms=10, max_batch_size=100, max_batch_tokens=10_000)
+
+    await asyncio.gather(
+        batcher.embed(["a"], EMBEDDING_CONFIG, SimpleNamespace(organization_id="org-1")),
+        batcher.embed(["b"], EMBEDDING_CONFIG, SimpleNamespace(organization_id="org-2")),
+    )
+    assert embedding_client.request_embeddings.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_propagate_to_every_waiter(embedding_client):
+    embedding_client.request_embeddings.side_effect = RuntimeError("rate limited")
+    batcher = EmbeddingBatcher(max_wait_ms=10, max_batch_size=100, max_batch_tokens=10_000)
+    actor = SimpleNamespace(organization_id="org-1")
+
+    results = await asyncio.gather(
+        batcher.embed(["a"], EMBEDDING_CONFIG, actor),
+        batcher.embed(["b"], EMBEDDING_CONFIG, actor),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_fails_its_waiters(embedding_client):
+    sent = asyncio.Event()
+
+    async def _request_embeddings(texts, embedding_config):
+        sent.set()
+        await asyncio.Event().wait()
+
+    embedding_client.request_embeddings = AsyncMock(side_effect=_request_embeddings)
+    batcher = EmbeddingBatcher(max_wait_ms=0, max_batch_size=100, max_batch_tokens=10_000)
+
+    waiter = asyncio.create_task(batcher.embed(["a"], EMBEDDING_CONFIG, SimpleNamespace(organization_id="org-1")))
+    await asyncio.wait_for(sent.wait(), timeout=1)
+    for task in asyncio.all_tasks():
+        if task not in (waiter, asyncio.current_task()):
+            task.cancel()
+
+    with pytest.raises(RuntimeError, match="cancelled"):
+        await asyncio.wait_for(waiter, timeout=1)
@@ -0,0 +1,138 @@
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+from sqlalchemy import select, update
+
+from letta.orm.embedding_cache import EmbeddingCache as EmbeddingCacheModel
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.server.db import db_registry
+from letta.services import embedding_cache_manager
+from letta.services.embedding_cache_manager import EmbeddingCacheManager, embedding_cache_key
+
+EMBEDDING_CONFIG = EmbeddingConfig(
+    embedding_endpoint_type="openai",
+    embedding_endpoint="https://api.openai.com/v1",
+    embedding_model="text-embedding-3-small",
+    embedding_dim=2,
+)
+ACTOR = SimpleNamespace(organization_id="org-1")
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """Stand-in for the embedding_cache table so the manager's lookup/dedup logic can be tested without a database."""
+    rows = {}
+    embedding_cache_manager._local_embedding_cache.clear()
+
+    async def _get(self, keys):
+        return {key: rows[key] for key in keys if key in rows}
+
+    async def _store(self, entries, embedding_config, actor):
+        rows.update(entries)
+
+    monkeypatch.setattr(EmbeddingCacheManager, "get_embeddings_async", _get)
+    monkeypatch.setattr(EmbeddingCacheManager, "store_embeddings_async", _store)
+    return rows
+
+
+def test_cache_key_depends_on_model_and_org():
+    key = embedding_cache_key("hello", EMBEDDING_CONFIG, "org-1")
+    assert key == embedding_cache_key("hello", EMBEDDING_CONFIG, "org-1")
+    assert key != embedding_cache_key("hello", EMBEDDING_CONFIG, "org-2")
+    assert key != embedding_cache_key("hello", EMBEDDING_CONFIG.model_copy(update={"embedding_model": "other"}), "org-1")
+    assert key != embedding_cache_key("hello!", EMBEDDING_CONFIG, "org-1")
+
+
+def test_local_tier_is_bounded_in_bytes(monkeypatch):
+    monkeypatch.setattr(embedding_cache_manager.settings, "embedding_cache_local_max_mb", 1)
+    embedding_cache_manager._local_embedding_cache.clear()
+    manager = EmbeddingCacheManager()
+    embedding = [0.5] * 1536  # 6 KB packed as float32
+    for i in range(200):
+        manager._local_put(f"key-{i}", np.asarray(embedding, dtype=np.float32).tobytes())
+
+    local = embedding_cache_manager._local_embedding_cache
+    assert local.size_bytes <= 1024 * 1024
+    assert len(local) == (1024 * 1024) // (1536 * 4)
+    assert manager._local_get("key-0") is None
+    assert manager._local_get("key-199") == embedding
+    local.clear()
+
+
+@pytest.mark.asyncio
+async def test_only_distinct_uncached_texts_are_embedded(table):
+    embed_fn = AsyncMock(side_effect=lambda texts: [[float(len(t)), 1.0] for t in texts])
+    manager = EmbeddingCacheManager()
+
+    first = await manager.embed_with_cache_async(["a", "bb", "a"], EMBEDDING_CONFIG, ACTOR, embed_fn=embed_fn)
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    embed_fn.assert_awaited_once_with(["a", "bb"])
+
+    # re-ingesting the same chunks plus one new chunk only embeds the new one
+    second = await manager.embed_with_cache_async(["bb", "ccc", "a"], EMBEDDING_CONFIG, ACTOR, embed_fn=embed_fn)
+    assert second == [[2.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
+    assert embed_fn.await_args_list[-1].args == (["ccc"],)
+    assert len(table) == 3
+
+
+@pytest.mark.asyncio
+async def test_lookup_failure_falls_back_to_embedding(monkeypatch, table):
+    async def _broken(self, keys):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(EmbeddingCacheManager, "get_embeddings_async", _broken)
+    embed_fn = AsyncMock(return_value=[[0.5, 0.5]])
+
+    result = await EmbeddingCacheManager().embed_with_cache_async(["x"], EMBEDDING_CONFIG, ACTOR, embed_fn=embed_fn)
+    assert result == [[0.5, 0.5]]
+
+
+def test_prune_is_throttled_per_process(monkeypatch):
+    scheduled = []
+
+    def _fire_and_forget(coro, task_name=None, **kwargs):
+        scheduled.append(task_name)
+        coro.close()
+
+    monkeypatch.setattr(embedding_cache_manager, "fire_and_forget", _fire_and_forget)
+    monkeypatch.setattr(embedding_cache_manager, "_last_prune_at", None)
+    manager = EmbeddingCacheManager()
+
+    manager._maybe_schedule_prune()
+    manager._maybe_schedule_prune()
+    assert scheduled == ["prune_embedding_cache"]
+
+    # expiry disabled: nothing to prune
+    monkeypatch.setattr(embedding_cache_manager, "_last_prune_at", None)
+    monkeypatch.setattr(embedding_cache_manager.settings, "embedding_cache_ttl_days", 0)
+    manager._maybe_schedule_prune()
+    assert scheduled == ["prune_embedding_cache"]
+
+
+@pytest.mark.asyncio
+async def test_expired_embeddings_are_ignored_and_pruned(default_user, monkeypatch):
+    # keep the background prune out of the way; the test drives it directly
+    monkeypatch.setattr(embedding_cache_manager, "_last_prune_at", time.monotonic())
+    manager = EmbeddingCacheManager()
+    fresh_key = embedding_cache_key("fresh", EMBEDDING_CONFIG, default_user.organization_id)
+    stale_key = embedding_cache_key("stale", EMBEDDING_CONFIG, default_user.organization_id)
+    await manager.store_embeddings_async({fresh_key: [1.0, 0.0], stale_key: [0.0, 1.0]}, EMBEDDING_CONFIG, default_user)
+
+    expired_at = datetime.now(timezone.utc) - timedelta(days=embedding_cache_manager.settings.embedding_cache_ttl_days + 1)
+    async with db_registry.async_session() as session:
+        await session.execute(update(EmbeddingCacheModel).where(EmbeddingCacheModel.cache_key == stale_key).values(created_at=expired_at))
+        await session.commit()
+
+    embedding_cache_manager._local_embedding_cache.clear()
+    assert set(await manager.get_embeddings_async([fresh_key, stale_key])) == {fresh_key}
+
+    assert await manager.prune_expired_async() >= 1
+    async with db_registry.async_session() as session:
+        remaining = await session.execute(
+            select(EmbeddingCacheModel.cache_key).where(EmbeddingCacheModel.cache_key.in_([fresh_key, stale_key]))
+        )
+        assert set(remaining.scalars().all()) == {fresh_key}
@@ -291,3 +291,89 @@ class TestFileProcessorWithPinecone:
                         assert call_args.kwargs["file_id"] == mock_file.id
                         assert call_args.kwargs["source_id"] == mock_file.source_id
                         assert len(call_args.kwargs["chunks"]) > 0
+
+
+class TestFileProcessorPipeline:
+    """Test suite for the streaming chunk -> embed -> write pipeline"""
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        from letta.schemas.enums import FileProcessingStatus, VectorDBProvider
+        from letta.schemas.file import FileMetadata
+        from letta.schemas.passage import Passage
+        from letta.services.file_processor.file_processor import FileProcessor
+        from letta.settings import settings
+
+        monkeypatch.setattr(settings, "file_processing_batch_size", 2)
+        monkeypatch.setattr(settings, "file_processing_queue_size", 1)
+
+        embedder = Mock()
+        embedder.vector_db_type = VectorDBProvider.NATIVE
+        embedder.embedding_config = EmbeddingConfig.default_config(model_name="letta")
+
+        async def _embed(file_id, source_id, chunks, actor):
+            return [
+                Passage(
+                    text=chunk,
+                    file_id=file_id,
+                    source_id=source_id,
+                    organization_id="org",
+                    embedding=[0.1],
+                    embedding_config=embedder.embedding_config,
+                )
+                for chunk in chunks
+            ]
+
+        embedder.generate_embedded_passages = AsyncMock(side_effect=_embed)
+
+        actor = Mock()
+        actor.organization_id = "org"
+        processor = FileProcessor(file_parser=Mock(), embedder=embedder, actor=actor)
+        processor.file_manager.update_file_status = AsyncMock()
+        processor.passage_manager.create_many_source_passages_async = AsyncMock(side_effect=lambda passages, **kwargs: passages)
+        processor.passage_manager.delete_source_passages_async = AsyncMock()
+
+        file_metadata = FileMetadata(file_name="test.txt", source_id="source-1", processing_status=FileProcessingStatus.PARSING)
+        pages = [f"Page {i}. " + "A sentence about the page. " * 3 for i in range(5)]
+        return processor, file_metadata, pages
+
+    @pytest.mark.asyncio
+    async def test_passages_are_written_batch_by_batch(self, pipeline):
+        processor, file_metadata, pages = pipeline
+
+        passages = await processor._chunk_embed_and_write(file_metadata=file_metadata, pages=pages, source_id="source-1")
+
+        assert [p.text.split(".")[0] for p in passages] == [f"Page {i}" for i in range(5)]
+        write_calls = processor.passage_manager.create_many_source_passages_async.await_args_list
+        assert [len(c.kwargs["passages"]) for c in write_calls] == [2, 2, 1]
+
+        progress = [
+            c.kwargs["chunks_embedded"] for c in processor.file_manager.update_file_status.await_args_list if "chunks_embedded" in c.kwargs
+        ]
+        assert progress == sorted(progress)
+        assert progress[-1] == 5
+        final = processor.file_manager.update_file_status.await_args_list[-1].kwargs
+        assert (final["total_chunks"], final["chunks_embedded"]) == (5, 5)
+        # only the write stage reports chunks_embedded while the pipeline runs
+        chunk_stage_calls = [c.kwargs for c in processor.file_manager.update_file_status.await_args_list[:-1] if "total_chunks" in c.kwargs]
+        assert chunk_stage_calls and all("chunks_embedded" not in kwargs for kwargs in chunk_stage_calls)
+
+    @pytest.mark.asyncio
+    async def test_failure_removes_partially_written_passages(self, pipeline):
+        processor, file_metadata, pages = pipeline
+        calls = {"n": 0}
+        original = processor.passage_manager.create_many_source_passages_async.side_effect
+
+        def _fail_second_write(passages, **kwargs):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise RuntimeError("db write failed")
+            return original(passages, **kwargs)
+
+        processor.passage_manager.create_many_source_passages_async.side_effect = _fail_second_write
+
+        with pytest.raises(RuntimeError):
+            await processor._chunk_embed_and_write(file_metadata=file_metadata, pages=pages, source_id="source-1")
+
+        deleted = processor.passage_manager.delete_source_passages_async.await_args.kwargs["passages"]
+        assert len(deleted) == 2
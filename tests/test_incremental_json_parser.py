@@ -0,0 +1,55 @@
+import json
+import random
+
+import pytest
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser
+
+ARGUMENTS = {
+    "inner_thoughts": 'Thinking "hard" \\ about unicode: ünïcode 😀\nand a newline',
+    "message": "Hello, world! " * 20,
+    "request_heartbeat": True,
+    "count": -1.5e3,
+    "nested": {"items": [1, "a string with , } and ]", {"b": None}]},
+    "empty": "",
+}
+
+
+def _fragments(text, rng):
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 8)
+        yield text[i : i + size]
+        i += size
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_streamed_fragments_reassemble_the_arguments(ensure_ascii):
+    text = json.dumps(ARGUMENTS, ensure_ascii=ensure_ascii)
+    rng = random.Random(0)
+    for _ in range(50):
+        parser = IncrementalJSONParser()
+        streamed = {}
+        for fragment in _fragments(text, rng):
+            for key, appended in parser.feed(fragment).items():
+                # escapes split across fragments never leave half a character behind
+                assert not any("\ud800" <= char <= "\udfff" for char in appended)
+                streamed[key] = streamed.get(key, "") + appended
+
+        assert parser.complete
+        assert parser.value == ARGUMENTS
+        assert streamed == {key: value for key, value in ARGUMENTS.items() if isinstance(value, str) and value}
+
+
+def test_keys_appear_once_their_value_starts():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"inner_thoughts": "ab') == {"inner_thoughts": "ab"}
+    assert parser.feed('c", "mess') == {"inner_thoughts": "c"}
+    assert parser.keys == ["inner_thoughts"]
+    assert parser.feed('age": "') == {}
+    assert parser.keys == ["inner_thoughts", "message"]
+    assert parser.get("message") == ""
+    assert parser.feed('hi"') == {"message": "hi"}
+    assert not parser.complete
+    assert parser.feed("}") == {}
+    assert parser.complete
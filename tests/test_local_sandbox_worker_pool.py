@@ -0,0 +1,117 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from letta.services.tool_sandbox.local_worker_pool import LocalSandboxWorkerPool
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    pool = LocalSandboxWorkerPool(
+        python_executable=sys.executable,
+        cwd=str(tmp_path),
+        spawn_env=dict(os.environ),
+        size=1,
+        max_calls=2,
+        max_lifetime_seconds=600,
+        max_rss_mb=4096,
+    )
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_executes_script_with_per_call_env(pool):
+    code = "import os, sys\nprint(os.environ['TOOL_SECRET'])\nsys.stdout.buffer.write(b'raw')\n"
+    stdout, stderr, returncode = await pool.execute(code, {**os.environ, "TOOL_SECRET": "s3cret"}, timeout=30)
+    assert (stdout, stderr, returncode) == (b"s3cret\nraw", "", 0)
+
+    # the next call does not see the previous call's environment or globals
+    stdout, _, returncode = await pool.execute(
+        "import os\nprint(os.environ.get('TOOL_SECRET'), 'code' in globals())\n", dict(os.environ), 30
+    )
+    assert (stdout, returncode) == (b"None False\n", 0)
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_errors_and_is_recycled(pool):
+    stdout, stderr, returncode = await pool.execute("raise ValueError('bad input')\n", dict(os.environ), timeout=30)
+    assert returncode == 1 and stdout == b""
+    assert "ValueError: bad input" in stderr
+
+    pid = pool._idle[0].process.pid
+    await pool.execute("pass\n", dict(os.environ), timeout=30)
+    # max_calls=2 reached, so the worker was retired instead of returned to the pool
+    assert all(worker.process.pid != pid for worker in pool._idle)
+
+    _, stderr, returncode = await pool.execute("import os\nos._exit(3)\n", dict(os.environ), timeout=30)
+    assert returncode == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_timeout_kills_worker(pool):
+    with pytest.raises(TimeoutError):
+        await pool.execute("import time\ntime.sleep(30)\n", dict(os.environ), timeout=0.5)
+    stdout, _, _ = await pool.execute("print('ok')\n", dict(os.environ), timeout=30)
+    assert stdout == b"ok\n"
+
+
+@pytest.mark.asyncio
+async def test_pool_size_does_not_cap_concurrency(pool):
+    # pool size is 1, but two calls that each wait for the other must still run side by side
+    code = (
+        "import os, time\n"
+        "open(os.environ['MINE'], 'w').close()\n"
+        "deadline = time.time() + 10\n"
+        "while not os.path.exists(os.environ['THEIRS']) and time.time() < deadline:\n"
+        "    time.sleep(0.01)\n"
+        "print(os.path.exists(os.environ['THEIRS']))\n"
+    )
+    a, b = os.path.join(pool.cwd, "a"), os.path.join(pool.cwd, "b")
+    results = await asyncio.gather(
+        pool.execute(code, {**os.environ, "MINE": a, "THEIRS": b}, timeout=30),
+        pool.execute(code, {**os.environ, "MINE": b, "THEIRS": a}, timeout=30),
+    )
+    assert [stdout for stdout, _, _ in results] == [b"True\n", b"True\n"]
+    # the overflow worker is retired instead of kept warm
+    assert pool._num_workers <= pool.size
+
+
+@pytest.mark.asyncio
+async def test_timeout_covers_worker_startup(pool, monkeypatch):
+    async def _slow_spawn():
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(pool, "_spawn", _slow_spawn)
+    with pytest.raises(TimeoutError):
+        await pool.execute("pass\n", dict(os.environ), timeout=0.2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/self/environ")
+async def test_worker_does_not_inherit_server_environment(tmp_path, monkeypatch):
+    from letta.services.tool_sandbox.local_sandbox import _WORKER_SPAWN_ENV_KEYS, AsyncToolSandboxLocal
+
+    monkeypatch.setenv("LETTA_PG_URI", "postgresql://user:secret@db/letta")
+    spawn_env = AsyncToolSandboxLocal._build_exec_env({k: os.environ[k] for k in _WORKER_SPAWN_ENV_KEYS if k in os.environ}, None)
+    pool = LocalSandboxWorkerPool(
+        python_executable=sys.executable,
+        cwd=str(tmp_path),
+        spawn_env=spawn_env,
+        size=1,
+        max_calls=10,
+        max_lifetime_seconds=600,
+        max_rss_mb=4096,
+    )
+    try:
+        # the process environment tools can read back (e.g. /proc/self/environ) carries no server secrets
+        code = "import os\nprint(os.environ.get('LETTA_PG_URI'), b'secret' in open('/proc/self/environ', 'rb').read())\n"
+        stdout, _, _ = await pool.execute(code, {"PATH": os.defpath}, timeout=30)
+        assert stdout == b"None False\n"
+
+        stdout, _, _ = await pool.execute("import os\nprint(os.environ.get('LETTA_PG_URI'))\n", {"LETTA_PG_URI": "x"}, timeout=30)
+        assert stdout == b"x\n"
+    finally:
+        await pool.close()
@@ -0,0 +1,277 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from letta.helpers import local_vector_store
+from letta.helpers.local_vector_store import LocalVectorStore
+from letta.helpers.tpuf_client import TurbopufferClient, should_use_tpuf, should_use_tpuf_for_tools
+from letta.helpers.vector_store import get_vector_store
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.settings import VectorStoreBackend, model_settings, settings
+
+NAMESPACE = "messages_org-00000000_dev"
+DIM = 8
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _vector(seed: int, dim: int = DIM) -> list:
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32).tolist()
+
+
+def _columns(count: int, agent_ids=("agent-a", "agent-b")) -> dict:
+    return {
+        "id": [f"message-{i}" for i in range(count)],
+        "vector": [_vector(i) for i in range(count)],
+        "text": [f"message number {i} about {'cats' if i % 2 else 'dogs'}" for i in range(count)],
+        "agent_id": [agent_ids[i % len(agent_ids)] for i in range(count)],
+        "tags": [["even"] if i % 2 == 0 else ["odd"] for i in range(count)],
+        "created_at": [START + timedelta(minutes=i) for i in range(count)],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_vector_text_and_timestamp_queries(store):
+    result = await store.write(NAMESPACE, upsert_columns=_columns(10))
+    assert result.rows_affected == 10
+
+    result = await store.query(NAMESPACE, rank_by=("vector", "ANN", _vector(3)), top_k=3, include_attributes=["text", "agent_id"])
+    assert result.rows[0].id == "message-3"
+    assert result.rows[0].agent_id == "agent-b"
+    assert result.rows[0].text == "message number 3 about cats"
+    assert getattr(result.rows[0], "$dist") == pytest.approx(0.0, abs=1e-5)
+    distances = [getattr(row, "$dist") for row in result.rows]
+    assert distances == sorted(distances)
+
+    result = await store.query(NAMESPACE, rank_by=("text", "BM25", "CATS"), top_k=10, include_attributes=["text"])
+    assert {row.id for row in result.rows} == {f"message-{i}" for i in range(1, 10, 2)}
+    assert all(getattr(row, "$score") > 0 for row in result.rows)
+
+    result = await store.query(NAMESPACE, rank_by=("created_at", "desc"), top_k=2, include_attributes=True)
+    assert [row.id for row in result.rows] == ["message-9", "message-8"]
+    assert result.rows[0].created_at == START + timedelta(minutes=9)
+    assert result.rows[0].tags == ["odd"]
+
+
+@pytest.mark.asyncio
+async def test_filters(store):
+    await store.write(NAMESPACE, upsert_columns=_columns(10))
+
+    async def ids(filters):
+        result = await store.query(NAMESPACE, rank_by=("created_at", "asc"), top_k=100, include_attributes=[], filters=filters)
+        return [row.id for row in result.rows]
+
+    assert await ids(("agent_id", "Eq", "agent-a")) == [f"message-{i}" for i in range(0, 10, 2)]
+    assert await ids(("And", [("agent_id", "Eq", "agent-b"), ("created_at", "Gte", START + timedelta(minutes=7))])) == [
+        "message-7",
+        "message-9",
+    ]
+    assert await ids(("Or", [("id", "In", ["message-1"]), ("created_at", "Lt", START + timedelta(minutes=1))])) == [
+        "message-0",
+    ]
+    assert await ids(("tags", "ContainsAny", ["odd"])) == [f"message-{i}" for i in range(1, 10, 2)]
+    assert await ids(("Not", ("agent_id", "NotEq", "agent-a"))) == [f"message-{i}" for i in range(0, 10, 2)]
+    assert await ids(("agent_id", "Eq", "agent-c")) == []
+
+    result = await store.query(
+        NAMESPACE, rank_by=("vector", "ANN", _vector(3)), top_k=3, include_attributes=[], filters=("agent_id", "Eq", "agent-a")
+    )
+    assert "message-3" not in [row.id for row in result.rows]
+    assert len(result.rows) == 3
+
+
+@pytest.mark.asyncio
+async def test_upserts_and_deletes(store):
+    await store.write(NAMESPACE, upsert_columns=_columns(10))
+
+    # an upsert replaces the row
+    columns = _columns(1)
+    columns["text"] = ["rewritten about birds"]
+    await store.write(NAMESPACE, upsert_columns=columns)
+    result = await store.query(NAMESPACE, rank_by=("text", "BM25", "dogs birds"), top_k=10, include_attributes=["text"])
+    assert result.rows[0].id == "message-0"
+    assert result.rows[0].text == "rewritten about birds"
+    assert len(result.rows) == 5
+
+    result = await store.write(NAMESPACE, deletes=["message-0", "missing"])
+    assert result.rows_affected == 1
+    result = await store.write(NAMESPACE, delete_by_filter=("agent_id", "Eq", "agent-b"))
+    assert result.rows_affected == 5
+
+    result = await store.query(NAMESPACE, rank_by=("vector", "ANN", _vector(0)), top_k=10, include_attributes=[])
+    assert sorted(row.id for row in result.rows) == [f"message-{i}" for i in range(2, 10, 2)]
+
+    await store.delete_all(NAMESPACE)
+    result = await store.query(NAMESPACE, rank_by=("created_at", "desc"), top_k=10, include_attributes=[])
+    assert result.rows == []
+
+
+@pytest.mark.asyncio
+async def test_namespaces_persist(tmp_path):
+    store = LocalVectorStore(tmp_path)
+    await store.write(NAMESPACE, upsert_columns=_columns(10))
+    await store.write(NAMESPACE, deletes=["message-1"])
+    store.close()
+
+    reloaded = LocalVectorStore(tmp_path)
+    result = await reloaded.query(NAMESPACE, rank_by=("vector", "ANN", _vector(2)), top_k=20, include_attributes=True)
+    assert result.rows[0].id == "message-2"
+    assert result.rows[0].created_at == START + timedelta(minutes=2)
+    assert len(result.rows) == 9
+
+    result = await reloaded.query("unknown", rank_by=("created_at", "desc"), top_k=10, include_attributes=[])
+    assert result.rows == []
+
+
+@pytest.mark.asyncio
+async def test_namespace_is_owned_by_one_store(tmp_path):
+    store = LocalVectorStore(tmp_path)
+    await store.write(NAMESPACE, upsert_columns=_columns(3))
+
+    other = LocalVectorStore(tmp_path)
+    with pytest.raises(RuntimeError, match="in use by another process"):
+        await other.query(NAMESPACE, rank_by=("created_at", "desc"), top_k=10, include_attributes=[])
+    with pytest.raises(RuntimeError, match="in use by another process"):
+        await other.write(NAMESPACE, deletes=["message-0"])
+
+    store.close()
+    result = await other.query(NAMESPACE, rank_by=("created_at", "desc"), top_k=10, include_attributes=[])
+    assert len(result.rows) == 3
+
+
+def test_local_backend_needs_no_openai_key(monkeypatch):
+    monkeypatch.setattr(settings, "use_tpuf", True)
+    monkeypatch.setattr(settings, "tpuf_api_key", None)
+    monkeypatch.setattr(settings, "embed_tools", True)
+    monkeypatch.setattr(model_settings, "openai_api_key", None)
+    monkeypatch.setattr(settings, "vector_store_backend", VectorStoreBackend.LOCAL)
+    assert should_use_tpuf()
+    assert not should_use_tpuf_for_tools()
+
+    monkeypatch.setattr(settings, "vector_store_backend", VectorStoreBackend.TPUF)
+    monkeypatch.setattr(settings, "tpuf_api_key", "tpuf-key")
+    assert not should_use_tpuf()
+
+
+@pytest.mark.asyncio
+async def test_compaction_is_atomic(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_vector_store, "_COMPACT_MIN_DEAD_SLOTS", 2)
+    store = LocalVectorStore(tmp_path)
+    await store.write(NAMESPACE, upsert_columns=_columns(10))
+    namespace_path = tmp_path / NAMESPACE
+
+    # a crash before the log is replaced leaves the previous generation in place
+    replace = local_vector_store.os.replace
+
+    def crash_on_log(src, dst):
+        if str(dst).endswith(local_vector_store._LOG_FILE):
+            raise OSError("crashed")
+        replace(src, dst)
+
+    monkeypatch.setattr(local_vector_store.os, "replace", crash_on_log)
+    with pytest.raises(OSError):
+        await store.write(NAMESPACE, deletes=[f"message-{i}" for i in range(6)])
+    monkeypatch.setattr(local_vector_store.os, "replace", replace)
+    store.close()
+
+    reloaded = LocalVectorStore(tmp_path)
+    result = await reloaded.query(NAMESPACE, rank_by=("vector", "ANN", _vector(7)), top_k=20, include_attributes=[])
+    assert result.rows[0].id == "message-7"
+    assert sorted(row.id for row in result.rows) == [f"message-{i}" for i in range(6, 10)]
+    assert sorted(path.name for path in namespace_path.glob("*.f32")) == ["vectors.f32"]
+
+    # a completed compaction switches to the vectors and graph of the next generation
+    await reloaded.write(NAMESPACE, deletes=["message-6", "message-7"])
+    assert sorted(path.name for path in namespace_path.iterdir()) == [".lock", "hnsw.1.json", "rows.jsonl", "vectors.1.f32"]
+    reloaded.close()
+    result = await LocalVectorStore(tmp_path).query(NAMESPACE, rank_by=("vector", "ANN", _vector(9)), top_k=20, include_attributes=["text"])
+    assert result.rows[0].id == "message-9"
+    assert sorted(row.id for row in result.rows) == ["message-8", "message-9"]
+    assert result.rows[0].text == "message number 9 about cats"
+
+
+@pytest.mark.asyncio
+async def test_hnsw_recall(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_vector_store, "_EXACT_SEARCH_MAX_ROWS", 0)
+    monkeypatch.setattr(local_vector_store, "_GRAPH_SAVE_INTERVAL", 500)
+    dim, count = 32, 2000
+    vectors = np.random.default_rng(0).standard_normal((count, dim)).astype(np.float32)
+    store = LocalVectorStore(tmp_path)
+    for start in range(0, count, 500):
+        ids = range(start, start + 500)
+        await store.write(
+            NAMESPACE,
+            upsert_columns={
+                "id": [f"row-{i}" for i in ids],
+                "vector": vectors[start : start + 500].tolist(),
+                "agent_id": ["agent-a" if i % 4 else "agent-b" for i in ids],
+            },
+        )
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = np.random.default_rng(1).standard_normal((20, dim)).astype(np.float32)
+    store.close()
+    reloaded = LocalVectorStore(tmp_path)
+    for filters, members in ((None, np.arange(count)), (("agent_id", "Eq", "agent-b"), np.arange(0, count, 4))):
+        hits = 0
+        for query in queries:
+            exact = members[np.argsort(-(normalized[members] @ query))[:10]]
+            result = await reloaded.query(
+                NAMESPACE, rank_by=("vector", "ANN", query.tolist()), top_k=10, include_attributes=[], filters=filters
+            )
+            hits += len({f"row-{i}" for i in exact} & {row.id for row in result.rows})
+        assert hits / (10 * len(queries)) >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_turbopuffer_client_on_local_store(tmp_path, monkeypatch, default_organization, default_user):
+    monkeypatch.setattr(settings, "vector_store_backend", VectorStoreBackend.LOCAL)
+    monkeypatch.setattr(settings, "local_vector_store_dir", tmp_path)
+    monkeypatch.setattr(settings, "use_tpuf", True)
+    monkeypatch.setattr(settings, "tpuf_api_key", None)
+    monkeypatch.setattr(model_settings, "openai_api_key", None)
+    assert should_use_tpuf()
+    assert isinstance(get_vector_store(), LocalVectorStore)
+
+    client = TurbopufferClient()
+    embedding_config = EmbeddingConfig(
+        embedding_model="nomic-embed-text",
+        embedding_endpoint_type="ollama",
+        embedding_endpoint="http://localhost:11434",
+        embedding_dim=8,
+    )
+    archive = await client.archive_manager.create_archive_async(name="local", embedding_config=embedding_config, actor=default_user)
+    archive_id = archive.id
+    texts = ["the cat sat on the mat", "stock prices fell sharply", "a kitten chased a mouse"]
+    embeddings = {text: _vector(i, 8) for i, text in enumerate(texts)}
+    embeddings["feline"] = embeddings[texts[0]]
+
+    async def generate_embeddings(texts, actor, embedding_config=None):
+        # the archive's own embedding config, not the default OpenAI one
+        assert embedding_config.embedding_model == "nomic-embed-text"
+        return [embeddings[text] for text in texts]
+
+    monkeypatch.setattr(client, "_generate_embeddings", generate_embeddings)
+
+    await client.insert_archival_memories(
+        archive_id=archive_id,
+        text_chunks=texts,
+        passage_ids=[f"passage-{i}" for i in range(len(texts))],
+        organization_id=default_organization.id,
+        actor=default_user,
+        tags=["animals"],
+    )
+
+    results = await client.query_passages(archive_id=archive_id, actor=default_user, query_text="feline", search_mode="vector", top_k=1)
+    assert [passage.text for passage, _, _ in results] == [texts[0]]
+
+    results = await client.query_passages(archive_id=archive_id, actor=default_user, query_text="kitten", search_mode="fts", top_k=3)
+    assert [passage.text for passage, _, _ in results] == [texts[2]]
+
+    assert await client.delete_all_passages(archive_id)
+    assert await client.query_passages(archive_id=archive_id, actor=default_user, query_text="feline", search_mode="vector") == []
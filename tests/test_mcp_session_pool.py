@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+
+from letta.functions.mcp_client.types import StdioServerConfig
+from letta.services.mcp.session_pool import MCPSessionPool, get_mcp_session_pool, invalidate_mcp_sessions
+
+
+class FakeMCPClient:
+    def __init__(self, events: list):
+        self.server_config = StdioServerConfig(server_name="fake", command="fake-mcp", args=[])
+        self.events = events
+        self.broken = False
+
+    async def connect_to_server(self):
+        await asyncio.sleep(0.01)
+        self.events.append(("connect", asyncio.current_task()))
+
+    async def cleanup(self):
+        self.events.append(("cleanup", asyncio.current_task()))
+
+    async def ping(self):
+        if self.broken:
+            raise ConnectionResetError("gone")
+
+    async def list_tools(self):
+        if self.broken:
+            raise ConnectionResetError("gone")
+        return ["echo"]
+
+
+def _pool(**kwargs) -> MCPSessionPool:
+    return MCPSessionPool(**{"idle_ttl_seconds": 300, "health_check_interval_seconds": 30, "max_concurrent_calls": 4, **kwargs})
+
+
+async def test_session_is_connected_once_and_cleaned_up_by_its_owner():
+    events = []
+    pool = _pool()
+
+    async def factory():
+        return FakeMCPClient(events)
+
+    results = await asyncio.gather(*(pool.run("server", factory, lambda client: client.list_tools()) for _ in range(8)))
+    assert results == [["echo"]] * 8
+    assert [name for name, _ in events] == ["connect"]
+
+    await pool.close()
+    assert [name for name, _ in events] == ["connect", "cleanup"]
+    # connect and cleanup must run in the same task for the anyio-based transports
+    assert events[0][1] is events[1][1]
+
+
+async def test_broken_session_is_replaced_and_idempotent_calls_retried():
+    events = []
+    clients = []
+    pool = _pool()
+
+    async def factory():
+        clients.append(FakeMCPClient(events))
+        return clients[-1]
+
+    assert await pool.run("server", factory, lambda client: client.list_tools()) == ["echo"]
+    clients[0].broken = True
+
+    assert await pool.run("server", factory, lambda client: client.list_tools(), idempotent=True) == ["echo"]
+    assert len(clients) == 2
+    assert [name for name, _ in events] == ["connect", "cleanup", "connect"]
+
+    # non-idempotent calls surface the error, but the next call gets a fresh session
+    clients[1].broken = True
+    with pytest.raises(ConnectionResetError):
+        await pool.run("server", factory, lambda client: client.list_tools())
+    assert await pool.run("server", factory, lambda client: client.list_tools()) == ["echo"]
+    assert len(clients) == 3
+    await pool.close()
+
+
+async def test_unhealthy_idle_session_is_reconnected_before_use():
+    events = []
+    clients = []
+    pool = _pool(health_check_interval_seconds=0)
+
+    async def factory():
+        clients.append(FakeMCPClient(events))
+        return clients[-1]
+
+    await pool.run("server", factory, lambda client: client.list_tools())
+    clients[0].broken = True
+    calls = []
+
+    async def call(client):
+        calls.append(client)
+        return await client.list_tools()
+
+    assert await pool.run("server", factory, call) == ["echo"]
+    assert calls == [clients[1]]
+    await pool.close()
+
+
+async def test_invalidate_closes_only_the_changed_servers_sessions():
+    events = []
+    pool = get_mcp_session_pool()
+
+    async def factory():
+        return FakeMCPClient(events)
+
+    # keys as built by mcp_session_pool_key: (organization, server name, config hash, user, agent)
+    changed, other = ("org-1", "fake", "hash", None, "agent-1"), ("org-1", "other", "hash", None, "agent-1")
+    await pool.run(changed, factory, lambda client: client.list_tools())
+    await pool.run(other, factory, lambda client: client.list_tools())
+
+    await invalidate_mcp_sessions("org-2", "fake")
+    assert set(pool._sessions) == {changed, other}
+
+    await invalidate_mcp_sessions("org-1", "fake")
+    assert set(pool._sessions) == {other}
+    await pool.close()
+
+
+async def test_invalidated_session_closes_after_its_running_calls_finish():
+    events = []
+    pool = _pool()
+    release = asyncio.Event()
+
+    async def factory():
+        return FakeMCPClient(events)
+
+    async def slow_call(client):
+        await release.wait()
+        return await client.list_tools()
+
+    running = asyncio.create_task(pool.run("server", factory, slow_call))
+    await asyncio.sleep(0.05)
+    await pool.invalidate(lambda key: True)
+    await asyncio.sleep(0)
+    assert [name for name, _ in events] == ["connect"]
+
+    release.set()
+    assert await running == ["echo"]
+    await asyncio.sleep(0)
+    assert [name for name, _ in events] == ["connect", "cleanup"]
+
+    # the next call opens a fresh session
+    assert await pool.run("server", factory, lambda client: client.list_tools()) == ["echo"]
+    assert [name for name, _ in events] == ["connect", "cleanup", "connect"]
+    await pool.close()
+
+
+async def test_reaper_keeps_semaphore_while_calls_are_queued():
+    events = []
+    pool = _pool(idle_ttl_seconds=0, max_concurrent_calls=1)
+    connected = asyncio.Event()
+
+    class SlowConnectClient(FakeMCPClient):
+        async def connect_to_server(self):
+            await connected.wait()
+            await super().connect_to_server()
+
+    async def factory():
+        return SlowConnectClient(events)
+
+    # the first call is still connecting (nothing in flight on the session yet) and the second waits on the semaphore
+    calls = [asyncio.create_task(pool.run("server", factory, lambda client: client.list_tools())) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    semaphore = pool._semaphores["server"]
+    pool._close_idle_sessions()
+    assert "server" in pool._sessions
+    assert pool._semaphores["server"] is semaphore
+
+    connected.set()
+    assert await asyncio.gather(*calls) == [["echo"], ["echo"]]
+    assert [name for name, _ in events] == ["connect"]
+    pool._close_idle_sessions()
+    assert not pool._sessions and not pool._semaphores and not pool._locks
+    await pool.close()
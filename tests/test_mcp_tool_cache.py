@@ -0,0 +1,95 @@
+import pytest
+from mcp.types import ToolListChangedNotification
+
+from letta.data_sources.redis_client import NoopAsyncRedisClient
+from letta.functions.mcp_client.types import MCPTool, MCPToolHealth
+from letta.services.mcp import tool_cache
+from letta.services.mcp.base_client import _dispatch_tools_list_changed
+from letta.services.mcp.tool_cache import MCPToolCache
+
+
+class DictRedisClient(NoopAsyncRedisClient):
+    def __init__(self):
+        super().__init__()
+        self.data = {}
+
+    async def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = DictRedisClient()
+
+    async def get_redis_client():
+        return client
+
+    monkeypatch.setattr(tool_cache, "get_redis_client", get_redis_client)
+    return client
+
+
+def _tools():
+    return [
+        MCPTool(
+            name="echo",
+            description="Echo the input",
+            inputSchema={"type": "object", "properties": {"text": {"type": "string"}}},
+            health=MCPToolHealth(status="STRICT_COMPLIANT", reasons=[]),
+        )
+    ]
+
+
+async def test_listing_is_shared_through_redis_and_invalidated(redis_client):
+    writer = MCPToolCache(ttl_seconds=600, local_ttl_seconds=30)
+    # another server process, with its own in-process tier
+    reader = MCPToolCache(ttl_seconds=600, local_ttl_seconds=30)
+
+    assert await reader.get("org-1", "mcp_server-1") is None
+    await writer.set("org-1", "mcp_server-1", _tools())
+
+    cached = await reader.get("org-1", "mcp_server-1")
+    assert [tool.name for tool in cached] == ["echo"]
+    assert cached[0].health.status == "STRICT_COMPLIANT"
+    assert cached[0].inputSchema == _tools()[0].inputSchema
+    assert await reader.get("org-2", "mcp_server-1") is None
+
+    # callers may mutate what they get back without corrupting the in-process tier
+    cached[0].inputSchema["properties"] = {}
+    assert (await reader.get("org-1", "mcp_server-1"))[0].inputSchema == _tools()[0].inputSchema
+
+    await writer.invalidate("org-1", "mcp_server-1")
+    assert redis_client.data == {}
+    assert await writer.get("org-1", "mcp_server-1") is None
+
+
+async def test_in_process_tier_works_without_redis(monkeypatch):
+    async def get_redis_client():
+        return NoopAsyncRedisClient()
+
+    monkeypatch.setattr(tool_cache, "get_redis_client", get_redis_client)
+    cache = MCPToolCache(ttl_seconds=600, local_ttl_seconds=30)
+    await cache.set("org-1", "mcp_server-1", _tools())
+    assert [tool.name for tool in await cache.get("org-1", "mcp_server-1")] == ["echo"]
+
+    expired = MCPToolCache(ttl_seconds=600, local_ttl_seconds=0)
+    await expired.set("org-1", "mcp_server-1", _tools())
+    assert await expired.get("org-1", "mcp_server-1") is None
+
+
+async def test_tools_list_changed_notification_runs_callback():
+    calls = []
+
+    async def on_tools_list_changed():
+        calls.append("changed")
+
+    await _dispatch_tools_list_changed(ToolListChangedNotification(method="notifications/tools/list_changed"), on_tools_list_changed)
+    await _dispatch_tools_list_changed(RuntimeError("transport error"), on_tools_list_changed)
+    await _dispatch_tools_list_changed(ToolListChangedNotification(method="notifications/tools/list_changed"), None)
+    assert calls == ["changed"]
@@ -639,3 +639,45 @@ def test_compile_git_structured_recompile_after_description_change():
 
     assert out_before != out_after
     assert "human data" in out_after
+
+
+def test_compile_is_memoized_for_unchanged_memory(monkeypatch):
+    """Repeated compiles of unchanged memory should be served without re-rendering."""
+
+    m = Memory(agent_type=AgentType.memgpt_agent, blocks=[Block(label="human", value="cached human", limit=500)])
+    sources = [make_source("src-1", "docs")]
+    out_first = m.compile(sources=sources, max_files_open=3)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("compile should have been served from the memo")
+
+    monkeypatch.setattr(Memory, "_render_memory_blocks_standard", _fail)
+    monkeypatch.setattr(Memory, "_render_directories_common", _fail)
+    assert m.compile(sources=sources, max_files_open=3) == out_first
+
+
+def test_compile_memo_key_covers_sources_and_file_limits():
+    m = Memory(agent_type=AgentType.memgpt_agent, blocks=[Block(label="human", value="h", limit=500)])
+    sources = [make_source("src-1", "docs")]
+
+    out = m.compile(sources=sources, max_files_open=3)
+    assert m.compile(sources=sources, max_files_open=5) != out
+    assert m.compile(sources=[make_source("src-1", "renamed")], max_files_open=3) != out
+    assert m.compile(sources=sources, max_files_open=3) == out
+
+
+def test_compile_memo_is_thread_safe(monkeypatch):
+    """Concurrent compiles (compile_async runs in worker threads) must not corrupt or overflow the shared LRU."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from letta.schemas import memory as memory_module
+
+    monkeypatch.setattr(memory_module, "COMPILED_MEMORY_CACHE_SIZE", 4)
+    monkeypatch.setattr(memory_module, "_compiled_memory_cache", memory_module.OrderedDict())
+    memories = [Memory(agent_type=AgentType.memgpt_agent, blocks=[Block(label="human", value=f"human {i}", limit=500)]) for i in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        outputs = list(pool.map(lambda i: memories[i % 16].compile(), range(2000)))
+
+    assert all(f"human {i % 16}" in output for i, output in enumerate(outputs))
+    assert len(memory_module._compiled_memory_cache) <= 4
@@ -0,0 +1,184 @@
+import pytest
+from sqlalchemy import bindparam, column, text
+from sqlalchemy.dialects import postgresql
+
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.passage import Passage as PydanticPassage
+from letta.server.db import db_registry
+from letta.services import passage_vector_index_manager
+from letta.services.archive_manager import ArchiveManager
+from letta.services.helpers import agent_manager_helper
+from letta.services.helpers.agent_manager_helper import build_agent_passage_query
+from letta.services.passage_manager import PassageManager
+from letta.services.passage_vector_index_manager import PassageVectorIndexManager, ann_embedding_expression, ann_index_name
+from letta.settings import DatabaseChoice
+
+EMBEDDING_CONFIG = EmbeddingConfig.default_config(provider="openai")
+
+
+def test_index_name_is_deterministic_and_fits_postgres_identifier_limit():
+    name = ann_index_name("archive", "archive-" + "0" * 36)
+    assert name == ann_index_name("archive", "archive-" + "0" * 36)
+    assert name != ann_index_name("source", "archive-" + "0" * 36)
+    assert name != ann_index_name("archive", "archive-" + "1" * 36)
+    assert len(name) <= 63
+
+
+def test_embedding_expression_truncates_padding_to_indexable_type():
+    compiled = str(ann_embedding_expression(column("embedding"), 1536).compile(dialect=postgresql.dialect()))
+    assert "subvector(embedding" in compiled
+    assert "VECTOR(1536)" in compiled
+
+    # above pgvector's 2000-dim vector index limit the expression switches to halfvec
+    compiled = str(ann_embedding_expression(column("embedding"), 3072).compile(dialect=postgresql.dialect()))
+    assert "HALFVEC(3072)" in compiled
+
+
+@pytest.fixture
+def ann_search_enabled(monkeypatch):
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_ann_search_enabled", True)
+    monkeypatch.setattr(type(passage_vector_index_manager.settings), "database_engine", property(lambda self: DatabaseChoice.POSTGRES))
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_ann_index_min_rows", 0)
+    passage_vector_index_manager._checked_scopes.clear()
+    passage_vector_index_manager._pending_scopes.clear()
+    yield
+    passage_vector_index_manager._checked_scopes.clear()
+    passage_vector_index_manager._pending_scopes.clear()
+
+
+def test_index_lifecycle_is_scheduled_only_when_needed(ann_search_enabled, monkeypatch):
+    scheduled = []
+
+    def _fire_and_forget(coro, task_name=None, **kwargs):
+        scheduled.append(task_name)
+        coro.close()
+
+    monkeypatch.setattr(passage_vector_index_manager, "fire_and_forget", _fire_and_forget)
+    manager = PassageVectorIndexManager()
+
+    manager.schedule_ensure_index("archive", "archive-1", EMBEDDING_CONFIG)
+    manager.schedule_ensure_index("archive", "archive-2", None)
+    # a check already in flight isn't scheduled twice
+    manager.schedule_ensure_index("archive", "archive-1", EMBEDDING_CONFIG)
+    assert scheduled == ["ensure_ann_index_archive_archive-1"]
+
+    # once checked, later inserts don't re-check it until the recheck interval passes
+    passage_vector_index_manager._pending_scopes.clear()
+    passage_vector_index_manager._mark_checked(("archive", "archive-1"))
+    manager.schedule_ensure_index("archive", "archive-1", EMBEDDING_CONFIG)
+    assert len(scheduled) == 1
+    passage_vector_index_manager._checked_scopes[("archive", "archive-1")] -= (
+        passage_vector_index_manager.settings.pg_ann_index_recheck_seconds
+    )
+    manager.schedule_ensure_index("archive", "archive-1", EMBEDDING_CONFIG)
+    assert len(scheduled) == 2
+    passage_vector_index_manager._pending_scopes.clear()
+
+    manager.schedule_drop_index("archive", "archive-1")
+    assert scheduled[-1] == "drop_ann_index_archive_archive-1"
+    assert ("archive", "archive-1") not in passage_vector_index_manager._checked_scopes
+
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_ann_search_enabled", False)
+    manager.schedule_ensure_index("source", "source-1", EMBEDDING_CONFIG)
+    assert len(scheduled) == 3
+
+
+@pytest.mark.asyncio
+async def test_background_check_clears_pending_even_when_build_fails(ann_search_enabled, monkeypatch):
+    async def _fail(self, scope, scope_id, embedding_config):
+        raise RuntimeError("build failed")
+
+    monkeypatch.setattr(PassageVectorIndexManager, "ensure_index_async", _fail)
+    passage_vector_index_manager._pending_scopes.add(("source", "source-1"))
+    with pytest.raises(RuntimeError):
+        await PassageVectorIndexManager()._ensure_index_in_background("source", "source-1", EMBEDDING_CONFIG)
+    assert ("source", "source-1") not in passage_vector_index_manager._pending_scopes
+    assert passage_vector_index_manager._recently_checked(("source", "source-1"))
+
+
+def test_search_params_scale_with_limit_and_filter_selectivity(monkeypatch):
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_hnsw_ef_search", 100)
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_ivfflat_probes", 10)
+
+    assert passage_vector_index_manager.ann_search_params() == (100, 10)
+    assert passage_vector_index_manager.ann_search_params(top_k=10) == (100, 10)
+    assert passage_vector_index_manager.ann_search_params(top_k=200) == (400, 10)
+    # only 10% of the scope passes the filters, so ten times the candidates are needed
+    assert passage_vector_index_manager.ann_search_params(top_k=20, selectivity=0.1) == (400, 100)
+    assert passage_vector_index_manager.ann_search_params(top_k=50, selectivity=0.0) == (
+        passage_vector_index_manager.MAX_HNSW_EF_SEARCH,
+        passage_vector_index_manager.MAX_IVFFLAT_LISTS,
+    )
+
+
+class _StubEmbeddingClient:
+    async def request_embeddings(self, texts, embedding_config):
+        return [[1.0] + [0.0] * (embedding_config.embedding_dim - 1) for _ in texts]
+
+
+@pytest.mark.asyncio
+async def test_archive_passage_search_uses_ann_index(ann_search_enabled, default_user, monkeypatch):
+    monkeypatch.setattr(agent_manager_helper.LLMClient, "create", lambda **kwargs: _StubEmbeddingClient())
+    index_manager = PassageVectorIndexManager()
+    archive = await ArchiveManager().create_archive_async(name="ann-archive", embedding_config=EMBEDDING_CONFIG, actor=default_user)
+    await index_manager.ensure_index_async("archive", archive.id, EMBEDDING_CONFIG)
+    await PassageManager().create_agent_passages_async(
+        [
+            PydanticPassage(
+                text=f"passage {i}",
+                archive_id=archive.id,
+                organization_id=default_user.organization_id,
+                embedding=[float(i)] + [1.0] * (EMBEDDING_CONFIG.embedding_dim - 1),
+                embedding_config=EMBEDDING_CONFIG,
+            )
+            for i in range(5)
+        ],
+        actor=default_user,
+    )
+
+    query = await build_agent_passage_query(
+        actor=default_user,
+        archive_id=archive.id,
+        query_text="passage",
+        embed_query=True,
+        embedding_config=EMBEDDING_CONFIG,
+        use_ann_index=True,
+    )
+    compiled = query.limit(3).compile(dialect=postgresql.dialect(paramstyle="named"))
+    explain = text(f"EXPLAIN {compiled}").bindparams(
+        *[bindparam(name, value, type_=compiled.binds[name].type) for name, value in compiled.params.items()]
+    )
+    async with db_registry.async_session() as session:
+        # the archive is tiny, so keep the planner from preferring a sequential scan
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join((await session.execute(explain)).scalars().all())
+    assert ann_index_name("archive", archive.id) in plan
+
+    await ArchiveManager().delete_archive_async(archive_id=archive.id, actor=default_user)
+
+
+@pytest.mark.asyncio
+async def test_small_archives_are_not_indexed(ann_search_enabled, default_user, monkeypatch):
+    monkeypatch.setattr(passage_vector_index_manager.settings, "pg_ann_index_min_rows", 3)
+    index_manager = PassageVectorIndexManager()
+    archive = await ArchiveManager().create_archive_async(name="small-archive", embedding_config=EMBEDDING_CONFIG, actor=default_user)
+    passages = [
+        PydanticPassage(
+            text=f"passage {i}",
+            archive_id=archive.id,
+            organization_id=default_user.organization_id,
+            embedding=[1.0] * EMBEDDING_CONFIG.embedding_dim,
+            embedding_config=EMBEDDING_CONFIG,
+        )
+        for i in range(3)
+    ]
+
+    await PassageManager().create_agent_passages_async(passages[:2], actor=default_user)
+    assert await index_manager.ensure_index_async("archive", archive.id, EMBEDDING_CONFIG) is None
+    async with db_registry.async_session() as session:
+        assert not await passage_vector_index_manager.ann_index_exists_async(session, "archive", archive.id)
+
+    await PassageManager().create_agent_passages_async(passages[2:], actor=default_user)
+    assert await index_manager.ensure_index_async("archive", archive.id, EMBEDDING_CONFIG) == ann_index_name("archive", archive.id)
+
+    await ArchiveManager().delete_archive_async(archive_id=archive.id, actor=default_user)
@@ -0,0 +1,207 @@
+import pytest
+
+from letta.constants import PROVIDER_CATALOG_INVALIDATION_CHANNEL
+from letta.data_sources.redis_client import NoopAsyncRedisClient
+from letta.orm.provider_model import ProviderModel as ProviderModelORM
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.provider_model import ProviderModel as PydanticProviderModel
+from letta.services import provider_model_catalog
+from letta.services.provider_manager import plan_provider_model_sync
+from letta.services.provider_model_catalog import ProviderModelCatalog
+
+ORG_ID = "org-00000000-0000-4000-8000-000000000000"
+
+
+class PublishRecordingRedisClient(NoopAsyncRedisClient):
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = PublishRecordingRedisClient()
+
+    async def get_redis_client():
+        return client
+
+    monkeypatch.setattr(provider_model_catalog, "get_redis_client", get_redis_client)
+    return client
+
+
+def _model(handle, organization_id=None, model_type="llm", provider_id="provider-global", enabled=True):
+    return PydanticProviderModel(
+        handle=handle,
+        display_name=handle.split("/")[1],
+        name=handle.split("/")[1],
+        provider_id=provider_id,
+        organization_id=organization_id,
+        model_type=model_type,
+        enabled=enabled,
+        model_endpoint_type="openai",
+        max_context_window=128000,
+    )
+
+
+class CountingLoader:
+    def __init__(self, models):
+        self.models = models
+        self.calls = []
+
+    async def __call__(self, organization_id):
+        self.calls.append(organization_id)
+        return [m for m in self.models if m.organization_id == organization_id]
+
+
+@pytest.mark.asyncio
+async def test_catalog_prefers_org_models_and_caches_snapshots(redis_client):
+    loader = CountingLoader(
+        [
+            _model("openai/gpt-4o"),
+            _model("openai/text-embedding-3-small", model_type="embedding"),
+            _model("openai/gpt-4o", organization_id=ORG_ID, provider_id="provider-byok"),
+            _model("openai/gpt-4o-mini", enabled=False),
+        ]
+    )
+    catalog = ProviderModelCatalog(ttl_seconds=300, max_organizations=10)
+
+    model = await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)
+    assert model.provider_id == "provider-byok"
+    assert (await catalog.get_model(ORG_ID, "openai/text-embedding-3-small", None, loader)).model_type == "embedding"
+    assert await catalog.get_model(ORG_ID, "openai/text-embedding-3-small", "llm", loader) is None
+    assert await catalog.get_model(ORG_ID, "openai/missing", None, loader) is None
+
+    org_models, global_models = await catalog.list_models(ORG_ID, loader, model_type="llm", enabled=True)
+    assert [m.handle for m in org_models] == ["openai/gpt-4o"]
+    assert [m.handle for m in global_models] == ["openai/gpt-4o"]
+    _, global_models = await catalog.list_models(ORG_ID, loader, provider_id="provider-global", limit=2)
+    assert len(global_models) == 2
+
+    # one load per scope, however many lookups
+    assert sorted(loader.calls, key=str) == [None, ORG_ID]
+
+    # results are copies
+    model.name = "changed"
+    assert (await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)).name == "gpt-4o"
+
+
+@pytest.mark.asyncio
+async def test_catalog_invalidation(redis_client):
+    loader = CountingLoader([_model("openai/gpt-4o"), _model("openai/gpt-4o", organization_id=ORG_ID)])
+    catalog = ProviderModelCatalog(ttl_seconds=300, max_organizations=10)
+    await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)
+    await catalog.get_model("org-other", "openai/gpt-4o", "llm", loader)
+    loader.calls.clear()
+
+    await catalog.invalidate(ORG_ID)
+    assert redis_client.published == [(PROVIDER_CATALOG_INVALIDATION_CHANNEL, ORG_ID)]
+    await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)
+    await catalog.get_model("org-other", "openai/gpt-4o", "llm", loader)
+    assert loader.calls == [ORG_ID]
+
+    # global providers are visible to every organization
+    loader.calls.clear()
+    catalog.invalidate_local(None)
+    await catalog.get_model("org-other", "openai/gpt-4o", "llm", loader)
+    assert loader.calls == ["org-other", None]
+
+
+@pytest.mark.asyncio
+async def test_catalog_config_cache(redis_client):
+    loader = CountingLoader([_model("openai/gpt-4o")])
+    catalog = ProviderModelCatalog(ttl_seconds=300, max_organizations=10)
+    config = LLMConfig(model="gpt-4o", model_endpoint_type="openai", context_window=128000, handle="openai/gpt-4o")
+
+    assert catalog.get_config(ORG_ID, "llm", "openai/gpt-4o") is None
+    generation = catalog.generation
+    await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)
+    catalog.set_config(ORG_ID, "llm", "openai/gpt-4o", config, generation)
+    cached = catalog.get_config(ORG_ID, "llm", "openai/gpt-4o")
+    assert cached == config and cached is not config
+    assert catalog.get_config(ORG_ID, "embedding", "openai/gpt-4o") is None
+
+    # a resolution that raced with an invalidation is not cached
+    generation = catalog.generation
+    catalog.invalidate_local(ORG_ID)
+    await catalog.get_model(ORG_ID, "openai/gpt-4o", "llm", loader)
+    catalog.set_config(ORG_ID, "llm", "openai/gpt-4o", config, generation)
+    assert catalog.get_config(ORG_ID, "llm", "openai/gpt-4o") is None
+
+
+def _row(handle, provider_id="provider-1", organization_id=ORG_ID, model_type="llm", context_window=8192):
+    name = handle.split("/")[1]
+    return ProviderModelORM(
+        id=f"model-{name}",
+        handle=handle,
+        display_name=name,
+        name=name,
+        provider_id=provider_id,
+        organization_id=organization_id,
+        model_type=model_type,
+        enabled=True,
+        model_endpoint_type="openai",
+        max_context_window=context_window,
+    )
+
+
+def _llm(handle, context_window=8192):
+    return LLMConfig(model=handle.split("/")[1], model_endpoint_type="openai", context_window=context_window, handle=handle)
+
+
+def _embedding(handle):
+    return EmbeddingConfig(embedding_model=handle.split("/")[1], embedding_endpoint_type="openai", embedding_dim=1536, handle=handle)
+
+
+def test_plan_provider_model_sync_diff():
+    unchanged = _row("byok/unchanged")
+    resized = _row("byok/resized")
+    removed = _row("byok/removed")
+    embedding = _row("byok/embed", model_type="embedding")
+    other_provider = _row("byok/taken", provider_id="provider-2")
+
+    plan = plan_provider_model_sync(
+        provider_id="provider-1",
+        organization_id=ORG_ID,
+        existing_models=[unchanged, resized, removed, embedding, other_provider],
+        llm_models=[
+            _llm("byok/unchanged"),
+            _llm("byok/resized", context_window=32000),
+            _llm("byok/new"),
+            _llm("byok/new"),
+            _llm("byok/taken"),
+        ],
+        embedding_models=[_embedding("byok/embed")],
+    )
+
+    assert plan.changed
+    assert plan.to_remove == [removed]
+    assert plan.to_update == [(resized, {"max_context_window": 32000})]
+    assert [(m.handle, m.model_type, m.organization_id) for m in plan.to_create] == [("byok/new", "llm", ORG_ID)]
+
+
+def test_plan_provider_model_sync_no_op_and_renamed_handle():
+    existing = _row("byok/gpt-4o")
+    plan = plan_provider_model_sync(
+        provider_id="provider-1",
+        organization_id=ORG_ID,
+        existing_models=[existing],
+        llm_models=[_llm("byok/gpt-4o")],
+        embedding_models=[],
+    )
+    assert not plan.changed
+
+    # same model name under a new handle: the old row is removed, and the new handle is created
+    plan = plan_provider_model_sync(
+        provider_id="provider-1",
+        organization_id=ORG_ID,
+        existing_models=[existing],
+        llm_models=[_llm("renamed/gpt-4o")],
+        embedding_models=[],
+    )
+    assert plan.to_remove == [existing]
+    assert [m.handle for m in plan.to_create] == ["renamed/gpt-4o"]
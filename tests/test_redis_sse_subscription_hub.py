@@ -0,0 +1,181 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from letta.constants import SSE_LIVE_RUNS_CHANNEL
+from letta.data_sources.redis_client import NoopAsyncRedisClient
+from letta.server.rest_api import redis_stream_manager
+from letta.server.rest_api.redis_stream_manager import RedisSSESubscriptionHub, _stream_id, redis_sse_stream_generator
+from letta.settings import settings
+
+RUN_ID = "run-00000000-0000-4000-8000-000000000000"
+STREAM_KEY = f"sse:run:{RUN_ID}"
+
+
+class InMemoryStreamRedisClient(NoopAsyncRedisClient):
+    """Just enough of Redis streams and pub/sub for the hub."""
+
+    def __init__(self):
+        super().__init__()
+        self.streams = {}
+        self.published = []
+        self.xread_calls = []
+        self._changed = asyncio.Condition()
+
+    async def add(self, seq_id, data, complete=False, run_id=RUN_ID):
+        entries = self.streams.setdefault(f"sse:run:{run_id}", [])
+        fields = {"seq_id": str(seq_id), "data": data}
+        if complete:
+            fields["complete"] = "true"
+        entries.append((f"{1000 + len(entries)}-0", fields))
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _after(self, stream, after_id, end_id="+"):
+        return [
+            (entry_id, fields)
+            for entry_id, fields in self.streams.get(stream, [])
+            if _stream_id(entry_id) > _stream_id(after_id) and (end_id == "+" or _stream_id(entry_id) <= _stream_id(end_id))
+        ]
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    async def xrange(self, stream, start="-", end="+", count=None):
+        start_id = _stream_id(start) if start != "-" else (0, 0)
+        entries = [e for e in self.streams.get(stream, []) if _stream_id(e[0]) >= start_id]
+        entries = [e for e in entries if end == "+" or _stream_id(e[0]) <= _stream_id(end)]
+        return entries[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        self.xread_calls.append(set(streams))
+
+        def ready():
+            return [
+                [stream, self._after(stream, after_id)[:count]] for stream, after_id in streams.items() if self._after(stream, after_id)
+            ]
+
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(ready), block / 1000)
+            except asyncio.TimeoutError:
+                return []
+        return ready()
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = RedisSSESubscriptionHub(block_ms=50)
+    monkeypatch.setattr(redis_stream_manager, "_hub", hub)
+    monkeypatch.setattr(settings, "sse_subscription_hub_enabled", True)
+    return hub
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_reader_per_run(hub):
+    redis_client = InMemoryStreamRedisClient()
+    await redis_client.add(1, 'data: {"run_id":null,"seq_id":null}\n\n')
+
+    first = asyncio.create_task(_collect(redis_sse_stream_generator(redis_client, RUN_ID)))
+    second = asyncio.create_task(_collect(redis_sse_stream_generator(redis_client, RUN_ID, starting_after=1)))
+    await asyncio.sleep(0.01)
+    assert hub.has_subscribers(RUN_ID)
+    assert (SSE_LIVE_RUNS_CHANNEL, RUN_ID) in redis_client.published
+
+    await redis_client.add(2, "data: two\n\n")
+    await redis_client.add(3, "data: [DONE]\n\n", complete=True)
+    first, second = await asyncio.wait_for(asyncio.gather(first, second), timeout=1)
+
+    assert first == [f'data: {{"run_id":"{RUN_ID}","seq_id":1}}\n\n', "data: two\n\n", "data: [DONE]\n\n"]
+    assert second == ["data: two\n\n", "data: [DONE]\n\n"]
+    # one blocking read served both subscribers
+    assert len(redis_client.xread_calls) == 1
+    assert not hub.has_subscribers(RUN_ID)
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_reads_entries_handed_out_before_it_joined(hub):
+    redis_client = InMemoryStreamRedisClient()
+    async with aclosing(hub.subscribe(redis_client, RUN_ID, "0-0")) as early:
+        await redis_client.add(1, "one")
+        await redis_client.add(2, "two")
+        assert [(await anext(early))[1]["data"] for _ in range(2)] == ["one", "two"]
+
+        async with aclosing(hub.subscribe(redis_client, RUN_ID, "0-0")) as late:
+            assert (await anext(late))[1]["data"] == "one"
+            await redis_client.add(3, "three")
+            assert [(await anext(late))[1]["data"] for _ in range(2)] == ["two", "three"]
+        assert (await anext(early))[1]["data"] == "three"
+
+    # the reader stops with the last subscriber
+    await asyncio.sleep(0)
+    assert not hub.has_subscribers(RUN_ID)
+
+
+@pytest.mark.asyncio
+async def test_runs_are_read_with_one_multiplexed_xread(hub):
+    redis_client = InMemoryStreamRedisClient()
+    other_run_id = "run-11111111-1111-4111-8111-111111111111"
+    async with (
+        aclosing(hub.subscribe(redis_client, RUN_ID, "0-0")) as first,
+        aclosing(hub.subscribe(redis_client, other_run_id, "0-0")) as other,
+    ):
+        await asyncio.sleep(0.06)
+        await redis_client.add(1, "one")
+        await redis_client.add(1, "other one", run_id=other_run_id)
+        assert (await anext(first))[1]["data"] == "one"
+        assert (await anext(other))[1]["data"] == "other one"
+
+    assert {STREAM_KEY, f"sse:run:{other_run_id}"} in redis_client.xread_calls
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_rereads_entries_dropped_from_its_full_queue():
+    hub = RedisSSESubscriptionHub(block_ms=50, queue_size=2)
+    redis_client = InMemoryStreamRedisClient()
+    async with aclosing(hub.subscribe(redis_client, RUN_ID, "0-0")) as slow:
+        await redis_client.add(0, "chunk 0")
+        assert (await anext(slow))[1]["data"] == "chunk 0"
+        for i in range(1, 7):
+            await redis_client.add(i, f"chunk {i}")
+        await asyncio.sleep(0.06)
+        (subscriber,) = hub._feeds[RUN_ID].subscribers
+        assert subscriber.lagging and subscriber.queue.full()
+        assert [(await anext(slow))[1]["data"] for _ in range(6)] == [f"chunk {i}" for i in range(1, 7)]
+
+
+@pytest.mark.asyncio
+async def test_transient_read_errors_are_retried(hub, monkeypatch):
+    monkeypatch.setattr(redis_stream_manager, "_XREAD_RETRY_DELAY_SECONDS", 0)
+
+    class FlakyRedisClient(InMemoryStreamRedisClient):
+        failures = 2
+
+        async def xread(self, streams, count=None, block=None):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection reset")
+            return await super().xread(streams, count=count, block=block)
+
+    redis_client = FlakyRedisClient()
+    async with aclosing(hub.subscribe(redis_client, RUN_ID, "0-0")) as stream:
+        await redis_client.add(1, "one")
+        assert (await asyncio.wait_for(anext(stream), timeout=1))[1]["data"] == "one"
+
+
+@pytest.mark.asyncio
+async def test_read_errors_are_raised_to_subscribers(hub, monkeypatch):
+    monkeypatch.setattr(redis_stream_manager, "_XREAD_RETRY_DELAY_SECONDS", 0)
+
+    class FailingRedisClient(InMemoryStreamRedisClient):
+        async def xread(self, streams, count=None, block=None):
+            raise ConnectionError("redis went away")
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(_collect(redis_sse_stream_generator(FailingRedisClient(), RUN_ID)), timeout=1)
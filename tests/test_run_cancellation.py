@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from letta.constants import RUN_CANCELLED_KEY_PREFIX
+from letta.data_sources.redis_client import AsyncRedisClient, NoopAsyncRedisClient
+from letta.services import run_cancellation
+from letta.services.run_cancellation import RunCancellationSignals
+
+RUN_ID = "run-00000000-0000-4000-8000-000000000000"
+
+
+class InMemoryPubSubRedisClient(AsyncRedisClient):
+    """Just enough of Redis keys and pub/sub for cancellation signals, shared by several "processes"."""
+
+    def __init__(self):
+        super().__init__()
+        self.values = {}
+        self.subscribers = []
+        self.gets = 0
+
+    async def get(self, key, default=None):
+        self.gets += 1
+        return self.values.get(key, default)
+
+    async def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        self.values[key] = str(value)
+        return True
+
+    async def publish(self, channel, message):
+        for queue in self.subscribers:
+            queue.put_nowait({"channel": channel, "data": message})
+        return len(self.subscribers)
+
+    async def subscribe(self, *channels, on_subscribe=None):
+        queue = asyncio.Queue()
+        self.subscribers.append(queue)
+        try:
+            if on_subscribe is not None:
+                await on_subscribe()
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers.remove(queue)
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = InMemoryPubSubRedisClient()
+
+    async def get_redis_client():
+        return client
+
+    monkeypatch.setattr(run_cancellation, "get_redis_client", get_redis_client)
+    return client
+
+
+async def _until(condition):
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_cancellation_is_pushed_to_other_processes(redis_client):
+    canceller, executor = RunCancellationSignals(), RunCancellationSignals()
+    # the executor watches the run for as long as it holds the event
+    event = executor.event(RUN_ID)
+
+    # a run seen for the first time is checked against the recorded cancellations once
+    assert await executor.is_cancelled(RUN_ID) is False
+    await _until(lambda: executor.listening)
+    gets = redis_client.gets
+    assert await executor.is_cancelled(RUN_ID) is False
+    assert redis_client.gets == gets
+
+    await canceller.cancel(RUN_ID)
+    await asyncio.wait_for(event.wait(), timeout=1)
+    assert await executor.is_cancelled(RUN_ID) is True
+    assert redis_client.gets == gets
+
+
+@pytest.mark.asyncio
+async def test_cancellations_missed_while_unsubscribed_are_picked_up(redis_client):
+    executor = RunCancellationSignals()
+    event = executor.event(RUN_ID)
+    redis_client.values[f"{RUN_CANCELLED_KEY_PREFIX}{RUN_ID}"] = "1"
+
+    await executor.is_cancelled("run-other")
+    await _until(lambda: executor.listening)
+    assert event.is_set()
+
+
+@pytest.mark.asyncio
+async def test_without_redis_the_run_status_must_be_checked(monkeypatch):
+    async def get_redis_client():
+        return NoopAsyncRedisClient()
+
+    monkeypatch.setattr(run_cancellation, "get_redis_client", get_redis_client)
+    signals = RunCancellationSignals()
+    event = signals.event(RUN_ID)
+    assert await signals.is_cancelled(RUN_ID) is None
+
+    # a cancellation in this process is still seen
+    await signals.cancel(RUN_ID)
+    assert event.is_set()
+    assert await signals.is_cancelled(RUN_ID) is True
+
+
+@pytest.mark.asyncio
+async def test_events_are_dropped_when_no_one_waits_on_the_run(redis_client):
+    signals = RunCancellationSignals()
+    event = signals.event(RUN_ID)
+    for i in range(100):
+        await signals.is_cancelled(f"run-finished-{i}")
+    assert set(signals._events) == {RUN_ID}
+
+    del event
+    assert not signals._events
+
+    # resubscribing only looks up runs that are still watched
+    mgets = []
+    original_mget = redis_client.mget
+
+    async def mget(*keys):
+        mgets.append(keys)
+        return await original_mget(*keys)
+
+    redis_client.mget = mget
+    watched = signals.event("run-watched")
+    await signals._on_subscribe()
+    assert mgets == [(f"{RUN_CANCELLED_KEY_PREFIX}run-watched",)]
+    assert not watched.is_set()
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+from letta.schemas.letta_message import AssistantMessage, ToolCall, ToolCallMessage, ToolReturnMessage
+from letta.schemas.letta_stop_reason import LettaStopReason, StopReasonType
+from letta.server.rest_api.sse_chunk_encoding import _KEYFRAME_INTERVAL, COMPACT_ENCODING, SSEChunkDecoder, SSEChunkEncoder
+
+DATE = datetime(2026, 10, 18, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+def _sse(message):
+    return f"data: {message.model_dump_json()}\n\n"
+
+
+def _token_stream(tokens=200):
+    chunks = [
+        _sse(
+            AssistantMessage(
+                id="message-8e3c4a1e-0c1e-4a6a-9a2c-2c8d0a1f6b11",
+                date=DATE,
+                otid="8e3c4a1e-0c1e-4a6a-9a2c-2c8d0a1f6b00",
+                step_id="step-5d0f3d4a-8a1b-4d52-a7f5-bd1fa9f1f6b2",
+                content=f"token{i} ",
+            )
+        )
+        for i in range(tokens)
+    ]
+    chunks.append(
+        _sse(
+            ToolCallMessage(
+                id="message-1c1f4a1e-0c1e-4a6a-9a2c-2c8d0a1f6b11",
+                date=DATE,
+                tool_call=ToolCall(name="send_message", arguments='{"message": "hi"}', tool_call_id="call_1"),
+            )
+        )
+    )
+    chunks.append(
+        _sse(
+            ToolReturnMessage(
+                id="message-2c1f4a1e-0c1e-4a6a-9a2c-2c8d0a1f6b11",
+                date=DATE,
+                tool_return="result line\n" * 100,
+                status="success",
+                tool_call_id="call_1",
+            )
+        )
+    )
+    chunks.append(f"data: {LettaStopReason(stop_reason=StopReasonType.end_turn).model_dump_json()}\n\n")
+    chunks.append('event: error\ndata: {"message_type":"error_message"}\n\n')
+    chunks.append("data: [DONE]\n\n")
+    return chunks
+
+
+def _encode(chunks):
+    encoder = SSEChunkEncoder()
+    return [{"seq_id": str(i + 1), "data": encoder.encode(chunk), "encoding": COMPACT_ENCODING} for i, chunk in enumerate(chunks)]
+
+
+def test_compact_encoding_round_trips_exactly_and_is_smaller():
+    chunks = _token_stream()
+    entries = _encode(chunks)
+
+    decoder = SSEChunkDecoder()
+    assert [decoder.decode(entry) for entry in entries] == chunks
+    assert sum(len(entry["data"]) for entry in entries) < sum(len(chunk) for chunk in chunks) / 3
+    # the large tool return is compressed
+    assert entries[-4]["data"].startswith("z")
+
+
+def test_entries_without_the_compact_encoding_are_read_as_is():
+    decoder = SSEChunkDecoder()
+    assert decoder.decode({"seq_id": "1", "data": "data: [DONE]\n\n"}) == "data: [DONE]\n\n"
+    assert decoder.decode({"seq_id": "2", "data": 'data: {"0":1}\n\n'}) == 'data: {"0":1}\n\n'
+
+    # bodies that could be confused with field codes are stored as is
+    assert SSEChunkEncoder().encode('data: {"0":1}\n\n') == 'rdata: {"0":1}\n\n'
+
+
+def test_reader_of_a_trimmed_stream_resumes_at_the_next_keyframe():
+    chunks = _token_stream()
+    entries = _encode(chunks)
+
+    decoder = SSEChunkDecoder()
+    decoded = [decoder.decode(entry) for entry in entries[10:]]
+    first_keyframe = _KEYFRAME_INTERVAL - 10
+    assert decoded[:first_keyframe] == [""] * first_keyframe
+    assert decoded[first_keyframe:] == chunks[_KEYFRAME_INTERVAL:]
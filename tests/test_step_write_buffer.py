@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from letta.orm.provider_trace import ProviderTrace as ProviderTraceModel
+from letta.schemas.enums import StepStatus
+from letta.services.step_write_buffer import StepWriteBuffer
+
+ORG_ID = "org-00000000-0000-4000-8000-000000000000"
+STEP_ID = "step-00000000-0000-4000-8000-000000000000"
+
+
+@pytest.fixture
+async def buffer(monkeypatch):
+    buffer = StepWriteBuffer(flush_interval_seconds=3600, max_pending=100)
+    buffer.batches = []
+
+    async def write(batch):
+        buffer.batches.append(batch)
+
+    monkeypatch.setattr(buffer, "_write", write)
+    yield buffer
+    await buffer.close()
+
+
+def _step_values(step_id=STEP_ID):
+    return {
+        "id": step_id,
+        "organization_id": ORG_ID,
+        "agent_id": "agent-00000000-0000-4000-8000-000000000000",
+        "project_id": "project-1",
+        "status": StepStatus.PENDING,
+        "prompt_tokens": 0,
+        "run_id": None,
+        "tags": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_step_writes_are_coalesced_into_one_insert(buffer):
+    step = buffer.add_step(_step_values())
+    assert step.id == STEP_ID and step.status == StepStatus.PENDING
+
+    buffer.record_metrics(ORG_ID, STEP_ID, {"step_ns": None, "llm_request_ns": None})
+    buffer.add_row(STEP_ID, ProviderTraceModel(id="provider_trace-1", step_id=STEP_ID, request_json={}, response_json={}))
+    step = buffer.update_step(ORG_ID, STEP_ID, {"status": StepStatus.SUCCESS, "prompt_tokens": 42})
+    assert step.status == StepStatus.SUCCESS
+    metrics = buffer.record_metrics(ORG_ID, STEP_ID, {"step_ns": 5, "llm_request_ns": None})
+    assert metrics.step_ns == 5 and metrics.agent_id == "agent-00000000-0000-4000-8000-000000000000"
+
+    assert buffer.has_pending([STEP_ID])
+    await buffer.flush()
+    assert not buffer.has_pending()
+
+    (batch,) = buffer.batches
+    (inserted,) = batch.step_inserts
+    assert inserted["status"] == StepStatus.SUCCESS and inserted["prompt_tokens"] == 42
+    assert batch.metrics_inserts[0]["step_ns"] == 5
+    assert len(batch.rows) == 1
+    assert not batch.step_updates and not batch.metrics_updates
+
+
+@pytest.mark.asyncio
+async def test_updates_after_a_flush_write_only_changed_columns(buffer):
+    buffer.add_step(_step_values())
+    await buffer.flush()
+
+    buffer.update_step(ORG_ID, STEP_ID, {"stop_reason": "end_turn"})
+    buffer.update_step(ORG_ID, STEP_ID, {"status": StepStatus.SUCCESS})
+    assert buffer.get_step(ORG_ID, STEP_ID).stop_reason == "end_turn"
+    await buffer.flush()
+
+    (update,) = buffer.batches[-1].step_updates
+    assert {key: value for key, value in update.items() if key != "updated_at"} == {
+        "id": STEP_ID,
+        "stop_reason": "end_turn",
+        "status": StepStatus.SUCCESS,
+    }
+    assert not buffer.batches[-1].step_inserts
+
+    # untracked steps are left to the caller, other organizations are rejected
+    assert buffer.update_step(ORG_ID, "step-untracked", {"status": StepStatus.SUCCESS}) is None
+    with pytest.raises(Exception, match="Unauthorized"):
+        buffer.update_step("org-other", STEP_ID, {"status": StepStatus.SUCCESS})
+
+
+@pytest.mark.asyncio
+async def test_flush_steps_waits_for_a_flush_in_progress(monkeypatch):
+    buffer = StepWriteBuffer(flush_interval_seconds=3600, max_pending=100)
+    release = asyncio.Event()
+    written = []
+
+    async def write(batch):
+        await release.wait()
+        written.extend(values["id"] for values in batch.step_inserts)
+
+    monkeypatch.setattr(buffer, "_write", write)
+    buffer.add_step(_step_values())
+    in_progress = asyncio.create_task(buffer.flush())
+    await asyncio.sleep(0)
+
+    # the step is no longer pending, but its insert has not been written yet
+    waiter = asyncio.create_task(buffer.flush_steps([STEP_ID]))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    release.set()
+    await asyncio.gather(in_progress, waiter)
+    assert written == [STEP_ID]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_when_max_pending_is_reached(monkeypatch):
+    buffer = StepWriteBuffer(flush_interval_seconds=3600, max_pending=2)
+    batches = []
+
+    async def write(batch):
+        batches.append(batch)
+
+    monkeypatch.setattr(buffer, "_write", write)
+    buffer.add_step(_step_values("step-1"))
+    await asyncio.sleep(0)
+    assert not batches
+
+    buffer.add_step(_step_values("step-2"))
+    await asyncio.sleep(0.01)
+    assert [len(batch.step_inserts) for batch in batches] == [2]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_failing_writes_are_isolated(monkeypatch):
+    buffer = StepWriteBuffer(flush_interval_seconds=3600, max_pending=100)
+    written = []
+
+    async def write(batch):
+        if any(row.id == "provider_trace-bad" for row in batch.rows):
+            raise ValueError("bad row")
+        written.append(batch)
+
+    monkeypatch.setattr(buffer, "_write", write)
+    buffer.add_step(_step_values())
+    buffer.record_metrics(ORG_ID, STEP_ID, {"step_ns": 5})
+    for trace_id in ("provider_trace-good", "provider_trace-bad"):
+        buffer.add_row(STEP_ID, ProviderTraceModel(id=trace_id, step_id=STEP_ID, request_json={}, response_json={}))
+    await buffer.flush()
+
+    # only the failing row is dropped; the step, its metrics and its other row are written, and the step stays tracked
+    assert [values["id"] for batch in written for values in batch.step_inserts] == [STEP_ID]
+    assert [values["id"] for batch in written for values in batch.metrics_inserts] == [STEP_ID]
+    assert [row.id for batch in written for row in batch.rows] == ["provider_trace-good"]
+    assert buffer.get_step(ORG_ID, STEP_ID) is not None
+    await buffer.close()
@@ -0,0 +1,151 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.message import Message
+from letta.services.context_window_calculator.token_counter import LocalTokenCounter, TokenCountLRUCache, get_token_count_cache
+
+
+def _make_message(text: str, role: MessageRole = MessageRole.user) -> Message:
+    return Message(role=role, content=[TextContent(text=text)])
+
+
+@pytest.fixture(autouse=True)
+def reset_local_counter_state():
+    get_token_count_cache().clear()
+    LocalTokenCounter._calibration_factors.clear()
+    LocalTokenCounter._calls_since_calibration = 0
+    yield
+    get_token_count_cache().clear()
+    LocalTokenCounter._calibration_factors.clear()
+
+
+class TestTokenCountLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = TokenCountLRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "a" is now most recently used
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_tracks_hits_and_misses(self):
+        cache = TokenCountLRUCache(maxsize=4)
+        cache.get("missing")
+        cache.put("k", 5)
+        cache.get("k")
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+
+class TestLocalTokenCounter:
+    @pytest.mark.asyncio
+    async def test_counts_text_without_remote_calls(self):
+        counter = LocalTokenCounter(model="gpt-4o-mini", provider_type="openai")
+        assert await counter.count_text_tokens("") == 0
+        assert await counter.count_text_tokens("hello world") > 0
+
+    @pytest.mark.asyncio
+    async def test_list_count_is_sum_of_cached_per_message_counts(self):
+        counter = LocalTokenCounter(model="gpt-4o-mini", provider_type="openai")
+        messages = [_make_message("first message"), _make_message("second message", role=MessageRole.assistant)]
+
+        total = await counter.count_messages(messages)
+        individual = [await counter.count_messages([m]) for m in messages]
+        assert total == sum(individual)
+
+        # Appending a message only tokenizes the new one
+        cache = get_token_count_cache()
+        misses_before = cache.misses
+        await counter.count_messages([*messages, _make_message("third message")])
+        assert cache.misses - misses_before == 1
+
+    @pytest.mark.asyncio
+    async def test_edited_message_content_invalidates_entry(self):
+        counter = LocalTokenCounter(model="gpt-4o-mini", provider_type="openai")
+        message = _make_message("short")
+        before = await counter.count_messages([message])
+        message.content = [TextContent(text="a much longer message body than before " * 10)]
+        after = await counter.count_messages([message])
+        assert after > before
+
+    @pytest.mark.asyncio
+    async def test_applies_provider_calibration_factor(self):
+        openai_counter = LocalTokenCounter(model="claude-sonnet-4-5", provider_type="openai")
+        anthropic_counter = LocalTokenCounter(model="claude-sonnet-4-5", provider_type="anthropic")
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+        assert await anthropic_counter.count_text_tokens(text) > await openai_counter.count_text_tokens(text)
+
+    @pytest.mark.asyncio
+    async def test_remote_sample_updates_calibration(self, monkeypatch):
+        from letta.settings import settings
+
+        monkeypatch.setattr(settings, "local_token_counter_calibration_interval", 1)
+        remote = MagicMock()
+        remote.convert_messages = MagicMock(return_value=[])
+        remote.count_message_tokens = AsyncMock(return_value=10_000)
+        counter = LocalTokenCounter(model="claude-sonnet-4-5", provider_type="anthropic", remote_counter=remote)
+
+        messages = [_make_message("calibrate me")]
+        raw = await counter.count_messages(messages)
+        await counter._sample_remote(raw, messages=messages)
+
+        remote.count_message_tokens.assert_awaited()
+        assert counter.calibration_factor > LocalTokenCounter.DEFAULT_CALIBRATION_FACTORS["anthropic"]
+        assert counter.calibration_factor <= LocalTokenCounter.CALIBRATION_BOUNDS[1]
+
+
+class TestPersistedTokenCounts:
+    def test_compute_message_token_counts_is_keyed_by_tokenizer_family(self):
+        from letta.services.context_window_calculator.token_counter import compute_message_token_counts
+
+        message = _make_message("persist my token count")
+        counts = compute_message_token_counts(message)
+        family = LocalTokenCounter().encoding_name
+        assert set(counts) == {family}
+        assert counts[family] > 0
+
+    @pytest.mark.asyncio
+    async def test_count_messages_uses_persisted_counts(self):
+        counter = LocalTokenCounter(provider_type="openai")
+        message = _make_message("this text is never tokenized")
+        message.token_counts = {counter.encoding_name: 1234}
+
+        cache = get_token_count_cache()
+        misses_before = cache.misses
+        assert await counter.count_messages([message]) == 1234
+        assert cache.misses == misses_before
+
+    @pytest.mark.asyncio
+    async def test_counts_use_the_agent_model_encoding(self, monkeypatch):
+        from letta.schemas.llm_config import LLMConfig
+        from letta.services.context_window_calculator import token_counter
+        from letta.services.context_window_calculator.token_counter import compute_message_token_counts
+
+        class FakeEncoding:
+            def __init__(self, name: str, chars_per_token: int):
+                self.name = name
+                self.chars_per_token = chars_per_token
+
+            def encode(self, text, disallowed_special=()):
+                return [0] * (len(text) // self.chars_per_token)
+
+        encodings = {"gpt-4o": FakeEncoding("o200k_base", 4), None: FakeEncoding("cl100k_base", 2)}
+        monkeypatch.setattr(token_counter, "_get_tiktoken_encoding", lambda model: encodings.get(model, encodings[None]))
+
+        message = _make_message("count me with the tokenizer of the agent model")
+        llm_config = LLMConfig(model="gpt-4o", model_endpoint_type="openai", context_window=128000)
+        counts = compute_message_token_counts(message, llm_config=llm_config)
+        assert set(counts) == {"o200k_base"}
+        message.token_counts = counts
+
+        # an agent on another encoding recounts instead of reusing the persisted count
+        cl100k_counter = LocalTokenCounter()
+        assert await cl100k_counter.count_messages([message]) > counts["o200k_base"]
+        assert compute_message_token_counts(message, counter=cl100k_counter).keys() == {"o200k_base", "cl100k_base"}
+        assert await LocalTokenCounter(model="gpt-4o").count_messages([message]) == counts["o200k_base"]
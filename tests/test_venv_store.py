@@ -0,0 +1,86 @@
+import os
+
+from letta.schemas.pip_requirement import PipRequirement
+from letta.schemas.sandbox_config import LocalSandboxConfig
+from letta.schemas.tool import Tool
+from letta.services.tool_sandbox import venv_store
+from letta.services.tool_sandbox.venv_store import VenvLease, VenvStore, normalize_requirements, venv_store_key
+from letta.settings import tool_settings
+
+
+def test_key_is_independent_of_requirement_order_and_source(tmp_path):
+    config = LocalSandboxConfig(sandbox_dir=str(tmp_path), pip_requirements=[PipRequirement(name="Requests", version="2.32.0")])
+    tool = Tool(name="t", source_code="def t(): pass", pip_requirements=[PipRequirement(name="numpy")])
+    requirements = normalize_requirements(config, tool)
+    assert requirements == ["numpy", "requests==2.32.0"]
+
+    swapped = normalize_requirements(
+        LocalSandboxConfig(sandbox_dir=str(tmp_path), pip_requirements=[PipRequirement(name="numpy")]),
+        Tool(name="t", source_code="def t(): pass", pip_requirements=[PipRequirement(name="requests", version="2.32.0")]),
+    )
+    assert venv_store_key(swapped) == venv_store_key(requirements)
+    assert venv_store_key(requirements) != venv_store_key(["numpy"])
+    assert venv_store_key(requirements) != venv_store_key(requirements, requirements_txt="pandas\n")
+
+
+def _publish(store: VenvStore, key: str, last_used: float) -> str:
+    venv_path = os.path.join(store.root, f"{key}-0000")
+    os.makedirs(os.path.join(venv_path, "bin"))
+    open(os.path.join(venv_path, "bin", "python3"), "w").close()
+    os.symlink(venv_path, os.path.join(store.root, key))
+    os.utime(os.path.join(store.root, key), (last_used, last_used), follow_symlinks=False)
+    return venv_path
+
+
+def test_ready_venvs_are_resolved_and_lru_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_settings, "sandbox_venv_store_max_venvs", 2)
+    store = VenvStore(str(tmp_path))
+    os.makedirs(store.root)
+    oldest = _publish(store, "aaa", 1000)
+    middle = _publish(store, "bbb", 2000)
+    newest = _publish(store, "ccc", 3000)
+
+    assert store.get_ready_venv("missing") is None
+    # resolving refreshes the LRU clock, so "aaa" survives and "bbb" is evicted
+    assert store.get_ready_venv("aaa") == os.path.realpath(oldest)
+    store.evict()
+
+    assert not os.path.exists(middle) and not os.path.lexists(os.path.join(store.root, "bbb"))
+    assert os.path.isdir(oldest) and os.path.isdir(newest)
+
+
+def test_leased_venvs_are_not_evicted_until_released(tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_settings, "sandbox_venv_store_max_venvs", 1)
+    store = VenvStore(str(tmp_path))
+    os.makedirs(store.root)
+    in_use = _publish(store, "aaa", 1000)
+    _publish(store, "bbb", 2000)
+
+    lease = VenvLease(os.path.realpath(in_use))
+    assert lease.acquire()
+    store.evict()
+    # still published and intact while a tool or worker holds the lease
+    assert store.get_ready_venv("aaa") == os.path.realpath(in_use)
+    os.utime(os.path.join(store.root, "aaa"), (1000, 1000), follow_symlinks=False)
+
+    lease.release()
+    store.evict()
+    assert not os.path.exists(in_use) and store.get_ready_venv("aaa") is None
+    # a lease taken on an evicted venv fails, so the caller resolves it again
+    assert not VenvLease(os.path.realpath(in_use)).acquire()
+
+
+def test_build_failure_leaves_no_partial_venv(tmp_path, monkeypatch):
+    store = VenvStore(str(tmp_path))
+
+    def _fail(path, with_pip):
+        os.makedirs(path)
+        raise RuntimeError("pip exploded")
+
+    monkeypatch.setattr(venv_store.venv, "create", _fail)
+    try:
+        store._build("abc", ["numpy"], env={})
+    except RuntimeError:
+        pass
+    assert os.listdir(store.root) == []
+    assert store.get_ready_venv("abc") is None